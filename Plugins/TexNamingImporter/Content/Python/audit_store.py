@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import csv
+from array import array
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:  # NumPy があれば集計・抽出をベクトル化する（無くても動く）
+    import numpy as _np
+except ImportError:  # pragma: no cover - 環境依存
+    _np = None
+
+from suffix_grammar import GrammarMatch
+
+
+class AuditVerdict(IntEnum):
+    OK = 0
+    INVALID_SUFFIX = 1   # 行（カテゴリ）が特定できる不一致
+    NAME_MISMATCH = 2    # 個数不一致・本体なしなど、行が特定できない不一致
+    SKIPPED = 3          # 対象外（ディレクトリ外など）
+
+
+# カテゴリ列（StringPool のコードで保持する列）。failed_token は不一致だった行のトークン（小文字）
+CATEGORY_COLUMNS = ("texture_type", "address", "failed_token")
+# すべての列
+COLUMNS = ("path",) + CATEGORY_COLUMNS + ("verdict", "failed_row")
+
+
+class StringPool:
+    """
+    文字列 ⇔ 小さな整数コード の共有辞書。コード 0 は空文字（値なし）。
+    max_code はコードを入れる配列の型の上限（既定は uint16）。超えると OverflowError。
+    """
+
+    def __init__(self, max_code: int = 0xFFFF):
+        self.max_code = max_code
+        self._codes: Dict[str, int] = {"": 0}
+        self._strings: List[str] = [""]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def code(self, s: Optional[str]) -> int:
+        if not s:
+            return 0
+        c = self._codes.get(s)
+        if c is None:
+            c = len(self._strings)
+            if c > self.max_code:
+                raise OverflowError(f"StringPool のコードが上限（{self.max_code}）を超えました")
+            self._codes[s] = c
+            self._strings.append(s)
+        return c
+
+    def lookup(self, s: str) -> Optional[int]:
+        """登録済みならコード、未登録なら None（登録はしない）。"""
+        return self._codes.get(s or "")
+
+    def string(self, code: int) -> str:
+        return self._strings[code]
+
+    @property
+    def strings(self) -> List[str]:
+        return list(self._strings)
+
+
+class AuditResultStore:
+    """
+    監査結果を列指向で保持するコンテナ。
+
+    - texture_type / address / failed_token は共有 StringPool のコード（uint16）。
+      texture_type / address には規則に合ったキーだけを入れ、綴り違いは failed_token に分ける
+    - verdict は AuditVerdict（uint8）、failed_row は int8（-1 = なし）
+    - パスは UTF-8 を 1 本の bytearray に連結し、オフセット（uint64）で引く
+    1 件あたり十数バイト + パス長 程度なので、100 万件でも数十 MB に収まる。
+    """
+
+    def __init__(self, *, type_row: int = 0, address_row: int = 1):
+        self.type_row = type_row
+        self.address_row = address_row
+        self.pool = StringPool()
+        self._path_blob = bytearray()
+        self._path_offsets = array("Q", [0])
+        self._cols: Dict[str, array] = {
+            "texture_type": array("H"),
+            "address": array("H"),
+            "failed_token": array("H"),
+            "verdict": array("B"),
+            "failed_row": array("b"),
+        }
+
+    def __len__(self) -> int:
+        return len(self._cols["verdict"])
+
+    # ---------- 追加 ----------
+    def append(self, path: str, texture_type: Optional[str], address: Optional[str],
+               verdict: AuditVerdict, failed_row: Optional[int] = None, failed_token: Optional[str] = None) -> None:
+        self._path_blob += path.encode("utf-8")
+        self._path_offsets.append(len(self._path_blob))
+        cols = self._cols
+        cols["texture_type"].append(self.pool.code(texture_type))
+        cols["address"].append(self.pool.code(address))
+        cols["failed_token"].append(self.pool.code(failed_token))
+        cols["verdict"].append(int(verdict))
+        cols["failed_row"].append(-1 if failed_row is None else failed_row)
+
+    def append_match(self, path: str, match: GrammarMatch) -> None:
+        """CompiledSuffixGrammar の照合結果を 1 件追加する。"""
+        if match.ok:
+            keys = match.keys_by_row
+            self.append(path, _at(keys, self.type_row), _at(keys, self.address_row), AuditVerdict.OK)
+            return
+        failed = match.failed_row_index
+        if failed is None:
+            # 行が特定できない不一致は、どのトークンもカテゴリ列に入れない
+            self.append(path, None, None, AuditVerdict.NAME_MISMATCH)
+            return
+        # 不一致の行より前は規則に合っている。不一致のトークンは小文字で failed_token に残す（綴り違いを束ねるため）
+        run = [t.lower() for t in match.matches_by_row if t is not None]
+        valid = run[:failed]
+        self.append(path, _at(valid, self.type_row), _at(valid, self.address_row), AuditVerdict.INVALID_SUFFIX,
+                    failed, _at(run, failed))
+
+    def extend_matches(self, items: Iterable[Tuple[str, GrammarMatch]]) -> None:
+        for path, match in items:
+            self.append_match(path, match)
+
+    # ---------- 参照 ----------
+    def path(self, i: int) -> str:
+        o = self._path_offsets
+        return self._path_blob[o[i]:o[i + 1]].decode("utf-8")
+
+    def row(self, i: int) -> Dict[str, Union[str, int, None]]:
+        cols = self._cols
+        fr = cols["failed_row"][i]
+        return {
+            "path": self.path(i),
+            "texture_type": self.pool.string(cols["texture_type"][i]),
+            "address": self.pool.string(cols["address"][i]),
+            "failed_token": self.pool.string(cols["failed_token"][i]),
+            "verdict": AuditVerdict(cols["verdict"][i]).name,
+            "failed_row": None if fr < 0 else fr,
+        }
+
+    def rows(self, indices: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Union[str, int, None]]]:
+        for i in (range(len(self)) if indices is None else indices):
+            yield self.row(i)
+
+    def column(self, name: str) -> array:
+        """生の列（array）を返す。変更しないこと。"""
+        return self._cols[name]
+
+    def nbytes(self) -> int:
+        """保持しているバッファの合計サイズ（バイト）。"""
+        total = len(self._path_blob) + self._path_offsets.itemsize * len(self._path_offsets)
+        for a in self._cols.values():
+            total += a.itemsize * len(a)
+        return total
+
+    # ---------- 集計 ----------
+    def _np_col(self, name: str):
+        a = self._cols[name]
+        return _np.frombuffer(a, dtype=_np.dtype(a.typecode)) if len(a) else _np.zeros(0, dtype=a.typecode)
+
+    def _code_of(self, column: str, value) -> Optional[int]:
+        if column in CATEGORY_COLUMNS:
+            return self.pool.lookup(value)
+        if column == "verdict":
+            return int(value if isinstance(value, AuditVerdict) else AuditVerdict[value])
+        if column == "failed_row":
+            return -1 if value is None else int(value)
+        raise KeyError(column)
+
+    def _label(self, column: str, code: int):
+        if column in CATEGORY_COLUMNS:
+            return self.pool.string(code)
+        if column == "verdict":
+            return AuditVerdict(code).name
+        return None if code < 0 else code
+
+    def count_by(self, column: str) -> Dict[Union[str, int, None], int]:
+        """列の値ごとの件数（0 件の値は含めない）。"""
+        a = self._cols[column]
+        if column == "failed_row":
+            codes = range(-1, 128)
+        elif column == "verdict":
+            codes = [int(v) for v in AuditVerdict]
+        else:
+            codes = range(len(self.pool))
+
+        if _np is not None:
+            shift = 1 if column == "failed_row" else 0  # -1 を 0 に寄せて bincount する
+            counts = _np.bincount(self._np_col(column).astype(_np.int64) + shift, minlength=max(codes) + 1 + shift)
+            return {self._label(column, c): int(counts[c + shift]) for c in codes if counts[c + shift]}
+        out = {}
+        for c in codes:
+            n = a.count(c)  # C 実装の線形走査（値の種類は少ない）
+            if n:
+                out[self._label(column, c)] = n
+        return out
+
+    def group_counts(self, by: Sequence[str]) -> Dict[Tuple, int]:
+        """複数列の組み合わせごとの件数。"""
+        if _np is not None and len(self):
+            key = _np.zeros(len(self), dtype=_np.int64)
+            radices = []
+            for name in by:
+                col = self._np_col(name).astype(_np.int64)
+                if name == "failed_row":
+                    col = col + 1  # -1 を 0 に寄せる
+                radix = int(col.max()) + 1
+                key = key * radix + col
+                radices.append(radix)
+            uniq, counts = _np.unique(key, return_counts=True)
+            out: Dict[Tuple, int] = {}
+            for k, n in zip(uniq.tolist(), counts.tolist()):
+                parts = []
+                for name, radix in zip(reversed(by), reversed(radices)):
+                    k, c = divmod(k, radix)
+                    parts.append(self._label(name, c - 1 if name == "failed_row" else c))
+                out[tuple(reversed(parts))] = n
+            return out
+
+        counts: Dict[Tuple, int] = {}
+        for key in zip(*(self._cols[name] for name in by)):
+            counts[key] = counts.get(key, 0) + 1
+        return {tuple(self._label(n, c) for n, c in zip(by, key)): v for key, v in counts.items()}
+
+    def filter(self, **conditions) -> array:  # array('q')
+        """列 = 値 の条件（AND）に一致する行インデックスを返す。例: filter(verdict="OK", texture_type="nml")"""
+        codes = {}
+        for name, value in conditions.items():
+            code = self._code_of(name, value)
+            if code is None:
+                return array("q")  # 未登録の値には一致しない
+            codes[name] = code
+
+        if _np is not None:
+            mask = _np.ones(len(self), dtype=bool)
+            for name, code in codes.items():
+                mask &= self._np_col(name) == code
+            out = array("q")
+            out.frombytes(_np.nonzero(mask)[0].astype(_np.int64).tobytes())
+            return out
+
+        cols = [(self._cols[name], code) for name, code in codes.items()]
+        return array("q", (i for i in range(len(self)) if all(c[i] == code for c, code in cols)))
+
+    # ---------- 出力 ----------
+    def to_csv(self, file_path: Union[str, Path], indices: Optional[Iterable[int]] = None) -> None:
+        p = Path(file_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with p.open("w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(COLUMNS))
+            w.writeheader()
+            for r in self.rows(indices):
+                w.writerow(r)
+
+    def to_parquet(self, file_path: Union[str, Path]) -> None:
+        """
+        Parquet で書き出す（pyarrow が必要）。カテゴリ列は辞書エンコードのまま出力する。
+        failed_row の「なし」は CSV の空欄と同じく null にする。
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("to_parquet には pyarrow が必要です（pip install pyarrow）") from e
+
+        dictionary = pa.array(self.pool.strings, type=pa.string())
+        failed_row = pa.array(self._cols["failed_row"], pa.int8())
+        failed_row = pc.if_else(pc.equal(failed_row, -1), pa.scalar(None, pa.int8()), failed_row)
+        table = pa.table({
+            "path": pa.LargeStringArray.from_buffers(len(self), pa.py_buffer(self._path_offsets.tobytes()),
+                                                     pa.py_buffer(bytes(self._path_blob))),
+            "texture_type": pa.DictionaryArray.from_arrays(pa.array(self._cols["texture_type"], pa.uint16()), dictionary),
+            "address": pa.DictionaryArray.from_arrays(pa.array(self._cols["address"], pa.uint16()), dictionary),
+            "failed_token": pa.DictionaryArray.from_arrays(pa.array(self._cols["failed_token"], pa.uint16()),
+                                                           dictionary),
+            "verdict": pa.DictionaryArray.from_arrays(pa.array(self._cols["verdict"], pa.uint8()),
+                                                      pa.array([v.name for v in AuditVerdict])),
+            "failed_row": failed_row,
+        })
+        p = Path(file_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, str(p))
+
+
+def _at(seq: Sequence[Optional[str]], i: int) -> Optional[str]:
+    return seq[i] if 0 <= i < len(seq) else None
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SchedulerState(Enum):
+    IDLE = 0
+    RUNNING = 1
+    PAUSED = 2
+    CANCELLED = 3
+    DONE = 4
+
+
+@dataclass
+class TickStats:
+    """1 tick 分の処理結果。"""
+    processed: int = 0          # この tick で処理した件数
+    elapsed_ms: float = 0.0     # この tick で消費した時間（ms）
+    slice_size: int = 0         # この tick で目標とした件数
+    remaining: int = 0          # キューに残っている件数
+
+
+class TickBudgetScheduler(Generic[T]):
+    """
+    キューに積まれた要素を、1 tick あたりの時間予算（ms）内で少しずつ処理するスケジューラ。
+
+    - unreal に依存しない（tick の呼び出し元は detail_unreal 側で登録する）
+    - clock を差し替えられるので、テストでは擬似時計で動作を確認できる
+    - 1 要素あたりの実測コスト（指数移動平均）から次の tick の処理件数を決める
+    - pause / resume / cancel に対応
+    - 進捗保証のため、RUNNING 中の tick では最低 1 件は処理する
+    """
+
+    def __init__(
+        self,
+        process: Callable[[T], Any],
+        *,
+        budget_ms: float = 8.0,
+        clock: Callable[[], float] = time.perf_counter,
+        initial_slice: int = 1,
+        max_slice: int = 256,
+        smoothing: float = 0.3,
+        on_result: Optional[Callable[[T, Any, Optional[BaseException]], None]] = None,
+        on_finished: Optional[Callable[["TickBudgetScheduler[T]"], None]] = None,
+    ):
+        if budget_ms <= 0:
+            raise ValueError("budget_ms は正の値を指定してください")
+        if initial_slice < 1 or max_slice < 1:
+            raise ValueError("initial_slice / max_slice は 1 以上を指定してください")
+        if not (0.0 < smoothing <= 1.0):
+            raise ValueError("smoothing は (0, 1] の範囲で指定してください")
+
+        self._process = process
+        self._budget_s = budget_ms / 1000.0
+        self._clock = clock
+        self._initial_slice = initial_slice
+        self._max_slice = max_slice
+        self._smoothing = smoothing
+        self._on_result = on_result
+        self._on_finished = on_finished
+
+        self._queue: Deque[T] = deque()
+        self._state = SchedulerState.IDLE
+        self._avg_cost_s: Optional[float] = None  # 1 要素あたりの平均コスト（秒）
+        self.processed_total = 0
+        self.error_total = 0
+
+    # ---------- キュー操作 ----------
+    def enqueue(self, items: Iterable[T]) -> None:
+        """要素を末尾に追加する。完了済み（DONE）の場合は RUNNING に戻す。"""
+        if self._state is SchedulerState.CANCELLED:
+            raise RuntimeError("キャンセル済みのスケジューラには追加できません")
+        self._queue.extend(items)
+        if self._state is SchedulerState.DONE and self._queue:
+            self._state = SchedulerState.RUNNING
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def state(self) -> SchedulerState:
+        return self._state
+
+    @property
+    def is_finished(self) -> bool:
+        return self._state in (SchedulerState.DONE, SchedulerState.CANCELLED)
+
+    @property
+    def avg_cost_ms(self) -> Optional[float]:
+        return None if self._avg_cost_s is None else self._avg_cost_s * 1000.0
+
+    # ---------- 状態遷移 ----------
+    def start(self) -> None:
+        if self._state is SchedulerState.IDLE:
+            self._state = SchedulerState.RUNNING
+
+    def pause(self) -> None:
+        if self._state is SchedulerState.RUNNING:
+            self._state = SchedulerState.PAUSED
+
+    def resume(self) -> None:
+        if self._state is SchedulerState.PAUSED:
+            self._state = SchedulerState.RUNNING
+
+    def cancel(self) -> None:
+        """未処理の要素を破棄して終了する。"""
+        if self.is_finished:
+            return
+        self._queue.clear()
+        self._state = SchedulerState.CANCELLED
+        self._notify_finished()
+
+    # ---------- tick ----------
+    def next_slice_size(self) -> int:
+        """実測コストから次の tick で処理する目標件数を求める。"""
+        if self._avg_cost_s is None:
+            return self._initial_slice
+        if self._avg_cost_s <= 0.0:
+            return self._max_slice
+        n = int(self._budget_s / self._avg_cost_s)
+        return max(1, min(self._max_slice, n))
+
+    def tick(self, *_args) -> TickStats:
+        """
+        1 tick 分の処理を行う。post-tick コールバックからそのまま呼べるよう、余分な引数は無視する。
+        予算を超えた時点で打ち切り、残りは次の tick に回す。
+        """
+        stats = TickStats(remaining=len(self._queue))
+        if self._state is not SchedulerState.RUNNING:
+            return stats
+
+        slice_size = self.next_slice_size()
+        stats.slice_size = slice_size
+        clock = self._clock
+        start = clock()
+        deadline = start + self._budget_s
+
+        processed = 0
+        while self._queue and processed < slice_size:
+            item = self._queue.popleft()
+            result, error = None, None
+            try:
+                result = self._process(item)
+            except Exception as e:  # 1 件の失敗でバッチ全体を止めない
+                error = e
+                self.error_total += 1
+            processed += 1
+            if self._on_result is not None:
+                self._on_result(item, result, error)
+            if self._state is not SchedulerState.RUNNING:
+                break  # コールバック内で pause / cancel された
+            if clock() >= deadline:
+                break
+
+        elapsed = clock() - start
+        if processed:
+            cost = elapsed / processed
+            if self._avg_cost_s is None:
+                self._avg_cost_s = cost
+            else:
+                a = self._smoothing
+                self._avg_cost_s = a * cost + (1.0 - a) * self._avg_cost_s
+
+        self.processed_total += processed
+        stats.processed = processed
+        stats.elapsed_ms = elapsed * 1000.0
+        stats.remaining = len(self._queue)
+
+        if not self._queue and self._state is SchedulerState.RUNNING:
+            self._state = SchedulerState.DONE
+            self._notify_finished()
+        return stats
+
+    def _notify_finished(self) -> None:
+        if self._on_finished is not None:
+            self._on_finished(self)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+from dataclasses import dataclass, fields, replace
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from config import Config
+from directory_overrides import DirectoryOverrideIndex, directory_of
+from suffix_config import TextureSuffixConfig, load_texture_suffix_config
+from suffix_grammar import CompiledSuffixGrammar, GrammarMatch, compile_suffix_grammar
+from suffix_suggest import SuffixSuggester
+from texture_config import TextureConfigParams, load_params_map_json
+from type_define import AddressMode
+
+# 行ごとのキー（省略された行は None）。CompiledSuffixGrammar の keys_by_row と同じ並び
+KeyTuple = Tuple[Optional[str], ...]
+
+# これを超える組み合わせ数の設定では全列挙せず、初回参照時に解決してキャッシュする
+MAX_PRECOMPUTED_ENTRIES = 65536
+
+
+def resolve_params(keys: Sequence[Optional[str]],
+                   texture_settings: Dict[str, TextureConfigParams],
+                   suffix_settings: TextureSuffixConfig) -> TextureConfigParams:
+    """
+    サフィックスキー列から最終パラメータを作る（build_texture_config_params と同じ規則）。
+    - 最初に texture_settings に存在するキーを基本設定に使う（無ければ既定値）
+    - 最初に 2D/3D アドレス表に存在するキーでアドレスを上書き（無ければ WRAP/WRAP）
+    元の texture_settings は変更せず、新しいインスタンスを返す。
+    """
+    present = [k for k in keys if k is not None]
+    base = next((texture_settings[k] for k in present if k in texture_settings), None)
+    params = replace(base) if base is not None else TextureConfigParams()
+
+    for k in present:
+        if suffix_settings.has_2d(k):
+            params.address_u, params.address_v = suffix_settings.get_uv(k)
+            break
+        if suffix_settings.has_3d(k):
+            params.address_u, params.address_v, params.address_z = suffix_settings.get_uvw(k)
+            break
+    else:
+        params.address_u, params.address_v = AddressMode.WRAP, AddressMode.WRAP
+    return params
+
+
+def _enum_name(v) -> str:
+    if v is None:
+        return ""
+    return getattr(v, "name", str(v))
+
+
+def _cell(v) -> Union[str, int, bool]:
+    if isinstance(v, (bool, int)):
+        return v if isinstance(v, bool) else int(v)
+    return _enum_name(v)
+
+
+def _summary(p: TextureConfigParams) -> str:
+    """マトリクス CSV のセル用の短い表記。"""
+    addr = ",".join(_enum_name(a) for a in (p.address_u, p.address_v, p.address_z) if a is not None)
+    return (f"{_enum_name(p.compression)}/{_enum_name(p.srgb)}/{p.max_in_game or 0}"
+            f"/{_enum_name(p.texture_group)}/{_enum_name(p.mip_gen)}/{addr}")
+
+
+class ResolutionTable:
+    """
+    texture_type × アドレスサフィックス（= suffix_index の全行の直積）から
+    最終パラメータへの対応表。ルール読み込み時に 1 度だけ作り、以降の解決は dict 参照 1 回。
+
+    返す TextureConfigParams は表で共有しているので、呼び出し側では変更しないこと。
+    """
+
+    def __init__(self, grammar: CompiledSuffixGrammar,
+                 texture_settings: Dict[str, TextureConfigParams],
+                 suffix_settings: TextureSuffixConfig,
+                 *, max_entries: int = MAX_PRECOMPUTED_ENTRIES):
+        self.categories: List[str] = [r.category for r in grammar.rows]
+        self._texture_settings = texture_settings
+        self._suffix_settings = suffix_settings
+        self._axes: List[List[Optional[str]]] = [
+            list(r.keys.values()) + ([None] if r.optional else []) for r in grammar.rows
+        ]
+        self._entries: Dict[KeyTuple, TextureConfigParams] = {}
+
+        total = 1
+        for axis in self._axes:
+            total *= len(axis)
+        self.precomputed = total <= max_entries
+        if self.precomputed:
+            for combo in product(*self._axes):
+                self._entries[combo] = resolve_params(combo, texture_settings, suffix_settings)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, keys_by_row: Sequence[Optional[str]]) -> TextureConfigParams:
+        key = tuple(keys_by_row)
+        hit = self._entries.get(key)
+        if hit is None:
+            hit = resolve_params(key, self._texture_settings, self._suffix_settings)
+            self._entries[key] = hit
+        return hit
+
+    def items(self) -> Iterator[Tuple[KeyTuple, TextureConfigParams]]:
+        return iter(self._entries.items())
+
+    # ---------- CSV 出力 ----------
+    def export_csv(self, file_path: Union[str, Path], *, matrix: bool = False) -> None:
+        """
+        レビュー用に CSV を書き出す。
+        - matrix=False: 1 組み合わせ 1 行（各行のキー + 全パラメータ列）
+        - matrix=True : 2 カテゴリの設定のみ。行 = 1 番目のカテゴリ、列 = 2 番目のカテゴリ
+        """
+        p = Path(file_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with p.open("w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            if matrix:
+                if len(self._axes) != 2:
+                    raise ValueError("matrix 形式はカテゴリ数が 2 の設定でのみ出力できます")
+                rows_axis, cols_axis = self._axes
+                w.writerow([f"{self.categories[0]}\\{self.categories[1]}"] + [c or "-" for c in cols_axis])
+                for r in rows_axis:
+                    w.writerow([r or "-"] + [_summary(self.resolve((r, c))) for c in cols_axis])
+                return
+
+            names = [f.name for f in fields(TextureConfigParams)]
+            w.writerow(self.categories + names)
+            for combo, params in sorted(self._entries.items(), key=lambda kv: [k or "" for k in kv[0]]):
+                values = [_cell(getattr(params, n)) for n in names]
+                w.writerow([k or "" for k in combo] + values)
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """読み込み・検証済みのルール一式（文法・対応表・修正候補・ディレクトリ上書き）。"""
+    texture_settings: Dict[str, TextureConfigParams]
+    suffix_settings: TextureSuffixConfig
+    grammar: CompiledSuffixGrammar
+    table: ResolutionTable
+    suggester: SuffixSuggester
+    overrides: Optional[DirectoryOverrideIndex] = None
+
+    def resolve_path(self, src_path: str) -> Tuple[GrammarMatch, Optional[TextureConfigParams]]:
+        """パスを照合し、(照合結果, 最終パラメータ) を返す。照合失敗時のパラメータは None。"""
+        match = self.grammar.match(src_path)
+        if not match.ok:
+            return match, None
+        params = self.table.resolve(match.keys_by_row)
+        if self.overrides is not None:
+            params = self.overrides.apply(params, directory_of(src_path), match.keys_by_row)
+        return match, params
+
+
+def build_rules(texture_settings: Dict[str, TextureConfigParams],
+                suffix_settings: TextureSuffixConfig,
+                directory_overrides: Optional[Dict[str, Dict[str, Dict[str, object]]]] = None) -> CompiledRules:
+    grammar = compile_suffix_grammar(suffix_settings)
+    return CompiledRules(
+        texture_settings=texture_settings,
+        suffix_settings=suffix_settings,
+        grammar=grammar,
+        table=ResolutionTable(grammar, texture_settings, suffix_settings),
+        suggester=SuffixSuggester.from_grammar(grammar),
+        overrides=DirectoryOverrideIndex(directory_overrides) if directory_overrides else None,
+    )
+
+
+def compile_rules(texture_config_path: Union[str, Path], suffix_config_path: Union[str, Path],
+                  config_path: Optional[Union[str, Path]] = None) -> CompiledRules:
+    """
+    TextureConfig.json / SuffixConfig.json を読み込んで CompiledRules を作る。
+    config_path（Config.json）を渡すと、その directory_overrides も反映する。
+    """
+    overrides = Config.load(config_path).directory_overrides if config_path is not None else None
+    return build_rules(load_params_map_json(texture_config_path), load_texture_suffix_config(suffix_config_path),
+                       overrides)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="compiled_rules",
+        description="サフィックスの全組み合わせと最終パラメータの対応表を CSV に書き出します。",
+    )
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("out_csv", help="出力する CSV のパス")
+    parser.add_argument("--matrix", action="store_true", help="texture_type × アドレスサフィックスの表形式で出力")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    rules = compile_rules(args.texture_config_path, args.suffix_config_path)
+    rules.table.export_csv(args.out_csv, matrix=args.matrix)
+    print(f"{len(rules.table)} combinations -> {args.out_csv}")
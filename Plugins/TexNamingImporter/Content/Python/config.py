@@ -103,6 +103,31 @@ class TextureConfigParams:
             texture_group=cls._enum(TextureGroupKind, d.get("texture_group")) or TextureGroupKind.WORLD,
         )
 
+    @classmethod
+    def partial_from_dict(cls, d: dict) -> Dict[str, object]:
+        """
+        部分指定（ディレクトリ上書きなど）を検証し、指定されたキーだけを変換して返す。
+        未知のキーは ValueError。
+        """
+        converters = {
+            "address_u": lambda v: cls._enum(AddressMode, v),
+            "address_v": lambda v: cls._enum(AddressMode, v),
+            "address_z": lambda v: cls._enum(AddressMode, v),
+            "max_in_game": cls._size_to_int,
+            "enforce_pow2": bool,
+            "compression": lambda v: cls._enum(CompressionKind, v),
+            "srgb": lambda v: cls._enum(SRGBMode, v),
+            "mip_gen": lambda v: cls._enum(MipGenKind, v),
+            "texture_group": lambda v: cls._enum(TextureGroupKind, v),
+        }
+        out: Dict[str, object] = {}
+        for k, v in d.items():
+            conv = converters.get(k)
+            if conv is None:
+                raise ValueError(f"未知のパラメータ名: {k}")
+            out[k] = conv(v)
+        return out
+
     def to_dict(self, *, minimal: bool = True) -> dict:
         """辞書に変換。minimal=True の場合は None を出力しない。"""
         def _enum_name(e: Optional[object]) -> Optional[str]:
@@ -148,6 +173,37 @@ def _parse_3d(val) -> AddressTriple:
     return (_to_addr(val[0]), _to_addr(val[1]), _to_addr(val[2]))
 
 
+@dataclass
+class MemoryBudget:
+    """ディレクトリ以下のテクスチャメモリの予算。
+
+    - budget_mb: GPU メモリの上限（MB、ミップ込み）
+    - priority : texture_type ごとの重み（既定 1.0）。大きいほど最大サイズを下げにくい
+    """
+    budget_mb: float
+    priority: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "MemoryBudget":
+        budget = d.get("budget_mb")
+        if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0:
+            raise ValueError(f"budget_mb は正の数で指定してください: {budget!r}")
+        priority = d.get("priority", {})
+        if not isinstance(priority, dict) or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0 for v in priority.values()):
+            raise ValueError("priority は {texture_type: 正の数} で指定してください")
+        unknown = set(d) - {"budget_mb", "priority"}
+        if unknown:
+            raise ValueError(f"未知のキー: {sorted(unknown)}")
+        return cls(budget_mb=float(budget), priority={k: float(v) for k, v in priority.items()})
+
+    def to_dict(self) -> dict:
+        out: dict = {"budget_mb": self.budget_mb}
+        if self.priority:
+            out["priority"] = dict(self.priority)
+        return out
+
+
 # =========================
 # ルート統合設定: Config
 # =========================
@@ -162,6 +218,11 @@ class Config:
       - address_suffix_3d  : Dict[str, [U,V,W]]（任意）… 3D 用のサフィックス→(U,V,W) 対応表
       - suffix_index       : List[str]        … サフィックス検索順や優先度の定義
       - texture_config     : Dict[str, TextureConfigParams 相当の dict]
+      - directory_overrides: Dict[ディレクトリ, Dict[キー, 部分 dict]]（任意）
+                             キーは "*"（全テクスチャ）またはサフィックス（例: "nml"）。
+                             親ディレクトリから順に、"*" → サフィックスの順で基本設定に上書きする。
+      - memory_budgets     : Dict[ディレクトリ, {"budget_mb": 数, "priority": {type: 重み}}]（任意）
+                             ディレクトリ以下が予算に収まるよう、texture_type ごとに max_in_game を下げる。
     """
     run_dir: List[str] = field(default_factory=list)
 
@@ -174,6 +235,12 @@ class Config:
     # テクスチャタイプごとの詳細設定
     texture_config: Dict[str, TextureConfigParams] = field(default_factory=dict)
 
+    # ディレクトリごとの上書き（値は TextureConfigParams.partial_from_dict の結果）
+    directory_overrides: Dict[str, Dict[str, Dict[str, object]]] = field(default_factory=dict)
+
+    # ディレクトリごとのメモリ予算
+    memory_budgets: Dict[str, MemoryBudget] = field(default_factory=dict)
+
     # ---------- 読み書き ----------
     @classmethod
     def from_dict(cls, data: dict) -> "Config":
@@ -240,6 +307,41 @@ class Config:
                 raise ValueError(f"texture_config['{key}'] はオブジェクトで指定してください")
             params_map[key] = TextureConfigParams.from_dict(val)
 
+        # directory_overrides ブロック（任意）
+        raw_over = data.get("directory_overrides", {})
+        if not isinstance(raw_over, dict):
+            raise ValueError("'directory_overrides' はオブジェクトで指定してください")
+        overrides: Dict[str, Dict[str, Dict[str, object]]] = {}
+        for dir_path, blocks in raw_over.items():
+            if not isinstance(dir_path, str) or not dir_path.startswith("/"):
+                raise ValueError(f"directory_overrides のキーは '/' で始まるパスにしてください: {dir_path!r}")
+            if not isinstance(blocks, dict):
+                raise ValueError(f"directory_overrides['{dir_path}'] はオブジェクトで指定してください")
+            parsed: Dict[str, Dict[str, object]] = {}
+            for key, val in blocks.items():
+                if not isinstance(val, dict):
+                    raise ValueError(f"directory_overrides['{dir_path}']['{key}'] はオブジェクトで指定してください")
+                try:
+                    parsed[key] = TextureConfigParams.partial_from_dict(val)
+                except (ValueError, TypeError) as e:
+                    raise ValueError(f"directory_overrides['{dir_path}']['{key}']: {e}") from e
+            overrides[dir_path] = parsed
+
+        # memory_budgets ブロック（任意）
+        raw_budgets = data.get("memory_budgets", {})
+        if not isinstance(raw_budgets, dict):
+            raise ValueError("'memory_budgets' はオブジェクトで指定してください")
+        budgets: Dict[str, MemoryBudget] = {}
+        for dir_path, val in raw_budgets.items():
+            if not isinstance(dir_path, str) or not dir_path.startswith("/"):
+                raise ValueError(f"memory_budgets のキーは '/' で始まるパスにしてください: {dir_path!r}")
+            if not isinstance(val, dict):
+                raise ValueError(f"memory_budgets['{dir_path}'] はオブジェクトで指定してください")
+            try:
+                budgets[dir_path] = MemoryBudget.from_dict(val)
+            except ValueError as e:
+                raise ValueError(f"memory_budgets['{dir_path}']: {e}") from e
+
         return cls(
             run_dir=list(run_dir),
             texture_type=list(tt),
@@ -247,6 +349,8 @@ class Config:
             address_suffix_3d=map3d,
             suffix_index=list(suf_index),
             texture_config=params_map,
+            directory_overrides=overrides,
+            memory_budgets=budgets,
         )
 
     def to_dict(self) -> dict:
@@ -261,6 +365,13 @@ class Config:
             out["address_suffix_2d"] = {k: [u.name, v.name] for k, (u, v) in self.address_suffix_2d.items()}
         if self.address_suffix_3d:
             out["address_suffix_3d"] = {k: [u.name, v.name, w.name] for k, (u, v, w) in self.address_suffix_3d.items()}
+        if self.directory_overrides:
+            out["directory_overrides"] = {
+                d: {k: {n: getattr(v, "name", v) for n, v in block.items()} for k, block in blocks.items()}
+                for d, blocks in self.directory_overrides.items()
+            }
+        if self.memory_budgets:
+            out["memory_budgets"] = {d: b.to_dict() for d, b in self.memory_budgets.items()}
         return out
 
     @classmethod
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules, compile_rules
+from config import Config
+
+# (mtime_ns, size)。ファイルが無い場合は None
+FileStamp = Optional[Tuple[int, int]]
+
+
+def _stamp(path: Path) -> FileStamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigWatcher:
+    """
+    TextureConfig.json / SuffixConfig.json / Config.json を監視し、変更されたら
+    ルールを作り直して差し替える常駐プロセス向けのウォッチャ。
+
+    - 監視スレッドは Event.wait(interval) で眠り、起きたら 3 ファイルを stat するだけ（ビジーループなし）
+    - 保存途中の書き込みを拾わないよう、stamp が debounce 秒変化しなくなってから読み直す
+    - 読み直し・検証（compile_rules / Config.load）は監視スレッドで行い、成功したときだけ参照を差し替える
+      （参照の代入は原子的なので、呼び出し側は rules を読むだけでよく、処理が途切れない）
+    - 不正な設定だった場合は前のルールを使い続け、エラーを出力する
+    """
+
+    def __init__(self, texture_config_path: Union[str, Path], suffix_config_path: Union[str, Path],
+                 config_path: Union[str, Path], *, interval: float = 1.0, debounce: float = 0.5,
+                 on_reload: Optional[Callable[[CompiledRules], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.texture_config_path = Path(texture_config_path)
+        self.suffix_config_path = Path(suffix_config_path)
+        self.config_path = Path(config_path)
+        self.interval = interval
+        self.debounce = debounce
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._clock = clock
+
+        self._paths: List[Path] = [self.texture_config_path, self.suffix_config_path, self.config_path]
+        self._stamps: Dict[Path, FileStamp] = {p: _stamp(p) for p in self._paths}
+        self._pending_since: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.reload_count = 0
+        self.error_count = 0
+        self.last_error: Optional[Exception] = None
+        # 初回は呼び出し元のスレッドで読み込む（不正ならここで例外）
+        self._rules, self._config = self._load()
+
+    # ---------- 参照 ----------
+    @property
+    def rules(self) -> CompiledRules:
+        """現在有効なルール。差し替え中でも常にどちらか一方の完全なルールが返る。"""
+        return self._rules
+
+    @property
+    def config(self) -> Config:
+        return self._config
+
+    # ---------- 開始/停止 ----------
+    def start(self) -> "ConfigWatcher":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TexNamingConfigWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll_once()
+
+    # ---------- 監視 ----------
+    def poll_once(self) -> bool:
+        """
+        3 ファイルの stamp を 1 回確認し、必要なら読み直す。差し替えたら True。
+        テストや、スレッドを使わずエディタの tick から呼ぶ場合はこれを直接使う。
+        """
+        now = self._clock()
+        stamps = {p: _stamp(p) for p in self._paths}
+        if stamps != self._stamps:
+            # 変化を検出したら静まるまで待つ（連続保存は 1 回の読み直しにまとめる）
+            self._stamps = stamps
+            self._pending_since = now
+            if self.debounce > 0:
+                return False
+        if self._pending_since is None or now - self._pending_since < self.debounce:
+            return False
+        self._pending_since = None
+        return self.reload()
+
+    def reload(self) -> bool:
+        """設定を読み直して検証し、成功したらルールを差し替える。"""
+        try:
+            rules, config = self._load()
+        except Exception as e:
+            self.error_count += 1
+            self.last_error = e
+            print(f"[ConfigWatcher] invalid config, keeping previous rules: {e}", file=sys.stderr)
+            if self.on_error is not None:
+                self.on_error(e)
+            return False
+        self._rules, self._config = rules, config
+        self.reload_count += 1
+        self.last_error = None
+        print(f"[ConfigWatcher] rules reloaded ({len(rules.table)} combinations)")
+        if self.on_reload is not None:
+            self.on_reload(rules)
+        return True
+
+    def _load(self) -> Tuple[CompiledRules, Config]:
+        rules = compile_rules(self.texture_config_path, self.suffix_config_path, self.config_path)
+        config = Config.load(self.config_path)
+        return rules, config
@@ -0,0 +1,100 @@
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+import unreal
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules, compile_rules
+from settings_inventory import TAG_DIMENSIONS, TAG_FIELDS, iter_inventory, write_drift_csv
+from detail_unreal.texture_configurator_unreal import _get_texture_from_path
+
+# 棚卸しの対象クラス
+TEXTURE_CLASSES = ("Texture2D", "TextureCube", "VolumeTexture", "Texture2DArray")
+
+# タグ名 → エディタプロパティ名（タグが無いときに読み込んだアセットから読む）
+_TAG_PROPERTIES: Dict[str, str] = {
+    "CompressionSettings": "compression_settings",
+    "SRGB": "srgb",
+    "LODGroup": "lod_group",
+    "MipGenSettings": "mip_gen_settings",
+    "MaxTextureSize": "max_texture_size",
+    "AddressX": "address_x",
+    "AddressY": "address_y",
+    "AddressZ": "address_z",
+}
+
+
+def _texture_filter(package_paths: Sequence[str]):
+    """UE5.1 以降は class_paths、それ以前は class_names で絞り込む。"""
+    try:
+        class_paths = [unreal.TopLevelAssetPath("/Script/Engine", c) for c in TEXTURE_CLASSES]
+        return unreal.ARFilter(class_paths=class_paths, package_paths=list(package_paths),
+                               recursive_paths=True, recursive_classes=True)
+    except (AttributeError, TypeError):
+        return unreal.ARFilter(class_names=list(TEXTURE_CLASSES), package_paths=list(package_paths),
+                               recursive_paths=True, recursive_classes=True)
+
+
+def iter_texture_tags(package_paths: Sequence[str] = ("/Game",)) -> Iterator[Tuple[str, Dict[str, Optional[str]]]]:
+    """
+    AssetRegistry から (オブジェクトパス, {タグ名: 値}) を 1 件ずつ返す。アセットは読み込まない。
+    タグが登録されていない項目の値は None。
+    """
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    for data in registry.get_assets(_texture_filter(package_paths)):
+        path = f"{data.package_name}.{data.asset_name}"
+        yield path, {tag: data.get_tag_value(tag) for tag in (*TAG_FIELDS, TAG_DIMENSIONS)}
+
+
+def load_settings(path: str, tags: Sequence[str]) -> Mapping[str, str]:
+    """タグが無かった項目を、アセットを読み込んでエディタプロパティから取る（タグと同じ文字列形式で返す）。"""
+    texture = _get_texture_from_path(path)
+    out: Dict[str, str] = {}
+    for tag in tags:
+        try:
+            value = texture.get_editor_property(_TAG_PROPERTIES[tag])
+        except Exception:
+            continue  # VolumeTexture 以外の AddressZ など
+        out[tag] = getattr(value, "name", None) or str(value)
+    return out
+
+
+def run_inventory(rules: CompiledRules, out_csv: str, *, package_paths: Sequence[str] = ("/Game",),
+                  tags_only: bool = False) -> Counter:
+    """
+    プロジェクト内のテクスチャの設定を resolve 済みパラメータと比べ、差分を CSV に書き出す。
+    tags_only=True なら一切読み込まず、タグの無い項目は unknown として出力する。
+    """
+    rows = iter_inventory(iter_texture_tags(package_paths), rules, load=None if tags_only else load_settings)
+    counts = write_drift_csv(rows, out_csv)
+    unreal.log(f"[SettingsInventory] {counts['textures']} textures: {counts['drifted']} drifted, "
+               f"{counts['unknown']} with unknown fields, {counts['bad_name']} bad names, "
+               f"{counts['loaded']} loaded -> {out_csv}")
+    return counts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="inventory_unreal",
+        description="AssetRegistry のタグからテクスチャ設定を棚卸しし、設定ファイルとの差分を CSV に書き出します。",
+    )
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("config_path", help="Config.json のパス")
+    parser.add_argument("out_csv", help="出力する CSV のパス")
+    parser.add_argument("--package-path", action="append", dest="package_paths",
+                        help="対象のパッケージパス（複数指定可、既定: /Game）")
+    parser.add_argument("--tags-only", action="store_true", help="タグの無い項目のためにアセットを読み込まない")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    run_inventory(compile_rules(args.texture_config_path, args.suffix_config_path, args.config_path), args.out_csv,
+                  package_paths=args.package_paths or ["/Game"], tags_only=args.tags_only)
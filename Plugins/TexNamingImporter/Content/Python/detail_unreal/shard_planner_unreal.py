@@ -0,0 +1,65 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import unreal
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules, compile_rules
+from config import Config
+from shard_planner import Shard, estimate_cost, imbalance, plan_shards, rgba8_bytes, write_manifests
+from detail_unreal.inventory_unreal import _texture_filter
+
+
+def _source_bytes(dimensions: Optional[str]) -> Optional[int]:
+    """Dimensions タグ（"2048x1024"）から RGBA8 相当のバイト数を出す。読めなければ None。"""
+    if not dimensions:
+        return None
+    try:
+        w, h = (int(v) for v in dimensions.lower().split("x")[:2])
+    except ValueError:
+        return None
+    return rgba8_bytes(w, h)
+
+
+def iter_registry_costs(rules: CompiledRules, package_paths: Sequence[str]) -> Iterator[Tuple[str, float]]:
+    """AssetRegistry から run_dir 以下のテクスチャを列挙し、(オブジェクトパス, コスト) を返す。アセットは読み込まない。"""
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    for data in registry.get_assets(_texture_filter(package_paths)):
+        path = f"{data.package_name}.{data.asset_name}"
+        _match, params = rules.resolve_path(path)
+        yield path, estimate_cost(params, _source_bytes(data.get_tag_value("Dimensions")))
+
+
+def plan_from_registry(rules: CompiledRules, out_dir: str, shard_count: int,
+                       package_paths: Sequence[str]) -> List[Shard]:
+    """run_dir 以下のテクスチャを shard に分け、パスリストと plan.json を out_dir に書き出す。"""
+    shards = plan_shards(iter_registry_costs(rules, package_paths), shard_count)
+    write_manifests(shards, out_dir)
+    unreal.log(f"[ShardPlanner] {sum(len(s.paths) for s in shards)} textures -> {shard_count} shards "
+               f"(imbalance {imbalance(shards):.3f}) -> {out_dir}")
+    return shards
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="shard_planner_unreal",
+        description="AssetRegistry から run_dir 以下のテクスチャを列挙し、コストが均等になるよう N 個のパスリストに分けます。",
+    )
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("config_path", help="Config.json のパス（run_dir を対象にする）")
+    parser.add_argument("out_dir", help="shard のパスリストと plan.json の出力先")
+    parser.add_argument("--shards", type=int, required=True, help="分割数")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    run_dirs = Config.load(args.config_path).run_dir or ["/Game"]
+    plan_from_registry(compile_rules(args.texture_config_path, args.suffix_config_path, args.config_path),
+                       args.out_dir, args.shards, run_dirs)
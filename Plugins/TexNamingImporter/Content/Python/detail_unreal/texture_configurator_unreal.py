@@ -1,14 +1,18 @@
-import math
 import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
 import unreal
-from typing import Union, Dict, List
+from typing import Union, Dict, Iterator, List, Optional, Tuple
 
 _THIS_DIR = Path(__file__).resolve().parent
 if str(_THIS_DIR) not in sys.path:
     sys.path.insert(0, str(_THIS_DIR))
 
 from texture_config import TextureConfigParams, NumericSize
+from image_header import ImageHeader, ImageHeaderError, effective_max_size, read_image_header, source_warnings
+from fingerprint import SourceFingerprint, TAG_SOURCE_HASH, TAG_SOURCE_SIZE, TAG_CONFIG_HASH, compute_fingerprint, params_fingerprint
 from type_define import (
     AddressMode,
     CompressionKind,
@@ -18,6 +22,112 @@ from type_define import (
     TextureGroupKind, 
 ) 
 
+class UndoMode(Enum):
+    PER_TEXTURE = 0  # テクスチャごとに 1 トランザクション（従来の動作）
+    BATCH = 1        # バッチ全体で 1 トランザクション（1 回の Undo でバッチ全体を戻す）
+    NONE = 2         # Undo を記録しない（スクリプトによるプロジェクト全体の一括適用向け）
+
+
+@dataclass
+class BatchStats:
+    """batch_transaction の集計。メモリは取得できない環境では None。"""
+    undo_mode: UndoMode
+    textures: int = 0
+    memory_before: Optional[int] = None
+    memory_after: Optional[int] = None
+
+    @property
+    def memory_delta(self) -> Optional[int]:
+        if self.memory_before is None or self.memory_after is None:
+            return None
+        return self.memory_after - self.memory_before
+
+
+# 実行中の batch_transaction（入れ子の場合は最も内側）
+_active_batch: Optional[BatchStats] = None
+
+
+def _rss_from_statm(path: str = "/proc/self/statm") -> Optional[int]:
+    """Linux: /proc/self/statm の 2 列目（常駐ページ数）から現在の常駐メモリ量を求める。"""
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        import os
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _rss_windows() -> Optional[int]:
+    """Windows: GetProcessMemoryInfo の WorkingSetSize（現在のワーキングセット）。"""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters),
+                                                        counters.cb):
+            return None
+        return int(counters.WorkingSetSize)
+    except Exception:
+        return None
+
+
+def _process_memory_bytes() -> Optional[int]:
+    """
+    プロセスの現在の常駐メモリ量（バイト）。psutil → /proc/self/statm → GetProcessMemoryInfo の順で試し、
+    取れなければ None。ru_maxrss は起動からの最大値でバッチの増分にならないので使わない。
+    """
+    try:
+        import psutil
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        pass
+    rss = _rss_from_statm()
+    return rss if rss is not None else _rss_windows()
+
+
+@contextmanager
+def batch_transaction(description: str = "Configure Textures (Batch Apply)", *,
+                      undo_mode: UndoMode = UndoMode.BATCH, log: bool = True) -> Iterator[BatchStats]:
+    """
+    この中で呼ばれた TextureConfigurator.apply の Undo 記録方法をまとめて指定する。
+    - BATCH      : 全体を 1 つの ScopedEditorTransaction にまとめる
+    - NONE       : トランザクションも texture.modify() も行わない（Undo バッファが増えない）
+    - PER_TEXTURE: 従来どおりテクスチャごとにトランザクションを張る
+    終了時に処理件数とメモリ増分をログに出す（log=False で抑制）。
+    """
+    global _active_batch
+    stats = BatchStats(undo_mode=undo_mode, memory_before=_process_memory_bytes())
+    prev = _active_batch
+    _active_batch = stats
+    try:
+        if undo_mode is UndoMode.BATCH:
+            with unreal.ScopedEditorTransaction(description):
+                yield stats
+        else:
+            yield stats
+    finally:
+        _active_batch = prev
+        stats.memory_after = _process_memory_bytes()
+        if not log:
+            return
+        delta = stats.memory_delta
+        mem = "n/a" if delta is None else f"{delta / (1024 * 1024):+.1f} MiB"
+        unreal.log(f"[TextureConfigurator] batch undo={undo_mode.name}: textures={stats.textures}, memory {mem}")
+
+
 def _get_texture_from_path(path: str) -> unreal.Texture:
     """
     /Game から始まるパスからテクスチャ(UTexture系)を取得する。
@@ -46,17 +156,79 @@ def _get_texture_from_path(path: str) -> unreal.Texture:
     return asset  # type: ignore[return-value]
 
 
+def _source_file_of(texture: unreal.Texture) -> Optional[str]:
+    """インポート元ファイルの絶対パス。記録が無い／ファイルが無い場合は None。"""
+    try:
+        data = texture.get_editor_property("asset_import_data")
+        src = data.get_first_filename() if data is not None else ""
+    except Exception:
+        return None
+    return src if src and Path(src).is_file() else None
+
+
+def source_file_of_path(path_name: str) -> Optional[str]:
+    """アセットパスからインポート元ファイルを引く（アセットが無い／記録が無い場合は None）。"""
+    try:
+        texture = _get_texture_from_path(path_name)
+    except (LookupError, TypeError):
+        return None
+    return _source_file_of(texture)
+
+
+def _read_source_header(source_file: Optional[str]) -> Optional[ImageHeader]:
+    """ソースファイルのヘッダ（寸法など）。読めない・未対応の形式なら None。"""
+    if source_file is None:
+        return None
+    try:
+        return read_image_header(source_file)
+    except (OSError, ImageHeaderError) as e:
+        unreal.log_warning(f"[TextureConfigurator] failed to read image header of {source_file}: {e}")
+        return None
+
+
+def read_fingerprint(texture: unreal.Texture) -> Optional[SourceFingerprint]:
+    """前回の適用成功時に記録した指紋をメタデータタグから読む。"""
+    lib = unreal.EditorAssetLibrary
+    tags = {t: lib.get_metadata_tag(texture, t) for t in (TAG_SOURCE_HASH, TAG_SOURCE_SIZE, TAG_CONFIG_HASH)}
+    return SourceFingerprint.from_tags(tags)
+
+
+def write_fingerprint(texture: unreal.Texture, fp: SourceFingerprint) -> None:
+    for tag, value in fp.to_tags().items():
+        unreal.EditorAssetLibrary.set_metadata_tag(texture, tag, value)
+
+
 class TextureConfigurator:
     """
-    - __init__(*, params: TextureConfigParams) で設定値を受け取る
+    - __init__(*, params: TextureConfigParams, undo_mode: Optional[UndoMode]) で設定値を受け取る
+      （undo_mode 省略時は batch_transaction の指定、その外では PER_TEXTURE）
+    - skip_unchanged=True の場合、ソースファイルと適用パラメータの指紋が前回の適用成功時と
+      同じテクスチャは何もせずに返す（内容の変わらない再インポート向け）。False でも指紋は記録する
     - apply(texture): dataclassの内容を一括反映（Undo, post_edit_change, 保存, 共通エラハン）
     - set_address / set_max_in_game / set_compression / set_srgb: 個別反映（commit=Trueで即保存）
     """
 
-    def __init__(self, *, params: TextureConfigParams):
+    def __init__(self, *, params: TextureConfigParams, undo_mode: Optional[UndoMode] = None,
+                 skip_unchanged: bool = True):
         if not isinstance(params, TextureConfigParams):
             raise TypeError("params must be TextureConfigParams")
         self.params = params
+        self.undo_mode = undo_mode
+        self.skip_unchanged = skip_unchanged
+        self._config_hash: Optional[str] = None
+
+    @property
+    def config_hash(self) -> str:
+        if self._config_hash is None:
+            self._config_hash = params_fingerprint(self.params)
+        return self._config_hash
+
+    def _resolve_undo_mode(self) -> UndoMode:
+        if self.undo_mode is not None:
+            return self.undo_mode
+        if _active_batch is not None:
+            return _active_batch.undo_mode
+        return UndoMode.PER_TEXTURE
 
     # ---------- Unreal 変換（アダプタ） ----------
     @staticmethod
@@ -164,16 +336,84 @@ class TextureConfigurator:
         if cs == getattr(E, "TC_BC7", object()): return True
         return True
 
+    def _desired_properties(self, texture: unreal.Texture, report: Dict[str, Union[bool, List[str]]],
+                            source: Optional[ImageHeader] = None) -> List[Tuple[str, str, object]]:
+        """
+        params から (グループ名, エディタプロパティ名, 値) の一覧を作る（まだ書き込まない）。
+        変換に失敗したグループは report にエラーを積んで除外する。
+        source（ソース画像のヘッダ）があれば、最大サイズをソースの寸法で頭打ちにする。
+        """
+        p = self.params
+        out: List[Tuple[str, str, object]] = []
+
+        def group(name: str, build) -> None:
+            try:
+                props = build()
+            except Exception as e:
+                report["ok"] = False
+                report["errors"].append(f"{name}: {e}")
+                return
+            out.extend((name, prop, value) for prop, value in props)
+            report["applied"].append(name)
+
+        # 1) Address
+        if p.address_u is not None and p.address_v is not None:
+            def _address():
+                props = [("address_x", self._ua(p.address_u)), ("address_y", self._ua(p.address_v))]
+                if p.address_z is not None and hasattr(texture, "address_z"):
+                    props.append(("address_z", self._ua(p.address_z)))
+                return props
+            group("address", _address)
+
+        # 2) Max In-Game
+        if p.max_in_game is not None:
+            def _max_in_game():
+                # ソースより大きい値は効果が無いので、ソースの寸法に合わせる
+                size = effective_max_size(self._size_to_int(p.max_in_game), source, enforce_pow2=p.enforce_pow2)
+                return [("max_texture_size", size)]
+            group("max_in_game", _max_in_game)
+
+        # 3) Compression（sRGB AUTO 参照元）
+        compression = None
+        if p.compression is not None:
+            def _compression():
+                nonlocal compression
+                compression = self._uc(p.compression)
+                return [("compression_settings", compression)]
+            group("compression", _compression)
+
+        # 4) sRGB（AUTO は書き込み予定の圧縮設定、無ければ現在の圧縮設定から決める）
+        if p.srgb is not None:
+            def _srgb():
+                if p.srgb is SRGBMode.AUTO:
+                    cs = compression if compression is not None else texture.get_editor_property("compression_settings")
+                    if not isinstance(cs, unreal.TextureCompressionSettings):
+                        raise RuntimeError("failed to read compression_settings for AUTO sRGB")
+                    desired = self._auto_srgb_from_compression_unreal(cs)
+                else:
+                    desired = (p.srgb is SRGBMode.ON)
+                return [("srgb", bool(desired))]
+            group("srgb", _srgb)
+
+        # 5) TextureGroup（C++プロパティ名は LODGroup）
+        group("texture_group", lambda: [("lod_group", self._utg(p.texture_group))])
+
+        # 6) MipGenSettings
+        group("mip_gen", lambda: [("mip_gen_settings", self._um(p.mip_gen))])
+        return out
+
     def apply(self, path_name: str) -> Dict[str, Union[bool, List[str]]]:
         """
         dataclassの内容を一括反映。
-        - Undo（ScopedEditorTransaction）
-        - post_edit_change / mark_package_dirty / 保存（1回）
-        - 各ステップの例外を収集して返す
+        - Undo（PER_TEXTURE: 1 件ごとに ScopedEditorTransaction / BATCH: 外側の batch_transaction に記録 / NONE: 記録しない）
+        - 現在値と異なるプロパティだけを通知なしでまとめて書き込み、post_edit_change は最後に 1 回
+          （再圧縮は 1 テクスチャにつき 1 回。変更が無ければ post_edit_change も行わない）
+        - 成功したらソースファイルと設定の指紋をメタデータタグに記録し、次回同じなら report["skipped"]="unchanged" で返す
+        - 保存（1回、ダーティな場合のみ）
+        - 各ステップの例外を収集して返す（report["changed"] に実際に書き換えたプロパティ名）
         """
         texture = _get_texture_from_path(path_name)
-        p = self.params
-        report = {"ok": True, "applied": [], "errors": []}
+        report = {"ok": True, "applied": [], "changed": [], "errors": [], "warnings": []}
 
         if not isinstance(texture, unreal.Texture):
             msg = "apply(): first argument must be unreal.Texture"
@@ -181,92 +421,72 @@ class TextureConfigurator:
             report.update(ok=False, errors=[msg])
             return report
 
-        trans = unreal.ScopedEditorTransaction("Configure Texture (Batch Apply)")
-        try:
-            texture.modify()
+        # 指紋は常に計算して成功時に記録する（skip_unchanged=False は比較を飛ばすだけ）
+        fingerprint = None
+        source_file = _source_file_of(texture)
+        if source_file is not None:
+            try:
+                fingerprint = compute_fingerprint(source_file, self.config_hash)
+            except OSError as e:
+                unreal.log_warning(f"[TextureConfigurator] fingerprint failed for {source_file}: {e}")
+        if self.skip_unchanged:
+            if fingerprint is not None and fingerprint == read_fingerprint(texture):
+                report["skipped"] = "unchanged"
+                unreal.log(f"[TextureConfigurator] Unchanged source and config, skipped {texture.get_path_name()}")
+                return report
 
-            # 1) Address
-            if p.address_u is not None and p.address_v is not None:
-                try:
-                    texture.address_x = self._ua(p.address_u)
-                    texture.address_y = self._ua(p.address_v)
-                    if p.address_z is not None and hasattr(texture, "address_z"):
-                        texture.address_z = self._ua(p.address_z)
-                    report["applied"].append("address")
-                except Exception as e:
-                    report["ok"] = False
-                    report["errors"].append(f"address: {e}")
+        undo_mode = self._resolve_undo_mode()
+        if _active_batch is not None:
+            _active_batch.textures += 1
+        trans = None
+        if undo_mode is UndoMode.PER_TEXTURE:
+            trans = unreal.ScopedEditorTransaction("Configure Texture (Batch Apply)")
+        try:
+            source = _read_source_header(source_file)
+            if source is not None:
+                report["source"] = f"{source.format} {source.width}x{source.height} ch={source.channels} bits={source.bit_depth}"
+                report["source_size"] = [source.width, source.height, source.channels, source.bit_depth]
+                report["warnings"].extend(source_warnings(source))
+            desired = self._desired_properties(texture, report, source)
 
-            # 2) Max In-Game
-            if p.max_in_game is not None:
+            # 現在値と同じものは書かない（不要な再圧縮・ダーティ化を避ける）
+            changes = []
+            for group_name, prop, value in desired:
                 try:
-                    size = self._size_to_int(p.max_in_game)
-                    if p.enforce_pow2 and size > 0:
-                        size = 1 << int(math.log2(size))
-                    if size > 0:
-                        size = max(16, min(size, 16384))
-                    if hasattr(texture, "max_texture_size"):
-                        texture.max_texture_size = size
-                    else:
-                        texture.set_editor_property("MaxTextureSize", size)
-                    report["applied"].append("max_in_game")
-                except Exception as e:
-                    report["ok"] = False
-                    report["errors"].append(f"max_in_game: {e}")
+                    if texture.get_editor_property(prop) == value:
+                        continue
+                except Exception:
+                    pass  # 読めないプロパティは書き込みを試す
+                changes.append((group_name, prop, value))
 
-            # 3) Compression（sRGB AUTO 参照元）
-            if p.compression is not None:
-                try:
-                    texture.compression_settings = self._uc(p.compression)
-                    report["applied"].append("compression")
-                except Exception as e:
-                    report["ok"] = False
-                    report["errors"].append(f"compression: {e}")
+            if changes:
+                if undo_mode is not UndoMode.NONE:
+                    texture.modify()  # Undo 用のスナップショット
+                never = unreal.PropertyAccessChangeNotifyMode.NEVER
+                failed_groups = set()
+                for group_name, prop, value in changes:
+                    try:
+                        texture.set_editor_property(prop, value, never)
+                        report["changed"].append(prop)
+                    except Exception as e:
+                        report["ok"] = False
+                        report["errors"].append(f"{group_name}: {e}")
+                        failed_groups.add(group_name)
+                report["applied"] = [g for g in report["applied"] if g not in failed_groups]
+                if report["changed"]:
+                    texture.post_edit_change()  # 通知・再圧縮はここで 1 回だけ
 
-            # 4) sRGB
-            if p.srgb is not None:
+            if report["ok"] and fingerprint is not None:
                 try:
-                    if p.srgb is SRGBMode.AUTO:
-                        cs = getattr(texture, "compression_settings", None)
-                        if not isinstance(cs, unreal.TextureCompressionSettings):
-                            raise RuntimeError("failed to read compression_settings for AUTO sRGB")
-                        desired = self._auto_srgb_from_compression_unreal(cs)
-                    else:
-                        desired = (p.srgb is SRGBMode.ON)
-
-                    if hasattr(texture, "srgb"):
-                        texture.srgb = bool(desired)
-                    else:
-                        texture.set_editor_property("SRGB", bool(desired))
-                    report["applied"].append("srgb")
+                    write_fingerprint(texture, fingerprint)
                 except Exception as e:
-                    report["ok"] = False
-                    report["errors"].append(f"srgb: {e}")
-
-            # 5) TextureGroup（LODGroup
-            try:
-                tg = self._utg(p.texture_group)
-                # C++プロパティ名は LODGroup。Python では set_editor_property が確実。
-                texture.set_editor_property("LODGroup", tg)
-                report["applied"].append("texture_group")
-            except Exception as e:
-                report["ok"] = False
-                report["errors"].append(f"texture_group: {e}")
-
-            # === 6) MipGenSettings ===
-            try:
-                mg = self._um(p.mip_gen)
-                texture.set_editor_property("MipGenSettings", mg)
-                report["applied"].append("mip_gen")
-            except Exception as e:
-                report["ok"] = False
-                report["errors"].append(f"mip_gen: {e}")
+                    unreal.log_warning(f"[TextureConfigurator] failed to record fingerprint: {e}")
 
             # 一括反映
-            unreal.EditorAssetLibrary.save_loaded_asset(texture)            
+            unreal.EditorAssetLibrary.save_loaded_asset(texture)
             path = texture.get_path_name()
             if report["ok"]:
-                unreal.log(f"[TextureConfigurator] Applied to {path} ({', '.join(report['applied']) or 'no-op'})")
+                unreal.log(f"[TextureConfigurator] Applied to {path} ({', '.join(report['changed']) or 'no-op'})")
             else:
                 unreal.log_warning(f"[TextureConfigurator] Applied with errors on {path}: {report['errors']}")
 
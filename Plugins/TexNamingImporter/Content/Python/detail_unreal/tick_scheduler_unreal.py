@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+from typing import Callable, ContextManager, List, Optional
+
+import unreal
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from batch_scheduler import TickBudgetScheduler
+
+# 実行中のスケジューラ（GC でコールバックごと消えないよう参照を保持）
+_ACTIVE: List["SlateTickDriver"] = []
+
+
+class SlateTickDriver:
+    """
+    TickBudgetScheduler を Slate の post-tick コールバックで駆動する。
+    スケジューラが終了（完了/キャンセル）したら自動でコールバックを解除する。
+    tick_context を渡すと、各 tick をその戻り値（コンテキストマネージャ）の中で実行する。
+    """
+
+    def __init__(self, scheduler: TickBudgetScheduler, *,
+                 tick_context: Optional[Callable[[], ContextManager]] = None):
+        self.scheduler = scheduler
+        self.tick_context = tick_context
+        self._handle = None
+
+    def start(self) -> "SlateTickDriver":
+        if self._handle is not None:
+            return self
+        self.scheduler.start()
+        self._handle = unreal.register_slate_post_tick_callback(self._on_tick)
+        _ACTIVE.append(self)
+        return self
+
+    def stop(self) -> None:
+        if self._handle is None:
+            return
+        unreal.unregister_slate_post_tick_callback(self._handle)
+        self._handle = None
+        if self in _ACTIVE:
+            _ACTIVE.remove(self)
+
+    def _on_tick(self, delta_seconds: float) -> None:
+        try:
+            if self.tick_context is None:
+                self.scheduler.tick(delta_seconds)
+            else:
+                with self.tick_context():
+                    self.scheduler.tick(delta_seconds)
+        except Exception as e:
+            unreal.log_error(f"[TextureConfigurator] tick batch aborted: {e}")
+            self.scheduler.cancel()
+        if self.scheduler.is_finished:
+            self.stop()
+
+
+def start_tick_batch(scheduler: TickBudgetScheduler, *,
+                     tick_context: Optional[Callable[[], ContextManager]] = None) -> SlateTickDriver:
+    """スケジューラを post-tick に登録して処理を開始する。"""
+    return SlateTickDriver(scheduler, tick_context=tick_context).start()
+
+
+def active_drivers() -> List[SlateTickDriver]:
+    return list(_ACTIVE)
@@ -0,0 +1,484 @@
+"""
+エディタ外で TextureConfigurator.apply を動かすための unreal モジュールの代用品。
+
+texture_configurator_unreal.py / tick_scheduler_unreal.py が使う範囲
+（列挙体、AssetRegistry、EditorAssetLibrary、ScopedEditorTransaction、
+エディタプロパティを持つ Texture、ログ、Slate tick コールバック）だけを再現する。
+
+    from detail_unreal import unreal_standin
+    ue = unreal_standin.install()          # sys.modules["unreal"] に登録
+    tex = ue.add_texture("/Game/T_Rock_nml_cc.T_Rock_nml_cc")
+    ue.recorder.set_latency("Texture.post_edit_change", 0.002)
+    ...
+    unreal_standin.uninstall()
+
+すべての呼び出しは ue.recorder に (名前, 引数) で記録され、名前ごとに遅延を注入できる。
+"""
+from __future__ import annotations
+
+import re
+import sys
+import time
+import types
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+_MODULE_NAME = "unreal"
+
+
+@dataclass
+class Call:
+    name: str
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass
+class CallRecorder:
+    """呼び出しの記録と遅延の注入。遅延は time.sleep で表現する（秒）。"""
+    calls: List[Call] = field(default_factory=list)
+    latency: Dict[str, float] = field(default_factory=dict)
+    record_calls: bool = True
+    sleep: Callable[[float], None] = time.sleep
+
+    def __call__(self, name: str, *args: Any) -> None:
+        if self.record_calls:
+            self.calls.append(Call(name, args))
+        delay = self.latency.get(name)
+        if delay:
+            self.sleep(delay)
+
+    def set_latency(self, name: str, seconds: float) -> None:
+        self.latency[name] = seconds
+
+    def count(self, name: str) -> int:
+        return sum(1 for c in self.calls if c.name == name)
+
+    def names(self) -> List[str]:
+        return [c.name for c in self.calls]
+
+    def clear(self) -> None:
+        self.calls.clear()
+
+
+# ---------- 列挙体（UE の Python 公開名に合わせる） ----------
+class TextureAddress(Enum):
+    TA_WRAP = 0
+    TA_CLAMP = 1
+    TA_MIRROR = 2
+
+
+class TextureCompressionSettings(Enum):
+    TC_DEFAULT = 0
+    TC_NORMALMAP = 1
+    TC_DISPLACEMENTMAP = 2
+    TC_GRAYSCALE = 3
+    TC_HDR = 4
+    TC_EDITORICON = 5
+    TC_ALPHA = 6
+    TC_DISTANCE_FIELD_FONT = 7
+    TC_HDR_COMPRESSED = 8
+    TC_BC7 = 9
+    TC_MASKS = 10
+
+
+class TextureMipGenSettings(Enum):
+    TMGS_FROM_TEXTURE_GROUP = 0
+    TMGS_SIMPLE_AVERAGE = 1
+    TMGS_SHARPEN0 = 2
+    TMGS_SHARPEN1 = 3
+    TMGS_SHARPEN2 = 4
+    TMGS_SHARPEN3 = 5
+    TMGS_SHARPEN4 = 6
+    TMGS_SHARPEN5 = 7
+    TMGS_SHARPEN6 = 8
+    TMGS_SHARPEN7 = 9
+    TMGS_SHARPEN8 = 10
+    TMGS_NO_MIPMAPS = 13
+
+
+class TextureGroup(Enum):
+    TEXTUREGROUP_WORLD = 0
+    TEXTUREGROUP_WORLD_NORMAL_MAP = 1
+    TEXTUREGROUP_WORLD_SPECULAR = 2
+    TEXTUREGROUP_CHARACTER = 3
+    TEXTUREGROUP_CHARACTER_NORMAL_MAP = 4
+    TEXTUREGROUP_CHARACTER_SPECULAR = 5
+    TEXTUREGROUP_WEAPON = 6
+    TEXTUREGROUP_WEAPON_NORMAL_MAP = 7
+    TEXTUREGROUP_WEAPON_SPECULAR = 8
+    TEXTUREGROUP_VEHICLE = 9
+    TEXTUREGROUP_VEHICLE_NORMAL_MAP = 10
+    TEXTUREGROUP_VEHICLE_SPECULAR = 11
+    TEXTUREGROUP_CINEMATIC = 12
+    TEXTUREGROUP_EFFECTS = 13
+    TEXTUREGROUP_EFFECTS_NOT_FILTERED = 14
+    TEXTUREGROUP_SKYBOX = 15
+    TEXTUREGROUP_UI = 16
+    TEXTUREGROUP_LIGHTMAP = 17
+    TEXTUREGROUP_RENDER_TARGET = 18
+    TEXTUREGROUP_MOBILE_FLATTENED = 19
+    TEXTUREGROUP_PROCEDURAL_LIGHTMAP = 20
+    TEXTUREGROUP_SHADOWMAP = 21
+    TEXTUREGROUP_MEDIA = 32
+
+
+class PropertyAccessChangeNotifyMode(Enum):
+    DEFAULT = 0
+    NEVER = 1
+    ALWAYS = 2
+
+
+def _snake(name: str) -> str:
+    """"LODGroup" → "lod_group" のように C++ 名を Python 名へ寄せる。"""
+    s = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", name)
+    s = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s)
+    return s.lower()
+
+
+# Texture2D 作成直後の既定値（UTexture のコンストラクタに合わせる）
+TEXTURE_DEFAULTS: Dict[str, Any] = {
+    "address_x": TextureAddress.TA_WRAP,
+    "address_y": TextureAddress.TA_WRAP,
+    "max_texture_size": 0,
+    "compression_settings": TextureCompressionSettings.TC_DEFAULT,
+    "srgb": True,
+    "lod_group": TextureGroup.TEXTUREGROUP_WORLD,
+    "mip_gen_settings": TextureMipGenSettings.TMGS_FROM_TEXTURE_GROUP,
+}
+
+
+# AssetRegistry に載るテクスチャのタグ（AssetRegistrySearchable なプロパティと、Texture2D の Dimensions）。
+# MaxTextureSize は載らない
+SEARCHABLE_TAGS: Tuple[str, ...] = (
+    "CompressionSettings", "SRGB", "LODGroup", "MipGenSettings", "AddressX", "AddressY", "AddressZ",
+    "Dimensions",   # 実機では "2048x2048" の形。スタンドインでは properties に "dimensions" があるときだけ載る
+)
+
+
+def _tag_string(value: Any) -> str:
+    if isinstance(value, Enum):
+        return value.name
+    return str(value)
+
+
+class _Class:
+    def __init__(self, name: str):
+        self._name = name
+
+    def get_name(self) -> str:
+        return self._name
+
+
+class Object:
+    """UObject の代用。エディタプロパティは属性アクセスと get/set_editor_property の両方で扱える。"""
+    _recorder: CallRecorder = CallRecorder()  # StandIn の生成時に差し替わる
+    _kind = "Object"                          # 記録名の接頭辞（例: "Texture.modify"）
+
+    def __init__(self, path: str, properties: Optional[Dict[str, Any]] = None):
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_props", dict(properties or {}))
+        object.__setattr__(self, "notifications", 0)  # PostEditChange 相当の回数
+        object.__setattr__(self, "modify_count", 0)
+        object.__setattr__(self, "dirty", False)
+
+    def _rec(self, method: str, *args: Any) -> None:
+        self._recorder(f"{self._kind}.{method}", self._path, *args)
+
+    # ---- エディタプロパティ ----
+    def get_editor_property(self, name: str) -> Any:
+        self._rec("get_editor_property", name)
+        key = _snake(name)
+        if key not in self._props:
+            raise Exception(f"Failed to find property '{name}' on '{type(self).__name__}'")
+        return self._props[key]
+
+    def set_editor_property(self, name: str, value: Any,
+                            notify_mode: PropertyAccessChangeNotifyMode = PropertyAccessChangeNotifyMode.DEFAULT) -> None:
+        self._rec("set_editor_property", name, value, notify_mode)
+        key = _snake(name)
+        if key not in self._props:
+            raise Exception(f"Failed to find property '{name}' on '{type(self).__name__}'")
+        changed = self._props[key] != value
+        self._props[key] = value
+        object.__setattr__(self, "dirty", self.dirty or changed)
+        # DEFAULT は値が変わったときだけ、ALWAYS は常に通知（UE の挙動に合わせる）
+        if notify_mode is PropertyAccessChangeNotifyMode.ALWAYS or (
+                notify_mode is PropertyAccessChangeNotifyMode.DEFAULT and changed):
+            self._notify()
+
+    def set_editor_properties(self, properties: Dict[str, Any]) -> None:
+        for k, v in properties.items():
+            self.set_editor_property(k, v)
+
+    def __getattr__(self, name: str) -> Any:
+        props = object.__getattribute__(self, "_props")
+        if name in props:
+            return props[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._props:
+            # 属性代入は set_editor_property（通知あり）と同じ扱い
+            self.set_editor_property(name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def _notify(self) -> None:
+        object.__setattr__(self, "notifications", self.notifications + 1)
+
+    # ---- UObject ----
+    def modify(self) -> bool:
+        self._rec("modify")
+        object.__setattr__(self, "modify_count", self.modify_count + 1)
+        return True
+
+    def post_edit_change(self) -> None:
+        self._rec("post_edit_change")
+        self._notify()
+
+    def get_path_name(self) -> str:
+        return self._path
+
+    def get_name(self) -> str:
+        return self._path.rsplit(".", 1)[-1].rsplit("/", 1)[-1]
+
+    def get_class(self) -> _Class:
+        return _Class(type(self).__name__)
+
+    def is_a(self, cls: type) -> bool:
+        return isinstance(self, cls)
+
+
+class AssetImportData(Object):
+    def __init__(self, path: str, source_file: str = ""):
+        super().__init__(path)
+        object.__setattr__(self, "source_file", source_file)
+
+    def get_first_filename(self) -> str:
+        return self.source_file
+
+
+class Texture(Object):
+    _kind = "Texture"
+    def __init__(self, path: str, properties: Optional[Dict[str, Any]] = None, *, source_file: str = ""):
+        super().__init__(path, {**TEXTURE_DEFAULTS, **(properties or {})})
+        self._props["asset_import_data"] = AssetImportData(path + ":AssetImportData", source_file)
+        object.__setattr__(self, "metadata", {})
+        object.__setattr__(self, "registry_tags", SEARCHABLE_TAGS)  # AssetRegistry に載せるタグ名
+
+
+class Texture2D(Texture):
+    pass
+
+
+class TextureCube(Texture):
+    pass
+
+
+class VolumeTexture(Texture):
+    def __init__(self, path: str, properties: Optional[Dict[str, Any]] = None, *, source_file: str = ""):
+        super().__init__(path, {"address_z": TextureAddress.TA_WRAP, **(properties or {})}, source_file=source_file)
+
+
+# ---------- アセット ----------
+class ARFilter:
+    def __init__(self, *, class_names: Sequence[str] = (), package_paths: Sequence[str] = (),
+                 recursive_paths: bool = False, recursive_classes: bool = False):
+        self.class_names = list(class_names)
+        self.package_paths = list(package_paths)
+        self.recursive_paths = recursive_paths
+        self.recursive_classes = recursive_classes
+
+
+class AssetData:
+    """FAssetData の代用。タグ値はアセットを読み込まずに返す（registry_tags に含まれるものだけ）。"""
+
+    def __init__(self, asset: Optional[Object]):
+        self._asset = asset
+        if asset is not None:
+            package, _, name = asset.get_path_name().partition(".")
+            self.package_name, self.asset_name = package, name or package.rsplit("/", 1)[-1]
+            self.package_path = package.rsplit("/", 1)[0]
+            self.asset_class = type(asset).__name__
+            tags = getattr(asset, "registry_tags", ())
+            self._tags = {t: _tag_string(asset._props[_snake(t)]) for t in tags if _snake(t) in asset._props}
+        else:
+            self.package_name = self.asset_name = self.package_path = self.asset_class = ""
+            self._tags = {}
+
+    def is_valid(self) -> bool:
+        return self._asset is not None
+
+    def get_asset(self) -> Optional[Object]:
+        if self._asset is not None:
+            Object._recorder("AssetData.get_asset", self._asset.get_path_name())
+        return self._asset
+
+    def get_tag_value(self, tag_name: str) -> Optional[str]:
+        return self._tags.get(tag_name)
+
+
+class AssetRegistry:
+    def __init__(self, owner: "StandIn"):
+        self._owner = owner
+
+    def get_asset_by_object_path(self, path: str) -> AssetData:
+        self._owner.recorder("AssetRegistry.get_asset_by_object_path", path)
+        return AssetData(self._owner.assets.get(path))
+
+    def get_assets(self, ar_filter: ARFilter) -> List[AssetData]:
+        self._owner.recorder("AssetRegistry.get_assets", tuple(ar_filter.package_paths))
+        out = []
+        for path, asset in self._owner.assets.items():
+            if ar_filter.class_names and type(asset).__name__ not in ar_filter.class_names:
+                continue
+            package_dir = path.partition(".")[0].rsplit("/", 1)[0]
+            if ar_filter.package_paths and not any(
+                    package_dir == p.rstrip("/") or (ar_filter.recursive_paths and package_dir.startswith(p.rstrip("/") + "/"))
+                    for p in ar_filter.package_paths):
+                continue
+            out.append(AssetData(asset))
+        return out
+
+
+class ScopedEditorTransaction:
+    """with 文でも、変数に保持して del する従来の書き方でも使える。"""
+    _owner: "StandIn"
+
+    def __init__(self, description: str):
+        self.description = description
+        self._open = True
+        self._owner.recorder("ScopedEditorTransaction.begin", description)
+        self._owner.open_transactions += 1
+
+    def _end(self) -> None:
+        if self._open:
+            self._open = False
+            self._owner.open_transactions -= 1
+            self._owner.transactions.append(self.description)
+            self._owner.recorder("ScopedEditorTransaction.end", self.description)
+
+    def __enter__(self) -> "ScopedEditorTransaction":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._end()
+        return False
+
+    def __del__(self) -> None:
+        self._end()
+
+
+class StandIn(types.ModuleType):
+    """
+    unreal モジュールとして sys.modules に置くオブジェクト。
+    アセット・トランザクション・ログ・tick コールバックの状態をインスタンスごとに持つ。
+    """
+
+    TextureAddress = TextureAddress
+    TextureCompressionSettings = TextureCompressionSettings
+    TextureMipGenSettings = TextureMipGenSettings
+    TextureGroup = TextureGroup
+    PropertyAccessChangeNotifyMode = PropertyAccessChangeNotifyMode
+    Object = Object
+    AssetImportData = AssetImportData
+    Texture = Texture
+    Texture2D = Texture2D
+    TextureCube = TextureCube
+    VolumeTexture = VolumeTexture
+    AssetData = AssetData
+    ARFilter = ARFilter
+    ScopedEditorTransaction = ScopedEditorTransaction
+
+    def __init__(self, recorder: Optional[CallRecorder] = None):
+        super().__init__(_MODULE_NAME, __doc__)
+        self.recorder = recorder or CallRecorder()
+        self.assets: Dict[str, Object] = {}
+        self.saved: List[str] = []
+        self.logs: List[Tuple[str, str]] = []
+        self.transactions: List[str] = []   # 閉じたトランザクションの説明（= Undo 履歴）
+        self.open_transactions = 0
+        self.tick_callbacks: Dict[int, Callable[[float], None]] = {}
+        self._next_handle = 1
+
+        # オブジェクト・トランザクションの記録先は最後に作った代用品（同時に使うのは 1 つだけの想定）
+        Object._recorder = self.recorder
+        ScopedEditorTransaction._owner = self
+        registry = AssetRegistry(self)
+        self.AssetRegistryHelpers = types.SimpleNamespace(get_asset_registry=lambda: registry)
+        self.EditorAssetLibrary = types.SimpleNamespace(
+            load_asset=self._load_asset,
+            save_loaded_asset=self._save_loaded_asset,
+            get_metadata_tag=self._get_metadata_tag,
+            set_metadata_tag=self._set_metadata_tag,
+        )
+
+    # ---------- テスト用の操作 ----------
+    def add_texture(self, path: str, properties: Optional[Dict[str, Any]] = None, *,
+                    source_file: str = "", cls: Optional[type] = None) -> Texture:
+        tex = (cls or Texture2D)(path, properties, source_file=source_file)
+        self.assets[path] = tex
+        return tex
+
+    def reset_calls(self) -> None:
+        self.recorder.clear()
+
+    # ---------- unreal.* 関数 ----------
+    def log(self, msg: str) -> None:
+        self.logs.append(("log", str(msg)))
+
+    def log_warning(self, msg: str) -> None:
+        self.logs.append(("warning", str(msg)))
+
+    def log_error(self, msg: str) -> None:
+        self.logs.append(("error", str(msg)))
+
+    def register_slate_post_tick_callback(self, fn: Callable[[float], None]) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        self.tick_callbacks[handle] = fn
+        return handle
+
+    def unregister_slate_post_tick_callback(self, handle: int) -> None:
+        self.tick_callbacks.pop(handle, None)
+
+    def tick(self, delta_seconds: float = 1.0 / 60.0) -> None:
+        """登録済みの post-tick コールバックを 1 回ずつ呼ぶ（エディタの 1 フレーム相当）。"""
+        for fn in list(self.tick_callbacks.values()):
+            fn(delta_seconds)
+
+    # ---------- EditorAssetLibrary ----------
+    def _load_asset(self, path: str) -> Optional[Object]:
+        self.recorder("EditorAssetLibrary.load_asset", path)
+        return self.assets.get(path)
+
+    def _save_loaded_asset(self, asset: Object, only_if_is_dirty: bool = True) -> bool:
+        self.recorder("EditorAssetLibrary.save_loaded_asset", asset.get_path_name())
+        if only_if_is_dirty and not asset.dirty:
+            return True
+        object.__setattr__(asset, "dirty", False)
+        self.saved.append(asset.get_path_name())
+        return True
+
+    def _get_metadata_tag(self, asset: Object, tag: str) -> str:
+        self.recorder("EditorAssetLibrary.get_metadata_tag", asset.get_path_name(), tag)
+        return getattr(asset, "metadata", {}).get(tag, "")
+
+    def _set_metadata_tag(self, asset: Object, tag: str, value: str) -> None:
+        self.recorder("EditorAssetLibrary.set_metadata_tag", asset.get_path_name(), tag, value)
+        if asset.metadata.get(tag) != value:
+            asset.metadata[tag] = value
+            object.__setattr__(asset, "dirty", True)
+
+
+def install(recorder: Optional[CallRecorder] = None) -> StandIn:
+    """新しい代用品を sys.modules["unreal"] に登録して返す。"""
+    standin = StandIn(recorder)
+    sys.modules[_MODULE_NAME] = standin
+    return standin
+
+
+def uninstall() -> None:
+    if isinstance(sys.modules.get(_MODULE_NAME), StandIn):
+        del sys.modules[_MODULE_NAME]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from texture_config import TextureConfigParams
+
+# 全テクスチャに効く上書きブロックのキー
+WILDCARD = "*"
+
+# ディレクトリ 1 つ分の上書き: キー（"*" またはサフィックス）→ {パラメータ名: 値}
+OverrideBlocks = Mapping[str, Mapping[str, object]]
+
+
+class _Node:
+    __slots__ = ("children", "blocks")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.blocks: Optional[OverrideBlocks] = None
+
+
+def _segments(directory: str) -> List[str]:
+    # アセットパスは大小無視で扱う（/Game/VFX と /game/vfx は同じ）
+    return [s for s in directory.lower().split("/") if s]
+
+
+def directory_of(asset_path: str) -> str:
+    """"/Game/VFX/T_A.T_A" → "/Game/VFX" """
+    head, sep, _ = asset_path.rpartition("/")
+    return head if sep else ""
+
+
+class DirectoryOverrideIndex:
+    """
+    ディレクトリ単位の上書き設定を、パス区切りの接頭辞木（trie）にしたもの。
+
+    - 照会は対象ディレクトリの深さ分だけ木をたどる（上書きディレクトリの数に依存しない）
+    - 上書きは親 → 子の順、各ディレクトリ内では "*" → サフィックス（行の順）の順に重ねる
+    - 結果は (ディレクトリ, サフィックスの組) ごとにキャッシュする
+    返す TextureConfigParams はキャッシュで共有しているので、呼び出し側では変更しないこと。
+    """
+
+    def __init__(self, overrides: Mapping[str, OverrideBlocks], *, cache_size: int = 65536):
+        self._root = _Node()
+        for directory, blocks in overrides.items():
+            node = self._root
+            for seg in _segments(directory):
+                node = node.children.setdefault(seg, _Node())
+            node.blocks = {k.lower(): v for k, v in blocks.items()}
+        self._count = len(overrides)
+        self._chains: Dict[str, Tuple[OverrideBlocks, ...]] = {}
+        self._cache: Dict[Tuple[str, Tuple[Optional[str], ...]], TextureConfigParams] = {}
+        self._cache_size = cache_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def chain(self, directory: str) -> Tuple[OverrideBlocks, ...]:
+        """directory とその祖先に設定された上書きを、根に近い順に返す。"""
+        key = directory.lower()
+        hit = self._chains.get(key)
+        if hit is not None:
+            return hit
+        out = []
+        node = self._root
+        if node.blocks is not None:
+            out.append(node.blocks)
+        for seg in _segments(directory):
+            node = node.children.get(seg)
+            if node is None:
+                break
+            if node.blocks is not None:
+                out.append(node.blocks)
+        hit = tuple(out)
+        if len(self._chains) >= self._cache_size:
+            self._chains.clear()
+        self._chains[key] = hit
+        return hit
+
+    def apply(self, base: TextureConfigParams, directory: str,
+              keys_by_row: Sequence[Optional[str]]) -> TextureConfigParams:
+        """base に directory の上書きを重ねた結果を返す（上書きが無ければ base をそのまま返す）。"""
+        chain = self.chain(directory)
+        if not chain:
+            return base
+        ck = (directory.lower(), tuple(keys_by_row))
+        hit = self._cache.get(ck)
+        if hit is not None:
+            return hit
+
+        merged: Dict[str, object] = {}
+        lower_keys = [k.lower() for k in keys_by_row if k is not None]
+        for blocks in chain:
+            block = blocks.get(WILDCARD)
+            if block:
+                merged.update(block)
+            for k in lower_keys:
+                block = blocks.get(k)
+                if block:
+                    merged.update(block)
+        result = replace(base, **merged) if merged else base
+
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[ck] = result
+        return result
+
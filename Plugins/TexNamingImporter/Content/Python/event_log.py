@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from fingerprint import hash_file
+
+LOG_VERSION = 1
+
+# gzip メンバーの先頭（ID1 ID2 CM=deflate）
+_GZIP_MAGIC = b"\x1f\x8b\x08"
+
+# 圧縮器のバッファを同期フラッシュする間隔（落ちても直前のフラッシュまでは読める）
+DEFAULT_FLUSH_EVERY = 256
+
+
+@dataclass(frozen=True)
+class ImportEvent:
+    """記録した 1 件分のインポート（設定適用）。"""
+    time: float      # 開始時刻（エポック秒）
+    path: str
+    config: str      # 適用したパラメータの指紋（命名エラーは空）
+    status: str      # progress_journal の結果（ok / unchanged / suffix / error）
+    seconds: float   # 解決 + 適用にかかった時間
+    session: int = field(default=0, compare=False)   # 何番目の記録（起動）か。ファイルには書かない
+
+    def to_json(self) -> List:
+        return [round(self.time, 4), self.path, self.config, self.status, round(self.seconds, 6)]
+
+    @classmethod
+    def from_json(cls, row: List, session: int = 0) -> "ImportEvent":
+        t, path, config, status, seconds = row
+        return cls(float(t), path, config, status, float(seconds), session)
+
+
+def config_hashes(texture_config_path: Union[str, Path], suffix_config_path: Union[str, Path],
+                  config_path: Optional[Union[str, Path]] = None) -> Dict[str, str]:
+    """設定ファイルごとの内容の指紋（記録時と再生時で設定が同じかを確かめる）。"""
+    out = {"texture_config": hash_file(texture_config_path), "suffix_config": hash_file(suffix_config_path)}
+    if config_path is not None:
+        out["config"] = hash_file(config_path)
+    return out
+
+
+class EventRecorder:
+    """
+    インポートの列を gzip 圧縮した JSONL に追記する（1 行 1 イベント、キーを持たない配列で数十バイト）。
+
+    - 開くたびに gzip のメンバーを 1 つ追加し、先頭行に設定の指紋を書く（複数回の起動を 1 ファイルに続けて記録できる）
+    - flush_every 件ごとに圧縮器を同期フラッシュする。途中で落ちても、最後のフラッシュまでは読める
+    - 落ちたあとに追記しても、読み出しはメンバーごとに行うので前後のセッションは失われない
+    """
+
+    def __init__(self, file_path: Union[str, Path], configs: Optional[Dict[str, str]] = None, *,
+                 flush_every: int = DEFAULT_FLUSH_EVERY, clock: Callable[[], float] = time.time):
+        if flush_every < 1:
+            raise ValueError("flush_every は 1 以上を指定してください")
+        self.path = Path(file_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._clock = clock
+        self._f = gzip.open(self.path, "ab")
+        self.events = 0
+        self._write({"version": LOG_VERSION, "started": clock(), "configs": configs or {}})
+
+    def _write(self, obj) -> None:
+        self._f.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def now(self) -> float:
+        return self._clock()
+
+    def record(self, event: ImportEvent) -> None:
+        self._write(event.to_json())
+        self.events += 1
+        if self.events % self.flush_every == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        self._f.flush(zlib.Z_SYNC_FLUSH)
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> "EventRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class EventLog:
+    """read_events の結果。"""
+    sessions: List[Dict]            # 記録を開くたびのヘッダ（version / started / configs）
+    events: List[ImportEvent]
+    truncated: bool = False         # 書きかけ（閉じられていない）末尾があった
+
+
+# 各メンバーの展開後の先頭（EventRecorder が最初に書くヘッダ行）
+_HEADER_PREFIX = b'{"version":'
+_CHUNK = 4096
+
+
+def _decompress(data: bytes, start: int, end: Optional[int] = None) -> Tuple[bytes, bool, int]:
+    """
+    data[start:end] の先頭のメンバーを少しずつ展開する。(内容, 完結したか, 次のメンバーの位置)。
+    途中で壊れていたら、そこまでに展開できた分を返す。
+    """
+    end = len(data) if end is None else end
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    out = []
+    pos = start
+    while pos < end and not d.eof:
+        chunk = data[pos:min(pos + _CHUNK, end)]
+        try:
+            out.append(d.decompress(chunk))
+        except zlib.error:
+            break
+        pos += len(chunk)
+    if d.eof:
+        pos -= len(d.unused_data)
+    return b"".join(out), d.eof, pos
+
+
+def _starts_member(data: bytes, pos: int) -> bool:
+    """pos から EventRecorder の書いたメンバーが始まっているか（先頭だけ展開して確かめる）。"""
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        return d.decompress(data[pos:pos + _CHUNK], len(_HEADER_PREFIX)) == _HEADER_PREFIX
+    except zlib.error:
+        return False
+
+
+def _iter_members(data: bytes) -> Iterator[Tuple[bytes, bool]]:
+    """
+    gzip のメンバーを 1 つずつ展開し、(内容, 完結しているか) を返す。
+    書きかけで終わったメンバーのうしろに次のセッションが追記されている場合は、
+    ヘッダ行から始まる次のメンバーを探し、その手前までを途切れたメンバーとして読む。
+    """
+    pos = 0
+    while pos < len(data):
+        content, complete, end = _decompress(data, pos)
+        if complete:
+            yield content, True
+            pos = end
+            continue
+        nxt = data.find(_GZIP_MAGIC, pos + 1)
+        while nxt >= 0 and not _starts_member(data, nxt):
+            nxt = data.find(_GZIP_MAGIC, nxt + 1)
+        if nxt < 0:
+            yield content, False
+            return
+        yield _decompress(data, pos, nxt)[0], False
+        pos = nxt
+
+
+def read_events(file_path: Union[str, Path]) -> EventLog:
+    """
+    記録を読み、イベントをセッション（記録した起動）ごとに時刻順で返す。
+    途切れたセッション（行の途中も含む）は読める所までを使い、truncated を立てる。
+    """
+    log = EventLog([], [])
+    data = Path(file_path).read_bytes()
+    for content, complete in _iter_members(data):
+        if not complete:
+            log.truncated = True
+        session = len(log.sessions) - 1
+        for line in content.splitlines():
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                log.truncated = True
+                continue
+            if isinstance(obj, dict):
+                log.sessions.append(obj)
+                session += 1
+            else:
+                log.events.append(ImportEvent.from_json(obj, max(session, 0)))
+    log.events.sort(key=lambda e: (e.session, e.time))
+    return log
+
+
+def session_offsets(events: List[ImportEvent]) -> List[float]:
+    """
+    各イベントの、ログ先頭からの経過秒。セッションの間（エディタを閉じていた時間）は詰める。
+    次のセッションの最初のイベントは、前のセッションの最後の処理が終わった直後に置く。
+    """
+    out: List[float] = []
+    base = 0.0
+    prev: Optional[ImportEvent] = None
+    start = 0.0
+    for e in events:
+        if prev is None or e.session != prev.session:
+            base = out[-1] + prev.seconds if prev is not None else 0.0
+            start = e.time
+        out.append(base + (e.time - start))
+        prev = e
+    return out
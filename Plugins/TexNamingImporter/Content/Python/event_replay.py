@@ -0,0 +1,239 @@
+"""
+event_log で記録したインポートの列を、unreal の代用品（detail_unreal/unreal_standin.py）の上で
+命名 → 解決 → 適用の各段階に流し直し、レイテンシとスループットを測る。
+
+記録時と同じ間隔（--speed 1）でも、待たずに最大速度（--max-speed）でも再生できる。
+同じログを別のコードや設定で再生すれば、アーティストの実際の作業量で性能を比べられる。
+
+実行例（Python ディレクトリ直下で）:
+    python event_replay.py TextureConfig.json SuffixConfig.json Config.json session.jsonl.gz \\
+        --max-speed --latency Texture.post_edit_change=0.002 --out replay.json
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import compile_rules
+from event_log import EventLog, ImportEvent, config_hashes, read_events, session_offsets
+from fingerprint import params_fingerprint
+from pipeline import iter_resolved
+from progress_journal import status_of
+from detail_unreal import unreal_standin
+
+PERCENTILES = (50, 95, 99)
+# 代用品を import 時に束縛するモジュール（再生のたびに読み込み直す）
+_UNREAL_MODULES = ("texture_configurator", "detail_unreal.texture_configurator_unreal",
+                   "detail_unreal.tick_scheduler_unreal")
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = PERCENTILES) -> Dict[str, float]:
+    """最近順位法のパーセンタイルと最大値（秒）。空なら 0。"""
+    if not values:
+        return {**{f"p{p}": 0.0 for p in points}, "max": 0.0}
+    ordered = sorted(values)
+    out = {f"p{p}": ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] for p in points}
+    out["max"] = ordered[-1]
+    return out
+
+
+@dataclass
+class ReplayReport:
+    """再生の結果。時間はすべて秒。"""
+    events: int
+    wall_seconds: float
+    speed: float                                   # 0 = 最大速度
+    latency: Dict[str, float]                      # 予定時刻から適用完了まで（予定に遅れた待ちを含む）
+    service: Dict[str, float]                      # 解決 + 適用の処理時間
+    recorded_service: Dict[str, float]             # 記録時の処理時間
+    recorded_wall_seconds: float
+    recorded_status: Dict[str, int] = field(default_factory=dict)
+    replayed_status: Dict[str, int] = field(default_factory=dict)
+    params_changed: int = 0                        # 記録時とパラメータの指紋が違うテクスチャ
+    config_changed: List[str] = field(default_factory=list)   # 記録時と内容が違う設定ファイル
+
+    @property
+    def throughput(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def recorded_throughput(self) -> float:
+        return self.events / self.recorded_wall_seconds if self.recorded_wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        out = asdict(self)
+        out["throughput"] = self.throughput
+        out["recorded_throughput"] = self.recorded_throughput
+        return out
+
+
+def _changed_configs(log: EventLog, current: Mapping[str, str]) -> List[str]:
+    """記録したどのセッションとも内容が違う設定ファイルの名前。"""
+    recorded = [s.get("configs") or {} for s in log.sessions]
+    return sorted(name for name, digest in current.items()
+                  if recorded and all(r.get(name, digest) != digest for r in recorded))
+
+
+def _recorded_wall(events: Sequence[ImportEvent], offsets: Sequence[float]) -> float:
+    """記録時の所要時間。セッションの間（エディタを閉じていた時間）は含めない。"""
+    if not events:
+        return 0.0
+    return max(at + e.seconds for at, e in zip(offsets, events))
+
+
+def replay(log: EventLog, texture_config_path: Union[str, Path], suffix_config_path: Union[str, Path],
+           config_path: Union[str, Path], *, speed: float = 1.0,
+           latency: Optional[Mapping[str, float]] = None,
+           skip_unchanged: bool = False, quiet: bool = True,
+           clock: Callable[[], float] = time.perf_counter,
+           sleep: Callable[[float], None] = time.sleep) -> ReplayReport:
+    """
+    log のイベントを記録時の間隔 / speed で再生する（speed=0 なら待たずに流す）。
+    複数のセッションを含むログは、セッションの間を詰めて続けて再生する。
+    unreal の代用品を登録して texture_configurator を読み込み直すので、エディタの外（素の Python）で呼ぶこと。
+    latency は代用品の呼び出し名ごとの遅延（例: {"Texture.post_edit_change": 0.002}）で、エンジン側のコストを模擬する。
+    代用品のテクスチャは毎回新しく作るため、既定（skip_unchanged=False）ではすべて適用し直す。
+    """
+    if speed < 0:
+        raise ValueError("speed は 0 以上を指定してください")
+    events = log.events
+    offsets = session_offsets(events)
+    rules = compile_rules(texture_config_path, suffix_config_path, config_path)
+    recorder = unreal_standin.CallRecorder(latency=dict(latency or {}), record_calls=False, sleep=sleep)
+    ue = unreal_standin.install(recorder)
+    for path in dict.fromkeys(e.path for e in events):
+        ue.add_texture(path)
+    for name in _UNREAL_MODULES:
+        sys.modules.pop(name, None)
+    configurator = importlib.import_module("texture_configurator")
+    from detail_unreal.texture_configurator_unreal import UndoMode, batch_transaction
+
+    # 予定時刻（due）と処理を始めた時刻（start）を、パスを流すたびに積む
+    due: List[float] = []
+    start: List[float] = []
+
+    def _paced(origin: float) -> Iterator[str]:
+        for e, offset in zip(events, offsets):
+            at = origin + offset / speed if speed else None
+            wait = at - clock() if at is not None else 0.0
+            if wait > 0:
+                sleep(wait)
+            now = clock()
+            due.append(now if at is None else at)
+            start.append(now)
+            yield e.path
+
+    latencies: List[float] = []
+    service: List[float] = []
+    replayed: Counter = Counter()
+    params_changed = 0
+    out = open(os.devnull, "w") if quiet else None
+    try:
+        with redirect_stdout(out) if out is not None else nullcontext():
+            origin = clock()
+            with batch_transaction(undo_mode=UndoMode.BATCH, log=False):
+                for i, item in enumerate(iter_resolved(_paced(origin), rules)):
+                    report = configurator._apply_resolved(item, rules, skip_unchanged=skip_unchanged)
+                    done = clock()
+                    latencies.append(done - due[i])
+                    service.append(done - start[i])
+                    replayed[status_of(report)] += 1
+                    if item.ok and events[i].config and params_fingerprint(item.params) != events[i].config:
+                        params_changed += 1
+            wall = clock() - origin
+    finally:
+        if out is not None:
+            out.close()
+        unreal_standin.uninstall()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+
+    return ReplayReport(
+        events=len(events), wall_seconds=wall, speed=speed,
+        latency=percentiles(latencies), service=percentiles(service),
+        recorded_service=percentiles([e.seconds for e in events]),
+        recorded_wall_seconds=_recorded_wall(events, offsets),
+        recorded_status=dict(Counter(e.status for e in events)), replayed_status=dict(replayed),
+        params_changed=params_changed,
+        config_changed=_changed_configs(log, config_hashes(texture_config_path, suffix_config_path, config_path)),
+    )
+
+
+def log_report(report: ReplayReport) -> None:
+    def _ms(stats: Mapping[str, float]) -> str:
+        return " ".join(f"{k}={v * 1e3:.2f}ms" for k, v in stats.items())
+
+    mode = "max speed" if not report.speed else f"x{report.speed:g}"
+    print(f"[EventReplay] {report.events} events ({mode}) in {report.wall_seconds:.3f}s, "
+          f"{report.throughput:.1f} tex/s (recorded {report.recorded_throughput:.1f} tex/s)")
+    print(f"[EventReplay] latency  {_ms(report.latency)}")
+    print(f"[EventReplay] service  {_ms(report.service)}")
+    print(f"[EventReplay] recorded {_ms(report.recorded_service)}")
+    if report.params_changed:
+        print(f"[EventReplay] {report.params_changed} textures resolved to different params than recorded")
+    if report.config_changed:
+        print(f"[EventReplay] config changed since recording: {', '.join(report.config_changed)}")
+
+
+def _parse_latency(text: str):
+    name, sep, seconds = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"NAME=SECONDS の形式で指定してください: {text}")
+    try:
+        return name, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"秒数が数値ではありません: {text}") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="event_replay",
+        description="記録したインポートの列を unreal の代用品の上で再生し、レイテンシとスループットを測ります。",
+    )
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("config_path", help="Config.json のパス")
+    parser.add_argument("event_log", help="texture_configurator --record で記録したログ")
+    speed = parser.add_mutually_exclusive_group()
+    speed.add_argument("--speed", type=float, default=1.0, help="記録時の何倍速で再生するか（既定: 1）")
+    speed.add_argument("--max-speed", action="store_true", help="間隔を待たずに最大速度で再生する")
+    parser.add_argument(
+        "--latency",
+        type=_parse_latency,
+        action="append",
+        default=[],
+        metavar="NAME=SECONDS",
+        help="代用品の呼び出しに注入する遅延（例: Texture.post_edit_change=0.002）。複数指定可",
+    )
+    parser.add_argument("--skip-unchanged", action="store_true", help="指紋が同じテクスチャを読み飛ばす（既定は全件適用）")
+    parser.add_argument("--verbose", action="store_true", help="適用ごとのログを表示する")
+    parser.add_argument("--out", help="結果を JSON で書き出すパス")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    log = read_events(args.event_log)
+    if log.truncated:
+        print(f"[EventReplay] {args.event_log} ends with a torn record; replaying what could be read")
+    result = replay(log, args.texture_config_path, args.suffix_config_path, args.config_path,
+                    speed=0.0 if args.max_speed else args.speed, latency=dict(args.latency),
+                    skip_unchanged=args.skip_unchanged, quiet=not args.verbose)
+    log_report(result)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+        print(f"[EventReplay] wrote {args.out}")
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, fields
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+from texture_config import TextureConfigParams
+
+# アセットのメタデータタグ名（EditorAssetLibrary.set_metadata_tag で保存する）
+TAG_SOURCE_HASH = "TexNaming.SourceHash"
+TAG_SOURCE_SIZE = "TexNaming.SourceSize"
+TAG_CONFIG_HASH = "TexNaming.ConfigHash"
+
+# 1 回の読み込みサイズ。大きすぎるとキャッシュ効率が落ち、小さすぎると呼び出し回数が増える
+DEFAULT_CHUNK_SIZE = 1 << 20
+DIGEST_SIZE = 16
+
+
+def hash_file(file_path: Union[str, Path], *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    ファイル内容の BLAKE2b（16 バイト）を 16 進文字列で返す。
+    固定長バッファへ readinto で読み込みながら逐次ハッシュするので、
+    数百 MB の EXR でもメモリ使用量はバッファ 1 つ分で済む。
+    """
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _plain(v):
+    if isinstance(v, Enum):
+        return v.name
+    return v
+
+
+def params_fingerprint(params: TextureConfigParams) -> str:
+    """
+    適用するパラメータの指紋。TextureConfig.json / SuffixConfig.json のうち
+    このテクスチャに効く部分だけが変わったときに変化する（無関係な行の編集では変わらない）。
+    """
+    canonical = json.dumps({f.name: _plain(getattr(params, f.name)) for f in fields(params)},
+                           sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=DIGEST_SIZE).hexdigest()
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """最後に適用が成功したときのソースファイルと設定の指紋。"""
+    source_hash: str
+    source_size: int
+    config_hash: str
+
+    def to_tags(self) -> Dict[str, str]:
+        return {
+            TAG_SOURCE_HASH: self.source_hash,
+            TAG_SOURCE_SIZE: str(self.source_size),
+            TAG_CONFIG_HASH: self.config_hash,
+        }
+
+    @classmethod
+    def from_tags(cls, tags: Mapping[str, Optional[str]]) -> Optional["SourceFingerprint"]:
+        """タグが欠けている・壊れている場合は None。"""
+        source_hash, size, config_hash = (tags.get(TAG_SOURCE_HASH), tags.get(TAG_SOURCE_SIZE),
+                                          tags.get(TAG_CONFIG_HASH))
+        if not source_hash or not size or not config_hash:
+            return None
+        try:
+            return cls(source_hash=source_hash, source_size=int(size), config_hash=config_hash)
+        except ValueError:
+            return None
+
+
+def compute_fingerprint(source_file: Union[str, Path], config_hash: str) -> SourceFingerprint:
+    """
+    ソースファイルの指紋を作る。読み込みは 1 回だけで、スキップ判定（記録値との ==）と
+    適用後の記録の両方にこの結果を使う。
+    """
+    size = os.stat(source_file).st_size
+    return SourceFingerprint(source_hash=hash_file(source_file), source_size=size, config_hash=config_hash)
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+# 先頭でまとめて読むバイト数（PNG/TGA/PSD/DDS はこの範囲で足りる）
+HEAD_SIZE = 512
+# JPEG/EXR のヘッダを探すときに読む上限（EXIF や属性が大きいファイル向け）
+MAX_SCAN_BYTES = 1 << 20
+
+
+class ImageHeaderError(ValueError):
+    """対応形式だがヘッダが壊れている／途中で切れている。"""
+
+
+@dataclass(frozen=True)
+class ImageHeader:
+    format: str          # "png" / "jpeg" / "tga" / "psd" / "dds" / "exr"
+    width: int
+    height: int
+    channels: int
+    bit_depth: int       # チャンネルあたりのビット数（ブロック圧縮 DDS は 0）
+    is_float: bool = False
+
+    @property
+    def is_pow2(self) -> bool:
+        return _is_pow2(self.width) and _is_pow2(self.height)
+
+    @property
+    def is_multiple_of_4(self) -> bool:
+        return self.width % 4 == 0 and self.height % 4 == 0
+
+    @property
+    def max_side(self) -> int:
+        return max(self.width, self.height)
+
+
+def _is_pow2(v: int) -> bool:
+    return v > 0 and (v & (v - 1)) == 0
+
+
+def _ceil_pow2(v: int) -> int:
+    return 1 << (v - 1).bit_length() if v > 1 else 1
+
+
+def _need(buf: bytes, n: int, fmt: str) -> None:
+    if len(buf) < n:
+        raise ImageHeaderError(f"{fmt}: header truncated ({len(buf)} < {n} bytes)")
+
+
+# ---------- 形式ごとの読み取り ----------
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+
+def _read_png(head: bytes, f: BinaryIO) -> ImageHeader:
+    _need(head, 29, "png")
+    if head[12:16] != b"IHDR":
+        raise ImageHeaderError("png: IHDR chunk not found")
+    width, height, depth, color_type = struct.unpack_from(">IIBB", head, 16)
+    if color_type not in _PNG_CHANNELS:
+        raise ImageHeaderError(f"png: unknown color type {color_type}")
+    # パレット画像はインデックスのビット数ではなく、展開後の 8bit RGB として扱う
+    return ImageHeader("png", width, height, _PNG_CHANNELS[color_type], 8 if color_type == 3 else depth)
+
+
+# SOF0..SOF15 のうち DHT(C4) / JPG(C8) / DAC(CC) を除いたもの
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _read_jpeg(head: bytes, f: BinaryIO) -> ImageHeader:
+    # マーカーを長さで飛ばしながら SOF を探す（EXIF などはシークで読み飛ばす）
+    pos = 2
+    f.seek(pos)
+    while pos < MAX_SCAN_BYTES:
+        marker = f.read(2)
+        if len(marker) < 2:
+            break
+        if marker[0] != 0xFF:
+            raise ImageHeaderError(f"jpeg: bad marker at {pos}")
+        code = marker[1]
+        if code == 0xFF:  # フィルバイト
+            f.seek(pos + 1)
+            pos += 1
+            continue
+        if code in (0x01,) or 0xD0 <= code <= 0xD9:  # 長さを持たないマーカー
+            pos += 2
+            continue
+        seg = f.read(2)
+        if len(seg) < 2:
+            break
+        (length,) = struct.unpack(">H", seg)
+        if code in _JPEG_SOF:
+            body = f.read(6)
+            _need(body, 6, "jpeg")
+            precision, height, width, components = struct.unpack(">BHHB", body)
+            return ImageHeader("jpeg", width, height, components, precision)
+        pos += 2 + length
+        f.seek(pos)
+    raise ImageHeaderError("jpeg: SOF marker not found")
+
+
+def _read_psd(head: bytes, f: BinaryIO) -> ImageHeader:
+    _need(head, 26, "psd")
+    version, = struct.unpack_from(">H", head, 4)
+    if version not in (1, 2):  # 2 = PSB
+        raise ImageHeaderError(f"psd: unknown version {version}")
+    channels, height, width, depth, _mode = struct.unpack_from(">HIIHH", head, 12)
+    return ImageHeader("psd", width, height, channels, depth, is_float=(depth == 32))
+
+
+# DDS の FourCC → (チャンネル数, float か)
+_DDS_FOURCC = {
+    b"DXT1": (4, False), b"DXT2": (4, False), b"DXT3": (4, False), b"DXT4": (4, False), b"DXT5": (4, False),
+    b"ATI1": (1, False), b"BC4U": (1, False), b"BC4S": (1, False),
+    b"ATI2": (2, False), b"BC5U": (2, False), b"BC5S": (2, False),
+}
+# DXGI_FORMAT の代表値 → (チャンネル数, チャンネルあたりのビット数, float か)。0 ビットはブロック圧縮
+_DXGI = {
+    2: (4, 32, True), 10: (4, 16, True), 11: (4, 16, False), 24: (4, 10, False), 26: (3, 11, True),
+    28: (4, 8, False), 29: (4, 8, False), 41: (1, 32, True), 54: (1, 16, True), 56: (1, 16, False),
+    61: (1, 8, False), 87: (4, 8, False), 88: (3, 8, False), 91: (4, 8, False),
+    71: (4, 0, False), 72: (4, 0, False), 74: (4, 0, False), 75: (4, 0, False), 77: (4, 0, False),
+    78: (4, 0, False), 80: (1, 0, False), 81: (1, 0, False), 83: (2, 0, False), 84: (2, 0, False),
+    95: (3, 0, True), 96: (3, 0, True), 98: (4, 0, False), 99: (4, 0, False),
+}
+_DDPF_ALPHAPIXELS = 0x1
+_DDPF_FOURCC = 0x4
+_DDPF_LUMINANCE = 0x20000
+
+
+def _read_dds(head: bytes, f: BinaryIO) -> ImageHeader:
+    _need(head, 128, "dds")
+    size, _flags, height, width = struct.unpack_from("<IIII", head, 4)
+    if size != 124:
+        raise ImageHeaderError(f"dds: bad header size {size}")
+    pf_flags, = struct.unpack_from("<I", head, 80)
+    fourcc = head[84:88]
+    rgb_bits, = struct.unpack_from("<I", head, 88)
+    if pf_flags & _DDPF_FOURCC:
+        if fourcc == b"DX10":
+            _need(head, 132, "dds")
+            dxgi, = struct.unpack_from("<I", head, 128)
+            if dxgi not in _DXGI:
+                raise ImageHeaderError(f"dds: unsupported DXGI format {dxgi}")
+            channels, depth, is_float = _DXGI[dxgi]
+            return ImageHeader("dds", width, height, channels, depth, is_float)
+        if fourcc in _DDS_FOURCC:
+            channels, is_float = _DDS_FOURCC[fourcc]
+            return ImageHeader("dds", width, height, channels, 0, is_float)
+        # D3DFMT の数値 FourCC（例: 113 = A16B16G16R16F）
+        code = struct.unpack("<I", fourcc)[0]
+        float_formats = {111: (1, 16), 112: (2, 16), 113: (4, 16), 114: (1, 32), 115: (2, 32), 116: (4, 32)}
+        if code in float_formats:
+            channels, depth = float_formats[code]
+            return ImageHeader("dds", width, height, channels, depth, True)
+        raise ImageHeaderError(f"dds: unsupported FourCC {fourcc!r}")
+    if pf_flags & _DDPF_LUMINANCE:
+        channels = 2 if pf_flags & _DDPF_ALPHAPIXELS else 1
+    else:
+        channels = 4 if pf_flags & _DDPF_ALPHAPIXELS else 3
+    return ImageHeader("dds", width, height, channels, rgb_bits // channels if channels else 0)
+
+
+# EXR のピクセル型 → ビット数
+_EXR_PIXEL_BITS = {0: 32, 1: 16, 2: 32}
+
+
+def _read_exr(head: bytes, f: BinaryIO) -> ImageHeader:
+    # 属性は「名前\0 型名\0 サイズ(int32) 値」の並び。必要な 2 つが揃ったら打ち切る
+    data = bytearray(head)
+    pos = 8  # マジック + バージョン
+
+    def ensure(n: int) -> None:
+        # data[pos:pos+n] が読めるまで追加で読む（MAX_SCAN_BYTES を超える分は読む前に断る）
+        if n < 0 or pos + n > MAX_SCAN_BYTES:
+            raise ImageHeaderError(f"exr: header larger than {MAX_SCAN_BYTES} bytes")
+        while len(data) < pos + n:
+            chunk = f.read(min(max(HEAD_SIZE, pos + n - len(data)), MAX_SCAN_BYTES - len(data)))
+            if not chunk:
+                raise ImageHeaderError("exr: header truncated")
+            data.extend(chunk)
+
+    def cstring() -> bytes:
+        nonlocal pos
+        while True:
+            end = data.find(b"\0", pos)
+            if end >= 0:
+                s, pos = bytes(data[pos:end]), end + 1
+                return s
+            ensure(len(data) - pos + 1)
+
+    data_window = None
+    channels: List[int] = []
+    f.seek(len(head))
+    while data_window is None or not channels:
+        ensure(1)
+        if data[pos] == 0:  # ヘッダ終端
+            break
+        name = cstring()
+        cstring()  # 型名
+        ensure(4)
+        size, = struct.unpack_from("<i", data, pos)
+        pos += 4
+        ensure(size)  # 負や巨大なサイズはここで ImageHeaderError
+        value = bytes(data[pos:pos + size])
+        pos += size
+        if name == b"dataWindow":
+            _need(value, 16, "exr dataWindow")
+            data_window = struct.unpack_from("<iiii", value, 0)
+        elif name == b"channels":
+            # chlist: 「名前\0 pixel_type(int32) pLinear(u8) 予約(3) xSampling(int32) ySampling(int32)」の並び
+            i = 0
+            while i < len(value) and value[i] != 0:
+                nend = value.find(b"\0", i)
+                if nend < 0 or nend + 1 + 16 > len(value):
+                    raise ImageHeaderError("exr: channels attribute truncated")
+                channels.append(struct.unpack_from("<i", value, nend + 1)[0])
+                i = nend + 1 + 16
+    if data_window is None or not channels:
+        raise ImageHeaderError("exr: dataWindow or channels attribute missing")
+    xmin, ymin, xmax, ymax = data_window
+    if xmax < xmin or ymax < ymin:
+        raise ImageHeaderError(f"exr: inverted dataWindow {data_window}")
+    bits = max(_EXR_PIXEL_BITS.get(t, 32) for t in channels)
+    return ImageHeader("exr", xmax - xmin + 1, ymax - ymin + 1, len(channels), bits,
+                       is_float=any(t in (1, 2) for t in channels))
+
+
+def _read_tga(head: bytes, f: BinaryIO) -> ImageHeader:
+    _need(head, 18, "tga")
+    _id_len, cmap_type, image_type = head[0], head[1], head[2]
+    if image_type not in (1, 2, 3, 9, 10, 11) or cmap_type not in (0, 1):
+        raise ImageHeaderError(f"tga: unsupported image type {image_type}")
+    width, height, pixel_depth, descriptor = struct.unpack_from("<HHBB", head, 12)
+    alpha_bits = descriptor & 0x0F
+    if image_type in (3, 11):                    # グレースケール
+        channels, depth = (2, 8) if pixel_depth == 16 else (1, pixel_depth)
+    elif image_type in (1, 9):                   # カラーマップ
+        cmap_depth = head[7]
+        channels, depth = (4 if cmap_depth == 32 else 3), 8
+    elif pixel_depth == 16:
+        channels, depth = (4 if alpha_bits else 3), 5
+    else:
+        channels, depth = (4 if pixel_depth == 32 else 3), 8
+    return ImageHeader("tga", width, height, channels, depth)
+
+
+# (マジック, 読み取り関数)。TGA はマジックが無いので拡張子で判定する
+_MAGIC: List[Tuple[bytes, Callable[[bytes, BinaryIO], ImageHeader]]] = [
+    (b"\x89PNG\r\n\x1a\n", _read_png),
+    (b"\xff\xd8", _read_jpeg),
+    (b"8BPS", _read_psd),
+    (b"DDS ", _read_dds),
+    (b"\x76\x2f\x31\x01", _read_exr),
+]
+_BY_EXTENSION: Dict[str, Callable[[bytes, BinaryIO], ImageHeader]] = {".tga": _read_tga}
+
+
+def read_image_header(file_path: Union[str, Path]) -> Optional[ImageHeader]:
+    """
+    画像ファイルのヘッダだけを読み、寸法・チャンネル数・ビット深度を返す。
+    先頭 HEAD_SIZE バイトを 1 回読むだけで済む形式がほとんど（JPEG/EXR のみ必要に応じて追加で読む）。
+    未対応の形式は None、対応形式でヘッダが壊れている場合は ImageHeaderError（読み取り中の例外もすべてこれに揃える）。
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(HEAD_SIZE)
+        reader = next((r for magic, r in _MAGIC if head.startswith(magic)), None)
+        if reader is None:
+            reader = _BY_EXTENSION.get(Path(file_path).suffix.lower())
+        if reader is None:
+            return None
+        try:
+            return reader(head, f)
+        except ImageHeaderError:
+            raise
+        except (struct.error, IndexError, ValueError) as e:
+            raise ImageHeaderError(f"{file_path}: malformed header ({e})") from e
+
+
+# ---------- ルール側の判断 ----------
+def clamp_max_size(size: int, header: Optional[ImageHeader], *, enforce_pow2: bool = False) -> int:
+    """
+    設定上の最大サイズをソースの寸法で頭打ちにする（ソースより大きい値は効果が無く、誤解を招くため）。
+    size が 0（無制限）またはヘッダが無い場合はそのまま返す。
+    enforce_pow2 の場合はソースの長辺を 2 の冪に切り上げた値で頭打ちにする。
+    """
+    if size <= 0 or header is None or header.max_side <= 0:
+        return size
+    limit = _ceil_pow2(header.max_side) if enforce_pow2 else header.max_side
+    return min(size, limit)
+
+
+def effective_max_size(size: int, source: Optional[ImageHeader] = None, *, enforce_pow2: bool = False) -> int:
+    """
+    TextureConfigurator が実際に書き込む max_texture_size（0 は無制限）。
+    enforce_pow2 なら 2 の冪に切り下げ → ソース寸法で頭打ち → [16, 16384] に収める。
+    """
+    size = max(0, int(size))
+    if enforce_pow2 and size > 0:
+        size = 1 << (size.bit_length() - 1)
+    size = clamp_max_size(size, source, enforce_pow2=enforce_pow2)
+    if size > 0:
+        size = max(16, min(size, 16384))
+    return size
+
+
+def source_warnings(header: Optional[ImageHeader]) -> List[str]:
+    """ソース寸法の注意点（2 の冪でない／4 の倍数でない＝ブロック圧縮で余白が出る）。"""
+    if header is None:
+        return []
+    out = []
+    size = f"{header.width}x{header.height}"
+    if not header.is_pow2:
+        out.append(f"non-pow2 source {size} (no mips/streaming unless padded)")
+    if not header.is_multiple_of_4:
+        out.append(f"source {size} is not a multiple of 4 (block compression pads it)")
+    return out
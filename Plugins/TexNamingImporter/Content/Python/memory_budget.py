@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules, build_rules, compile_rules
+from config import Config, MemoryBudget
+from directory_overrides import directory_of
+from image_header import effective_max_size
+from memory_estimator import DEFAULT_SIZE, _FORMAT_CODES, _np, _require_numpy, iter_scan_rows, pixel_format, texture_bytes
+from texture_config import TextureConfigParams
+from type_define import MipGenKind, SizePreset
+
+# 候補の最大サイズ（小さい順）。最後の 0 は「設定どおり」（上書きしない）
+CANDIDATE_SIZES: Tuple[int, ...] = (SizePreset.P256, SizePreset.P512, SizePreset.P1024, SizePreset.P2048,
+                                    SizePreset.P4096, 0)
+_TOP = len(CANDIDATE_SIZES) - 1
+_MB = 1024 * 1024
+STATE_VERSION = 1
+
+# (アセットパス, texture_type, 解決済みパラメータ, 幅, 高さ, チャンネル数, ビット深度)。寸法 0 は不明
+BudgetInput = Tuple[str, Optional[str], TextureConfigParams, int, int, int, int]
+
+
+@dataclass
+class SubtreePlan:
+    """予算ディレクトリ 1 つ分の割り当て結果。"""
+    root: str
+    budget_bytes: int
+    before_bytes: int                     # 設定どおりの場合の合計
+    after_bytes: int                      # 割り当て後の合計（BudgetPlan.lowered のディレクトリは実際にはこれより小さい）
+    sizes: Dict[str, int] = field(default_factory=dict)   # texture_type → 最大サイズ（0 = 設定どおり）
+
+    @property
+    def within(self) -> bool:
+        return self.after_bytes <= self.budget_bytes
+
+
+@dataclass
+class BudgetPlan:
+    subtrees: List[SubtreePlan]
+    # (予算ディレクトリ, texture_type, 前回のサイズ, 今回のサイズ)。適用済みテクスチャの再適用が必要なもの
+    changes: List[Tuple[str, str, int, int]] = field(default_factory=list)
+    # directory_overrides と同じ形の上書き（テクスチャのあるディレクトリごと）
+    overrides: Dict[str, Dict[str, Dict[str, object]]] = field(default_factory=dict)
+    # (ディレクトリ, texture_type, 割り当てたサイズ, 書き込むサイズ)。cap の違うテクスチャが混ざるため、
+    # 一部のテクスチャが割り当てより小さくなる（sizes / after_bytes とは一致しない）もの
+    lowered: List[Tuple[str, str, int, int]] = field(default_factory=list)
+
+
+class BudgetSolver:
+    """
+    予算ディレクトリ（memory_budgets のキー）以下のテクスチャを texture_type ごとにまとめ、
+    予算に収まるまで「削減量 / (重み × 枚数)」が最大の種別から 1 段ずつ最大サイズを下げる（貪欲法）。
+
+    - テクスチャごとに全候補サイズのメモリを NumPy でまとめて計算し、(予算ディレクトリ, 種別) ごとの合計を持つ
+    - 解くのは 種別数 × 候補数 の小さな表だけなので、テクスチャ数に依存しない
+    - add は同じパスを置き換えるので、新しいインポート分だけ追加して solve し直せる（save / load で状態を持ち越す）
+    """
+
+    def __init__(self, budgets: Mapping[str, MemoryBudget]):
+        _require_numpy()
+        self.budgets = dict(budgets)
+        self._roots = {d.rstrip("/").lower(): d for d in budgets}
+        self._root_cache: Dict[str, Optional[str]] = {}
+        # path → (root, type, 候補ごとのバイト数, 設定上の最大サイズ（0 = 無制限）)
+        self._entries: Dict[str, Tuple[str, str, "_np.ndarray", int]] = {}
+        self._sums: Dict[Tuple[str, str], "_np.ndarray"] = {}
+        self._counts: Counter = Counter()
+        # (root, type) → (テクスチャのあるディレクトリ, 設定上の最大サイズ) ごとの枚数
+        self._dirs: Dict[Tuple[str, str], Counter] = {}
+        self.assignments: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def root_of(self, asset_path: str) -> Optional[str]:
+        """asset_path を含む最も深い予算ディレクトリ（無ければ None）。"""
+        directory = directory_of(asset_path).lower()
+        hit = self._root_cache.get(directory, False)
+        if hit is not False:
+            return hit
+        d = directory
+        while d and d not in self._roots:
+            d = d.rpartition("/")[0]
+        root = self._roots.get(d) if d else None
+        self._root_cache[directory] = root
+        return root
+
+    # ---------- 追加・削除 ----------
+    def add_many(self, rows: Iterable[BudgetInput]) -> int:
+        """予算ディレクトリ以下のテクスチャを追加（同じパスは置き換え）し、追加した件数を返す。"""
+        keep = []
+        for row in rows:
+            root = self.root_of(row[0])
+            if root is not None:
+                keep.append((root,) + tuple(row))
+        if not keep:
+            return 0
+        n, k = len(keep), len(CANDIDATE_SIZES)
+        width, height, formats, caps, sizes, mips = [], [], [], [], [], []
+        for _root, path, _type, params, w, h, channels, bit_depth in keep:
+            cap = effective_max_size(int(params.max_in_game), enforce_pow2=params.enforce_pow2) \
+                if params.max_in_game else 0
+            caps.append(cap)
+            if not (w and h):
+                w = h = cap or DEFAULT_SIZE
+            fmt = _FORMAT_CODES[pixel_format(params.compression, channels, bit_depth).name]
+            for size in CANDIDATE_SIZES:
+                width.append(w)
+                height.append(h)
+                formats.append(fmt)
+                mips.append(params.mip_gen is not MipGenKind.NO_MIPMAPS)
+                # 設定値より大きい候補は設定値のまま（予算のために大きくはしない）
+                sizes.append(cap if not size else (min(size, cap) if cap else size))
+        table = texture_bytes(width, height, formats, sizes, mips).reshape(n, k)
+        for (root, path, texture_type, *_rest), cost, cap in zip(keep, table, caps):
+            self._store(path, root, texture_type or "", cost, cap)
+        return n
+
+    def add(self, path: str, texture_type: Optional[str], params: TextureConfigParams, *,
+            width: int = 0, height: int = 0, channels: int = 0, bit_depth: int = 8) -> bool:
+        return self.add_many([(path, texture_type, params, width, height, channels, bit_depth)]) == 1
+
+    def _store(self, path: str, root: str, texture_type: str, cost, cap: int = 0) -> None:
+        self.remove(path)
+        key = (root, texture_type)
+        self._entries[path] = (root, texture_type, cost, cap)
+        if key in self._sums:
+            self._sums[key] = self._sums[key] + cost
+        else:
+            self._sums[key] = cost.copy()
+        self._counts[key] += 1
+        self._dirs.setdefault(key, Counter())[(directory_of(path), cap)] += 1
+
+    def remove(self, path: str) -> bool:
+        old = self._entries.pop(path, None)
+        if old is None:
+            return False
+        root, texture_type, cost, cap = old
+        key = (root, texture_type)
+        self._sums[key] = self._sums[key] - cost
+        self._counts[key] -= 1
+        dirs = self._dirs[key]
+        slot = (directory_of(path), cap)
+        dirs[slot] -= 1
+        if dirs[slot] <= 0:
+            del dirs[slot]
+        if self._counts[key] <= 0:
+            del self._sums[key], self._counts[key], self._dirs[key]
+        return True
+
+    # ---------- 求解 ----------
+    @staticmethod
+    def _next_lower(cost, level: int) -> Optional[int]:
+        """level より小さくなる最大の候補（同じ合計になる候補は飛ばす）。"""
+        for j in range(level - 1, -1, -1):
+            if cost[j] < cost[level]:
+                return j
+        return None
+
+    def _solve_subtree(self, root: str) -> SubtreePlan:
+        budget = self.budgets[root]
+        limit = int(budget.budget_mb * _MB)
+        keys = [key for key in self._sums if key[0] == root]
+        level = {t: _TOP for _r, t in keys}
+        before = total = int(sum(int(self._sums[key][_TOP]) for key in keys))
+
+        heap: List[Tuple[float, str, int, int]] = []
+
+        def push(texture_type: str) -> None:
+            cost = self._sums[(root, texture_type)]
+            j = self._next_lower(cost, level[texture_type])
+            if j is None:
+                return
+            saved = int(cost[level[texture_type]] - cost[j])
+            weight = budget.priority.get(texture_type, 1.0) * self._counts[(root, texture_type)]
+            heapq.heappush(heap, (-saved / weight, texture_type, level[texture_type], j))
+
+        for _r, t in keys:
+            push(t)
+        while total > limit and heap:
+            _score, t, at, j = heapq.heappop(heap)
+            if level[t] != at:
+                continue
+            cost = self._sums[(root, t)]
+            total -= int(cost[at] - cost[j])
+            level[t] = j
+            push(t)
+        sizes = {t: int(CANDIDATE_SIZES[lv]) for t, lv in sorted(level.items())}
+        return SubtreePlan(root, limit, before, total, sizes)
+
+    def _directory_sizes(self, root: str, texture_type: str, size: int) -> Dict[str, Tuple[int, bool]]:
+        """
+        ディレクトリごとに書き込む最大サイズと、割り当てより小さくなるテクスチャがあるか。
+        設定上の最大サイズ（cap）を超えては上げない（= min(size, cap)）。
+        そのディレクトリの cap がすべて size 以下なら上書き自体が要らないので出さない。
+        1 つのディレクトリに cap の違うテクスチャが混ざる場合は、小さい方に揃える（上げる方向には動かさない）。
+        このとき cap の大きいテクスチャは割り当てより小さくなる。
+        """
+        caps: Dict[str, List[int]] = {}
+        for (directory, cap) in self._dirs[(root, texture_type)]:
+            caps.setdefault(directory, []).append(cap)
+        out = {}
+        for directory, values in caps.items():
+            if all(0 < cap <= size for cap in values):
+                continue
+            value = min([size] + [cap for cap in values if cap])
+            out[directory] = (value, any(min(size, cap or size) > value for cap in values))
+        return out
+
+    def solve(self) -> BudgetPlan:
+        """全予算ディレクトリを解き直し、前回の割り当てとの差分と directory_overrides 形式の上書きを返す。"""
+        plans = [self._solve_subtree(root) for root in self.budgets]
+        new: Dict[Tuple[str, str], int] = {}
+        overrides: Dict[str, Dict[str, Dict[str, object]]] = {}
+        lowered: List[Tuple[str, str, int, int]] = []
+        for p in plans:
+            for texture_type, size in p.sizes.items():
+                new[(p.root, texture_type)] = size
+                if not size:
+                    continue
+                # 子ディレクトリの上書きより優先させるため、テクスチャのあるディレクトリごとに置く
+                for directory, (value, below) in self._directory_sizes(p.root, texture_type, size).items():
+                    overrides.setdefault(directory, {})[texture_type or "*"] = {"max_in_game": value}
+                    if below:
+                        lowered.append((directory, texture_type, size, value))
+        changes = [(root, t, self.assignments.get((root, t), 0), size)
+                   for (root, t), size in sorted(new.items()) if self.assignments.get((root, t), 0) != size]
+        self.assignments = new
+        return BudgetPlan(plans, changes, overrides, sorted(lowered))
+
+    # ---------- 状態の保存 ----------
+    def save(self, file_path: Union[str, Path]) -> None:
+        data = {
+            "version": STATE_VERSION,
+            "entries": {p: [t, [int(v) for v in cost], cap] for p, (_r, t, cost, cap) in self._entries.items()},
+            "assignments": [[r, t, s] for (r, t), s in sorted(self.assignments.items())],
+        }
+        p = Path(file_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, p)
+
+    @classmethod
+    def load_or_new(cls, file_path: Union[str, Path], budgets: Mapping[str, MemoryBudget]) -> "BudgetSolver":
+        """保存した状態を読み込む。無い・形式が違う場合は空から始める。予算から外れたパスは読み捨てる。"""
+        solver = cls(budgets)
+        try:
+            data = json.loads(Path(file_path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return solver
+        if data.get("version") != STATE_VERSION:
+            print(f"[MemoryBudget] ignoring state with unknown version: {file_path}", file=sys.stderr)
+            return solver
+        for path, (texture_type, cost, *cap) in data["entries"].items():
+            root = solver.root_of(path)
+            if root is not None and len(cost) == len(CANDIDATE_SIZES):
+                # cap の無い古い状態は無制限として読む（候補ごとのバイト数は記録時の cap で計算済み）
+                solver._store(path, root, texture_type, _np.asarray(cost, dtype=_np.int64), int(cap[0]) if cap else 0)
+        solver.assignments = {(r, t): s for r, t, s in data.get("assignments", ()) if r in solver.budgets}
+        return solver
+
+
+def merge_overrides(base: Mapping[str, Mapping[str, Mapping[str, object]]],
+                    extra: Mapping[str, Mapping[str, Mapping[str, object]]]) -> Dict[str, Dict[str, Dict[str, object]]]:
+    """directory_overrides 同士を重ねる（extra が優先）。ディレクトリとキーは大小無視で同一視する。"""
+    merged = {d: {k: dict(v) for k, v in blocks.items()} for d, blocks in base.items()}
+    dir_names = {d.rstrip("/").lower(): d for d in merged}
+    for d, blocks in extra.items():
+        target = merged.setdefault(dir_names.setdefault(d.rstrip("/").lower(), d), {})
+        key_names = {k.lower(): k for k in target}
+        for k, block in blocks.items():
+            target.setdefault(key_names.setdefault(k.lower(), k), {}).update(block)
+    return merged
+
+
+def rules_with_budget(rules: CompiledRules, config: Config, plan: BudgetPlan) -> CompiledRules:
+    """config の directory_overrides に予算の割り当てを重ねたルールを作る。"""
+    if not plan.overrides:
+        return rules
+    return build_rules(rules.texture_settings, rules.suffix_settings,
+                       merge_overrides(config.directory_overrides, plan.overrides))
+
+
+def log_plan(plan: BudgetPlan) -> None:
+    for p in plan.subtrees:
+        state = "ok" if p.within else "OVER BUDGET"
+        lowered = ", ".join(f"{t or '*'}={s}" for t, s in p.sizes.items() if s) or "none"
+        print(f"[MemoryBudget] {p.root}: {p.before_bytes / _MB:.1f} MB -> {p.after_bytes / _MB:.1f} MB "
+              f"(budget {p.budget_bytes / _MB:.1f} MB, {state}); max_in_game lowered: {lowered}")
+    for directory, texture_type, size, value in plan.lowered:
+        print(f"[MemoryBudget] {directory} {texture_type or '*'}: lowered below plan ({size} -> {value}) "
+              f"because textures with different caps share the directory")
+    for root, texture_type, old, new in plan.changes:
+        print(f"[MemoryBudget] {root} {texture_type}: {old or 'config'} -> {new or 'config'} (re-apply needed)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="memory_budget",
+        description="事前チェックの CSV（preimport_scan）から、memory_budgets に収まる max_in_game を texture_type ごとに選びます。",
+    )
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("config_path", help="Config.json のパス（memory_budgets を使う）")
+    parser.add_argument("scan_csv", help="preimport_scan の出力 CSV（--asset-root 付きで走査したもの）")
+    parser.add_argument("--state", help="前回までの状態ファイル。指定すると読み込んで追加し、書き戻す")
+    parser.add_argument("--out", help="選んだ上書きを directory_overrides 形式の JSON で書き出すパス")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    config = Config.load(args.config_path)
+    rules = compile_rules(args.texture_config_path, args.suffix_config_path, args.config_path)
+    solver = BudgetSolver.load_or_new(args.state, config.memory_budgets) if args.state \
+        else BudgetSolver(config.memory_budgets)
+    inputs = []
+    for path, width, height, channels, bit_depth in iter_scan_rows(args.scan_csv):
+        match, params = rules.resolve_path(path)
+        if params is not None:
+            inputs.append((path, match.keys_by_row[0], params, width, height, channels, bit_depth))
+    solver.add_many(inputs)
+    result = solver.solve()
+    log_plan(result)
+    if args.state:
+        solver.save(args.state)
+    if args.out:
+        Path(args.out).write_text(json.dumps({"directory_overrides": result.overrides}, ensure_ascii=False, indent=2),
+                                  encoding="utf-8")
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:  # 集計はプロジェクト全体を NumPy でまとめて計算する（無ければ estimate で例外）
+    import numpy as _np
+except ImportError:  # pragma: no cover - 環境依存
+    _np = None
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from audit_store import StringPool
+from compiled_rules import CompiledRules, compile_rules
+from directory_overrides import directory_of
+from image_header import effective_max_size
+from texture_config import TextureConfigParams
+from type_define import CompressionKind, MipGenKind
+
+# ソースの寸法が分からないときの仮定（max_in_game が無制限のとき）
+DEFAULT_SIZE = 2048
+# エンジンが扱える最大の辺（16384 = 15 レベル）
+MAX_LEVELS = 15
+
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PixelFormat:
+    """圧縮設定から想定する UE のピクセル形式。"""
+    name: str
+    block: int          # ブロックの一辺（非圧縮は 1）
+    block_bytes: int    # 1 ブロックのバイト数
+    disk_ratio: float   # クック後のパッケージ圧縮（Oodle）でおおよそ何倍になるか（目安）
+
+    @property
+    def bits_per_pixel(self) -> float:
+        return self.block_bytes * 8 / (self.block * self.block)
+
+
+PIXEL_FORMATS: Tuple[PixelFormat, ...] = (
+    PixelFormat("DXT1", 4, 8, 0.75),
+    PixelFormat("DXT5", 4, 16, 0.8),
+    PixelFormat("BC4", 4, 8, 0.8),
+    PixelFormat("BC5", 4, 16, 0.85),
+    PixelFormat("BC7", 4, 16, 0.9),
+    PixelFormat("G8", 1, 1, 0.6),
+    PixelFormat("G16", 1, 2, 0.6),
+    PixelFormat("FloatRGBA", 1, 8, 0.7),
+    PixelFormat("B8G8R8A8", 1, 4, 0.5),
+)
+_FORMAT_CODES: Dict[str, int] = {f.name: i for i, f in enumerate(PIXEL_FORMATS)}
+
+
+def pixel_format(compression: Optional[CompressionKind], channels: int = 0, bit_depth: int = 8) -> PixelFormat:
+    """
+    圧縮設定（とソースのチャンネル数・ビット深度）から、クック後のピクセル形式を選ぶ。
+    Default / Masks はアルファがあれば DXT5、無ければ DXT1。チャンネル数が分からなければ大きい方（DXT5）で見積もる。
+    """
+    if compression in (None, CompressionKind.DEFAULT, CompressionKind.MASKS):
+        name = "DXT1" if 0 < channels < 4 else "DXT5"
+    elif compression is CompressionKind.GRAYSCALE:
+        name = "G16" if bit_depth > 8 else "G8"
+    else:
+        name = {
+            CompressionKind.NORMAL_MAP: "BC5",
+            CompressionKind.HDR: "FloatRGBA",
+            CompressionKind.ALPHA: "BC4",
+            CompressionKind.EDITOR_ICON: "B8G8R8A8",
+            CompressionKind.DISTANCE_FIELD_FONT: "G8",
+            CompressionKind.BC7: "BC7",
+        }[compression]
+    return PIXEL_FORMATS[_FORMAT_CODES[name]]
+
+
+def _require_numpy() -> None:
+    if _np is None:
+        raise RuntimeError("memory_estimator には NumPy が必要です")
+
+
+def _format_table():
+    block = _np.array([f.block for f in PIXEL_FORMATS], dtype=_np.int64)
+    block_bytes = _np.array([f.block_bytes for f in PIXEL_FORMATS], dtype=_np.int64)
+    disk = _np.array([f.disk_ratio for f in PIXEL_FORMATS], dtype=_np.float64)
+    return block, block_bytes, disk
+
+
+def in_game_size(width, height, max_size):
+    """
+    最大サイズを超える辺が収まるまで 1/2 ずつ縮めた、ゲーム中の最上位ミップの寸法（配列で受けて配列で返す）。
+    max_size は 0 で無制限（エンジンの上限 16384 まで）。
+    """
+    _require_numpy()
+    w = _np.asarray(width, dtype=_np.int64)
+    h = _np.asarray(height, dtype=_np.int64)
+    limit = _np.where(_np.asarray(max_size) > 0, max_size, 1 << (MAX_LEVELS - 1))
+    side = _np.maximum(_np.maximum(w, h), 1)
+    shift = _np.maximum(0, _np.ceil(_np.log2(side / limit) - 1e-9)).astype(_np.int64)
+    return _np.maximum(1, w >> shift), _np.maximum(1, h >> shift)
+
+
+def texture_bytes(width, height, formats, max_size, mips):
+    """
+    1 テクスチャ分の GPU メモリ（バイト）を配列でまとめて計算する。
+    - width / height: ソースの寸法、formats: PIXEL_FORMATS のインデックス、max_size: 0 で無制限、mips: ミップを作るか
+    - 2 のべき乗でないテクスチャはミップを作らない（エンジンの既定動作）
+    - 各ミップはブロック単位に切り上げる（4x4 未満のミップも 1 ブロック）
+    """
+    _require_numpy()
+    block, block_bytes, _disk = _format_table()
+    formats = _np.asarray(formats, dtype=_np.int64)
+    w, h = in_game_size(width, height, max_size)
+    pow2 = ((w & (w - 1)) == 0) & ((h & (h - 1)) == 0)
+    levels = _np.where(_np.asarray(mips, dtype=bool) & pow2,
+                       _np.floor(_np.log2(_np.maximum(w, h))).astype(_np.int64) + 1, 1)
+    b, bb = block[formats], block_bytes[formats]
+    total = _np.zeros(w.shape, dtype=_np.int64)
+    for level in range(MAX_LEVELS):
+        active = levels > level
+        if not active.any():
+            break
+        lw, lh = _np.maximum(1, w >> level), _np.maximum(1, h >> level)
+        total += _np.where(active, -(-lw // b) * -(-lh // b) * bb, 0)
+    return total
+
+
+@dataclass(frozen=True)
+class BudgetRow:
+    """集計の 1 行。"""
+    key: str
+    textures: int
+    gpu_bytes: int
+    disk_bytes: int
+
+
+class MemoryEstimate:
+    """estimate() の結果。テクスチャごとの配列と、ディレクトリ・TextureGroup・texture_type の集計を持つ。"""
+
+    BREAKDOWNS = ("directory", "group", "type")
+
+    def __init__(self, paths: List[str], pools: Dict[str, StringPool], codes: Dict[str, "_np.ndarray"],
+                 formats, width, height, mips, estimated, gpu_bytes, disk_bytes):
+        self.paths = paths
+        self.pools = pools
+        self.codes = codes
+        self.formats, self.width, self.height = formats, width, height
+        self.mips, self.estimated = mips, estimated
+        self.gpu_bytes, self.disk_bytes = gpu_bytes, disk_bytes
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def total_gpu_bytes(self) -> int:
+        return int(self.gpu_bytes.sum())
+
+    @property
+    def total_disk_bytes(self) -> int:
+        return int(self.disk_bytes.sum())
+
+    def summary(self, by: str) -> List[BudgetRow]:
+        """by（directory / group / type）ごとの件数と合計。GPU メモリの大きい順。"""
+        codes, pool = self.codes[by], self.pools[by]
+        n = len(pool)
+        count = _np.bincount(codes, minlength=n)
+        gpu = _np.bincount(codes, weights=self.gpu_bytes, minlength=n)
+        disk = _np.bincount(codes, weights=self.disk_bytes, minlength=n)
+        rows = [BudgetRow(pool.string(c), int(count[c]), int(gpu[c]), int(disk[c])) for c in _np.nonzero(count)[0]]
+        rows.sort(key=lambda r: (-r.gpu_bytes, r.key))
+        return rows
+
+
+class MemoryEstimator:
+    """
+    テクスチャを 1 件ずつ add し、estimate() でまとめて計算する。
+    add は列ごとの array に追記するだけなので、数十万件でもメモリはテクスチャ数 × 十数バイト程度。
+    """
+
+    def __init__(self):
+        self.paths: List[str] = []
+        # ディレクトリはプロジェクト全体で 65536 を超えうるので 32bit で持つ（適用ループの途中で溢れさせない）
+        self.pools = {by: StringPool(max_code=0xFFFFFFFF) for by in MemoryEstimate.BREAKDOWNS}
+        self._codes = {by: array("I") for by in MemoryEstimate.BREAKDOWNS}
+        self._formats = array("B")
+        self._width = array("l")
+        self._height = array("l")
+        self._max_size = array("l")
+        self._mips = array("B")
+        self._estimated = array("B")
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def add(self, path: str, texture_type: Optional[str], params: TextureConfigParams, *,
+            width: int = 0, height: int = 0, channels: int = 0, bit_depth: int = 8) -> None:
+        """resolve 済みの 1 テクスチャを追加する。寸法が 0（不明）なら max_in_game（無ければ DEFAULT_SIZE）の正方形とみなす。"""
+        max_size = effective_max_size(int(params.max_in_game), enforce_pow2=params.enforce_pow2) \
+            if params.max_in_game else 0
+        estimated = not (width and height)
+        if estimated:
+            width = height = max_size or DEFAULT_SIZE
+        self.paths.append(path)
+        self._codes["directory"].append(self.pools["directory"].code(directory_of(path)))
+        self._codes["group"].append(self.pools["group"].code(params.texture_group.name if params.texture_group else ""))
+        self._codes["type"].append(self.pools["type"].code(texture_type or ""))
+        self._formats.append(_FORMAT_CODES[pixel_format(params.compression, channels, bit_depth).name])
+        self._width.append(width)
+        self._height.append(height)
+        self._max_size.append(max_size)
+        self._mips.append(params.mip_gen is not MipGenKind.NO_MIPMAPS)
+        self._estimated.append(estimated)
+
+    def estimate(self) -> MemoryEstimate:
+        _require_numpy()
+        formats = _np.frombuffer(self._formats, dtype=_np.uint8).astype(_np.int64)
+        width = _np.asarray(self._width, dtype=_np.int64)
+        height = _np.asarray(self._height, dtype=_np.int64)
+        mips = _np.frombuffer(self._mips, dtype=_np.uint8).astype(bool)
+        gpu = texture_bytes(width, height, formats, _np.asarray(self._max_size, dtype=_np.int64), mips)
+        disk = (gpu * _format_table()[2][formats]).astype(_np.int64)
+        codes = {by: _np.frombuffer(a, dtype=_np.dtype(a.typecode)).astype(_np.int64) if len(a)
+                 else _np.zeros(0, dtype=_np.int64) for by, a in self._codes.items()}
+        return MemoryEstimate(list(self.paths), self.pools, codes, formats, width, height, mips,
+                              _np.frombuffer(self._estimated, dtype=_np.uint8).astype(bool), gpu, disk)
+
+
+def iter_scan_rows(scan_csv: Union[str, Path]) -> Iterable[Tuple[str, int, int, int, int]]:
+    """preimport_scan の CSV から、インポートされる行の (アセットパス, 幅, 高さ, チャンネル数, ビット深度) を返す。"""
+    with open(scan_csv, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["action"] == "reject" or not row["width"]:
+                continue
+            yield (row["asset_path"], int(row["width"]), int(row["height"]),
+                   int(row["channels"] or 0), int(row["bit_depth"] or 8))
+
+
+def estimate_from_scan(scan_csv: Union[str, Path], rules: CompiledRules) -> MemoryEstimate:
+    """ソースフォルダの事前チェック結果から、インポート後のメモリを見積もる。"""
+    est = MemoryEstimator()
+    for path, width, height, channels, bit_depth in iter_scan_rows(scan_csv):
+        match, params = rules.resolve_path(path)
+        if params is None:
+            continue
+        est.add(path, match.keys_by_row[0], params, width=width, height=height, channels=channels,
+                bit_depth=bit_depth)
+    return est.estimate()
+
+
+def write_budget_report(estimate: MemoryEstimate, out_dir: Union[str, Path], batch_id: str) -> List[Path]:
+    """
+    {out_dir}/{batch_id}.memory.csv（テクスチャごと）と
+    {out_dir}/{batch_id}.memory_summary.csv（ディレクトリ / TextureGroup / texture_type ごとの合計）を書き出す。
+    """
+    d = Path(out_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    per_texture = d / f"{batch_id}.memory.csv"
+    summary = d / f"{batch_id}.memory_summary.csv"
+
+    tmp = per_texture.with_name(per_texture.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["path", "type", "group", "format", "width", "height", "mips", "gpu_bytes", "disk_bytes",
+                    "estimated"])
+        for i, path in enumerate(estimate.paths):
+            w.writerow([path, estimate.pools["type"].string(estimate.codes["type"][i]),
+                        estimate.pools["group"].string(estimate.codes["group"][i]),
+                        PIXEL_FORMATS[estimate.formats[i]].name, int(estimate.width[i]), int(estimate.height[i]),
+                        int(estimate.mips[i]), int(estimate.gpu_bytes[i]), int(estimate.disk_bytes[i]),
+                        int(estimate.estimated[i])])
+    os.replace(tmp, per_texture)
+
+    tmp = summary.with_name(summary.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["by", "key", "textures", "gpu_mb", "disk_mb"])
+        w.writerow(["total", "", len(estimate), f"{estimate.total_gpu_bytes / _MB:.2f}",
+                    f"{estimate.total_disk_bytes / _MB:.2f}"])
+        for by in MemoryEstimate.BREAKDOWNS:
+            for r in estimate.summary(by):
+                w.writerow([by, r.key, r.textures, f"{r.gpu_bytes / _MB:.2f}", f"{r.disk_bytes / _MB:.2f}"])
+    os.replace(tmp, summary)
+    return [per_texture, summary]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="memory_estimator",
+        description="事前チェックの CSV（preimport_scan）から、設定適用後の GPU メモリとクック後のサイズを見積もります。",
+    )
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("config_path", help="Config.json のパス")
+    parser.add_argument("scan_csv", help="preimport_scan の出力 CSV（--asset-root 付きで走査したもの）")
+    parser.add_argument("out_dir", help="レポートの出力先")
+    parser.add_argument("--name", default="scan", help="出力ファイル名の接頭辞（既定: scan）")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    rules = compile_rules(args.texture_config_path, args.suffix_config_path, args.config_path)
+    result = estimate_from_scan(args.scan_csv, rules)
+    written = write_budget_report(result, args.out_dir, args.name)
+    print(f"[MemoryEstimator] {len(result)} textures: GPU {result.total_gpu_bytes / _MB:.1f} MB, "
+          f"disk {result.total_disk_bytes / _MB:.1f} MB -> {written[1]}")
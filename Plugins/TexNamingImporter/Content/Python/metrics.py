@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+# 環境変数: 指定されていればバッチごとにここへ書き出す
+ENV_METRICS_DIR = "TEXNAMING_METRICS_DIR"
+
+# 1 テクスチャの各段階の所要時間向け（秒）。照合は µs、適用は ms〜s のオーダー
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """ラベル付きカウンタ。ラベル値の組ごとに整数を持つだけ。"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0)
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        for lv, v in sorted(self.values.items()):
+            yield self.name, lv, v
+
+    def to_json(self):
+        return [{"labels": dict(zip(self.labels, lv)), "value": v} for lv, v in sorted(self.values.items())]
+
+    def empty_copy(self) -> "Counter":
+        return type(self)(self.name, self.help, self.labels)
+
+    def merge(self, other: "Counter") -> None:
+        for lv, v in other.values.items():
+            self.inc(*lv, amount=v)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *label_values: str) -> None:
+        self.values[label_values] = value
+
+    def merge(self, other: "Gauge") -> None:
+        """ゲージは合算せず、後から来た値で置き換える（直近のバッチの値）。"""
+        self.values.update(other.values)
+
+
+class Histogram:
+    """固定バケットのヒストグラム。observe は二分探索 1 回と加算 3 回。"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # ラベル値の組 → [バケットごとの件数..., +Inf の件数, 合計, 件数]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        row = self.values.get(label_values)
+        if row is None:
+            row = self.values[label_values] = [0] * (len(self.buckets) + 3)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def count(self, *label_values: str) -> int:
+        row = self.values.get(label_values)
+        return int(row[-1]) if row else 0
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        for lv, row in sorted(self.values.items()):
+            cumulative = 0
+            for le, n in zip(self.buckets + (float("inf"),), row):
+                cumulative += n
+                yield self.name + "_bucket", lv + (_fmt(le),), cumulative
+            yield self.name + "_sum", lv, row[-2]
+            yield self.name + "_count", lv, row[-1]
+
+    def empty_copy(self) -> "Histogram":
+        return Histogram(self.name, self.help, self.labels, self.buckets)
+
+    def merge(self, other: "Histogram") -> None:
+        if other.buckets != self.buckets:
+            raise ValueError(f"bucket mismatch for {self.name}")
+        for lv, row in other.values.items():
+            cur = self.values.get(lv)
+            if cur is None:
+                self.values[lv] = list(row)
+            else:
+                for i, n in enumerate(row):
+                    cur[i] += n
+
+    def to_json(self):
+        out = []
+        for lv, row in sorted(self.values.items()):
+            out.append({
+                "labels": dict(zip(self.labels, lv)),
+                "buckets": {_fmt(le): n for le, n in zip(self.buckets + (float("inf"),), row)},
+                "sum": row[-2],
+                "count": row[-1],
+            })
+        return out
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """メトリクスの入れ物。Prometheus のテキスト形式と JSON で書き出せる。"""
+
+    def __init__(self, prefix: str = "texnaming"):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(f"{self.prefix}_{name}_total", help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(f"{self.prefix}_{name}", help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(f"{self.prefix}_{name}", help, labels, buckets))
+
+    def __getitem__(self, name: str) -> Metric:
+        """名前で引く（接頭辞と、カウンタの _total は省略可）。"""
+        full = name if name.startswith(self.prefix + "_") else f"{self.prefix}_{name}"
+        return self._metrics.get(full) or self._metrics[full + "_total"]
+
+    def merge(self, other: "MetricsRegistry") -> None:
+        """other の値を足し込む（カウンタとヒストグラムは加算、ゲージは other の値で置き換え）。"""
+        for name, metric in other._metrics.items():
+            mine = self._metrics.get(name)
+            if mine is None:
+                mine = self._add(metric.empty_copy())
+            elif type(mine) is not type(metric):
+                raise ValueError(f"metric type mismatch: {name}")
+            mine.merge(metric)
+
+    # ---------- 出力 ----------
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics.values():
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            label_names = m.labels + (("le",) if m.kind == "histogram" else ())
+            for sample_name, lv, value in m.samples():
+                names = label_names if len(lv) == len(label_names) else m.labels
+                labels = ",".join(f'{k}="{_escape(str(v))}"' for k, v in zip(names, lv))
+                lines.append(f"{sample_name}{{{labels}}} {_fmt(value)}" if labels else f"{sample_name} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, Dict]:
+        return {m.name: {"type": m.kind, "help": m.help, "samples": m.to_json()} for m in self._metrics.values()}
+
+    def write(self, out_dir: Union[str, Path], batch_id: str, *,
+              cumulative: Optional["MetricsRegistry"] = None) -> List[Path]:
+        """
+        {out_dir}/tex_naming.prom（node_exporter の textfile collector 用、毎バッチ置き換え）と
+        {out_dir}/{batch_id}.metrics.json を書き出す。どちらも一時ファイル経由で置き換える。
+        JSON はこのバッチの値。.prom は cumulative（プロセス全体の累計、process_registry()）があればそちらを書く。
+        カウンタがバッチごとに 0 に戻ると Prometheus の rate() が壊れるため。
+        """
+        d = Path(out_dir)
+        d.mkdir(parents=True, exist_ok=True)
+        written = []
+        prom = (cumulative if cumulative is not None else self).to_prometheus()
+        for path, text in ((d / "tex_naming.prom", prom),
+                           (d / f"{batch_id}.metrics.json",
+                            json.dumps({"batch_id": batch_id, "metrics": self.to_json()}, ensure_ascii=False, indent=2))):
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+            written.append(path)
+        return written
+
+
+class PipelineMetrics:
+    """
+    パイプラインが更新するメトリクス一式。
+    よく使うメトリクスは属性に保持し、テクスチャ 1 件あたりの更新は dict 参照と加算数回で済ませる。
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        r = self.registry = registry or MetricsRegistry()
+        self.textures = r.counter("textures", "Processed textures by result", ("result",))
+        self.stage_seconds = r.histogram("stage_seconds", "Per-texture latency by pipeline stage", ("stage",))
+        self.combination_hits = r.counter("suffix_combination_hits", "Textures per suffix combination", ("combination",))
+        self.skipped = r.counter("skipped", "Skipped textures by reason", ("reason",))
+        self.apply_errors = r.counter("apply_errors", "Apply errors by property group", ("group",))
+        self.batch_seconds = r.gauge("batch_duration_seconds", "Wall time of the last batch")
+        self.throughput = r.gauge("textures_per_second", "Throughput of the last batch")
+        self._batch_start: Optional[float] = None
+        self._batch_count = 0
+
+    def begin_batch(self) -> None:
+        self._batch_start = time.perf_counter()
+        self._batch_count = 0
+
+    def end_batch(self) -> None:
+        if self._batch_start is None:
+            return
+        elapsed = time.perf_counter() - self._batch_start
+        self.batch_seconds.set(elapsed)
+        self.throughput.set(self._batch_count / elapsed if elapsed > 0 else 0.0)
+        self._batch_start = None
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.stage_seconds.observe(seconds, stage)
+
+    def observe_texture(self, keys_by_row: Optional[Sequence[Optional[str]]], report: Mapping) -> None:
+        """1 テクスチャ分の結果（_apply_resolved の戻り値）を反映する。"""
+        self._batch_count += 1
+        if keys_by_row is not None:
+            self.combination_hits.inc("_".join(k or "-" for k in keys_by_row))
+        skipped = report.get("skipped")
+        if skipped:
+            self.skipped.inc(str(skipped))
+            self.textures.inc("skipped")
+            return
+        if report.get("ok"):
+            self.textures.inc("ok")
+            return
+        self.textures.inc("error")
+        for err in report.get("errors", ()):
+            group, sep, _ = str(err).partition(":")
+            self.apply_errors.inc(group if sep else "other")
+
+
+# プロセス（エディタの起動）全体の累計。.prom はこれを書き出す
+_process_registry: Optional[MetricsRegistry] = None
+
+
+def process_registry() -> MetricsRegistry:
+    """バッチをまたいで累計するレジストリ（バッチごとの PipelineMetrics を end_batch 後に merge する）。"""
+    global _process_registry
+    if _process_registry is None:
+        _process_registry = MetricsRegistry()
+    return _process_registry
+
+
+def metrics_dir_from_env(environ: Mapping[str, str] = os.environ) -> Optional[Path]:
+    v = environ.get(ENV_METRICS_DIR)
+    return Path(v) if v else None
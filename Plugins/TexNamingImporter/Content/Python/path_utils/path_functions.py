@@ -1,5 +1,5 @@
 import os
-from typing import List, Sequence
+from typing import AbstractSet, Iterable, Iterator, List, Sequence, Tuple
 
 def collect_suffixes_from_path(src_path: str, suffix_array: Sequence[str]) -> List[str]:
     """
@@ -45,3 +45,34 @@ def collect_suffixes_from_path(src_path: str, suffix_array: Sequence[str]) -> Li
 
     return list(reversed(collected_rev))
 
+
+
+def build_suffix_token_index(suffix_array: Iterable[str]) -> frozenset:
+    """
+    collect_suffixes_from_paths 用のトークン索引を作る。
+    バッチ全体で 1 度だけ作って使い回す（大小の扱いは collect_suffixes_from_path と同じく厳密一致）。
+    """
+    return frozenset(suffix_array)
+
+
+def collect_suffixes_from_paths(src_paths: Iterable[str],
+                                token_index: AbstractSet[str]) -> Iterator[Tuple[str, List[str]]]:
+    """
+    collect_suffixes_from_path のバッチ版。(path, suffixes) を 1 件ずつ遅延で返す。
+
+    - token_index は build_suffix_token_index で事前に作った集合を渡す（呼び出しごとの set 構築なし）
+    - 右端から連続する範囲の開始位置だけを求めてスライスするので、中間リストの反転もしない
+    - 結果は collect_suffixes_from_path(path, token_index) と同一
+    """
+    basename = os.path.basename
+    splitext = os.path.splitext
+    for src_path in src_paths:
+        if not token_index:
+            yield src_path, []
+            continue
+        stem = splitext(basename(src_path))[0]
+        tokens = [t for t in stem.split('_') if t]
+        start = len(tokens)
+        while start and tokens[start - 1] in token_index:
+            start -= 1
+        yield src_path, tokens[start:]
@@ -0,0 +1,52 @@
+import gzip
+import io
+import mmap
+import os
+from typing import BinaryIO, Iterable, Iterator, TextIO, Union
+
+PathSource = Union[str, os.PathLike]
+
+
+def _clean(line: str) -> str:
+    return line.strip().lstrip("\ufeff")
+
+
+def iter_paths_from_stream(stream: Union[TextIO, BinaryIO]) -> Iterator[str]:
+    """
+    改行区切りのパス列をストリームから 1 行ずつ返す（空行・'#' 始まりの行は無視）。
+    テキスト/バイナリどちらのストリームでもよい（バイナリは UTF-8 として読む）。
+    """
+    for raw in stream:
+        line = _clean(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+        if line and not line.startswith("#"):
+            yield line
+
+
+def iter_paths_from_file(file_path: PathSource) -> Iterator[str]:
+    """
+    改行区切りのパスリストファイルを、全体を読み込まずに 1 行ずつ返す。
+    - '.gz' は gzip ストリームとして逐次展開
+    - それ以外は mmap して 1 行ずつ切り出す（ページキャッシュ任せでメモリは一定）
+    """
+    p = os.fspath(file_path)
+    if p.endswith(".gz"):
+        with gzip.open(p, "rb") as f:
+            yield from iter_paths_from_stream(io.BufferedReader(f))
+        return
+
+    with open(p, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter_paths_from_stream(iter(mm.readline, b""))
+
+
+def iter_paths(source: Union[PathSource, Iterable[str]]) -> Iterator[str]:
+    """
+    パスの入力元を正規化する。
+    - str / PathLike はパスリストファイルとして扱う
+    - それ以外の Iterable[str] はそのまま（遅延のまま）流す
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return iter_paths_from_file(source)
+    return iter(source)
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from image_header import ImageHeaderError
+from texture_classifier import _np, sample_grid
+
+HASH_BITS = 64
+# dHash の距離がこれ以下なら「ほぼ同じ画像」とみなす（64bit 中）
+DEFAULT_MAX_DISTANCE = 6
+# 縮小展開に使う画素数（dHash は 9x8 に縮めるので少なくてよい）
+HASH_SAMPLES = 4096
+# 9x8 に縮めた輝度の最大と最小の差（0..1）がこれ未満なら単色とみなす。
+# dHash は隣り合う画素の大小しか見ないので、単色の画像は色に関係なくすべて 0 になる
+FLAT_SPREAD = 4 / 255
+
+_MAGIC = b"TNPH"
+_VERSION = 1
+
+
+# ---------- ハッシュ ----------
+def _block_mean(a, rows: int, cols: int):
+    """2 次元配列を rows x cols のブロック平均に縮める（小さい画像は最近傍で拡大）。"""
+    h, w = a.shape
+    if h < rows or w < cols:
+        a = a[_np.linspace(0, h - 1, max(h, rows)).astype(int)][:, _np.linspace(0, w - 1, max(w, cols)).astype(int)]
+        h, w = a.shape
+    r_idx = (_np.arange(rows) * h) // rows
+    c_idx = (_np.arange(cols) * w) // cols
+    sums = _np.add.reduceat(_np.add.reduceat(a, r_idx, axis=0), c_idx, axis=1)
+    counts = _np.outer(_np.diff(_np.append(r_idx, h)), _np.diff(_np.append(c_idx, w)))
+    return sums / counts
+
+
+def _luma_blocks(grid):
+    """(H, W, C) または (H, W) の画素の輝度を 8x9 のブロック平均に縮める。"""
+    if _np is None:
+        raise RuntimeError("phash_index には NumPy が必要です")
+    g = _np.asarray(grid, dtype=_np.float32)
+    if g.ndim == 3:
+        g = g[..., :3].mean(axis=2) if g.shape[2] >= 3 else g[..., 0]
+    return _block_mean(g, 8, 9)
+
+
+def is_flat(grid, spread: float = FLAT_SPREAD) -> bool:
+    """ほぼ単色の画像か（dHash が形を表さず、どの単色どうしでも一致してしまう）。grid は 0..1。"""
+    small = _luma_blocks(grid)
+    return float(small.max() - small.min()) < spread
+
+
+def dhash_grid(grid) -> int:
+    """
+    (H, W, C) または (H, W) の画素から 64bit の dHash を作る。
+    輝度を 9x8 に縮め、横に隣り合う画素の大小を 1bit ずつ並べる（明るさ・縮尺・軽い圧縮の違いに強い）。
+    """
+    small = _luma_blocks(grid)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(_np.packbits(bits).tobytes(), "big")
+
+
+def dhash_file(file_path: Union[str, Path], *, max_samples: int = HASH_SAMPLES) -> Optional[int]:
+    """
+    ソース画像の dHash。展開できない形式（Pillow が無い PNG など）や NumPy が無い場合は None。
+    ほぼ単色の画像（T_White / T_Black / 平らな法線など）も None（索引に載せない）。
+    """
+    try:
+        grid = sample_grid(file_path, max_samples=max_samples)
+    except (OSError, ImageHeaderError, ValueError) as e:
+        print(f"[PHashIndex] failed to hash {file_path}: {e}", file=sys.stderr)
+        return None
+    if grid is None or is_flat(grid):
+        return None
+    return dhash_grid(grid)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+# ---------- 多重インデックスハッシュ ----------
+def _neighbors(value: int, bits: int, radius: int) -> Iterator[int]:
+    """value から Hamming 距離 radius 以内の bits ビット値をすべて列挙する。"""
+    yield value
+    for r in range(1, radius + 1):
+        for positions in combinations(range(bits), r):
+            v = value
+            for p in positions:
+                v ^= 1 << p
+            yield v
+
+
+class PerceptualHashIndex:
+    """
+    キー（アセットパスなど）→ 64bit 知覚ハッシュ の索引。Hamming 距離での近傍検索を多重インデックスハッシュで行う。
+
+    - 64bit を bands 本の部分列に分け、部分列ごとに 値 → 要素番号 の表を持つ
+    - 距離 r 以内の要素は、少なくとも 1 本の部分列で距離 floor(r / bands) 以内になる（鳩の巣原理）ので、
+      各部分列でその半径の近傍だけを引いて候補とし、全体の距離で確かめる
+    - 16bit x 4 本なら、10 万件・距離 7 以内の検索は 1 件あたり数百回の dict 参照で済む
+    置き換え・削除した要素の枠は残るが、save → load で詰まる。
+    """
+
+    def __init__(self, *, bands: int = 4):
+        if HASH_BITS % bands:
+            raise ValueError(f"bands must divide {HASH_BITS}")
+        self.bands = bands
+        self.band_bits = HASH_BITS // bands
+        self._mask = (1 << self.band_bits) - 1
+        self._keys: List[Optional[str]] = []     # 削除済みは None
+        self._hashes = array("Q")
+        self._slot: Dict[str, int] = {}
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot
+
+    def get(self, key: str) -> Optional[int]:
+        i = self._slot.get(key)
+        return None if i is None else self._hashes[i]
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        for key, i in self._slot.items():
+            yield key, self._hashes[i]
+
+    def _parts(self, h: int) -> Iterator[Tuple[int, int]]:
+        for b in range(self.bands):
+            yield b, (h >> (b * self.band_bits)) & self._mask
+
+    # ---------- 更新 ----------
+    def add(self, key: str, h: int) -> None:
+        """追加する。同じキーがあればハッシュを置き換える（再インポート）。"""
+        old = self._slot.get(key)
+        if old is not None:
+            if self._hashes[old] == h:
+                return
+            self.remove(key)
+        i = len(self._keys)
+        self._keys.append(key)
+        self._hashes.append(h)
+        self._slot[key] = i
+        for b, part in self._parts(h):
+            self._tables[b].setdefault(part, []).append(i)
+
+    def remove(self, key: str) -> bool:
+        i = self._slot.pop(key, None)
+        if i is None:
+            return False
+        for b, part in self._parts(self._hashes[i]):
+            bucket = self._tables[b][part]
+            bucket.remove(i)
+            if not bucket:
+                del self._tables[b][part]
+        self._keys[i] = None
+        return True
+
+    # ---------- 検索 ----------
+    def find(self, h: int, max_distance: int = DEFAULT_MAX_DISTANCE, *,
+             exclude: Optional[str] = None) -> List[Tuple[str, int]]:
+        """h から max_distance 以内の (キー, 距離) を距離の近い順に返す。"""
+        radius = max_distance // self.bands
+        seen = set()
+        out = []
+        hashes, keys = self._hashes, self._keys
+        for b, part in self._parts(h):
+            table = self._tables[b]
+            for v in _neighbors(part, self.band_bits, radius):
+                bucket = table.get(v)
+                if not bucket:
+                    continue
+                for i in bucket:
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    d = bin(hashes[i] ^ h).count("1")
+                    if d <= max_distance and keys[i] != exclude:
+                        out.append((keys[i], d))
+        out.sort(key=lambda kv: (kv[1], kv[0]))
+        return out
+
+    def duplicate_groups(self, max_distance: int = DEFAULT_MAX_DISTANCE) -> List[List[str]]:
+        """一括監査用: 距離 max_distance 以内でつながる要素をまとめたグループ（2 件以上のもの）を返す。"""
+        parent: Dict[str, str] = {}
+
+        def root(k: str) -> str:
+            parent.setdefault(k, k)
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        for key, h in self.items():
+            for other, _d in self.find(h, max_distance, exclude=key):
+                a, b = root(key), root(other)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+        groups: Dict[str, List[str]] = {}
+        for key in list(parent):
+            groups.setdefault(root(key), []).append(key)
+        return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: g[0])
+
+    # ---------- 保存 ----------
+    def save(self, file_path: Union[str, Path]) -> None:
+        """「マジック・版・件数・ハッシュ配列・改行区切りのキー」のバイナリで、一時ファイル経由で置き換える。"""
+        keys = list(self._slot)
+        hashes = array("Q", (self._hashes[self._slot[k]] for k in keys))
+        p = Path(file_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(struct.pack("<4sII", _MAGIC, _VERSION, len(keys)))
+            if sys.byteorder != "little":
+                hashes.byteswap()
+            f.write(hashes.tobytes())
+            f.write("\n".join(keys).encode("utf-8"))
+        os.replace(tmp, p)
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path], *, bands: int = 4) -> "PerceptualHashIndex":
+        with open(file_path, "rb") as f:
+            data = f.read()
+        magic, version, count = struct.unpack_from("<4sII", data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"not a perceptual hash index: {file_path}")
+        offset = 12 + 8 * count
+        hashes = array("Q")
+        hashes.frombytes(data[12:offset])
+        if sys.byteorder != "little":
+            hashes.byteswap()
+        keys = data[offset:].decode("utf-8").split("\n") if count else []
+        if len(keys) != count:
+            raise ValueError(f"corrupted perceptual hash index: {file_path}")
+        index = cls(bands=bands)
+        for key, h in zip(keys, hashes):
+            index.add(key, h)
+        return index
+
+    @classmethod
+    def load_or_new(cls, file_path: Union[str, Path], *, bands: int = 4) -> "PerceptualHashIndex":
+        return cls.load(file_path, bands=bands) if Path(file_path).is_file() else cls(bands=bands)
+
+
+# ---------- インポート時の確認 ----------
+def check_and_add(index: PerceptualHashIndex, key: str, source_file: Optional[str], *,
+                  max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Tuple[str, int]]:
+    """
+    ソース画像のハッシュで既存のテクスチャと照合し、近いもの（自分自身は除く）を返してから索引に登録する。
+    ハッシュが作れない（単色を含む）場合は照合せず、同じキーの以前のハッシュを索引から外す。
+    """
+    if source_file is None:
+        return []
+    h = dhash_file(source_file)
+    if h is None:
+        index.remove(key)
+        return []
+    found = index.find(h, max_distance, exclude=key)
+    index.add(key, h)
+    return found
+
+
+# ---------- CLI ----------
+def build_index(files: Sequence[str], index: PerceptualHashIndex, *, workers: int = 8) -> int:
+    """ファイルのハッシュをスレッドプールで計算して索引に登録し、登録件数を返す。"""
+    added = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TexNamingPHash") as pool:
+        for path, h in zip(files, pool.map(dhash_file, files)):
+            if h is not None:
+                index.add(path, h)
+                added += 1
+    return added
+
+
+def write_groups_csv(groups: List[List[str]], index: PerceptualHashIndex, file_path: Union[str, Path]) -> None:
+    p = Path(file_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["group", "key", "hash", "distance_to_first"])
+        for n, group in enumerate(groups):
+            first = index.get(group[0])
+            for key in group:
+                h = index.get(key)
+                w.writerow([n, key, f"{h:016x}", hamming(first, h)])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="phash_index",
+        description="ソース画像の知覚ハッシュ索引を作り、ほぼ同じ画像のグループを CSV に書き出します。",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="ソースフォルダのハッシュを索引に追加する")
+    b.add_argument("source_dir", help="走査するソースフォルダ")
+    b.add_argument("index_path", help="索引ファイルのパス（既存なら追記）")
+    b.add_argument("--workers", type=int, default=8, help="ハッシュ計算のスレッド数")
+    g = sub.add_parser("groups", help="重複グループを CSV に書き出す")
+    g.add_argument("index_path", help="索引ファイルのパス")
+    g.add_argument("out_csv", help="出力する CSV のパス")
+    g.add_argument("--max-distance", type=int, default=DEFAULT_MAX_DISTANCE, help="同一とみなす Hamming 距離")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.command == "build":
+        from preimport_scan import iter_source_files
+        idx = PerceptualHashIndex.load_or_new(args.index_path)
+        n = build_index(list(iter_source_files(args.source_dir)), idx, workers=args.workers)
+        idx.save(args.index_path)
+        print(f"[PHashIndex] hashed {n} files, {len(idx)} entries -> {args.index_path}")
+    else:
+        idx = PerceptualHashIndex.load(args.index_path)
+        found = idx.duplicate_groups(args.max_distance)
+        write_groups_csv(found, idx, args.out_csv)
+        print(f"[PHashIndex] {len(found)} duplicate groups in {len(idx)} entries -> {args.out_csv}")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from compiled_rules import CompiledRules
+from suffix_grammar import GrammarMatch
+from texture_config import TextureConfigParams
+
+
+@dataclass
+class ResolvedTexture:
+    """命名検証とパラメータ解決を終えた 1 テクスチャ分の結果。"""
+    path: str
+    match: GrammarMatch
+    # 検証 NG の場合は None
+    params: Optional[TextureConfigParams] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.match.ok
+
+
+def iter_resolved(paths: Iterable[str], rules: CompiledRules) -> Iterator[ResolvedTexture]:
+    """
+    パス列を 1 件ずつ 命名検証 → パラメータ解決 して返す（unreal 非依存の段）。
+    入力も出力も遅延評価なので、数百万件でも使用メモリは入力件数に比例しない。
+    """
+    resolve = rules.resolve_path
+    for path in paths:
+        match, params = resolve(path)
+        yield ResolvedTexture(path, match, params)
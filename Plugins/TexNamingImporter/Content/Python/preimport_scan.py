@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules, compile_rules
+from image_header import ImageHeader, ImageHeaderError, effective_max_size, read_image_header, source_warnings
+from texture_classifier import ContentClassification, classify_file
+
+# image_header で寸法を読める拡張子（インポート対象の候補）
+IMAGE_EXTENSIONS: FrozenSet[str] = frozenset({".png", ".tga", ".jpg", ".jpeg", ".psd", ".dds", ".exr"})
+
+# 判定
+ACTION_OK = "ok"
+ACTION_RECONFIGURE = "reconfigure"   # インポートはされるが、設定値がソースに合わせて変わる
+ACTION_REJECT = "reject"             # 命名規則違反、またはヘッダが読めない
+
+CSV_COLUMNS = ("path", "action", "asset_path", "keys", "width", "height", "channels", "bit_depth",
+               "format", "max_in_game", "effective_max", "proposed_type", "error", "warnings")
+
+
+@dataclass
+class ScanEntry:
+    """ソースフォルダ内の 1 ファイル分の事前チェック結果。"""
+    path: str
+    asset_path: str
+    action: str = ACTION_OK
+    keys: Tuple[Optional[str], ...] = ()
+    header: Optional[ImageHeader] = None
+    max_in_game: Optional[int] = None
+    effective_max: Optional[int] = None
+    proposed_type: str = ""  # 命名で弾いたファイルの、内容から推定した texture_type（classify=True のとき）
+    error: str = ""
+    warnings: List[str] = field(default_factory=list)
+
+    def to_row(self) -> Dict[str, object]:
+        h = self.header
+        return {
+            "path": self.path,
+            "action": self.action,
+            "asset_path": self.asset_path,
+            "keys": "_".join(k or "-" for k in self.keys),
+            "width": h.width if h else "",
+            "height": h.height if h else "",
+            "channels": h.channels if h else "",
+            "bit_depth": h.bit_depth if h else "",
+            "format": h.format if h else "",
+            "max_in_game": "" if self.max_in_game is None else self.max_in_game,
+            "effective_max": "" if self.effective_max is None else self.effective_max,
+            "proposed_type": self.proposed_type,
+            "error": self.error,
+            "warnings": "; ".join(self.warnings),
+        }
+
+
+def iter_source_files(root: Union[str, Path], *, recursive: bool = True,
+                      extensions: Iterable[str] = IMAGE_EXTENSIONS) -> Iterator[str]:
+    """
+    root 以下の画像ファイルを os.scandir で 1 件ずつ返す（一覧を溜めないので数万件でも一定メモリ）。
+    DirEntry の種別情報を使うので、ネットワーク共有でもファイルごとの stat は発生しない。
+    読めないディレクトリは警告を出して飛ばす。
+    """
+    exts = frozenset(e.lower() for e in extensions)
+    pending: List[str] = [os.fspath(root)]
+    while pending:
+        current = pending.pop()
+        try:
+            it = os.scandir(current)
+        except OSError as e:
+            print(f"[PreimportScan] cannot read directory {current}: {e}", file=sys.stderr)
+            continue
+        subdirs = []
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            subdirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in exts and entry.is_file():
+                        yield entry.path
+                except OSError:
+                    continue
+        # 名前順に処理したいので逆順に積む
+        pending.extend(sorted(subdirs, reverse=True))
+
+
+def asset_path_for(file_path: str, root: Union[str, Path], asset_root: Optional[str]) -> str:
+    """
+    ソースファイルのパスを、インポート後のアセットパス（/Game/... の形、拡張子なし）に写す。
+    asset_root が無い場合はファイル名だけを返す（ディレクトリ上書きは適用されない）。
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    if not asset_root:
+        return stem
+    rel_dir = os.path.relpath(os.path.dirname(file_path), os.fspath(root))
+    parts = [p for p in Path(rel_dir).parts if p not in (".", "")]
+    return "/".join([asset_root.rstrip("/")] + parts + [stem])
+
+
+def _read_header(file_path: str) -> Tuple[Optional[ImageHeader], str]:
+    try:
+        header = read_image_header(file_path)
+    except (OSError, ImageHeaderError) as e:
+        return None, str(e)
+    except Exception as e:  # 想定外の失敗もその 1 件の reject にとどめる
+        return None, f"{type(e).__name__}: {e}"
+    return header, "" if header is not None else "unsupported image format"
+
+
+def _finish(params, entry: ScanEntry, result: Tuple[Optional[ImageHeader], str]) -> ScanEntry:
+    """ヘッダを読み終えた 1 件の判定を確定させる。"""
+    header, error = result
+    entry.header = header
+    if header is None:
+        entry.action, entry.error = ACTION_REJECT, error
+        return entry
+    entry.warnings = source_warnings(header)
+    if params is not None and params.max_in_game is not None:
+        configured = effective_max_size(int(params.max_in_game), enforce_pow2=params.enforce_pow2)
+        effective = effective_max_size(int(params.max_in_game), header, enforce_pow2=params.enforce_pow2)
+        entry.max_in_game, entry.effective_max = configured, effective
+        if effective != configured:
+            entry.action = ACTION_RECONFIGURE
+    return entry
+
+
+def _propose(entry: ScanEntry, result: Optional[ContentClassification]) -> ScanEntry:
+    if result is not None and result.texture_type:
+        entry.proposed_type = result.texture_type
+        entry.warnings.append(f"content looks like {result.kind.name} ({result.reason})")
+    return entry
+
+
+# 走査窓の 1 要素: (結果, 実行中のタスク, タスク完了後に結果を確定させる関数)
+_Pending = Tuple[ScanEntry, Optional[Future], Optional[Callable[[ScanEntry, object], ScanEntry]]]
+
+
+def scan_source_folder(root: Union[str, Path], rules: CompiledRules, *, asset_root: Optional[str] = None,
+                       recursive: bool = True, workers: int = 16, max_in_flight: Optional[int] = None,
+                       classify: bool = False) -> Iterator[ScanEntry]:
+    """
+    ソースフォルダを走査し、インポートした場合の判定を 1 件ずつ（走査順に）返す。
+    - 命名検証とパラメータ解決はインポート時と同じ CompiledRules.resolve_path（メインスレッド、µs/件）
+    - ヘッダの読み込みはスレッドプールで並列に行う（I/O 待ちが支配的なネットワーク共有向け）
+    - 実行中のヘッダ読み込みは max_in_flight 件まで（既定 workers*4）。入力が何万件でもメモリは一定
+    命名で弾かれるファイルは、インポートされないのでヘッダを読まない。
+    classify=True なら、代わりに内容を解析して texture_type の候補を proposed_type に入れる（NumPy が必要）。
+    """
+    limit = max_in_flight or workers * 4
+    texture_settings = rules.texture_settings
+    window: Deque[_Pending] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TexNamingScan") as pool:
+        for file_path in iter_source_files(root, recursive=recursive):
+            asset_path = asset_path_for(file_path, root, asset_root)
+            match, params = rules.resolve_path(asset_path)
+            entry = ScanEntry(path=file_path, asset_path=asset_path, keys=tuple(match.keys_by_row or ()))
+            if not match.ok:
+                entry.action, entry.error = ACTION_REJECT, match.error or "invalid suffix"
+                if classify:
+                    window.append((entry, pool.submit(classify_file, file_path, texture_settings), _propose))
+                else:
+                    window.append((entry, None, None))
+            else:
+                window.append((entry, pool.submit(_read_header, file_path), partial(_finish, params)))
+            while len(window) > limit or (window and window[0][1] is None):
+                yield _pop(window)
+        while window:
+            yield _pop(window)
+
+
+def _pop(window: Deque[_Pending]) -> ScanEntry:
+    entry, future, finish = window.popleft()
+    if future is None:
+        return entry
+    try:
+        return finish(entry, future.result())
+    except Exception as e:
+        # 1 件の失敗で何万件の走査を止めない。命名で弾いた分はその理由を残す
+        entry.action, entry.error = ACTION_REJECT, entry.error or f"{type(e).__name__}: {e}"
+        return entry
+
+
+def write_scan_csv(entries: Iterable[ScanEntry], file_path: Union[str, Path]) -> Counter:
+    """結果を 1 件ずつ CSV に書き出し、判定ごとの件数を返す。"""
+    counts: Counter = Counter()
+    p = Path(file_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(CSV_COLUMNS))
+        w.writeheader()
+        for entry in entries:
+            w.writerow(entry.to_row())
+            counts[entry.action] += 1
+    return counts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="preimport_scan",
+        description="インポート前のソースフォルダに命名規則とヘッダ検査を適用し、弾かれる/設定が変わるファイルを CSV に書き出します。",
+    )
+    parser.add_argument("source_dir", help="走査するソースフォルダ")
+    parser.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    parser.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    parser.add_argument("out_csv", help="出力する CSV のパス")
+    parser.add_argument("--config", dest="config_path", default=None,
+                        help="Config.json のパス（directory_overrides を反映する場合）")
+    parser.add_argument("--asset-root", default=None,
+                        help="インポート先のアセットパス（例: /Game/Textures）。ディレクトリ上書きの判定に使う")
+    parser.add_argument("--workers", type=int, default=16, help="ヘッダ読み込みのスレッド数")
+    parser.add_argument("--no-recursive", action="store_true", help="サブフォルダを走査しない")
+    parser.add_argument("--classify", action="store_true",
+                        help="命名で弾かれるファイルの内容を解析し、texture_type の候補を出す（NumPy が必要）")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    rules = compile_rules(args.texture_config_path, args.suffix_config_path, args.config_path)
+    entries = scan_source_folder(args.source_dir, rules, asset_root=args.asset_root,
+                                 recursive=not args.no_recursive, workers=args.workers, classify=args.classify)
+    counts = write_scan_csv(entries, args.out_csv)
+    total = sum(counts.values())
+    print(f"[PreimportScan] {total} files: {counts[ACTION_OK]} ok, {counts[ACTION_RECONFIGURE]} reconfigure, "
+          f"{counts[ACTION_REJECT]} reject -> {args.out_csv}")
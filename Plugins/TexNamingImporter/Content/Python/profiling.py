@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional
+
+# 環境変数（CLI 引数が無いときの既定値）
+ENV_PROFILE = "TEXNAMING_PROFILE"                # "cprofile" / "sample"
+ENV_PROFILE_DIR = "TEXNAMING_PROFILE_DIR"        # 出力先ディレクトリ
+ENV_TRACEMALLOC = "TEXNAMING_TRACEMALLOC"        # "1" で tracemalloc を有効化
+ENV_SAMPLE_INTERVAL = "TEXNAMING_SAMPLE_INTERVAL_MS"
+
+PROFILE_MODES = ("cprofile", "sample")
+
+_PYTHON_DIR = str(Path(__file__).resolve().parent)
+
+
+@dataclass
+class ProfileOptions:
+    """
+    バッチ 1 回分のプロファイル設定。
+    - mode         : None（無効）/ "cprofile"（決定的・高精度）/ "sample"（低オーバーヘッドのサンプリング）
+    - tracemalloc  : バッチ前後のスナップショットを比較し、確保の多い行を出力する
+    """
+    mode: Optional[str] = None
+    out_dir: Path = field(default_factory=lambda: Path(tempfile.gettempdir()) / "tex_naming_profiles")
+    tracemalloc: bool = False
+    sample_interval: float = 0.005  # 秒
+    top: int = 25
+
+    def __post_init__(self):
+        if self.mode is not None and self.mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode: {self.mode!r} (expected one of {PROFILE_MODES})")
+        self.out_dir = Path(self.out_dir)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None or self.tracemalloc
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "ProfileOptions":
+        mode = (environ.get(ENV_PROFILE) or "").strip().lower() or None
+        opts = cls(mode=mode, tracemalloc=environ.get(ENV_TRACEMALLOC, "").strip() in ("1", "true", "yes"))
+        if environ.get(ENV_PROFILE_DIR):
+            opts.out_dir = Path(environ[ENV_PROFILE_DIR])
+        if environ.get(ENV_SAMPLE_INTERVAL):
+            opts.sample_interval = float(environ[ENV_SAMPLE_INTERVAL]) / 1000.0
+        return opts
+
+
+@dataclass
+class ProfileResult:
+    batch_id: str
+    files: List[Path] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+# プロセス内の通し番号。C++ 側はインポートごとにエディタのプロセス内でスクリプトを実行するため、
+# 時刻（秒）と pid だけでは同じ秒のバッチ同士が同じ ID になり、出力を上書きしてしまう
+_batch_seq = itertools.count(1)
+
+
+def new_batch_id() -> str:
+    """時刻（µs）+ pid + プロセス内の通し番号。モジュールを読み直しても µs で区別できる。"""
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+    return f"{stamp}-{int(now % 1 * 1e6):06d}-{os.getpid()}-{next(_batch_seq)}"
+
+
+# ---------- サンプリングプロファイラ ----------
+class StackSampler:
+    """
+    対象スレッドのスタックを一定間隔で採取し、collapsed 形式（"a;b;c 回数"）で集計する。
+    採取は別スレッドから sys._current_frames() を読むだけなので、対象側のオーバーヘッドはほぼ GIL 待ちのみ。
+    """
+
+    def __init__(self, *, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TexNamingSampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            parts = []
+            while frame is not None:
+                code = frame.f_code
+                parts.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(parts))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, file_path: Path) -> None:
+        with open(file_path, "w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+# ---------- tracemalloc ----------
+def _tracemalloc_report(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int) -> str:
+    """バッチ中に増えた確保を行単位で集計する（このプラグインの Python ファイルに限定）。"""
+    filters = [tracemalloc.Filter(True, os.path.join(_PYTHON_DIR, "*"))]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    out = io.StringIO()
+    total = sum(s.size_diff for s in stats)
+    out.write(f"# allocation growth in {_PYTHON_DIR}: {total / 1024:.1f} KiB\n")
+    for s in stats[:top]:
+        frame = s.traceback[0]
+        rel = os.path.relpath(frame.filename, _PYTHON_DIR)
+        out.write(f"{s.size_diff / 1024:10.1f} KiB {s.count_diff:+8d} blocks  {rel}:{frame.lineno}\n")
+    return out.getvalue()
+
+
+@contextmanager
+def profile_batch(options: Optional[ProfileOptions] = None, *, batch_id: Optional[str] = None) -> Iterator[ProfileResult]:
+    """
+    with の中をプロファイルし、out_dir に batch_id で始まるファイルを書き出す。
+      {batch_id}.pstats / {batch_id}.txt   : cProfile（snakeviz や pstats で読む）
+      {batch_id}.collapsed                 : サンプリング（flamegraph.pl / speedscope で読む）
+      {batch_id}.tracemalloc.txt           : 確保の多い行
+    options が無効（mode=None かつ tracemalloc=False）なら何もしない。
+    """
+    opts = options if options is not None else ProfileOptions.from_env()
+    result = ProfileResult(batch_id=batch_id or new_batch_id())
+    if not opts.enabled:
+        yield result
+        return
+
+    opts.out_dir.mkdir(parents=True, exist_ok=True)
+    base = opts.out_dir / result.batch_id
+
+    started_tracemalloc = False
+    before = None
+    if opts.tracemalloc:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracemalloc = True
+        before = tracemalloc.take_snapshot()
+
+    profiler = cProfile.Profile() if opts.mode == "cprofile" else None
+    sampler = StackSampler(interval=opts.sample_interval).start() if opts.mode == "sample" else None
+    t0 = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield result
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        result.elapsed = time.perf_counter() - t0
+
+        if profiler is not None:
+            pstats_path = base.with_suffix(".pstats")
+            profiler.dump_stats(str(pstats_path))
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(opts.top)
+            txt_path = base.with_suffix(".txt")
+            txt_path.write_text(text.getvalue(), encoding="utf-8")
+            result.files += [pstats_path, txt_path]
+        if sampler is not None:
+            collapsed_path = base.with_suffix(".collapsed")
+            sampler.write_collapsed(collapsed_path)
+            result.files.append(collapsed_path)
+        if before is not None:
+            after = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            tm_path = Path(f"{base}.tracemalloc.txt")
+            tm_path.write_text(_tracemalloc_report(before, after, opts.top), encoding="utf-8")
+            result.files.append(tm_path)
+
+        print(f"[Profile] batch {result.batch_id}: {result.elapsed:.3f}s -> "
+              + ", ".join(str(p) for p in result.files))
+
+
+def summarize_collapsed(file_path: Path, *, top: int = 10) -> Dict[str, int]:
+    """collapsed 出力から、末端（自身で時間を使っている）関数ごとのサンプル数を集計する。"""
+    leaf: Counter = Counter()
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, n = line.rstrip("\n").rpartition(" ")
+            if stack:
+                leaf[stack.rsplit(";", 1)[-1]] += int(n)
+    return dict(leaf.most_common(top))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Union
+
+# 1 レコードの結果
+STATUS_OK = "ok"
+STATUS_UNCHANGED = "unchanged"   # 指紋が一致して読み飛ばした（= 適用済み）
+STATUS_SUFFIX = "suffix"         # 命名エラーで読み飛ばした
+STATUS_ERROR = "error"
+
+# 再開時に「完了済み」とみなす結果（命名エラーとエラーはやり直す）
+DONE_STATUSES = frozenset({STATUS_OK, STATUS_UNCHANGED})
+
+# fsync の間隔（どちらかに達したら同期する）。flush はレコードごとに行う
+DEFAULT_SYNC_EVERY = 256
+DEFAULT_SYNC_INTERVAL = 2.0
+
+
+def status_of(report: Mapping) -> str:
+    """_apply_resolved の戻り値をジャーナルの結果に分類する。"""
+    skipped = report.get("skipped")
+    if skipped == "unchanged":
+        return STATUS_UNCHANGED
+    if skipped == "suffix":
+        return STATUS_SUFFIX
+    return STATUS_OK if report.get("ok") else STATUS_ERROR
+
+
+def _drop_torn_tail(path: Path) -> int:
+    """末尾が改行で終わっていなければ（書き込み途中で落ちた）、最後の改行の直後まで切り詰める。切った長さを返す。"""
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return 0
+        # 最後の改行を後ろから探す
+        pos = size
+        while pos > 0:
+            step = min(65536, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            i = chunk.rfind(b"\n")
+            if i >= 0:
+                keep = pos - step + i + 1
+                break
+            pos -= step
+        else:
+            keep = 0
+        f.truncate(keep)
+        return size - keep
+
+
+class ProgressJournal:
+    """
+    テクスチャ 1 件ごとの結果を追記する JSONL ジャーナル（1 行 1 レコード）。
+
+    - レコードは書くたびに flush する（エディタが落ちても OS のバッファには残る）
+    - fsync は sync_every 件ごと、または sync_interval 秒ごとにまとめて行う（電源断でも失うのは最後の数百件まで）
+    - 追記モードで開くときは、書きかけの最終行を切り詰めてから続きを書く
+    失ったレコードの分は再開時にもう一度適用されるだけ（適用は指紋で冪等）。
+    """
+
+    def __init__(self, file_path: Union[str, Path], *, append: bool = False,
+                 sync_every: int = DEFAULT_SYNC_EVERY, sync_interval: float = DEFAULT_SYNC_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        if sync_every < 1:
+            raise ValueError("sync_every は 1 以上を指定してください")
+        self.path = Path(file_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if append and self.path.exists():
+            dropped = _drop_torn_tail(self.path)
+            if dropped:
+                print(f"[ProgressJournal] dropped a torn record ({dropped} bytes) at the end of {self.path}")
+        self._f = open(self.path, "ab" if append else "wb")
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._unsynced = 0
+        self._last_sync = clock()
+        self.records = 0
+
+    def record(self, path: str, status: str, config: str = "") -> None:
+        """1 件分の結果を書く。config はその時点のパラメータの指紋（再開時の照合に使う）。"""
+        line = json.dumps({"path": path, "status": status, "config": config, "time": round(time.time(), 3)},
+                          ensure_ascii=False, separators=(",", ":"))
+        self._f.write(line.encode("utf-8") + b"\n")
+        self._f.flush()
+        self.records += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or self._clock() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._f.fileno())
+            self._unsynced = 0
+        self._last_sync = self._clock()
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self.sync()
+        self._f.close()
+
+    def __enter__(self) -> "ProgressJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class JournalState:
+    """ジャーナルを読み直した結果。"""
+    completed: Dict[str, str] = field(default_factory=dict)   # パス → 完了時のパラメータの指紋
+    counts: Counter = field(default_factory=Counter)           # 結果ごとの件数（同じパスは最後のレコードで数える）
+    corrupt: int = 0                                           # 読めなかった行（途中の破損と末尾の書きかけ）
+
+    def is_done(self, path: str, config: str) -> bool:
+        """前回、同じパラメータで適用し終えているか。"""
+        done = self.completed.get(path)
+        return done is not None and done == config
+
+
+def read_journal(file_path: Union[str, Path]) -> JournalState:
+    """
+    ジャーナルを先頭から読み、パスごとの最後の結果をまとめる。ファイルが無ければ空の状態を返す。
+    書きかけの最終行や壊れた行は数えて読み飛ばす。
+    """
+    state = JournalState()
+    last: Dict[str, str] = {}
+    try:
+        f = open(file_path, "rb")
+    except FileNotFoundError:
+        return state
+    with f:
+        for raw in f:
+            try:
+                rec = json.loads(raw)
+                path, status = rec["path"], rec["status"]
+            except (ValueError, KeyError, TypeError):
+                state.corrupt += 1
+                continue
+            last[path] = status
+            if status in DONE_STATUSES:
+                state.completed[path] = rec.get("config", "")
+            else:
+                state.completed.pop(path, None)
+    state.counts.update(last.values())
+    if state.corrupt:
+        print(f"[ProgressJournal] skipped {state.corrupt} unreadable record(s) in {file_path}", file=sys.stderr)
+    return state
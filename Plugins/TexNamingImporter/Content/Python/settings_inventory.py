@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import csv
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules
+from image_header import ImageHeader, effective_max_size
+from texture_config import TextureConfigParams
+from type_define import AddressMode, CompressionKind, MipGenKind, SRGBMode, TextureGroupKind
+
+# AssetRegistry のタグ名（= C++ のプロパティ名）→ 比較に使う項目名
+TAG_FIELDS: Dict[str, str] = {
+    "CompressionSettings": "compression",
+    "SRGB": "srgb",
+    "LODGroup": "texture_group",
+    "MipGenSettings": "mip_gen",
+    "MaxTextureSize": "max_in_game",
+    "AddressX": "address_u",
+    "AddressY": "address_v",
+    "AddressZ": "address_z",
+}
+FIELD_TAGS: Dict[str, str] = {v: k for k, v in TAG_FIELDS.items()}
+# Texture2D の寸法（"2048x1024"）。max_in_game の期待値をソースの寸法で頭打ちにするのに使う
+TAG_DIMENSIONS = "Dimensions"
+
+# 値の出所
+FROM_TAG = "tag"
+FROM_LOAD = "load"
+UNKNOWN = "unknown"   # タグが無く、読み込みもしなかった
+
+CSV_COLUMNS = ("path", "field", "expected", "actual", "source")
+
+# タグ値（"TC_Normalmap" / "TEXTUREGROUP_World" / "TA_Clamp" など）の接頭辞
+_ENUM_PREFIX = re.compile(r"^(TC|TA|TMGS|TEXTUREGROUP)_", re.IGNORECASE)
+_ENUM_FIELDS: Dict[str, Type[Enum]] = {
+    "compression": CompressionKind,
+    "texture_group": TextureGroupKind,
+    "mip_gen": MipGenKind,
+    "address_u": AddressMode,
+    "address_v": AddressMode,
+    "address_z": AddressMode,
+}
+# 自動 sRGB で OFF になる圧縮設定（TextureConfigurator の AUTO と同じ規則）
+_LINEAR_COMPRESSION = frozenset({
+    CompressionKind.NORMAL_MAP, CompressionKind.MASKS, CompressionKind.GRAYSCALE,
+    CompressionKind.HDR, CompressionKind.ALPHA, CompressionKind.DISTANCE_FIELD_FONT,
+})
+
+
+def _canonical(name: str) -> str:
+    return _ENUM_PREFIX.sub("", name.strip()).replace("_", "").upper()
+
+
+_ENUM_LOOKUP: Dict[Type[Enum], Dict[str, Enum]] = {
+    enum: {_canonical(m.name): m for m in enum} for enum in set(_ENUM_FIELDS.values())
+}
+
+
+def parse_tag_value(field_name: str, value: str):
+    """
+    タグ値（またはエディタプロパティの enum 名）を比較用の値にする。
+    enum は接頭辞・大小・'_' の違いを吸収する（"TC_Normalmap" と "TC_NORMALMAP" は同じ）。
+    """
+    if field_name == "srgb":
+        v = value.strip().lower()
+        if v not in ("true", "false", "1", "0"):
+            raise ValueError(f"invalid SRGB tag: {value!r}")
+        return v in ("true", "1")
+    if field_name == "max_in_game":
+        return int(value)
+    enum = _ENUM_FIELDS[field_name]
+    try:
+        return _ENUM_LOOKUP[enum][_canonical(value)]
+    except KeyError:
+        raise ValueError(f"unknown {enum.__name__} value: {value!r}") from None
+
+
+def parse_dimensions(value: Optional[str]) -> Optional[ImageHeader]:
+    """Dimensions タグ（"2048x1024"）を寸法だけの ImageHeader にする。読めなければ None。"""
+    if not value:
+        return None
+    try:
+        w, h = (int(v) for v in value.lower().split("x")[:2])
+    except ValueError:
+        return None
+    if w <= 0 or h <= 0:
+        return None
+    return ImageHeader("", w, h, 0, 0)
+
+
+def expected_settings(params: TextureConfigParams, source: Optional[ImageHeader] = None) -> Dict[str, object]:
+    """
+    resolve 済みパラメータから、適用後にあるべき値を項目ごとに求める（指定の無い項目は含めない）。
+    source（寸法）があれば、max_in_game は TextureConfigurator と同じくその寸法で頭打ちにする。
+    """
+    out: Dict[str, object] = {}
+    if params.compression is not None:
+        out["compression"] = params.compression
+    if params.srgb is not None:
+        if params.srgb is SRGBMode.AUTO:
+            if params.compression is not None:
+                out["srgb"] = params.compression not in _LINEAR_COMPRESSION
+        else:
+            out["srgb"] = params.srgb is SRGBMode.ON
+    if params.texture_group is not None:
+        out["texture_group"] = params.texture_group
+    if params.mip_gen is not None:
+        out["mip_gen"] = params.mip_gen
+    if params.max_in_game is not None:
+        out["max_in_game"] = effective_max_size(int(params.max_in_game), source, enforce_pow2=params.enforce_pow2)
+    if params.address_u is not None and params.address_v is not None:
+        out["address_u"], out["address_v"] = params.address_u, params.address_v
+        if params.address_z is not None:
+            out["address_z"] = params.address_z
+    return out
+
+
+def _fmt(v) -> str:
+    if isinstance(v, Enum):
+        return v.name
+    return str(v)
+
+
+@dataclass(frozen=True)
+class Drift:
+    field: str
+    expected: object
+    actual: object
+    source: str   # FROM_TAG / FROM_LOAD / UNKNOWN
+
+
+@dataclass
+class InventoryRow:
+    """1 テクスチャ分の棚卸し結果。"""
+    path: str
+    ok: bool                           # 命名が規則に合っているか（合わないものは比較しない）
+    drifts: List[Drift] = field(default_factory=list)
+    loaded: bool = False               # タグが足りずにアセットを読み込んだか
+    error: str = ""
+
+    @property
+    def drifted(self) -> bool:
+        return any(d.source != UNKNOWN for d in self.drifts)
+
+
+# (アセットパス, 読みたいタグ名の一覧) → {タグ名: 値の文字列}。タグが無い項目のためにアセットを読み込む
+LoadFn = Callable[[str, Sequence[str]], Mapping[str, str]]
+
+
+def inspect_texture(path: str, tags: Mapping[str, Optional[str]], rules: CompiledRules, *,
+                    load: Optional[LoadFn] = None) -> InventoryRow:
+    """
+    タグ値と resolve 済みパラメータを比べる。必要なタグが無い項目だけ load で補う（load が無ければ UNKNOWN）。
+    Dimensions タグが無いと max_in_game の頭打ちが分からないので、設定値より小さい値は差分にせず UNKNOWN にする。
+    """
+    match, params = rules.resolve_path(path)
+    if not match.ok:
+        return InventoryRow(path, ok=False, error=match.error or "invalid suffix")
+    row = InventoryRow(path, ok=True)
+    dims = parse_dimensions(tags.get(TAG_DIMENSIONS))
+    expected = expected_settings(params, dims)
+
+    observed: Dict[str, Tuple[str, str]] = {}
+    missing = []
+    for name in expected:
+        tag = FIELD_TAGS[name]
+        value = tags.get(tag)
+        if value:
+            observed[name] = (value, FROM_TAG)
+        else:
+            missing.append(tag)
+    if missing and load is not None:
+        row.loaded = True
+        try:
+            loaded = load(path, missing)
+        except Exception as e:
+            row.error = f"load failed: {e}"
+            loaded = {}
+        for tag in missing:
+            if loaded.get(tag):
+                observed[TAG_FIELDS[tag]] = (loaded[tag], FROM_LOAD)
+
+    for name, want in expected.items():
+        hit = observed.get(name)
+        if hit is None:
+            row.drifts.append(Drift(name, want, None, UNKNOWN))
+            continue
+        raw, source = hit
+        try:
+            actual = parse_tag_value(name, raw)
+        except ValueError as e:
+            row.drifts.append(Drift(name, want, raw, source))
+            row.error = row.error or str(e)
+            continue
+        if name == "max_in_game" and dims is None and 0 < actual < want:
+            row.drifts.append(Drift(name, want, actual, UNKNOWN))   # ソースに合わせた頭打ちかもしれない
+        elif actual != want:
+            row.drifts.append(Drift(name, want, actual, source))
+    return row
+
+
+def iter_inventory(assets: Iterable[Tuple[str, Mapping[str, Optional[str]]]], rules: CompiledRules, *,
+                   load: Optional[LoadFn] = None) -> Iterator[InventoryRow]:
+    """(アセットパス, タグ) の列を 1 件ずつ比べて返す（入力・出力とも遅延評価）。"""
+    for path, tags in assets:
+        yield inspect_texture(path, tags, rules, load=load)
+
+
+def write_drift_csv(rows: Iterable[InventoryRow], file_path: Union[str, Path]) -> Counter:
+    """
+    差分のある項目を 1 行ずつ CSV に書き出し、件数を返す。
+    件数のキー: textures / drifted / unknown / bad_name / loaded
+    """
+    counts: Counter = Counter()
+    p = Path(file_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(CSV_COLUMNS)
+        for row in rows:
+            counts["textures"] += 1
+            counts["loaded"] += row.loaded
+            if not row.ok:
+                counts["bad_name"] += 1
+                continue
+            if row.drifted:
+                counts["drifted"] += 1
+            if any(d.source == UNKNOWN for d in row.drifts):
+                counts["unknown"] += 1
+            for d in row.drifts:
+                w.writerow([row.path, d.field, _fmt(d.expected), "" if d.actual is None else _fmt(d.actual), d.source])
+    return counts
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import csv
+import heapq
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from compiled_rules import CompiledRules, compile_rules
+from directory_overrides import directory_of
+from image_header import ImageHeaderError, effective_max_size, read_image_header
+from path_utils.path_stream import iter_paths
+from preimport_scan import asset_path_for, iter_source_files
+from texture_config import TextureConfigParams
+from type_define import CompressionKind
+
+# 圧縮設定ごとの相対的なエンコード時間（DXT1/5 = 1.0）。BC7 は候補モードの探索で桁違いに重い
+COMPRESSION_COST: Dict[CompressionKind, float] = {
+    CompressionKind.DEFAULT: 1.0,
+    CompressionKind.NORMAL_MAP: 1.2,
+    CompressionKind.MASKS: 1.0,
+    CompressionKind.GRAYSCALE: 0.5,
+    CompressionKind.HDR: 1.5,
+    CompressionKind.ALPHA: 0.5,
+    CompressionKind.EDITOR_ICON: 0.3,
+    CompressionKind.DISTANCE_FIELD_FONT: 0.5,
+    CompressionKind.BC7: 4.0,
+}
+# 1 テクスチャあたりの固定分（読み込み・保存。ソース 1MB のエンコードを 1 とした単位）
+PER_TEXTURE_COST = 0.25
+# ソースの大きさが分からないときの仮定（2048x2048 RGBA8 相当）
+DEFAULT_SOURCE_BYTES = 2048 * 2048 * 4
+
+_MB = 1024 * 1024
+
+
+def package_name_of(asset_path: str) -> str:
+    """"/Game/VFX/T_A.T_A" → "/Game/VFX/T_A" """
+    head, _sep, tail = asset_path.rpartition("/")
+    return f"{head}/{tail.split('.', 1)[0]}" if head else tail.split(".", 1)[0]
+
+
+def rgba8_bytes(width: int, height: int) -> int:
+    """寸法から RGBA8 相当のバイト数（コストの単位。ファイルの圧縮率に左右されない）。"""
+    return width * height * 4
+
+
+def estimate_cost(params: Optional[TextureConfigParams], source_bytes: Optional[int] = None) -> float:
+    """
+    1 テクスチャの適用にかかる相対コスト。ソースの大きさ（RGBA8 相当のバイト数）× 圧縮設定の重み + 固定分。
+    ソースの大きさが分からなければ max_in_game（無ければ既定値）の RGBA8 相当で見積もる。
+    命名エラーで読み飛ばすもの（params=None）は固定分だけ。
+    """
+    if params is None:
+        return PER_TEXTURE_COST
+    if source_bytes is None:
+        size = params.max_in_game
+        source_bytes = rgba8_bytes(effective_max_size(int(size)), effective_max_size(int(size))) if size \
+            else DEFAULT_SOURCE_BYTES
+    weight = COMPRESSION_COST.get(params.compression, 1.0) if params.compression is not None else 1.0
+    return PER_TEXTURE_COST + weight * source_bytes / _MB
+
+
+def source_sizes(root: Union[str, Path], asset_root: str) -> Dict[str, int]:
+    """
+    ソースフォルダを走査し、{インポート後のパッケージ名: ソースの RGBA8 相当のバイト数} を返す。
+    ファイルサイズ（PNG/JPEG は圧縮後）ではなくヘッダの寸法から求め、ソースの無いパスの見積もりと単位を揃える。
+    ヘッダが読めないファイルは含めない（max_in_game からの見積もりになる）。
+    """
+    sizes: Dict[str, int] = {}
+    for file_path in iter_source_files(root):
+        try:
+            header = read_image_header(file_path)
+        except (OSError, ImageHeaderError):
+            continue
+        if header is not None:
+            sizes[asset_path_for(file_path, root, asset_root)] = rgba8_bytes(header.width, header.height)
+    return sizes
+
+
+def estimate_costs(paths: Iterable[str], rules: CompiledRules,
+                   sizes: Optional[Mapping[str, int]] = None) -> Iterator[Tuple[str, float]]:
+    """パス列を resolve し、(パス, コスト) を 1 件ずつ返す。sizes はパッケージ名 → ソースの RGBA8 相当のバイト数。"""
+    for path in paths:
+        _match, params = rules.resolve_path(path)
+        source_bytes = sizes.get(package_name_of(path)) if sizes else None
+        yield path, estimate_cost(params, source_bytes)
+
+
+@dataclass
+class Shard:
+    """1 インスタンス分の作業。ディレクトリ単位で割り当てるので、同じパッケージディレクトリは 1 つの shard にしか無い。"""
+    index: int
+    cost: float = 0.0
+    directories: List[str] = field(default_factory=list)
+    paths: List[str] = field(default_factory=list)
+
+
+def plan_shards(costs: Iterable[Tuple[str, float]], shard_count: int) -> List[Shard]:
+    """
+    (パス, コスト) をパッケージディレクトリごとにまとめ、コストの大きいディレクトリから順に
+    その時点で最も軽い shard へ割り当てる（LPT）。最大負荷は最適解の 4/3 倍以内に収まる。
+    1 ディレクトリが全体の 1/N より重い場合は、そのディレクトリの shard が突出する（分割はしない）。
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count は 1 以上を指定してください")
+    groups: Dict[str, List] = {}
+    for path, cost in costs:
+        g = groups.setdefault(directory_of(path), [0.0, []])
+        g[0] += cost
+        g[1].append(path)
+
+    shards = [Shard(i) for i in range(shard_count)]
+    heap = [(0.0, i) for i in range(shard_count)]
+    # 同じコストなら名前順（結果を決定的にする）
+    for directory, (cost, paths) in sorted(groups.items(), key=lambda kv: (-kv[1][0], kv[0])):
+        load, i = heapq.heappop(heap)
+        shard = shards[i]
+        shard.cost = load + cost
+        shard.directories.append(directory)
+        shard.paths.extend(paths)
+        heapq.heappush(heap, (shard.cost, i))
+    return shards
+
+
+def imbalance(shards: Sequence[Shard]) -> float:
+    """最大負荷 / 平均負荷（1.0 が完全に均等）。"""
+    total = sum(s.cost for s in shards)
+    return max(s.cost for s in shards) * len(shards) / total if total else 1.0
+
+
+def _write_text(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_manifests(shards: Sequence[Shard], out_dir: Union[str, Path], *, prefix: str = "shard") -> List[Path]:
+    """
+    shard ごとのパスリスト（{prefix}_{NN}.txt、texture_configurator の --path-list にそのまま渡せる）と
+    計画の要約 plan.json を書き出す。
+    """
+    d = Path(out_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    width = max(2, len(str(len(shards) - 1)))
+    written: List[Path] = []
+    summary = []
+    for s in shards:
+        path = d / f"{prefix}_{s.index:0{width}d}.txt"
+        header = f"# shard {s.index + 1}/{len(shards)} textures={len(s.paths)} cost={s.cost:.2f}\n"
+        _write_text(path, header + "".join(p + "\n" for p in s.paths))
+        written.append(path)
+        summary.append({"index": s.index, "manifest": path.name, "textures": len(s.paths),
+                        "cost": round(s.cost, 3), "directories": s.directories})
+    plan = d / "plan.json"
+    _write_text(plan, json.dumps({"shards": summary, "imbalance": round(imbalance(shards), 4)},
+                                 ensure_ascii=False, indent=2))
+    written.append(plan)
+    return written
+
+
+# ---------- 結果のマージ ----------
+def _labels_key(sample: Mapping) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(sample.get("labels", {}).items()))
+
+
+def merge_metrics(files: Iterable[Union[str, Path]]) -> Dict:
+    """
+    shard ごとの {batch_id}.metrics.json を 1 つにまとめる。
+    カウンタとヒストグラムは合算、ゲージは所要時間（*_seconds）なら最大値、それ以外は合計
+    （並列に走らせた shard 全体の壁時計時間とスループットになる）。
+    """
+    merged: Dict[str, Dict] = {}
+    samples: Dict[str, Dict[Tuple, Dict]] = {}
+    batch_ids = []
+    for f in files:
+        data = json.loads(Path(f).read_text(encoding="utf-8"))
+        batch_ids.append(data.get("batch_id", Path(f).name))
+        for name, metric in data["metrics"].items():
+            merged.setdefault(name, {"type": metric["type"], "help": metric["help"]})
+            by_labels = samples.setdefault(name, {})
+            for sample in metric["samples"]:
+                key = _labels_key(sample)
+                cur = by_labels.get(key)
+                if cur is None:
+                    by_labels[key] = copy.deepcopy(sample)
+                elif metric["type"] == "histogram":
+                    for le, n in sample["buckets"].items():
+                        cur["buckets"][le] = cur["buckets"].get(le, 0) + n
+                    cur["sum"] += sample["sum"]
+                    cur["count"] += sample["count"]
+                elif metric["type"] == "gauge" and name.endswith("_seconds"):
+                    cur["value"] = max(cur["value"], sample["value"])
+                else:
+                    cur["value"] += sample["value"]
+    for name, metric in merged.items():
+        metric["samples"] = [samples[name][k] for k in sorted(samples[name])]
+    return {"batch_id": "merged", "sources": batch_ids, "metrics": merged}
+
+
+def merge_csv(files: Iterable[Union[str, Path]], out_path: Union[str, Path]) -> int:
+    """
+    同じ列構成の CSV（ドリフト・事前チェックなどのレポート）を 1 つに連結し、書き出した行数を返す。
+    列構成が違うファイルが混ざっていれば ValueError。
+    """
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    header: Optional[List[str]] = None
+    rows = 0
+    with out.open("w", encoding="utf-8", newline="") as fo:
+        w = csv.writer(fo)
+        for f in files:
+            with open(f, encoding="utf-8", newline="") as fi:
+                r = csv.reader(fi)
+                head = next(r, None)
+                if head is None:
+                    continue
+                if header is None:
+                    header = head
+                    w.writerow(header)
+                elif head != header:
+                    raise ValueError(f"CSV columns differ: {f}")
+                for row in r:
+                    w.writerow(row)
+                    rows += 1
+    return rows
+
+
+def merge_results(files: Sequence[Union[str, Path]], out_path: Union[str, Path]) -> int:
+    """拡張子で振り分けてマージする（.json はメトリクス、.csv はレポート）。戻り値はマージしたファイル数。"""
+    suffixes = {Path(f).suffix.lower() for f in files}
+    if suffixes == {".json"}:
+        out = Path(out_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        _write_text(out, json.dumps(merge_metrics(files), ensure_ascii=False, indent=2))
+    elif suffixes == {".csv"}:
+        merge_csv(files, out_path)
+    else:
+        raise ValueError(f"マージできるのは同じ種類のファイルだけです: {sorted(suffixes)}")
+    return len(files)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="shard_planner",
+        description="プロジェクト全体の再適用を N 個の作業リストに分け、shard ごとの結果をまとめます。",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("plan", help="パスリストをコストで均等に分ける")
+    p.add_argument("texture_config_path", help="TextureConfig.json のパス")
+    p.add_argument("suffix_config_path", help="SuffixConfig.json のパス")
+    p.add_argument("config_path", help="Config.json のパス")
+    p.add_argument("path_list", help="改行区切りのテクスチャパス一覧ファイル（.gz 可）")
+    p.add_argument("out_dir", help="shard のパスリストと plan.json の出力先")
+    p.add_argument("--shards", type=int, required=True, help="分割数")
+    p.add_argument("--source-root", help="ソース画像のルート。指定するとソースの寸法でコストを見積もる")
+    p.add_argument("--asset-root", default="/Game", help="--source-root に対応するアセットパス（既定: /Game）")
+
+    m = sub.add_parser("merge", help="shard ごとの結果（metrics.json か CSV）を 1 つにまとめる")
+    m.add_argument("out_path", help="出力先")
+    m.add_argument("inputs", nargs="+", help="shard ごとの結果ファイル")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.command == "plan":
+        rules = compile_rules(args.texture_config_path, args.suffix_config_path, args.config_path)
+        sizes = source_sizes(args.source_root, args.asset_root) if args.source_root else None
+        shards = plan_shards(estimate_costs(iter_paths(args.path_list), rules, sizes), args.shards)
+        write_manifests(shards, args.out_dir)
+        for s in shards:
+            print(f"[ShardPlanner] shard {s.index}: {len(s.paths)} textures, {len(s.directories)} dirs, cost {s.cost:.1f}")
+        print(f"[ShardPlanner] imbalance {imbalance(shards):.3f} -> {args.out_dir}")
+    else:
+        n = merge_results(args.inputs, args.out_path)
+        print(f"[ShardPlanner] merged {n} files -> {args.out_path}")
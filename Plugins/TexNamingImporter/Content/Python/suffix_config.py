@@ -1,7 +1,7 @@
 
 from typing import Optional, Union, Tuple, Dict, List, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
 from type_define import AddressMode
 
@@ -21,6 +21,8 @@ class TextureSuffixConfig:
     address_suffix_2d: Dict[str, AddressPair]
     address_suffix_3d: Dict[str, AddressTriple]
     suffix_index: List[str]
+    # 名前の先頭側に並ぶカテゴリ（任意）。末尾 '?' は省略可能なカテゴリ
+    prefix_index: List[str] = field(default_factory=list)
     # ---------- 変換ユーティリティ ----------
     @staticmethod
     def _to_addr(x: Union[str, AddressMode]) -> AddressMode:
@@ -47,7 +49,9 @@ class TextureSuffixConfig:
         category に対して許容される「キー」の一覧を返す。
         - 配列型（例: texture_type）: そのまま要素をキーとして扱う
         - 辞書型（例: address_suffix_2d/3d）: dict のキーを返す
+        - 末尾の '?'（省略可能マーク）は無視する
         """
+        category = category.strip().rstrip("?")
         if not hasattr(self, category):
             return []
         value = getattr(self, category)
@@ -101,10 +105,15 @@ class TextureSuffixConfig:
             raise ValueError("no address suffix mapping found (2D/3D)")
         
         suf_index = data.get("suffix_index")
-        if not isinstance(suf_index, list) or not all(isinstance(x, str) for x in v):
+        if not isinstance(suf_index, list) or not all(isinstance(x, str) for x in suf_index):
             raise ValueError("'suffix_index' must be a list[str]")
 
-        return cls(texture_type=tt, address_suffix_2d=map2d, address_suffix_3d=map3d, suffix_index=suf_index)
+        pre_index = data.get("prefix_index", [])
+        if not isinstance(pre_index, list) or not all(isinstance(x, str) for x in pre_index):
+            raise ValueError("'prefix_index' must be a list[str]")
+
+        return cls(texture_type=tt, address_suffix_2d=map2d, address_suffix_3d=map3d, suffix_index=suf_index,
+                   prefix_index=pre_index)
 
     @classmethod
     def load(cls, file_path: Union[str, Path]) -> "TextureSuffixConfig":
@@ -117,7 +126,10 @@ class TextureSuffixConfig:
     def to_dict(self) -> dict:
         out = {
             "texture_type": list(self.texture_type),
+            "suffix_index": list(self.suffix_index),
         }
+        if self.prefix_index:
+            out["prefix_index"] = list(self.prefix_index)
         if self.address_suffix_2d:
             out["address_suffix_2d"] = {
                 k: [u.name, v.name] for k, (u, v) in self.address_suffix_2d.items()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from suffix_config import TextureSuffixConfig
+from validator import SuffixValidationResult, validate_suffixes
+
+# suffix_index / prefix_index の要素末尾に付けると「省略可能なカテゴリ」になる
+OPTIONAL_MARK = "?"
+
+
+@dataclass
+class GrammarRow:
+    """文法の 1 行（= 1 カテゴリ）。keys は 小文字 → 設定ファイル上の表記 の対応。"""
+    category: str
+    keys: Dict[str, str]
+    optional: bool = False
+
+
+@dataclass
+class GrammarMatch:
+    ok: bool
+    # 名前本体（プレフィックス/サフィックスを除いた部分）
+    stem: Optional[str] = None
+    # 行インデックス → 実際に一致したトークン（元の大小保持、省略された行は None）
+    matches_by_row: List[Optional[str]] = field(default_factory=list)
+    # 行インデックス → 設定ファイル上のキー（texture_config 等の参照にそのまま使える）
+    keys_by_row: List[Optional[str]] = field(default_factory=list)
+    # prefix_index 側の一致結果（並びは matches_by_row と同様）
+    prefix_matches: List[Optional[str]] = field(default_factory=list)
+    prefix_keys: List[Optional[str]] = field(default_factory=list)
+    error: Optional[str] = None
+    failed_row_index: Optional[int] = None
+
+    @property
+    def keys(self) -> List[str]:
+        """一致したサフィックスのキー（省略行を除く、左→右）。"""
+        return [k for k in self.keys_by_row if k is not None]
+
+    def to_validation_result(self) -> SuffixValidationResult:
+        """既存の SuffixValidationResult 形式へ変換する。"""
+        tokens = [t for t in self.matches_by_row if t is not None]
+        return SuffixValidationResult(
+            ok=self.ok,
+            matches_by_row=list(self.matches_by_row) if self.ok else None,
+            error=self.error,
+            failed_row_index=self.failed_row_index,
+            suffix_list=tokens,
+        )
+
+
+def _split_mark(category: str) -> Tuple[str, bool]:
+    c = category.strip()
+    if c.endswith(OPTIONAL_MARK):
+        return c[:-1].strip(), True
+    return c, False
+
+
+def _category_keys(cfg: TextureSuffixConfig, category: str) -> Dict[str, str]:
+    """カテゴリの許容キーを 小文字 → 元表記 の dict で返す。"""
+    value = getattr(cfg, category, None)
+    if isinstance(value, dict):
+        names = [str(k) for k in value.keys()]
+    elif isinstance(value, (list, tuple)):
+        names = [str(v) for v in value]
+    else:
+        names = []
+    return {n.lower(): n for n in names}
+
+
+def _lookup(keys: Dict[str, str], token: str) -> str:
+    """一致したトークンから設定上のキーを引く（IGNORECASE は casefold 相当で照合するため両方試す）。"""
+    key = keys.get(token.lower())
+    if key is not None:
+        return key
+    folded = token.casefold()
+    for k, v in keys.items():
+        if k.casefold() == folded:
+            return v
+    raise KeyError(token)
+
+
+def _alternation(keys: Dict[str, str]) -> str:
+    # 長いものから並べ、バックトラック時の候補順を安定させる
+    return "|".join(re.escape(k) for k in sorted(keys, key=lambda k: (-len(k), k)))
+
+
+class CompiledSuffixGrammar:
+    """
+    suffix_index（と任意の prefix_index）から生成した命名文法。
+
+    名前全体を 1 本のアンカー付き正規表現（大小無視）で照合し、
+    サフィックスの抽出と行（カテゴリ）ごとの分類を 1 パスで行う。
+
+      {prefix_0}_..._{stem}_{suffix_0}_..._{suffix_n}
+
+    - 省略可能なカテゴリ（末尾 '?'）は、存在すれば採用・無ければ None
+    - stem の最後のトークンはどのサフィックスのキーでもない。つまり従来の collect_suffixes_from_path と同じく
+      「末尾から連続するサフィックス」を最大限取り、その並びが規則に合わなければ不一致
+      （T_Rock_nml_col_cc のように規則より長い並びは、stem に 1 つ押し込んで通したりしない）
+    - 名前がサフィックスだけ（col_cc）の場合も従来どおり一致とし、stem は None
+      （プレフィックスの規則がある場合は、どこまでがプレフィックスか決まらないので不一致）
+    - 照合に失敗した場合のみ、トークン分割して既存 validate_suffixes 相当のエラー情報を作る
+    """
+
+    def __init__(self, rows: Sequence[GrammarRow], prefix_rows: Sequence[GrammarRow] = ()):
+        self.rows: List[GrammarRow] = list(rows)
+        self.prefix_rows: List[GrammarRow] = list(prefix_rows)
+        for r in self.rows + self.prefix_rows:
+            if not r.keys:
+                raise ValueError(f"カテゴリ '{r.category}' の許容キーが空です")
+
+        self._union = frozenset(k for r in self.rows for k in r.keys)
+        parts: List[str] = ["^"]
+        for i, r in enumerate(self.prefix_rows):
+            seg = f"(?:(?P<p{i}>{_alternation(r.keys)})_)"
+            parts.append(seg + ("?" if r.optional else ""))
+        # stem の最後のトークンはサフィックスのキー（大小無視）であってはならない
+        last_token = f"(?!(?:{_alternation(dict.fromkeys(self._union))})(?:_|$))[^_]+"
+        parts.append(f"(?P<stem>(?:.*?_)??{last_token}_*)")
+        suffix_parts: List[str] = []
+        for i, r in enumerate(self.rows):
+            seg = f"(?:_(?P<s{i}>{_alternation(r.keys)}))"
+            suffix_parts.append(seg + ("?" if r.optional else ""))
+        self.pattern = re.compile("".join(parts + suffix_parts + ["$"]), re.IGNORECASE)
+        # 名前がサフィックスだけの場合（先頭に "_" を補って照合する）
+        self._suffix_only = None if self.prefix_rows else re.compile("".join(["^"] + suffix_parts + ["$"]),
+                                                                      re.IGNORECASE)
+
+        # 失敗時の診断用
+        self._grid: List[List[str]] = [list(r.keys) for r in self.rows]
+        self._has_optional = any(r.optional for r in self.rows)
+
+    # ---------- 生成 ----------
+    @classmethod
+    def from_config(cls, cfg: TextureSuffixConfig) -> "CompiledSuffixGrammar":
+        rows = []
+        for entry in cfg.suffix_index:
+            cat, optional = _split_mark(entry)
+            rows.append(GrammarRow(cat, _category_keys(cfg, cat), optional))
+        prefix_rows = []
+        for entry in getattr(cfg, "prefix_index", None) or []:
+            cat, optional = _split_mark(entry)
+            prefix_rows.append(GrammarRow(cat, _category_keys(cfg, cat), optional))
+        return cls(rows, prefix_rows)
+
+    # ---------- 照合 ----------
+    @staticmethod
+    def name_from_path(src_path: str) -> str:
+        """パスから照合対象の名前（拡張子/オブジェクト名を除いたファイル名）を取り出す。"""
+        stem, _ext = os.path.splitext(os.path.basename(src_path))
+        return stem.strip("_")
+
+    def match(self, src_path: str) -> GrammarMatch:
+        return self.match_name(self.name_from_path(src_path))
+
+    def match_name(self, name: str) -> GrammarMatch:
+        m = self.pattern.match(name)
+        if m is None and self._suffix_only is not None:
+            m = self._suffix_only.match("_" + name)
+        if m is None:
+            return self._diagnose(name)
+
+        tokens: List[Optional[str]] = []
+        keys: List[Optional[str]] = []
+        for i, r in enumerate(self.rows):
+            tok = m.group(f"s{i}")
+            tokens.append(tok)
+            keys.append(None if tok is None else _lookup(r.keys, tok))
+        p_tokens: List[Optional[str]] = []
+        p_keys: List[Optional[str]] = []
+        for i, r in enumerate(self.prefix_rows):
+            tok = m.group(f"p{i}")
+            p_tokens.append(tok)
+            p_keys.append(None if tok is None else _lookup(r.keys, tok))
+        return GrammarMatch(
+            ok=True,
+            stem=m.groupdict().get("stem"),
+            matches_by_row=tokens,
+            keys_by_row=keys,
+            prefix_matches=p_tokens,
+            prefix_keys=p_keys,
+        )
+
+    def _diagnose(self, name: str) -> GrammarMatch:
+        """照合失敗時に、どの行が不一致だったかを求める（失敗時のみ通る遅い経路）。"""
+        tokens = [t for t in name.split("_") if t]
+        # 末尾から、いずれかのカテゴリに属するトークンが続く範囲を取り出す
+        start = len(tokens)
+        while start > 0 and tokens[start - 1].lower() in self._union:
+            start -= 1
+        run = tokens[start:]
+
+        if self._has_optional or self.prefix_rows:
+            if self._has_optional:
+                required = sum(1 for r in self.rows if not r.optional)
+                error = (f"サフィックスが規則に一致しません。required>={required}, max={len(self.rows)}, "
+                         f"actual={run}")
+            else:
+                error = f"プレフィックス/サフィックスが規則に一致しません: '{name}'"
+            return GrammarMatch(ok=False, matches_by_row=list(run), error=error)
+
+        res = validate_suffixes(run, self._grid)
+        if res.ok:
+            # 並びは規則どおりだが名前全体が照合できない（空のトークンだけの stem など）
+            return GrammarMatch(ok=False, matches_by_row=list(run), error=f"名前が規則に一致しません: '{name}'")
+        return GrammarMatch(ok=False, matches_by_row=list(run), error=res.error,
+                            failed_row_index=res.failed_row_index)
+
+
+def compile_suffix_grammar(cfg: TextureSuffixConfig) -> CompiledSuffixGrammar:
+    """TextureSuffixConfig から CompiledSuffixGrammar を生成する。"""
+    return CompiledSuffixGrammar.from_config(cfg)
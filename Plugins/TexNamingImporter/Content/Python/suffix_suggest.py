@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import combinations, permutations
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from suffix_grammar import CompiledSuffixGrammar
+
+
+@dataclass
+class RowSuggestion:
+    """不正サフィックス 1 件（1 行分）に対する修正候補。"""
+    row: int
+    token: str
+    # (設定上のキー, 編集距離) を近い順に
+    candidates: List[Tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def best(self) -> Optional[str]:
+        return self.candidates[0][0] if self.candidates else None
+
+
+@dataclass
+class SuffixSuggestion:
+    """名前 1 件に対する修正候補。"""
+    name: str
+    rows: List[RowSuggestion] = field(default_factory=list)
+    # すべての不正行を先頭候補で置き換えた名前（候補の無い行がある場合は None）
+    suggested_name: Optional[str] = None
+    # サフィックスが足りず、トークンの無い必須行（このとき rows は空）
+    missing_rows: List[int] = field(default_factory=list)
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    """word から最大 depth 文字を削除した文字列の集合（word 自身を含む）。"""
+    out = {word}
+    frontier = {word}
+    for _ in range(depth):
+        nxt = set()
+        for w in frontier:
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        nxt -= out
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def osa_distance(a: str, b: str) -> int:
+    """隣接転置を 1 操作と数える編集距離（Optimal String Alignment）。"""
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if not la:
+        return lb
+    if not lb:
+        return la
+    prev2: List[int] = []
+    prev = list(range(lb + 1))
+    for i in range(1, la + 1):
+        cur = [i] + [0] * lb
+        ca = a[i - 1]
+        for j in range(1, lb + 1):
+            cost = 0 if ca == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+        prev2, prev = prev, cur
+    return prev[lb]
+
+
+class SuffixSuggester:
+    """
+    行（カテゴリ）ごとに削除近傍マップ（SymSpell 方式）を事前計算し、
+    不正トークンに近い許容キーを返す。
+
+    - 照会時はトークン側の削除近傍だけを生成して辞書を引くので、許容キー数に依存しにくい
+    - (行, トークン) 単位で結果をキャッシュするので、同じ綴り間違いが大量にある監査でも速い
+    - optional は省略可能な行のインデックス、prefix_rows は名前の先頭に必ず付く（必須の）プレフィックスの数
+    """
+
+    def __init__(self, rows: Sequence[Mapping[str, str]], *, optional: Iterable[int] = (), prefix_rows: int = 0,
+                 max_distance: int = 2, max_candidates: int = 3, cache_size: int = 65536):
+        if max_distance < 1:
+            raise ValueError("max_distance は 1 以上を指定してください")
+        self.max_distance = max_distance
+        self.max_candidates = max_candidates
+        # 行ごと: 小文字キー → 設定上のキー
+        self._keys: List[Dict[str, str]] = [{k.lower(): v for k, v in row.items()} for row in rows]
+        self._union: Set[str] = {k for keys in self._keys for k in keys}
+        self._optional: Set[int] = set(optional)
+        # サフィックスの手前に残すトークン数（必須のプレフィックス + stem 1 つ）
+        self._min_head = prefix_rows + 1
+        # トークンを割り当てる行の組。省略可能な行を多く残すものから試す
+        opt = sorted(self._optional)
+        self._layouts: List[Tuple[int, ...]] = [
+            tuple(i for i in range(len(self._keys)) if i not in dropped)
+            for r in range(len(opt) + 1) for dropped in combinations(opt, r)
+        ]
+        # 行ごと: 削除文字列 → 元の小文字キー集合
+        self._index: List[Dict[str, Set[str]]] = []
+        for keys in self._keys:
+            idx: Dict[str, Set[str]] = {}
+            for k in keys:
+                for d in _deletes(k, max_distance):
+                    idx.setdefault(d, set()).add(k)
+            self._index.append(idx)
+        self._cache: Dict[Tuple[int, str], List[Tuple[str, int]]] = {}
+        self._cache_size = cache_size
+
+    @classmethod
+    def from_grammar(cls, grammar: CompiledSuffixGrammar, **kw) -> "SuffixSuggester":
+        return cls([r.keys for r in grammar.rows], optional=[i for i, r in enumerate(grammar.rows) if r.optional],
+                   prefix_rows=sum(1 for r in grammar.prefix_rows if not r.optional), **kw)
+
+    @classmethod
+    def from_grid(cls, suffix_grid: Iterable[Iterable[str]], **kw) -> "SuffixSuggester":
+        return cls([{k: k for k in row} for row in suffix_grid], **kw)
+
+    # ---------- 照会 ----------
+    def closest(self, row: int, token: str) -> List[Tuple[str, int]]:
+        """行 row の許容キーのうち token に近いものを (キー, 距離) の昇順で返す。"""
+        if not (0 <= row < len(self._index)):
+            return []
+        t = token.lower()
+        ck = (row, t)
+        hit = self._cache.get(ck)
+        if hit is not None:
+            return hit
+
+        # 2 文字以下のトークンは距離 2 だと何にでも一致してしまうので 1 に抑える
+        limit = 1 if len(t) <= 2 else self.max_distance
+        idx = self._index[row]
+        seen: Set[str] = set()
+        for d in _deletes(t, limit):
+            ks = idx.get(d)
+            if ks:
+                seen |= ks
+        scored = []
+        for k in seen:
+            dist = osa_distance(t, k)
+            if dist <= limit:
+                scored.append((dist, k))
+        scored.sort()
+        keys = self._keys[row]
+        result = [(keys[k], dist) for dist, k in scored[: self.max_candidates]]
+
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[ck] = result
+        return result
+
+    def suggest(self, name: str) -> Optional[SuffixSuggestion]:
+        """
+        名前の末尾トークンを行に割り当て、許容されない行ごとに修正候補を返す。
+        name はパスではなく CompiledSuffixGrammar.name_from_path 後の名前を渡す。
+
+        割り当ては CompiledSuffixGrammar の照合に合わせる:
+        - 省略可能な行は、あってもなくてもよい（直す行が少ない方を採る）
+        - どこかの行のキーであるトークンは、その行の誤りとはしない（並べ替えで直る場合を除く）
+        - 割り当てた手前（stem の最後）のトークンはサフィックスのキーではない
+        どう割り当ててもトークンが足りない場合（T_Rock_col）は行ごとの候補を出さず、
+        末尾のキーの並びから足りない行を missing_rows に入れて返す（本体の Rock を誤りにしない）。
+        直す行が無い/名前が短すぎて本体が残らない場合は None。
+        """
+        tokens = [t for t in name.split("_") if t]
+        if not self._keys:
+            return None
+        best: Optional[SuffixSuggestion] = None
+        best_rank: Tuple[int, int] = (0, 0)
+        for present in self._layouts:
+            m = len(present)
+            if m == 0 or len(tokens) < m + self._min_head:
+                continue
+            head, tail = tokens[:-m], tokens[-m:]
+            if head[-1].lower() in self._union:
+                continue
+            rows: Optional[List[RowSuggestion]] = []
+            for row, token in zip(present, tail):
+                t = token.lower()
+                if t in self._keys[row]:
+                    continue
+                if t in self._union:
+                    rows = None  # 別の行のキー: この割り当てでは綴り間違いとみなさない
+                    break
+                rows.append(RowSuggestion(row=row, token=token, candidates=self.closest(row, token)))
+            if rows is None:
+                # 並び順だけが違う場合（例: _ww_nml）は並べ替えを優先して提案する
+                reordered = self._reorder(present, tail)
+                if reordered is not None:
+                    return self._reordered(name, head, present, tail, reordered)
+                continue
+            if not rows:
+                return None
+            rank = (sum(1 for r in rows if not r.candidates), len(rows))
+            if best is None or rank < best_rank:
+                best, best_rank = SuffixSuggestion(name=name, rows=rows), rank
+                if all(r.candidates for r in rows):
+                    fixed = list(tail)
+                    for r in rows:
+                        fixed[present.index(r.row)] = r.candidates[0][0]
+                    best.suggested_name = "_".join(head + fixed)
+        if best is not None:
+            return best
+        missing = self._missing_rows(tokens)
+        return SuffixSuggestion(name=name, missing_rows=missing) if missing else None
+
+    def _reordered(self, name: str, head: List[str], present: Tuple[int, ...], tail: List[str],
+                   reordered: List[str]) -> SuffixSuggestion:
+        rows = []
+        for row, token, key in zip(present, tail, reordered):
+            if token.lower() != key.lower():
+                rest = [c for c in self.closest(row, token) if c[0] != key]
+                rows.append(RowSuggestion(row=row, token=token, candidates=[(key, 0)] + rest))
+        return SuffixSuggestion(name=name, rows=rows, suggested_name="_".join(head + reordered))
+
+    def _reorder(self, present: Tuple[int, ...], tail: List[str]) -> Optional[List[str]]:
+        """tail の並べ替えで present のすべての行が許容される場合、その並び（設定上のキー）を返す。"""
+        if len(tail) > 4:
+            return None  # 行数が多い設定では総当たりしない
+        for perm in permutations(tail):
+            keys = []
+            for row, token in zip(present, perm):
+                key = self._keys[row].get(token.lower())
+                if key is None:
+                    break
+                keys.append(key)
+            else:
+                return keys
+        return None
+
+    def _missing_rows(self, tokens: List[str]) -> List[int]:
+        """
+        末尾から続くキーの並びを行の順に当てはめ、トークンの無い必須行を返す。
+        当てはまらない（規則より長い・順序が違う）場合や本体が残らない場合は空。
+        """
+        start = len(tokens)
+        while start > 0 and tokens[start - 1].lower() in self._union:
+            start -= 1
+        if start < self._min_head:
+            return []
+        used: Set[int] = set()
+        row = len(self._keys) - 1
+        for token in reversed(tokens[start:]):
+            t = token.lower()
+            while row >= 0 and t not in self._keys[row]:
+                row -= 1
+            if row < 0:
+                return []
+            used.add(row)
+            row -= 1
+        return [r for r in range(len(self._keys)) if r not in used and r not in self._optional]
+
+    def suggest_path(self, src_path: str) -> Optional[SuffixSuggestion]:
+        return self.suggest(CompiledSuffixGrammar.name_from_path(src_path))
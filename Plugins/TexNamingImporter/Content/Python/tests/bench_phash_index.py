@@ -0,0 +1,47 @@
+"""
+PerceptualHashIndex の検索速度（多重インデックスハッシュ）と総当たりの比較。
+
+実行例（Python ディレクトリ直下で）:
+    python tests/bench_phash_index.py [件数] [距離]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from phash_index import PerceptualHashIndex, hamming  # noqa: E402
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    distance = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    rng = random.Random(0)
+    hashes = [rng.getrandbits(64) for _ in range(n)]
+    queries = [h ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for h in rng.sample(hashes, 200)]
+
+    t0 = time.perf_counter()
+    index = PerceptualHashIndex()
+    for i, h in enumerate(hashes):
+        index.add(f"/Game/Bench/T_{i}", h)
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    found = sum(len(index.find(q, distance)) for q in queries)
+    mih = (time.perf_counter() - t0) / len(queries)
+
+    t0 = time.perf_counter()
+    brute = sum(sum(1 for h in hashes if hamming(h, q) <= distance) for q in queries[:20])
+    scan = (time.perf_counter() - t0) / 20
+
+    print(f"entries={n} distance={distance} build={build:.2f}s")
+    print(f"multi-index: {mih * 1e3:.3f} ms/query ({found} hits)")
+    print(f"brute force: {scan * 1e3:.3f} ms/query ({brute} hits in first 20)")
+
+
+if __name__ == "__main__":
+    main()
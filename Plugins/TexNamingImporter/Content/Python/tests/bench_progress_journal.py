@@ -0,0 +1,45 @@
+"""
+ProgressJournal の 1 レコードあたりのコスト（flush 毎回・fsync はまとめて）。
+テクスチャ 1 件の適用（数十 ms〜）に対して 1% 未満であることを確かめる。
+
+実行例（Python ディレクトリ直下で）:
+    python tests/bench_progress_journal.py [件数]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from fingerprint import params_fingerprint  # noqa: E402
+from progress_journal import STATUS_OK, ProgressJournal, read_journal  # noqa: E402
+from texture_config import TextureConfigParams  # noqa: E402
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    config = params_fingerprint(TextureConfigParams())
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "bench.journal"
+        t0 = time.perf_counter()
+        with ProgressJournal(path) as j:
+            for i in range(n):
+                j.record(f"/Game/Bench/Dir{i % 500}/T_{i}_col_cc.T_{i}_col_cc", STATUS_OK, config)
+        write = (time.perf_counter() - t0) / n
+
+        t0 = time.perf_counter()
+        state = read_journal(path)
+        replay = time.perf_counter() - t0
+        size = path.stat().st_size
+
+    print(f"records={n} size={size / 1e6:.1f} MB")
+    print(f"record: {write * 1e6:.1f} us/texture ({write / 0.010 * 100:.3f}% of a 10 ms apply)")
+    print(f"replay: {replay:.2f} s ({len(state.completed)} completed)")
+
+
+if __name__ == "__main__":
+    main()
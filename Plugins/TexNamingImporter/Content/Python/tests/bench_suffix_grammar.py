@@ -0,0 +1,63 @@
+"""
+collect_suffixes_from_path + validate_suffixes（従来の 2 段階）と
+CompiledSuffixGrammar.match（1 パス）の速度比較。
+
+実行例（Python ディレクトリ直下で）:
+    python tests/bench_suffix_grammar.py [件数]
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+import validator  # noqa: E402
+from path_utils.path_functions import collect_suffixes_from_path  # noqa: E402
+from suffix_config import load_texture_suffix_config  # noqa: E402
+from suffix_grammar import compile_suffix_grammar  # noqa: E402
+
+
+def _make_corpus(grid, n: int, seed: int = 0):
+    rng = random.Random(seed)
+    words = ["Rock", "Tree", "Smoke", "Fire", "Hero", "Face", "P0", "v2", "01"]
+    out = []
+    for i in range(n):
+        stem = "_".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        sufs = [rng.choice(row) for row in grid]
+        r = rng.random()
+        if r < 0.1:
+            sufs.reverse()            # 並び違い
+        elif r < 0.2:
+            sufs = sufs[:-1]          # 不足
+        elif r < 0.3:
+            sufs[-1] = "bad"          # 不正値
+        out.append(f"/Game/Bench/T_{stem}_{i}_{'_'.join(sufs)}.T_{stem}_{i}")
+    return out
+
+
+def main(n: int = 100_000) -> None:
+    cfg = load_texture_suffix_config(Path(PYTHON_DIR, "tests", "assets", "SuffixSettings.json"))
+    grid = validator.build_suffix_grid(cfg)
+    all_suffixes = [s for row in grid for s in row]
+    grammar = compile_suffix_grammar(cfg)
+    corpus = _make_corpus(grid, n)
+
+    def two_step():
+        for p in corpus:
+            validator.validate_suffixes(collect_suffixes_from_path(p, all_suffixes), grid)
+
+    def one_pass():
+        for p in corpus:
+            grammar.match(p)
+
+    for name, fn in (("two-step", two_step), ("grammar", one_pass)):
+        best = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f"{name:>9}: {best * 1e3:8.1f} ms total, {best / n * 1e9:7.0f} ns/path")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
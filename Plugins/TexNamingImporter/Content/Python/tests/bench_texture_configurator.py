@@ -0,0 +1,56 @@
+"""
+unreal の代用品（detail_unreal/unreal_standin.py）上で TextureConfigurator.apply のスループットを測る。
+post_edit_change（再圧縮）などに遅延を注入すると、エディタでの呼び出しコストを模擬できる。
+
+実行例（Python ディレクトリ直下で）:
+    python tests/bench_texture_configurator.py [件数] [post_edit_change の遅延 ms]
+"""
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from detail_unreal import unreal_standin  # noqa: E402
+
+unreal = unreal_standin.install()
+
+from compiled_rules import compile_rules  # noqa: E402
+from detail_unreal.texture_configurator_unreal import TextureConfigurator, UndoMode, batch_transaction  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+
+
+def main(n: int = 5_000, post_edit_ms: float = 0.0) -> None:
+    rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+    unreal.recorder.set_latency("Texture.post_edit_change", post_edit_ms / 1000.0)
+    combos = [k for k, _ in rules.table.items() if all(k)]
+    paths = []
+    for i in range(n):
+        keys = combos[i % len(combos)]
+        name = f"T_Bench{i}_{'_'.join(keys)}"
+        paths.append(f"/Game/Bench/{name}.{name}")
+
+    for mode in UndoMode:
+        unreal.assets.clear()
+        unreal.reset_calls()
+        for p in paths:
+            unreal.add_texture(p)
+        start = time.perf_counter()
+        with batch_transaction(undo_mode=mode, log=False):
+            for p in paths:
+                _match, params = rules.resolve_path(p)
+                TextureConfigurator(params=params, skip_unchanged=False).apply(p)
+        elapsed = time.perf_counter() - start
+        calls = Counter(unreal.recorder.names())
+        per_tex = ", ".join(f"{k}={v / n:.1f}" for k, v in sorted(calls.items()))
+        print(f"{mode.name:>11}: {elapsed * 1e3:8.1f} ms, {n / elapsed:9.0f} tex/s | per texture: {per_tex}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.0)
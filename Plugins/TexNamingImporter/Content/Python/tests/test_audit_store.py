@@ -0,0 +1,123 @@
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+import audit_store  # noqa: E402
+from audit_store import AuditResultStore, AuditVerdict  # noqa: E402
+from suffix_config import load_texture_suffix_config  # noqa: E402
+from suffix_grammar import compile_suffix_grammar  # noqa: E402
+
+PATHS = [
+    "/Game/VFX/T_A_col_cc.T_A_col_cc",
+    "/Game/VFX/T_B_col_ww.T_B_col_ww",
+    "/Game/VFX/T_C_nml_ww.T_C_nml_ww",
+    "/Game/VFX/T_D_ww_nml.T_D_ww_nml",      # 行 0 不一致
+    "/Game/VFX/T_E_col.T_E_col",            # 個数不一致
+    "/Game/VFX/日本語_col_cc.日本語_col_cc",
+]
+
+
+class _Base:
+    """NumPy あり/なしの両方で同じテストを回す。"""
+    use_numpy = True
+
+    def setUp(self):
+        self._saved_np = audit_store._np
+        if not self.use_numpy:
+            audit_store._np = None
+        elif audit_store._np is None:
+            self.skipTest("NumPy が無いためスキップします。")
+        cfg = load_texture_suffix_config(Path(PYTHON_DIR, "tests", "assets", "SuffixSettings.json"))
+        grammar = compile_suffix_grammar(cfg)
+        self.store = AuditResultStore()
+        self.store.extend_matches((p, grammar.match(p)) for p in PATHS)
+
+    def tearDown(self):
+        audit_store._np = self._saved_np
+
+    def test_rows_roundtrip(self):
+        self.assertEqual(len(self.store), len(PATHS))
+        self.assertEqual(self.store.path(5), PATHS[5])
+        self.assertEqual(self.store.row(0), {"path": PATHS[0], "texture_type": "col", "address": "cc",
+                                             "failed_token": "", "verdict": "OK", "failed_row": None})
+        self.assertEqual(self.store.row(3), {"path": PATHS[3], "texture_type": "", "address": "",
+                                             "failed_token": "ww", "verdict": "INVALID_SUFFIX", "failed_row": 0})
+        self.assertEqual(self.store.row(4)["verdict"], "NAME_MISMATCH")
+        self.assertEqual(self.store.row(4)["texture_type"], "")
+
+    def test_count_by(self):
+        self.assertEqual(self.store.count_by("verdict"), {"OK": 4, "INVALID_SUFFIX": 1, "NAME_MISMATCH": 1})
+        # 不一致のトークン（ww）は texture_type に混ぜない
+        self.assertEqual(self.store.count_by("texture_type"), {"": 2, "col": 3, "nml": 1})
+        self.assertEqual(self.store.count_by("failed_token"), {"": 5, "ww": 1})
+        self.assertEqual(self.store.count_by("failed_row"), {None: 5, 0: 1})
+
+    def test_group_counts(self):
+        g = self.store.group_counts(["texture_type", "verdict"])
+        self.assertEqual(g[("col", "OK")], 3)
+        self.assertEqual(g[("nml", "OK")], 1)
+        self.assertEqual(g[("", "INVALID_SUFFIX")], 1)
+        self.assertEqual(sum(g.values()), len(PATHS))
+
+    def test_filter(self):
+        self.assertEqual(list(self.store.filter(verdict="OK", texture_type="col")), [0, 1, 5])
+        self.assertEqual(list(self.store.filter(address="ww", verdict=AuditVerdict.OK)), [1, 2])
+        self.assertEqual(list(self.store.filter(texture_type="unknown")), [])
+
+    def test_to_csv(self):
+        with tempfile.TemporaryDirectory() as d:
+            out = Path(d, "audit.csv")
+            self.store.to_csv(out, self.store.filter(verdict="OK"))
+            with out.open(encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([r["path"] for r in rows], [PATHS[i] for i in (0, 1, 2, 5)])
+
+
+    def test_to_parquet_matches_csv(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow がインストールされていません")
+        with tempfile.TemporaryDirectory() as d:
+            self.store.to_parquet(Path(d, "audit.parquet"))
+            table = pq.read_table(Path(d, "audit.parquet"))
+            self.store.to_csv(Path(d, "audit.csv"))
+            with Path(d, "audit.csv").open(encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(table.column_names, list(audit_store.COLUMNS))
+        # 「なし」は Parquet では null、CSV では空欄
+        self.assertEqual(table.column("failed_row").to_pylist(), [None, None, None, 0, None, None])
+        self.assertEqual([r["failed_row"] for r in rows], ["", "", "", "0", "", ""])
+        for name in audit_store.CATEGORY_COLUMNS:
+            self.assertEqual(table.column(name).to_pylist(), [r[name] for r in rows])
+
+
+class TestAuditResultStoreNumpy(_Base, unittest.TestCase):
+    use_numpy = True
+
+
+class TestAuditResultStorePurePython(_Base, unittest.TestCase):
+    use_numpy = False
+
+
+class TestAuditResultStoreSize(unittest.TestCase):
+    def test_compact_per_row(self):
+        store = AuditResultStore()
+        for i in range(100000):
+            store.append(f"/Game/VFX/T_{i:06d}_col_cc", "col", "cc", AuditVerdict.OK)
+        # パス本体 + 1 件あたり 16 バイト程度
+        path_bytes = sum(len(f"/Game/VFX/T_{i:06d}_col_cc") for i in range(100000))
+        self.assertLess(store.nbytes() - path_bytes, 100000 * 18)
+        self.assertEqual(store.count_by("address"), {"cc": 100000})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
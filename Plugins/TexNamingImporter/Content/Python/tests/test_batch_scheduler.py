@@ -0,0 +1,108 @@
+import sys
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from batch_scheduler import TickBudgetScheduler, SchedulerState  # noqa: E402
+
+
+class FakeClock:
+    """擬似時計。process 内で advance して 1 要素あたりのコストを表現する。"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, ms: float) -> None:
+        self.now += ms / 1000.0
+
+
+class TestTickBudgetScheduler(unittest.TestCase):
+    def _make(self, cost_ms: float, budget_ms: float = 10.0, **kw):
+        clock = FakeClock()
+        done = []
+
+        def process(item):
+            clock.advance(cost_ms)
+            done.append(item)
+            return item
+
+        sched = TickBudgetScheduler(process, budget_ms=budget_ms, clock=clock, **kw)
+        return sched, clock, done
+
+    def test_slices_respect_budget_and_adapt(self):
+        """初回は initial_slice、以降は実測コストから予算内の件数に適応する。"""
+        sched, _clock, done = self._make(cost_ms=2.0, budget_ms=10.0, initial_slice=1)
+        sched.enqueue(range(20))
+        sched.start()
+
+        first = sched.tick()
+        self.assertEqual(first.processed, 1)
+        second = sched.tick()
+        self.assertEqual(second.slice_size, 5)   # 10ms / 2ms
+        self.assertEqual(second.processed, 5)
+        self.assertLessEqual(second.elapsed_ms, 10.0)
+
+        while not sched.is_finished:
+            sched.tick()
+        self.assertEqual(done, list(range(20)))
+        self.assertEqual(sched.state, SchedulerState.DONE)
+
+    def test_expensive_item_still_progresses(self):
+        """1 要素が予算を超える場合でも 1 tick に 1 件は処理する。"""
+        sched, _clock, done = self._make(cost_ms=50.0, budget_ms=10.0)
+        sched.enqueue(range(3))
+        sched.start()
+        for _ in range(3):
+            self.assertEqual(sched.tick().processed, 1)
+        self.assertTrue(sched.is_finished)
+        self.assertEqual(done, [0, 1, 2])
+
+    def test_pause_resume_cancel(self):
+        sched, _clock, done = self._make(cost_ms=1.0, budget_ms=2.0)
+        sched.enqueue(range(10))
+        sched.start()
+        sched.tick()
+        sched.pause()
+        self.assertEqual(sched.tick().processed, 0)
+        sched.resume()
+        self.assertGreater(sched.tick().processed, 0)
+
+        finished = []
+        sched._on_finished = finished.append
+        sched.cancel()
+        self.assertEqual(sched.state, SchedulerState.CANCELLED)
+        self.assertEqual(sched.pending, 0)
+        self.assertEqual(finished, [sched])
+        self.assertEqual(sched.tick().processed, 0)
+        self.assertLess(len(done), 10)
+
+    def test_errors_are_reported_and_do_not_stop_batch(self):
+        clock = FakeClock()
+        results = []
+
+        def process(item):
+            clock.advance(1.0)
+            if item == 2:
+                raise ValueError("boom")
+            return item * 10
+
+        sched = TickBudgetScheduler(process, budget_ms=100.0, clock=clock, initial_slice=10,
+                                    on_result=lambda i, r, e: results.append((i, r, e is not None)))
+        sched.enqueue(range(4))
+        sched.start()
+        sched.tick()
+        self.assertEqual(results, [(0, 0, False), (1, 10, False), (2, None, True), (3, 30, False)])
+        self.assertEqual(sched.error_total, 1)
+        self.assertTrue(sched.is_finished)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,66 @@
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import compile_rules, resolve_params  # noqa: E402
+from type_define import AddressMode, CompressionKind  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+
+
+class TestResolutionTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+
+    def test_full_cross_product_precomputed(self):
+        """同梱設定では 6 種 × 9 アドレス = 54 通りを読み込み時に作る。"""
+        self.assertTrue(self.rules.table.precomputed)
+        self.assertEqual(len(self.rules.table), 6 * 9)
+
+    def test_matches_step_by_step_resolution(self):
+        for keys, params in self.rules.table.items():
+            with self.subTest(keys=keys):
+                expected = resolve_params(keys, self.rules.texture_settings, self.rules.suffix_settings)
+                self.assertEqual(params, expected)
+
+    def test_resolve_path(self):
+        match, params = self.rules.resolve_path("/Game/VFX/T_Smoke_NML_cw.T_Smoke_NML_cw")
+        self.assertTrue(match.ok)
+        self.assertEqual(params.compression, CompressionKind.NORMAL_MAP)
+        self.assertEqual((params.address_u, params.address_v), (AddressMode.CLAMP, AddressMode.WRAP))
+        # 元の texture_settings は書き換えない
+        self.assertEqual(self.rules.texture_settings["nml"].address_u, AddressMode.WRAP)
+
+        match, params = self.rules.resolve_path("/Game/VFX/T_Smoke_cw.T_Smoke_cw")
+        self.assertFalse(match.ok)
+        self.assertIsNone(params)
+
+    def test_export_csv(self):
+        with tempfile.TemporaryDirectory() as d:
+            long_path = Path(d, "long.csv")
+            self.rules.table.export_csv(long_path)
+            with long_path.open(encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0][:2], ["texture_type", "address_suffix_2d"])
+            self.assertEqual(len(rows), 1 + 54)
+
+            matrix_path = Path(d, "matrix.csv")
+            self.rules.table.export_csv(matrix_path, matrix=True)
+            with matrix_path.open(encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(len(rows), 1 + 6)
+            self.assertEqual(len(rows[0]), 1 + 9)
+            self.assertTrue(rows[1][1].startswith("BC7/ON/1024"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
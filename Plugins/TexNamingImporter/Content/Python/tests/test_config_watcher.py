@@ -0,0 +1,101 @@
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from config_watcher import ConfigWatcher  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        for name in ("TextureConfig.json", "SuffixConfig.json", "Config.json"):
+            shutil.copy(CONFIG_DIR / name, self.dir / name)
+        self.suffix_path = self.dir / "SuffixConfig.json"
+        self.clock = FakeClock()
+        self.out = io.StringIO()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _watcher(self, **kw):
+        return ConfigWatcher(self.dir / "TextureConfig.json", self.suffix_path, self.dir / "Config.json",
+                             debounce=0.5, clock=self.clock, **kw)
+
+    def _poll(self, w, advance: float = 0.0) -> bool:
+        self.clock.now += advance
+        with redirect_stdout(self.out), redirect_stderr(self.out):
+            return w.poll_once()
+
+    def _edit_suffix(self, mutate):
+        data = json.loads(self.suffix_path.read_text(encoding="utf-8"))
+        mutate(data)
+        self.suffix_path.write_text(json.dumps(data), encoding="utf-8")
+
+    def test_reload_after_debounce(self):
+        w = self._watcher()
+        old = w.rules
+        self.assertFalse(self._poll(w))
+        self._edit_suffix(lambda d: d["texture_type"].append("dtl"))
+        self.assertFalse(self._poll(w))            # 検出直後は待つ
+        self.assertFalse(self._poll(w, 0.2))
+        self.assertTrue(self._poll(w, 0.4))        # 静まったら差し替え
+        self.assertIsNot(w.rules, old)
+        self.assertTrue(w.rules.resolve_path("/Game/VFX/T_Smoke_dtl_cc.T_Smoke_dtl_cc")[0].ok)
+        self.assertFalse(self._poll(w, 1.0))       # 以降は変化なし
+        self.assertEqual(w.reload_count, 1)
+
+    def test_invalid_config_keeps_previous_rules(self):
+        errors = []
+        w = self._watcher(on_error=errors.append)
+        old = w.rules
+        self.suffix_path.write_text("{ broken", encoding="utf-8")
+        self._poll(w)
+        self.assertFalse(self._poll(w, 1.0))
+        self.assertIs(w.rules, old)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("keeping previous rules", self.out.getvalue())
+
+        # 直せば次の変化で読み直す
+        shutil.copy(CONFIG_DIR / "SuffixConfig.json", self.suffix_path)
+        self._poll(w)
+        self.assertTrue(self._poll(w, 1.0))
+        self.assertIsNone(w.last_error)
+
+    def test_background_thread(self):
+        reloaded = []
+        w = ConfigWatcher(self.dir / "TextureConfig.json", self.suffix_path, self.dir / "Config.json",
+                          interval=0.01, debounce=0.0, on_reload=reloaded.append)
+        with redirect_stdout(self.out), w:
+            self._edit_suffix(lambda d: d["texture_type"].append("dtl"))
+            deadline = time.monotonic() + 5.0
+            while not reloaded and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(len(reloaded), 1)
+        self.assertIs(w.rules, reloaded[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import build_rules  # noqa: E402
+from config import Config  # noqa: E402
+from directory_overrides import DirectoryOverrideIndex, directory_of  # noqa: E402
+from suffix_config import load_texture_suffix_config  # noqa: E402
+from texture_config import TextureConfigParams, load_params_map_json  # noqa: E402
+from type_define import TextureGroupKind  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+
+RAW_OVERRIDES = {
+    "/Game/VFX": {"*": {"texture_group": "EFFECTS", "max_in_game": 1024}},
+    "/Game/VFX/Smoke": {"*": {"max_in_game": 512}, "NML": {"max_in_game": 256}},
+    "/Game/UI": {"*": {"texture_group": "UI", "mip_gen": "NO_MIPMAPS"}},
+}
+
+
+def _config_dict(overrides):
+    data = json.loads((CONFIG_DIR / "Config.json").read_text(encoding="utf-8"))
+    data["directory_overrides"] = overrides
+    return data
+
+
+class TestDirectoryOverrides(unittest.TestCase):
+    def setUp(self):
+        self.overrides = Config.from_dict(_config_dict(RAW_OVERRIDES)).directory_overrides
+        self.index = DirectoryOverrideIndex(self.overrides)
+
+    def test_merge_order_root_to_leaf(self):
+        base = TextureConfigParams(max_in_game=2048)
+        vfx = self.index.apply(base, "/Game/VFX/Fire", ("col", "cc"))
+        self.assertEqual((vfx.texture_group, vfx.max_in_game), (TextureGroupKind.EFFECTS, 1024))
+        smoke = self.index.apply(base, "/game/vfx/smoke/Dense", ("col", "cc"))
+        self.assertEqual((smoke.texture_group, smoke.max_in_game), (TextureGroupKind.EFFECTS, 512))
+        smoke_nml = self.index.apply(base, "/Game/VFX/Smoke", ("nml", "cc"))
+        self.assertEqual(smoke_nml.max_in_game, 256)
+        self.assertEqual(base.max_in_game, 2048)  # 元は変更しない
+
+    def test_no_override_returns_base_and_cache_is_shared(self):
+        base = TextureConfigParams()
+        self.assertIs(self.index.apply(base, "/Game/Characters", ("col", "cc")), base)
+        a = self.index.apply(base, "/Game/UI/Icons", ("col", "cc"))
+        self.assertIs(self.index.apply(base, "/Game/UI/Icons", ("col", "cc")), a)
+        self.assertEqual(len(self.index.chain("/Game/VFX/Smoke/Dense")), 2)
+
+    def test_rules_resolve_path(self):
+        rules = build_rules(load_params_map_json(CONFIG_DIR / "TextureConfig.json"),
+                            load_texture_suffix_config(CONFIG_DIR / "SuffixConfig.json"), self.overrides)
+        match, params = rules.resolve_path("/Game/UI/Icons/T_Heart_col_cc.T_Heart_col_cc")
+        self.assertTrue(match.ok)
+        self.assertEqual(params.texture_group, TextureGroupKind.UI)
+        _, plain = rules.resolve_path("/Game/Props/T_Heart_col_cc.T_Heart_col_cc")
+        self.assertIs(plain, rules.table.resolve(match.keys_by_row))
+        self.assertEqual(directory_of("/Game/UI/T_A.T_A"), "/Game/UI")
+
+    def test_invalid_override_is_rejected(self):
+        for bad in ({"Game/VFX": {}}, {"/Game/VFX": {"*": {"max_size": 1}}},
+                    {"/Game/VFX": {"*": {"texture_group": "NOPE"}}}):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                Config.from_dict(_config_dict(bad))
+        self.assertEqual(Config.from_dict(_config_dict(RAW_OVERRIDES)).to_dict()["directory_overrides"]["/Game/UI"]["*"],
+                         {"texture_group": "UI", "mip_gen": "NO_MIPMAPS"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import gzip
+import importlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from detail_unreal import unreal_standin  # noqa: E402
+from event_log import EventLog, EventRecorder, ImportEvent, config_hashes, read_events, session_offsets  # noqa: E402
+from event_replay import percentiles, replay  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+CONFIGS = tuple(str(CONFIG_DIR / n) for n in ("TextureConfig.json", "SuffixConfig.json", "Config.json"))
+_UNREAL_MODULES = ("texture_configurator", "detail_unreal.texture_configurator_unreal",
+                   "detail_unreal.tick_scheduler_unreal")
+
+
+class FakeClock:
+    """sleep で進む時計。呼び出し 1 回ごとに step 秒の処理時間も進める。"""
+
+    def __init__(self, step: float = 0.0):
+        self.now = 0.0
+        self.step = step
+        self.slept = []
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestEventLog(unittest.TestCase):
+    def test_round_trip_across_sessions(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "session.jsonl.gz"
+            with EventRecorder(path, {"config": "a"}) as rec:
+                rec.record(ImportEvent(10.0, "/Game/VFX/T_B_col_cc.T_B_col_cc", "f1", "ok", 0.002))
+            with EventRecorder(path, {"config": "b"}) as rec:
+                rec.record(ImportEvent(5.0, "/Game/VFX/T_A_col_cc.T_A_col_cc", "f1", "unchanged", 0.0005))
+            log = read_events(path)
+        self.assertFalse(log.truncated)
+        self.assertEqual([s["configs"]["config"] for s in log.sessions], ["a", "b"])
+        # セッションの順（ファイルの順）を保ち、その中で時刻順
+        self.assertEqual([(e.session, e.time) for e in log.events], [(0, 10.0), (1, 5.0)])
+        self.assertEqual(log.events[1].status, "unchanged")
+
+    def test_torn_tail_keeps_flushed_events(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "session.jsonl.gz"
+            rec = EventRecorder(path, flush_every=2)
+            for i in range(5):
+                rec.record(ImportEvent(float(i), f"/Game/VFX/T_{i}_col_cc.T_{i}_col_cc", "", "ok", 0.001))
+            # 閉じずに落ちた: 4 件目までは同期フラッシュ済み、5 件目は圧縮器の中
+            rec._f.fileobj.flush()
+            log = read_events(path)
+            rec.close()
+        self.assertTrue(log.truncated)
+        self.assertEqual(len(log.events), 4)
+
+    def test_append_after_crash_keeps_both_sessions(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "session.jsonl.gz"
+            rec = EventRecorder(path, {"config": "a"})
+            for i in range(300):
+                rec.record(ImportEvent(float(i), f"/Game/VFX/T_{i}_col_cc.T_{i}_col_cc", "", "ok", 0.001))
+            # 強制終了: 256 件目の同期フラッシュまでがディスクにあり、gzip の末尾は書かれていない
+            rec._f.fileobj.flush()
+            torn = path.read_bytes()
+            rec.close()
+            path.write_bytes(torn)
+            with EventRecorder(path, {"config": "b"}) as rec:
+                for i in range(10):
+                    rec.record(ImportEvent(1000.0 + i, f"/Game/VFX/U_{i}_col_cc.U_{i}_col_cc", "", "ok", 0.001))
+            log = read_events(path)
+        self.assertTrue(log.truncated)
+        self.assertEqual([s["configs"]["config"] for s in log.sessions], ["a", "b"])
+        self.assertEqual(len(log.events), 266)
+        self.assertEqual([e.session for e in log.events[255:257]], [0, 1])
+
+    def test_session_offsets_skip_gaps(self):
+        events = [ImportEvent(100.0, "a", "", "ok", 0.5), ImportEvent(102.0, "b", "", "ok", 1.0),
+                  ImportEvent(9000.0, "c", "", "ok", 0.5, session=1), ImportEvent(9004.0, "d", "", "ok", 0.5, session=1)]
+        self.assertEqual(session_offsets(events), [0.0, 2.0, 3.0, 7.0])
+
+    def test_compact(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "session.jsonl.gz"
+            with EventRecorder(path) as rec:
+                for i in range(1000):
+                    rec.record(ImportEvent(1.7e9 + i * 0.01, f"/Game/VFX/Smoke/T_Smoke{i}_col_cc.T_Smoke{i}_col_cc",
+                                           "0123456789abcdef", "ok", 0.0012))
+            self.assertLess(path.stat().st_size, 20 * 1000)
+
+    def test_percentiles(self):
+        stats = percentiles([float(i) for i in range(1, 101)])
+        self.assertEqual((stats["p50"], stats["p95"], stats["p99"], stats["max"]), (50.0, 95.0, 99.0, 100.0))
+        self.assertEqual(percentiles([])["max"], 0.0)
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("unreal")
+        self.unreal = unreal_standin.install()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        self.mod = importlib.import_module("texture_configurator")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "session.jsonl.gz"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        unreal_standin.uninstall()
+        if self._saved is not None:
+            sys.modules["unreal"] = self._saved
+
+    def _record(self, paths, times):
+        for path in paths:
+            self.unreal.add_texture(path)
+        # 先頭はヘッダ、続いて 1 件ごとの開始時刻（最後の 1 つは入力の終わりを確かめるときのもの）
+        clock = iter(times)
+        with EventRecorder(self.log_path, config_hashes(*CONFIGS), clock=lambda: next(clock)) as rec, \
+                redirect_stdout(io.StringIO()):
+            return dict(self.mod.iter_texture_property_from_config(paths, *CONFIGS,
+                                                                  hooks=self.mod.BatchHooks(recorder=rec)))
+
+    def test_pipeline_records_events(self):
+        good = "/Game/VFX/T_Smoke_nml_cc.T_Smoke_nml_cc"
+        bad = "/Game/VFX/T_Smoke_nlm_cc.T_Smoke_nlm_cc"
+        self._record([good, bad], [100.0, 101.0, 102.5, 103.0])
+        log = read_events(self.log_path)
+        self.assertEqual([(e.path, e.time, e.status) for e in log.events],
+                         [(good, 101.0, "ok"), (bad, 102.5, "suffix")])
+        self.assertTrue(log.events[0].config)
+        self.assertEqual(log.events[1].config, "")
+        self.assertEqual(log.sessions[0]["configs"], config_hashes(*CONFIGS))
+
+    def test_replay_at_max_speed(self):
+        paths = [f"/Game/VFX/T_Smoke{i}_nml_cc.T_Smoke{i}_nml_cc" for i in range(3)]
+        self._record(paths, [0.0, 0.0, 10.0, 20.0, 21.0])
+        fake = FakeClock(step=0.001)
+        report = replay(read_events(self.log_path), *CONFIGS, speed=0,
+                        latency={"Texture.post_edit_change": 0.5}, clock=fake, sleep=fake.sleep)
+        self.assertEqual(report.events, 3)
+        self.assertEqual(report.replayed_status, {"ok": 3})
+        self.assertEqual(report.recorded_status, {"ok": 3})
+        self.assertEqual(report.params_changed, 0)
+        self.assertEqual(report.config_changed, [])
+        # 最大速度では予定時刻を待たない（sleep は注入した遅延だけ）
+        self.assertTrue(all(s == 0.5 for s in fake.slept))
+        self.assertGreaterEqual(report.service["p50"], 0.5)
+        self.assertEqual(report.latency, report.service)
+        self.assertLess(report.wall_seconds, 20.0)
+        self.assertIs(sys.modules.get("unreal"), None)
+
+    def test_replay_keeps_original_pacing(self):
+        paths = [f"/Game/VFX/T_Smoke{i}_col_cc.T_Smoke{i}_col_cc" for i in range(3)]
+        self._record(paths, [0.0, 0.0, 10.0, 20.0, 21.0])
+        fake = FakeClock()
+        report = replay(read_events(self.log_path), *CONFIGS, speed=2.0, clock=fake, sleep=fake.sleep)
+        self.assertEqual(fake.slept, [5.0, 5.0])
+        self.assertAlmostEqual(report.wall_seconds, 10.0)
+        self.assertAlmostEqual(report.latency["max"], 0.0)
+
+    def test_replay_rebases_each_session(self):
+        paths = [f"/Game/VFX/T_Smoke{i}_col_cc.T_Smoke{i}_col_cc" for i in range(4)]
+        log = EventLog([{"version": 1, "configs": {}}] * 2,
+                       [ImportEvent(0.0, paths[0], "", "ok", 1.0), ImportEvent(4.0, paths[1], "", "ok", 1.0),
+                        ImportEvent(86400.0, paths[2], "", "ok", 1.0, session=1),
+                        ImportEvent(86402.0, paths[3], "", "ok", 1.0, session=1)])
+        fake = FakeClock()
+        report = replay(log, *CONFIGS, speed=1.0, clock=fake, sleep=fake.sleep)
+        # 2 つ目のセッションは 1 つ目の最後の処理（4 + 1 秒）の直後から始まる
+        self.assertEqual(fake.slept, [4.0, 1.0, 2.0])
+        self.assertAlmostEqual(report.wall_seconds, 7.0)
+        self.assertAlmostEqual(report.recorded_wall_seconds, 8.0)
+
+    def test_replay_reports_config_drift(self):
+        path = "/Game/VFX/T_Smoke_nml_cc.T_Smoke_nml_cc"
+        log = EventLog([{"version": 1, "configs": {"texture_config": "old"}}],
+                       [ImportEvent(0.0, path, "0" * 32, "ok", 0.01)])
+        fake = FakeClock()
+        report = replay(log, *CONFIGS, speed=0, clock=fake, sleep=fake.sleep)
+        self.assertEqual(report.params_changed, 1)
+        self.assertEqual(report.config_changed, ["texture_config"])
+        self.assertEqual(json.loads(json.dumps(report.to_dict()))["events"], 1)
+
+    def test_apply_writes_log(self):
+        path = "/Game/VFX/T_Smoke_nml_cc.T_Smoke_nml_cc"
+        self.unreal.add_texture(path)
+        with redirect_stdout(io.StringIO()):
+            self.mod.apply_texture_property_from_config([path], *CONFIGS,
+                                                          options=self.mod.BatchOptions(record_path=self.log_path))
+        with gzip.open(self.log_path, "rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])[1], path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import hashlib
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from fingerprint import (  # noqa: E402
+    SourceFingerprint, TAG_SOURCE_SIZE, compute_fingerprint, hash_file, params_fingerprint,
+)
+from texture_config import TextureConfigParams  # noqa: E402
+from type_define import CompressionKind  # noqa: E402
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_hash_file_matches_one_shot_hash(self):
+        data = bytes(range(256)) * 4099  # チャンク境界をまたぐ半端なサイズ
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d, "src.exr")
+            p.write_bytes(data)
+            expected = hashlib.blake2b(data, digest_size=16).hexdigest()
+            for chunk in (1, 7, 4096, 1 << 20):
+                with self.subTest(chunk=chunk):
+                    self.assertEqual(hash_file(p, chunk_size=chunk), expected)
+            fp = compute_fingerprint(p, "cfg")
+            self.assertEqual(fp.source_size, len(data))
+            self.assertEqual(SourceFingerprint.from_tags(fp.to_tags()), fp)
+
+    def test_params_fingerprint_tracks_values(self):
+        a = TextureConfigParams(compression=CompressionKind.MASKS)
+        b = TextureConfigParams(compression=CompressionKind.MASKS)
+        c = TextureConfigParams(compression=CompressionKind.NORMAL_MAP)
+        self.assertEqual(params_fingerprint(a), params_fingerprint(b))
+        self.assertNotEqual(params_fingerprint(a), params_fingerprint(c))
+
+    def test_from_tags_rejects_missing_or_broken(self):
+        fp = SourceFingerprint("ab", 3, "cd")
+        tags = fp.to_tags()
+        self.assertIsNone(SourceFingerprint.from_tags({}))
+        self.assertIsNone(SourceFingerprint.from_tags({**tags, TAG_SOURCE_SIZE: "x"}))
+        self.assertIsNone(SourceFingerprint.from_tags({**tags, TAG_SOURCE_SIZE: ""}))
+
+
+if __name__ == "__main__":
+    unittest.main()
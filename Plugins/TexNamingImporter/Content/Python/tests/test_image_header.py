@@ -0,0 +1,200 @@
+import io
+import random
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from image_header import (  # noqa: E402
+    MAX_SCAN_BYTES, ImageHeader, ImageHeaderError, _read_exr, clamp_max_size, read_image_header, source_warnings,
+)
+
+
+# ---------- 合成ヘッダ ----------
+def png(w, h, color_type=6, depth=8):
+    ihdr = struct.pack(">IIBBBBB", w, h, depth, color_type, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + ihdr + b"\0" * 4
+
+
+def jpeg(w, h, components=3, exif_size=0):
+    out = b"\xff\xd8"
+    if exif_size:
+        out += b"\xff\xe1" + struct.pack(">H", exif_size + 2) + b"\0" * exif_size
+    out += b"\xff\xdb" + struct.pack(">H", 67) + b"\0" * 65  # DQT
+    out += b"\xff\xc2" + struct.pack(">HBHHB", 8 + 3 * components, 8, h, w, components) + b"\0" * 3 * components
+    return out
+
+
+def tga(w, h, depth=32, image_type=2, descriptor=8):
+    return struct.pack("<BBBHHBHHHHBB", 0, 0, image_type, 0, 0, 0, 0, 0, w, h, depth, descriptor)
+
+
+def psd(w, h, channels=4, depth=16):
+    return b"8BPS" + struct.pack(">H6sHIIHH", 1, b"\0" * 6, channels, h, w, depth, 3)
+
+
+def dds(w, h, fourcc=b"DXT5", dxgi=None, pf_flags=0x4, rgb_bits=0):
+    header = bytearray(128)
+    header[0:4] = b"DDS "
+    struct.pack_into("<IIII", header, 4, 124, 0x1007, h, w)
+    struct.pack_into("<II4sI", header, 76, 32, pf_flags, fourcc, rgb_bits)
+    if dxgi is not None:
+        header += struct.pack("<IIIII", dxgi, 3, 0, 1, 0)
+    return bytes(header)
+
+
+def exr_attr(name, type_name, value, size=None):
+    return name + b"\0" + type_name + b"\0" + struct.pack("<i", len(value) if size is None else size) + value
+
+
+def exr(w, h, channel_types=(1, 1, 1, 1), padding=0):
+    attr = exr_attr
+
+    chlist = b"".join(n + b"\0" + struct.pack("<iB3xii", t, 0, 1, 1)
+                      for n, t in zip((b"A", b"B", b"G", b"R"), channel_types)) + b"\0"
+    out = b"\x76\x2f\x31\x01" + struct.pack("<I", 2)
+    if padding:
+        out += attr(b"comments", b"string", b"x" * padding)
+    out += attr(b"channels", b"chlist", chlist)
+    out += attr(b"compression", b"compression", b"\x03")
+    out += attr(b"dataWindow", b"box2i", struct.pack("<iiii", 0, 0, w - 1, h - 1))
+    return out + b"\0"
+
+
+class TestReadImageHeader(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _read(self, name, data):
+        p = self.dir / name
+        p.write_bytes(data)
+        return read_image_header(p)
+
+    def test_formats(self):
+        cases = [
+            ("a.png", png(1024, 512), ImageHeader("png", 1024, 512, 4, 8)),
+            ("a16.png", png(64, 64, color_type=0, depth=16), ImageHeader("png", 64, 64, 1, 16)),
+            ("pal.png", png(32, 16, color_type=3, depth=4), ImageHeader("png", 32, 16, 3, 8)),
+            ("a.jpg", jpeg(1920, 1080), ImageHeader("jpeg", 1920, 1080, 3, 8)),
+            ("exif.jpg", jpeg(640, 480, components=1, exif_size=4000), ImageHeader("jpeg", 640, 480, 1, 8)),
+            ("a.tga", tga(256, 128), ImageHeader("tga", 256, 128, 4, 8)),
+            ("gray.TGA", tga(16, 16, depth=8, image_type=3, descriptor=0), ImageHeader("tga", 16, 16, 1, 8)),
+            ("a.psd", psd(2048, 2048), ImageHeader("psd", 2048, 2048, 4, 16)),
+            ("a.dds", dds(512, 256), ImageHeader("dds", 512, 256, 4, 0)),
+            ("bc5.dds", dds(128, 128, fourcc=b"ATI2"), ImageHeader("dds", 128, 128, 2, 0)),
+            ("hdr.dds", dds(64, 32, fourcc=b"DX10", dxgi=10), ImageHeader("dds", 64, 32, 4, 16, True)),
+            ("rgba.dds", dds(8, 8, fourcc=b"\0\0\0\0", pf_flags=0x41, rgb_bits=32), ImageHeader("dds", 8, 8, 4, 8)),
+            ("a.exr", exr(4096, 2048), ImageHeader("exr", 4096, 2048, 4, 16, True)),
+            ("big.exr", exr(100, 60, (2, 2, 2), padding=3000), ImageHeader("exr", 100, 60, 3, 32, True)),
+        ]
+        for name, data, expected in cases:
+            with self.subTest(name=name):
+                self.assertEqual(self._read(name, data), expected)
+
+    def test_unknown_format_returns_none(self):
+        self.assertIsNone(self._read("a.bin", b"hello world"))
+        self.assertIsNone(self._read("a.png", b"\x89PNG" + bytes(64)))  # シグネチャ不一致
+
+    def test_truncated_header_raises(self):
+        for name, data in (("a.png", png(4, 4)[:20]), ("a.dds", dds(4, 4)[:64]),
+                           ("a.jpg", jpeg(4, 4)[:30]), ("a.exr", exr(4, 4)[:40]), ("a.tga", tga(4, 4)[:10])):
+            with self.subTest(name=name):
+                with self.assertRaises(ImageHeaderError):
+                    self._read(name, data)
+
+
+class _ReadSizeRecorder(io.BytesIO):
+    """1 回の read で要求された最大バイト数を覚える。"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.largest = 0
+
+    def read(self, n=-1):
+        self.largest = max(self.largest, n if n is not None and n >= 0 else 1 << 62)
+        return super().read(n)
+
+
+class TestMalformedExr(unittest.TestCase):
+    MAGIC = b"\x76\x2f\x31\x01" + struct.pack("<I", 2)
+
+    def _read(self, data):
+        f = _ReadSizeRecorder(data)
+        try:
+            return _read_exr(f.read(512), f)
+        finally:
+            self.assertLessEqual(f.largest, MAX_SCAN_BYTES)
+
+    def test_malformed_attributes_raise_header_error(self):
+        chlist = b"R\0" + struct.pack("<iB3xii", 1, 0, 1, 1) + b"\0"
+        cases = {
+            "short dataWindow": exr_attr(b"dataWindow", b"box2i", b"\0" * 8) + b"\0",
+            "truncated chlist": exr_attr(b"channels", b"chlist", b"R\0\1\0") + b"\0",
+            "unterminated channel name": exr_attr(b"channels", b"chlist", b"RGBA") + b"\0",
+            "negative size": exr_attr(b"comments", b"string", b"", size=-5) + b"\0",
+            "inverted window": exr_attr(b"channels", b"chlist", chlist)
+            + exr_attr(b"dataWindow", b"box2i", struct.pack("<iiii", 10, 0, 2, 4)) + b"\0",
+        }
+        for name, body in cases.items():
+            with self.subTest(name=name):
+                with self.assertRaises(ImageHeaderError):
+                    self._read(self.MAGIC + body)
+
+    def test_oversized_attribute_is_rejected_before_reading(self):
+        data = self.MAGIC + exr_attr(b"comments", b"string", b"x" * 4096, size=0x7FFFFFFF)
+        with self.assertRaises(ImageHeaderError):
+            self._read(data)
+
+    def test_fuzzed_headers_only_raise_header_error(self):
+        rng = random.Random(1234)
+        valid = exr(64, 32, padding=40)
+        for i in range(500):
+            data = bytearray(valid)
+            for _ in range(rng.randint(1, 8)):
+                data[rng.randrange(8, len(data))] = rng.randrange(256)
+            data = bytes(data[:rng.randint(8, len(data))])
+            with self.subTest(i=i):
+                try:
+                    header = self._read(data)
+                except ImageHeaderError:
+                    continue
+                self.assertGreater(header.width, 0)
+                self.assertGreater(header.height, 0)
+
+    def test_read_image_header_wraps_parse_errors(self):
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d, "bad.exr")
+            p.write_bytes(self.MAGIC + exr_attr(b"dataWindow", b"box2i", b"\0" * 8) + b"\0")
+            with self.assertRaises(ImageHeaderError):
+                read_image_header(p)
+
+
+class TestSourceRules(unittest.TestCase):
+    def test_clamp_max_size(self):
+        src = ImageHeader("png", 1000, 600, 3, 8)
+        self.assertEqual(clamp_max_size(2048, src), 1000)
+        self.assertEqual(clamp_max_size(2048, src, enforce_pow2=True), 1024)
+        self.assertEqual(clamp_max_size(512, src), 512)
+        self.assertEqual(clamp_max_size(0, src), 0)        # 0 = 無制限は触らない
+        self.assertEqual(clamp_max_size(2048, None), 2048)
+
+    def test_source_warnings(self):
+        self.assertEqual(source_warnings(ImageHeader("png", 1024, 512, 4, 8)), [])
+        self.assertEqual(len(source_warnings(ImageHeader("png", 1000, 600, 4, 8))), 1)   # 4 の倍数だが非 2 の冪
+        self.assertEqual(len(source_warnings(ImageHeader("png", 1001, 600, 4, 8))), 2)
+        self.assertEqual(source_warnings(None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
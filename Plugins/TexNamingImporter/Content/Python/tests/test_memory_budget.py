@@ -0,0 +1,165 @@
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import compile_rules  # noqa: E402
+from config import Config, MemoryBudget  # noqa: E402
+from memory_budget import BudgetSolver, log_plan, merge_overrides, rules_with_budget  # noqa: E402
+from memory_estimator import _np as np  # noqa: E402
+from texture_config import TextureConfigParams  # noqa: E402
+from type_define import CompressionKind  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+MB = 1024 * 1024
+
+COL = TextureConfigParams(compression=CompressionKind.BC7, max_in_game=2048)
+NML = TextureConfigParams(compression=CompressionKind.NORMAL_MAP, max_in_game=2048)
+
+
+def _textures(directory, n=10, size=2048):
+    rows = []
+    for i in range(n):
+        rows.append((f"{directory}/T_C{i}_col_cc.T_C{i}_col_cc", "col", COL, size, size, 3, 8))
+        rows.append((f"{directory}/T_N{i}_nml_cc.T_N{i}_nml_cc", "nml", NML, size, size, 3, 8))
+    return rows
+
+
+class TestMemoryBudgetConfig(unittest.TestCase):
+    def test_parse(self):
+        data = Config.load(CONFIG_DIR / "Config.json").to_dict()
+        data["memory_budgets"] = {"/Game/VFX": {"budget_mb": 256, "priority": {"col": 2}}}
+        config = Config.from_dict(data)
+        self.assertEqual(config.memory_budgets["/Game/VFX"], MemoryBudget(256.0, {"col": 2.0}))
+        self.assertEqual(Config.from_dict(config.to_dict()).memory_budgets, config.memory_budgets)
+        for bad in ({"budget_mb": 0}, {"budget_mb": 1, "priority": {"col": -1}}, {"budget_mb": 1, "limit": 2}):
+            with self.subTest(bad=bad):
+                data["memory_budgets"] = {"/Game/VFX": bad}
+                with self.assertRaises(ValueError):
+                    Config.from_dict(data)
+
+
+@unittest.skipIf(np is None, "NumPy がインストールされていません")
+class TestBudgetSolver(unittest.TestCase):
+    def test_ample_budget_keeps_config(self):
+        solver = BudgetSolver({"/Game/VFX": MemoryBudget(1024)})
+        self.assertEqual(solver.add_many(_textures("/Game/VFX") + _textures("/Game/Env")), 20)
+        plan = solver.solve()
+        self.assertEqual(plan.subtrees[0].sizes, {"col": 0, "nml": 0})
+        self.assertTrue(plan.subtrees[0].within)
+        self.assertEqual(plan.overrides, {})
+
+    def test_tight_budget_and_priority(self):
+        solver = BudgetSolver({"/Game/VFX": MemoryBudget(40)})
+        solver.add_many(_textures("/Game/VFX/A", 5) + _textures("/Game/VFX/B", 5))
+        plan = solver.solve().subtrees[0]
+        self.assertEqual(plan.sizes, {"col": 1024, "nml": 1024})
+        self.assertGreater(plan.before_bytes, 100 * MB)
+        self.assertLessEqual(plan.after_bytes, 40 * MB)
+
+        solver = BudgetSolver({"/Game/VFX": MemoryBudget(40, {"col": 10})})
+        solver.add_many(_textures("/Game/VFX/A", 5) + _textures("/Game/VFX/B", 5))
+        result = solver.solve()
+        plan = result.subtrees[0]
+        self.assertTrue(plan.within)
+        self.assertLess(plan.sizes["nml"], plan.sizes["col"])
+        # 子ディレクトリの上書きより優先させるため、テクスチャのあるディレクトリごとに置く
+        self.assertEqual(sorted(result.overrides), ["/Game/VFX/A", "/Game/VFX/B"])
+        self.assertEqual(result.overrides["/Game/VFX/A"]["nml"], {"max_in_game": plan.sizes["nml"]})
+
+    def test_override_never_raises_directory_cap(self):
+        # /Game/UI は directory_overrides で nml=256、/Game/Chars は既定の 1024
+        ui = TextureConfigParams(compression=CompressionKind.NORMAL_MAP, max_in_game=256)
+        chars = TextureConfigParams(compression=CompressionKind.NORMAL_MAP, max_in_game=1024)
+        rows = [(f"/Game/UI/T_U{i}_nml_cc.T_U{i}_nml_cc", "nml", ui, 2048, 2048, 3, 8) for i in range(4)]
+        rows += [(f"/Game/Chars/T_C{i}_nml_cc.T_C{i}_nml_cc", "nml", chars, 2048, 2048, 3, 8) for i in range(4)]
+        solver = BudgetSolver({"/Game": MemoryBudget(3)})
+        solver.add_many(rows)
+        result = solver.solve()
+        plan = result.subtrees[0]
+        self.assertEqual(plan.sizes, {"nml": 512})
+        self.assertTrue(plan.within)
+        # UI は既に 512 以下なので上書きしない（256 → 512 に上がらない）
+        self.assertEqual(result.overrides, {"/Game/Chars": {"nml": {"max_in_game": 512}}})
+
+        self.assertEqual(result.lowered, [])
+
+        # 同じディレクトリに cap の違うものが混ざっても、小さい方より上には書かない。
+        # cap 1024 のテクスチャは割り当て（512）より小さくなるので、計画と違うことを報告する
+        solver.add("/Game/Chars/T_X_nml_cc.T_X_nml_cc", "nml", ui, width=2048, height=2048)
+        mixed = solver.solve()
+        self.assertEqual(mixed.subtrees[0].sizes, {"nml": 512})
+        self.assertEqual(mixed.overrides["/Game/Chars"]["nml"], {"max_in_game": 256})
+        self.assertEqual(mixed.lowered, [("/Game/Chars", "nml", 512, 256)])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            log_plan(mixed)
+        self.assertIn("/Game/Chars nml: lowered below plan (512 -> 256)", out.getvalue())
+
+        with tempfile.TemporaryDirectory() as d:
+            state = Path(d) / "budget.json"
+            solver.save(state)
+            loaded = BudgetSolver.load_or_new(state, solver.budgets)
+        self.assertEqual(loaded.solve().overrides, solver.solve().overrides)
+
+    def test_unreachable_budget(self):
+        solver = BudgetSolver({"/Game/VFX": MemoryBudget(0.001)})
+        solver.add_many(_textures("/Game/VFX", 2))
+        plan = solver.solve().subtrees[0]
+        self.assertFalse(plan.within)
+        self.assertEqual(plan.sizes, {"col": 256, "nml": 256})
+
+    def test_incremental(self):
+        budgets = {"/Game/VFX": MemoryBudget(60), "/Game/VFX/UI": MemoryBudget(100)}
+        solver = BudgetSolver(budgets)
+        solver.add_many(_textures("/Game/VFX", 4))
+        self.assertEqual(solver.root_of("/Game/VFX/UI/Icons/T_A.T_A"), "/Game/VFX/UI")   # 最も深い予算
+        first = solver.solve()
+        self.assertEqual([p.sizes for p in first.subtrees], [{"col": 0, "nml": 0}, {}])
+
+        # 同じパスの再追加は置き換え（二重に数えない）
+        solver.add_many(_textures("/Game/VFX", 4))
+        self.assertEqual(len(solver), 8)
+        self.assertEqual(solver.solve().changes, [])
+
+        # 新しいインポートで予算を超えたら、変わった種別だけ差分に出る
+        solver.add_many(_textures("/Game/VFX/New", 6))
+        plan = solver.solve()
+        self.assertEqual(plan.changes, [("/Game/VFX", "col", 0, 1024), ("/Game/VFX", "nml", 0, 1024)])
+
+        with tempfile.TemporaryDirectory() as d:
+            state = Path(d) / "budget.json"
+            solver.save(state)
+            loaded = BudgetSolver.load_or_new(state, budgets)
+        self.assertEqual(len(loaded), len(solver))
+        again = loaded.solve()
+        self.assertEqual(again.changes, [])
+        self.assertEqual([p.after_bytes for p in again.subtrees], [p.after_bytes for p in plan.subtrees])
+
+    def test_rules_with_budget(self):
+        config = Config.load(CONFIG_DIR / "Config.json")
+        rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+        path = "/Game/VFX/T_Smoke_nml_cc.T_Smoke_nml_cc"
+        solver = BudgetSolver({"/Game/VFX": MemoryBudget(0.5)})
+        _match, params = rules.resolve_path(path)
+        solver.add(path, "nml", params, width=4096, height=4096)
+        plan = solver.solve()
+        budget_rules = rules_with_budget(rules, config, plan)
+        self.assertEqual(budget_rules.resolve_path(path)[1].max_in_game, plan.subtrees[0].sizes["nml"])
+        self.assertEqual(rules.resolve_path(path)[1].max_in_game, params.max_in_game)
+
+    def test_merge_overrides(self):
+        merged = merge_overrides({"/Game/VFX": {"NML": {"srgb": 1}}}, {"/game/vfx/": {"nml": {"max_in_game": 256}}})
+        self.assertEqual(merged, {"/Game/VFX": {"NML": {"srgb": 1, "max_in_game": 256}}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import csv
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import compile_rules  # noqa: E402
+from memory_estimator import (PIXEL_FORMATS, MemoryEstimator, _np as np, estimate_from_scan,  # noqa: E402
+                              pixel_format, texture_bytes, write_budget_report)
+from texture_config import TextureConfigParams  # noqa: E402
+from type_define import CompressionKind, MipGenKind, TextureGroupKind  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+_FORMAT = {f.name: i for i, f in enumerate(PIXEL_FORMATS)}
+
+
+def _reference_bytes(width, height, fmt, max_size, mips):
+    """1 枚ずつ素直に計算した値（ベクトル化版との比較用）。"""
+    f = PIXEL_FORMATS[fmt]
+    limit = max_size or 16384
+    while max(width, height) > limit:
+        width, height = max(1, width // 2), max(1, height // 2)
+    pow2 = width & (width - 1) == 0 and height & (height - 1) == 0
+    total = 0
+    while True:
+        total += -(-width // f.block) * -(-height // f.block) * f.block_bytes
+        if not (mips and pow2) or (width == 1 and height == 1):
+            return total
+        width, height = max(1, width // 2), max(1, height // 2)
+
+
+class TestPixelFormat(unittest.TestCase):
+    def test_pixel_format(self):
+        self.assertEqual(pixel_format(CompressionKind.DEFAULT, 3).name, "DXT1")
+        self.assertEqual(pixel_format(CompressionKind.DEFAULT, 4).name, "DXT5")
+        self.assertEqual(pixel_format(CompressionKind.MASKS).name, "DXT5")   # チャンネル数不明は大きい方
+        self.assertEqual(pixel_format(CompressionKind.GRAYSCALE, 1, 16).name, "G16")
+        self.assertEqual(pixel_format(CompressionKind.NORMAL_MAP).bits_per_pixel, 8)
+        self.assertEqual(pixel_format(CompressionKind.HDR).bits_per_pixel, 64)
+        self.assertEqual(pixel_format(CompressionKind.ALPHA).bits_per_pixel, 4)
+
+
+@unittest.skipIf(np is None, "NumPy がインストールされていません")
+class TestMemoryEstimator(unittest.TestCase):
+    def test_texture_bytes(self):
+        dxt1 = _FORMAT["DXT1"]
+        self.assertEqual(int(texture_bytes([1024], [1024], [dxt1], [0], [False])[0]), 512 * 1024)
+        # ミップ込みで約 4/3 倍（4x4 未満のミップも 1 ブロック）
+        self.assertEqual(int(texture_bytes([1024], [1024], [dxt1], [0], [True])[0]),
+                         _reference_bytes(1024, 1024, dxt1, 0, True))
+        # 最大サイズで縮む / 2 のべき乗でなければミップを作らない
+        self.assertEqual(int(texture_bytes([4096], [2048], [dxt1], [1024], [False])[0]), 1024 * 512 // 2)
+        self.assertEqual(int(texture_bytes([1000], [600], [dxt1], [0], [True])[0]), 250 * 150 * 8)
+
+    def test_matches_reference(self):
+        rng = random.Random(1)
+        rows = [(rng.choice([1, 3, 100, 256, 1000, 2048, 4096, 8192]), rng.choice([1, 64, 512, 600, 2048, 4096]),
+                 rng.randrange(len(PIXEL_FORMATS)), rng.choice([0, 256, 1024, 2048]), rng.random() < 0.7)
+                 for _ in range(2000)]
+        got = texture_bytes(*(list(c) for c in zip(*rows)))
+        self.assertEqual(got.tolist(), [_reference_bytes(*r) for r in rows])
+
+    def test_summary(self):
+        est = MemoryEstimator()
+        col = TextureConfigParams(compression=CompressionKind.BC7, max_in_game=1024, texture_group=TextureGroupKind.EFFECTS)
+        nml = TextureConfigParams(compression=CompressionKind.NORMAL_MAP, max_in_game=512,
+                                  mip_gen=MipGenKind.NO_MIPMAPS)
+        est.add("/Game/VFX/T_A_col.T_A_col", "col", col, width=2048, height=2048, channels=3)
+        est.add("/Game/VFX/T_B_col.T_B_col", "col", col)   # 寸法不明 → 1024 の正方形
+        est.add("/Game/Env/T_C_nml.T_C_nml", "nml", nml, width=512, height=512)
+        result = est.estimate()
+
+        one_col = _reference_bytes(1024, 1024, _FORMAT["BC7"], 0, True)
+        self.assertEqual(result.gpu_bytes.tolist(), [one_col, one_col, 512 * 512])
+        self.assertEqual(result.estimated.tolist(), [False, True, False])
+        self.assertEqual(result.total_gpu_bytes, 2 * one_col + 512 * 512)
+        self.assertEqual([(r.key, r.textures, r.gpu_bytes) for r in result.summary("directory")],
+                         [("/Game/VFX", 2, 2 * one_col), ("/Game/Env", 1, 512 * 512)])
+        self.assertEqual([r.key for r in result.summary("group")], ["EFFECTS", "WORLD"])
+        self.assertEqual([r.key for r in result.summary("type")], ["col", "nml"])
+        self.assertLess(result.total_disk_bytes, result.total_gpu_bytes)
+
+    def test_many_directories(self):
+        est = MemoryEstimator()
+        col = TextureConfigParams(compression=CompressionKind.BC7, max_in_game=256)
+        n = 0x10000 + 10   # uint16 のコードに収まらないディレクトリ数
+        for i in range(n):
+            est.add(f"/Game/D{i}/T_A_col.T_A_col", "col", col, width=256, height=256)
+        result = est.estimate()
+        self.assertEqual(len(result.summary("directory")), n)
+        self.assertEqual(int(result.codes["directory"][-1]), n)
+
+    def test_scan_csv_and_report(self):
+        rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+        with tempfile.TemporaryDirectory() as d:
+            scan = Path(d) / "scan.csv"
+            with scan.open("w", encoding="utf-8", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["path", "action", "asset_path", "width", "height", "channels", "bit_depth"])
+                w.writerow(["a.png", "ok", "/Game/VFX/T_A_nml_cc", 1024, 1024, 3, 8])
+                w.writerow(["b.png", "reconfigure", "/Game/VFX/T_B_col_cc", 256, 256, 4, 8])
+                w.writerow(["c.png", "reject", "/Game/VFX/T_C_xyz", "", "", "", ""])
+            result = estimate_from_scan(scan, rules)
+            self.assertEqual(result.paths, ["/Game/VFX/T_A_nml_cc", "/Game/VFX/T_B_col_cc"])
+
+            per_texture, summary = write_budget_report(result, Path(d) / "out", "batch1")
+            with per_texture.open(encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+            with summary.open(encoding="utf-8", newline="") as f:
+                totals = list(csv.DictReader(f))
+        self.assertEqual([(r["type"], r["format"]) for r in rows], [("nml", "BC5"), ("col", "BC7")])
+        self.assertEqual(totals[0]["by"], "total")
+        self.assertEqual({r["by"] for r in totals}, {"total", "directory", "group", "type"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from metrics import MetricsRegistry, PipelineMetrics  # noqa: E402
+
+
+class TestMetrics(unittest.TestCase):
+    def test_pipeline_metrics(self):
+        m = PipelineMetrics()
+        m.begin_batch()
+        m.observe_texture(("nml", "cc"), {"ok": True, "errors": []})
+        m.observe_texture(("nml", "cc"), {"ok": True, "skipped": "unchanged", "errors": []})
+        m.observe_texture(("col", None), {"ok": False, "errors": ["srgb: boom", "mip_gen: bad", "weird"]})
+        m.observe_texture(None, {"ok": False, "skipped": "suffix", "errors": ["x"]})
+        m.observe_stage("apply", 0.003)
+        m.end_batch()
+
+        self.assertEqual(m.combination_hits.get("nml_cc"), 2)
+        self.assertEqual(m.combination_hits.get("col_-"), 1)
+        self.assertEqual((m.textures.get("ok"), m.textures.get("skipped"), m.textures.get("error")), (1, 2, 1))
+        self.assertEqual(m.skipped.get("suffix"), 1)
+        self.assertEqual(m.apply_errors.get("srgb"), 1)
+        self.assertEqual(m.apply_errors.get("other"), 1)
+        self.assertEqual(m.stage_seconds.count("apply"), 1)
+        self.assertGreater(m.throughput.get(), 0)
+
+    def test_prometheus_text(self):
+        r = MetricsRegistry(prefix="t")
+        c = r.counter("hits", "Hits", ("combination",))
+        c.inc('a"b')
+        h = r.histogram("lat", "Latency", ("stage",), buckets=(0.1, 1))
+        h.observe(0.05, "apply")
+        h.observe(0.5, "apply")
+        h.observe(5, "apply")
+        g = r.gauge("rate", "Rate")
+        g.set(2.5)
+        text = r.to_prometheus()
+        self.assertIn("# TYPE t_hits_total counter", text)
+        self.assertIn('t_hits_total{combination="a\\"b"} 1', text)
+        self.assertIn('t_lat_bucket{stage="apply",le="0.1"} 1', text)
+        self.assertIn('t_lat_bucket{stage="apply",le="1"} 2', text)
+        self.assertIn('t_lat_bucket{stage="apply",le="+Inf"} 3', text)
+        self.assertIn('t_lat_count{stage="apply"} 3', text)
+        self.assertIn("t_rate 2.5", text)
+        self.assertIs(r["hits"], c)
+
+    def test_write(self):
+        m = PipelineMetrics()
+        m.observe_texture(("nml", "cc"), {"ok": True})
+        with tempfile.TemporaryDirectory() as d:
+            files = m.registry.write(d, "b1")
+            self.assertEqual([p.name for p in files], ["tex_naming.prom", "b1.metrics.json"])
+            data = json.loads(Path(d, "b1.metrics.json").read_text(encoding="utf-8"))
+            self.assertEqual(data["batch_id"], "b1")
+            self.assertEqual(data["metrics"]["texnaming_textures_total"]["samples"][0]["value"], 1)
+            self.assertEqual(sorted(p.name for p in Path(d).iterdir()), ["b1.metrics.json", "tex_naming.prom"])
+
+    def test_prometheus_accumulates_across_batches(self):
+        totals = MetricsRegistry()
+        with tempfile.TemporaryDirectory() as d:
+            for batch_id, n in (("b1", 2), ("b2", 3)):
+                m = PipelineMetrics()
+                m.begin_batch()
+                for _ in range(n):
+                    m.observe_texture(("nml", "cc"), {"ok": True})
+                    m.observe_stage("apply", 0.002)
+                m.end_batch()
+                totals.merge(m.registry)
+                m.registry.write(d, batch_id, cumulative=totals)
+            prom = Path(d, "tex_naming.prom").read_text(encoding="utf-8")
+            batch = json.loads(Path(d, "b2.metrics.json").read_text(encoding="utf-8"))
+        # .prom のカウンタは累計、JSON はバッチ分
+        self.assertIn('texnaming_textures_total{result="ok"} 5', prom)
+        self.assertIn('texnaming_stage_seconds_count{stage="apply"} 5', prom)
+        self.assertEqual(batch["metrics"]["texnaming_textures_total"]["samples"][0]["value"], 3)
+        # ゲージは直近のバッチの値
+        self.assertEqual(totals["batch_duration_seconds"].get(), m.batch_seconds.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
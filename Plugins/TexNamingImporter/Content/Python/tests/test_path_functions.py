@@ -1,3 +1,4 @@
+import random
 import unittest
 import sys
 from pathlib import Path
@@ -7,7 +8,11 @@ PYTHON_DIR = THIS_FILE.parents[1]
 if str(PYTHON_DIR) not in sys.path:
     sys.path.insert(0, str(PYTHON_DIR))
 
-from path_utils.path_functions import collect_suffixes_from_path
+from path_utils.path_functions import (
+    collect_suffixes_from_path,
+    collect_suffixes_from_paths,
+    build_suffix_token_index,
+)
 
 SUFFIX_ARRAY = ["cc","cw","cm","wc","ww","wm","mc","mw","mm","col","msk","nml","mat","cub","flw"]
 
@@ -63,5 +68,35 @@ class TestCollectSuffixesFromPath(unittest.TestCase):
                 self.assertEqual(collect_suffixes_from_path(path, SUFFIX_ARRAY), expected)
 
 
+class TestCollectSuffixesFromPaths(unittest.TestCase):
+    def _random_corpus(self, n: int, seed: int):
+        rng = random.Random(seed)
+        pool = SUFFIX_ARRAY + ["CC", "Col", "01", "lod1", "v2", "", "a.b", "Tree", "x"]
+        dirs = ["/Game/VFX", "/home/dev/tex", "C:/work", "", "/srv/a_b"]
+        exts = [".png", ".tga", "", ".tar.gz", ".T_Name"]
+        corpus = []
+        for _ in range(n):
+            tokens = [rng.choice(pool) for _ in range(rng.randint(0, 6))]
+            name = "_".join(tokens)
+            if rng.random() < 0.1:
+                name = "_" + name + "_"
+            corpus.append(f"{rng.choice(dirs)}/{name}{rng.choice(exts)}")
+        return corpus
+
+    def test_equivalent_to_single_path_version(self):
+        """ランダムな大規模コーパスで collect_suffixes_from_path と同一結果になる。"""
+        corpus = self._random_corpus(20000, seed=1234)
+        index = build_suffix_token_index(SUFFIX_ARRAY)
+        got = list(collect_suffixes_from_paths(corpus, index))
+        self.assertEqual([p for p, _ in got], corpus)
+        for path, suffixes in got:
+            self.assertEqual(suffixes, collect_suffixes_from_path(path, SUFFIX_ARRAY), path)
+
+    def test_lazy_and_empty_index(self):
+        it = collect_suffixes_from_paths(iter(["a_cc.png", "b_msk.png"]), build_suffix_token_index([]))
+        self.assertEqual(next(it), ("a_cc.png", []))
+        self.assertEqual(list(it), [("b_msk.png", [])])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import gzip
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import compile_rules  # noqa: E402
+from path_utils.path_stream import iter_paths, iter_paths_from_file  # noqa: E402
+from pipeline import iter_resolved  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+SUFFIXES = ["col_cc", "nml_ww", "msk_cw", "ww_nml", "col"]
+
+
+def _write_list(path: Path, n: int, *, gz: bool) -> None:
+    opener = gzip.open if gz else open
+    with opener(path, "wt", encoding="utf-8", newline="\n") as f:
+        for i in range(n):
+            name = f"T_Asset{i}_{SUFFIXES[i % len(SUFFIXES)]}"
+            f.write(f"/Game/VFX/Sub{i % 97}/{name}.{name}\n")
+
+
+class TestPathStream(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_plain_and_gzip_are_equivalent(self):
+        plain, gz = self.dir / "list.txt", self.dir / "list.txt.gz"
+        _write_list(plain, 1000, gz=False)
+        _write_list(gz, 1000, gz=True)
+        a = list(iter_paths_from_file(plain))
+        self.assertEqual(len(a), 1000)
+        self.assertEqual(a, list(iter_paths(gz)))
+        self.assertEqual(a[0], "/Game/VFX/Sub0/T_Asset0_col_cc.T_Asset0_col_cc")
+
+    def test_blank_comment_bom_crlf(self):
+        p = self.dir / "list.txt"
+        p.write_bytes("\ufeff/Game/A_col_cc\r\n\r\n# comment\n  /Game/B_nml_ww  \n".encode("utf-8"))
+        self.assertEqual(list(iter_paths(p)), ["/Game/A_col_cc", "/Game/B_nml_ww"])
+        (self.dir / "empty.txt").write_bytes(b"")
+        self.assertEqual(list(iter_paths(self.dir / "empty.txt")), [])
+
+    def test_iterables_pass_through_lazily(self):
+        src = iter(["/Game/A_col_cc"])
+        self.assertIs(iter_paths(src), src)
+
+    def _peak_bytes(self, path: Path, rules) -> int:
+        tracemalloc.start()
+        try:
+            ok = 0
+            for item in iter_resolved(iter_paths(path), rules):
+                ok += item.ok
+            _cur, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(ok, 0)
+        return peak
+
+    def test_peak_memory_flat_as_input_grows(self):
+        """入力を 10 倍にしてもピークメモリがほぼ変わらない（gzip / mmap の両方）。"""
+        rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+        for gz in (False, True):
+            with self.subTest(gz=gz):
+                suffix = ".txt.gz" if gz else ".txt"
+                small, large = self.dir / f"small{suffix}", self.dir / f"large{suffix}"
+                _write_list(small, 2000, gz=gz)
+                _write_list(large, 20000, gz=gz)
+                self._peak_bytes(small, rules)  # 初回の遅延初期化を除外するための空回し
+                peak_small = self._peak_bytes(small, rules)
+                peak_large = self._peak_bytes(large, rules)
+                self.assertLess(peak_large, peak_small * 1.5 + 64 * 1024,
+                                f"small={peak_small}, large={peak_large}")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+import random
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from phash_index import PerceptualHashIndex, _np as np, check_and_add, dhash_grid, hamming  # noqa: E402
+
+
+def _flip(h, rng, n):
+    for bit in rng.sample(range(64), n):
+        h ^= 1 << bit
+    return h
+
+
+class TestPerceptualHashIndex(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(3)
+        self.hashes = {f"/Game/T_{i}": self.rng.getrandbits(64) for i in range(3000)}
+        # 既存と距離 1..8 のほぼ同じものを混ぜる
+        for i in range(200):
+            src = self.hashes[f"/Game/T_{i}"]
+            self.hashes[f"/Game/Dup_{i}"] = _flip(src, self.rng, 1 + i % 8)
+        self.index = PerceptualHashIndex()
+        for k, h in self.hashes.items():
+            self.index.add(k, h)
+
+    def test_find_matches_brute_force(self):
+        for distance in (0, 3, 6, 8):
+            for q in list(self.hashes.values())[::97]:
+                with self.subTest(distance=distance, q=q):
+                    expected = sorted(((k, hamming(h, q)) for k, h in self.hashes.items() if hamming(h, q) <= distance),
+                                      key=lambda kv: (kv[1], kv[0]))
+                    self.assertEqual(self.index.find(q, distance), expected)
+
+    def test_replace_and_remove(self):
+        key = "/Game/T_5"
+        self.index.add(key, 0)
+        self.assertEqual(self.index.get(key), 0)
+        self.assertIn((key, 0), self.index.find(0, 0))
+        self.assertNotIn(key, [k for k, _ in self.index.find(self.hashes[key], 0)])
+        self.assertTrue(self.index.remove(key))
+        self.assertEqual(self.index.find(0, 0), [])
+        self.assertEqual(len(self.index), len(self.hashes) - 1)
+
+    def test_save_and_load(self):
+        self.index.remove("/Game/T_7")
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d) / "phash.bin"
+            self.index.save(p)
+            loaded = PerceptualHashIndex.load(p)
+        self.assertEqual(dict(loaded.items()), dict(self.index.items()))
+        q = self.hashes["/Game/T_1"]
+        self.assertEqual(loaded.find(q, 6), self.index.find(q, 6))
+
+    def test_duplicate_groups(self):
+        index = PerceptualHashIndex()
+        for k, h in (("a", 0), ("b", 1), ("c", 3), ("d", 0xFFFF_0000_0000_0000), ("e", 0xFFFF_0000_0000_0001)):
+            index.add(k, h)
+        self.assertEqual(index.duplicate_groups(1), [["a", "b", "c"], ["d", "e"]])
+        self.assertEqual(index.duplicate_groups(0), [])
+
+
+@unittest.skipIf(np is None, "NumPy がインストールされていません")
+class TestDHash(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        # なめらかな画像（ノイズを縦横にぼかしたもの）
+        base = rng.uniform(0, 1, (16, 16))
+        self.image = np.kron(base, np.ones((16, 16)))
+
+    def test_similar_images_are_close(self):
+        h = dhash_grid(self.image)
+        self.assertEqual(hamming(h, dhash_grid(self.image * 0.8 + 0.1)), 0)        # 明るさ違い
+        self.assertLessEqual(hamming(h, dhash_grid(self.image[::2, ::2])), 4)      # 縮小
+        self.assertEqual(hamming(h, dhash_grid(np.stack([self.image] * 3, axis=2))), 0)
+        other = np.random.default_rng(5).uniform(0, 1, (256, 256))
+        self.assertGreater(hamming(h, dhash_grid(other)), 16)
+
+    def test_check_and_add(self):
+        px = (self.image * 255).astype(np.uint8)
+        header = struct.pack("<BBBHHBHHHHBB", 0, 0, 3, 0, 0, 0, 0, 0, 256, 256, 8, 0)
+        index = PerceptualHashIndex()
+        with tempfile.TemporaryDirectory() as d:
+            a, b = Path(d, "a.tga"), Path(d, "b.tga")
+            a.write_bytes(header + px.tobytes())
+            b.write_bytes(header + (px // 2 + 10).astype(np.uint8).tobytes())
+            self.assertEqual(check_and_add(index, "/Game/T_A", str(a)), [])
+            self.assertEqual(check_and_add(index, "/Game/T_A", str(a)), [])   # 自分自身は除く
+            found = check_and_add(index, "/Game/T_B", str(b))
+        self.assertEqual([k for k, _ in found], ["/Game/T_A"])
+        self.assertEqual(check_and_add(index, "/Game/T_C", None), [])
+        self.assertEqual(len(index), 2)
+
+    def test_flat_images_are_not_duplicates(self):
+        header = struct.pack("<BBBHHBHHHHBB", 0, 0, 3, 0, 0, 0, 0, 0, 64, 64, 8, 0)
+        index = PerceptualHashIndex()
+        with tempfile.TemporaryDirectory() as d:
+            black, white, a = Path(d, "black.tga"), Path(d, "white.tga"), Path(d, "a.tga")
+            black.write_bytes(header + bytes(64 * 64))
+            white.write_bytes(header + b"\xff" * (64 * 64))
+            self.assertEqual(check_and_add(index, "/Game/T_Black", str(black)), [])
+            self.assertEqual(check_and_add(index, "/Game/T_White", str(white)), [])
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.duplicate_groups(), [])
+
+            # 模様のあった画像を単色に差し替えたら、以前のハッシュは外す
+            a.write_bytes(header + (self.image[::4, ::4] * 255).astype(np.uint8).tobytes())
+            check_and_add(index, "/Game/T_A", str(a))
+            self.assertIn("/Game/T_A", index)
+            a.write_bytes(black.read_bytes())
+            self.assertEqual(check_and_add(index, "/Game/T_A", str(a)), [])
+            self.assertNotIn("/Game/T_A", index)
+
+
+if __name__ == "__main__":
+    unittest.main()
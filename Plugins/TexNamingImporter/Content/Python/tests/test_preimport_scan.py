@@ -0,0 +1,129 @@
+import csv
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+import preimport_scan  # noqa: E402
+import texture_classifier  # noqa: E402
+from compiled_rules import compile_rules  # noqa: E402
+from preimport_scan import (  # noqa: E402
+    ACTION_OK, ACTION_RECONFIGURE, ACTION_REJECT, asset_path_for, iter_source_files, scan_source_folder, write_scan_csv,
+)
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+
+
+def _png(w, h):
+    return (b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR"
+            + struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0) + b"\0" * 4)
+
+
+class TestPreimportScan(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        files = {
+            "T_Smoke_col_cc.png": _png(2048, 2048),      # 1024 に縮小されるだけ → ok
+            "T_Small_nml_ww.png": _png(256, 256),        # 1024 はソースより大きい → reconfigure
+            "T_Bad_xyz.png": _png(64, 64),               # サフィックス不正 → reject
+            "readme.txt": b"not an image",               # 対象外
+            "sub/T_Broken_col_cc.png": b"\x89PNG\r\n\x1a\n",  # ヘッダが切れている → reject
+            "sub/T_Odd_msk_cc.png": _png(1000, 600),      # pow2 で 1024 → 変化なし、警告のみ
+        }
+        for name, data in files.items():
+            p = self.root / name
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_bytes(data)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_iter_source_files(self):
+        names = [Path(p).name for p in iter_source_files(self.root)]
+        self.assertEqual(sorted(names), ["T_Bad_xyz.png", "T_Broken_col_cc.png", "T_Odd_msk_cc.png",
+                                         "T_Small_nml_ww.png", "T_Smoke_col_cc.png"])
+        self.assertEqual(len(list(iter_source_files(self.root, recursive=False))), 3)
+
+    def test_asset_path_for(self):
+        f = str(self.root / "sub" / "T_Odd_msk_cc.png")
+        self.assertEqual(asset_path_for(f, self.root, "/Game/VFX/"), "/Game/VFX/sub/T_Odd_msk_cc")
+        self.assertEqual(asset_path_for(f, self.root, None), "T_Odd_msk_cc")
+
+    def test_scan_verdicts(self):
+        entries = {Path(e.path).name: e for e in scan_source_folder(self.root, self.rules, workers=2, max_in_flight=1)}
+        self.assertEqual(entries["T_Smoke_col_cc.png"].action, ACTION_OK)
+        self.assertEqual(entries["T_Smoke_col_cc.png"].effective_max, 1024)
+
+        small = entries["T_Small_nml_ww.png"]
+        self.assertEqual(small.action, ACTION_RECONFIGURE)
+        self.assertEqual((small.max_in_game, small.effective_max), (1024, 256))
+
+        self.assertEqual(entries["T_Bad_xyz.png"].action, ACTION_REJECT)
+        self.assertIsNone(entries["T_Bad_xyz.png"].header)  # 命名で弾いたものはヘッダを読まない
+        self.assertEqual(entries["T_Broken_col_cc.png"].action, ACTION_REJECT)
+        self.assertIn("truncated", entries["T_Broken_col_cc.png"].error)
+
+        odd = entries["T_Odd_msk_cc.png"]
+        self.assertEqual(odd.action, ACTION_OK)
+        self.assertEqual(len(odd.warnings), 1)
+
+    def test_malformed_file_does_not_stop_scan(self):
+        # dataWindow が 16 バイトに満たない EXR
+        (self.root / "T_Bad_col_cc.exr").write_bytes(
+            b"\x76\x2f\x31\x01" + struct.pack("<I", 2)
+            + b"dataWindow\0box2i\0" + struct.pack("<i", 8) + bytes(8) + b"\0")
+        entries = {Path(e.path).name: e for e in scan_source_folder(self.root, self.rules, workers=2)}
+        self.assertEqual(entries["T_Bad_col_cc.exr"].action, ACTION_REJECT)
+        self.assertIn("exr", entries["T_Bad_col_cc.exr"].error)
+        self.assertEqual(entries["T_Smoke_col_cc.png"].action, ACTION_OK)
+
+    def test_unexpected_reader_error_rejects_only_that_file(self):
+        real = preimport_scan.read_image_header
+
+        def flaky(path):
+            if Path(path).name == "T_Smoke_col_cc.png":
+                raise RuntimeError("boom")
+            return real(path)
+
+        with mock.patch.object(preimport_scan, "read_image_header", flaky):
+            entries = {Path(e.path).name: e for e in scan_source_folder(self.root, self.rules, workers=2)}
+        self.assertEqual(len(entries), 5)
+        self.assertEqual(entries["T_Smoke_col_cc.png"].action, ACTION_REJECT)
+        self.assertEqual(entries["T_Smoke_col_cc.png"].error, "RuntimeError: boom")
+        self.assertEqual(entries["T_Small_nml_ww.png"].action, ACTION_RECONFIGURE)
+
+    def test_write_csv(self):
+        out = self.root / "out" / "scan.csv"
+        counts = write_scan_csv(scan_source_folder(self.root, self.rules, asset_root="/Game/VFX"), out)
+        self.assertEqual(counts, {ACTION_OK: 2, ACTION_RECONFIGURE: 1, ACTION_REJECT: 2})
+        with out.open(encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 5)
+        self.assertIn("/Game/VFX/sub/T_Odd_msk_cc", [r["asset_path"] for r in rows])
+
+    @unittest.skipIf(texture_classifier._np is None, "NumPy がインストールされていません")
+    def test_classify_rejected_names(self):
+        # 16x16 の灰色の非圧縮 TGA（サフィックスなし）
+        tga = struct.pack("<BBBHHBHHHHBB", 0, 0, 3, 0, 0, 0, 0, 0, 16, 16, 8, 0) + bytes(range(256))
+        (self.root / "T_Height.tga").write_bytes(tga)
+        entries = {Path(e.path).name: e for e in scan_source_folder(self.root, self.rules, classify=True)}
+        self.assertEqual(entries["T_Height.tga"].action, ACTION_REJECT)
+        self.assertEqual(entries["T_Height.tga"].proposed_type, "msk")
+        self.assertEqual(entries["T_Smoke_col_cc.png"].proposed_type, "")  # 命名が正しいものは解析しない
+
+
+if __name__ == "__main__":
+    unittest.main()
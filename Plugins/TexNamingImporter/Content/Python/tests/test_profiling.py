@@ -0,0 +1,90 @@
+import io
+import pstats
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from profiling import ProfileOptions, new_batch_id, profile_batch, summarize_collapsed  # noqa: E402
+from suffix_config import load_texture_suffix_config  # noqa: E402
+from suffix_grammar import compile_suffix_grammar  # noqa: E402
+
+
+def _workload(seconds: float = 0.15) -> None:
+    cfg = load_texture_suffix_config(Path(PYTHON_DIR, "tests", "assets", "SuffixSettings.json"))
+    grammar = compile_suffix_grammar(cfg)
+    keep = []
+    end = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < end:
+        keep.append(grammar.match(f"/Game/T_Rock{i}_nml_cc.T_Rock{i}"))
+        i += 1
+
+
+class TestProfiling(unittest.TestCase):
+    def _run(self, **kw):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        opts = ProfileOptions(out_dir=Path(self._tmp.name), **kw)
+        with redirect_stdout(io.StringIO()), profile_batch(opts, batch_id="b1") as result:
+            _workload()
+        return result
+
+    def test_back_to_back_batches_get_distinct_files(self):
+        with tempfile.TemporaryDirectory() as d:
+            opts = ProfileOptions(mode="cprofile", out_dir=Path(d))
+            ids = []
+            for _ in range(2):
+                with redirect_stdout(io.StringIO()), profile_batch(opts) as result:
+                    _workload(0.01)
+                ids.append(result.batch_id)
+            self.assertNotEqual(ids[0], ids[1])
+            self.assertEqual(sorted(p.name for p in Path(d).glob("*.pstats")), sorted(f"{i}.pstats" for i in ids))
+        self.assertEqual(len({new_batch_id() for _ in range(1000)}), 1000)
+
+    def test_disabled_writes_nothing(self):
+        result = self._run()
+        self.assertEqual(result.files, [])
+        self.assertEqual(list(Path(self._tmp.name).iterdir()), [])
+
+    def test_cprofile_writes_pstats(self):
+        result = self._run(mode="cprofile")
+        names = sorted(p.name for p in result.files)
+        self.assertEqual(names, ["b1.pstats", "b1.txt"])
+        stats = pstats.Stats(str(Path(self._tmp.name, "b1.pstats")))
+        self.assertTrue(any(func[2] == "match" for func in stats.stats))
+
+    def test_sampler_writes_collapsed_stacks(self):
+        result = self._run(mode="sample", sample_interval=0.001)
+        collapsed = Path(self._tmp.name, "b1.collapsed")
+        self.assertIn(collapsed, result.files)
+        text = collapsed.read_text(encoding="utf-8")
+        self.assertIn("test_profiling.py:_workload", text)
+        self.assertTrue(summarize_collapsed(collapsed))
+
+    def test_tracemalloc_report(self):
+        result = self._run(tracemalloc=True)
+        report = Path(self._tmp.name, "b1.tracemalloc.txt")
+        self.assertEqual(result.files, [report])
+        self.assertIn("suffix_grammar.py", report.read_text(encoding="utf-8"))
+
+    def test_options_from_env(self):
+        opts = ProfileOptions.from_env({"TEXNAMING_PROFILE": "Sample", "TEXNAMING_TRACEMALLOC": "1",
+                                        "TEXNAMING_PROFILE_DIR": "/tmp/x", "TEXNAMING_SAMPLE_INTERVAL_MS": "2"})
+        self.assertEqual((opts.mode, opts.tracemalloc, opts.out_dir, opts.sample_interval),
+                         ("sample", True, Path("/tmp/x"), 0.002))
+        self.assertFalse(ProfileOptions.from_env({}).enabled)
+        with self.assertRaises(ValueError):
+            ProfileOptions(mode="perf")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+import progress_journal  # noqa: E402
+from progress_journal import (STATUS_ERROR, STATUS_OK, STATUS_SUFFIX, STATUS_UNCHANGED, ProgressJournal,  # noqa: E402
+                              read_journal, status_of)
+
+
+class TestProgressJournal(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "batch.journal"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_status_of(self):
+        self.assertEqual(status_of({"ok": True}), STATUS_OK)
+        self.assertEqual(status_of({"ok": True, "skipped": "unchanged"}), STATUS_UNCHANGED)
+        self.assertEqual(status_of({"ok": False, "skipped": "suffix"}), STATUS_SUFFIX)
+        self.assertEqual(status_of({"ok": False, "errors": ["x"]}), STATUS_ERROR)
+
+    def test_last_record_wins(self):
+        with ProgressJournal(self.path) as j:
+            j.record("/Game/A", STATUS_OK, "c1")
+            j.record("/Game/B", STATUS_ERROR, "c1")
+            j.record("/Game/C", STATUS_UNCHANGED, "c1")
+            j.record("/Game/C", STATUS_ERROR, "c2")   # 再実行で失敗
+            j.record("/Game/B", STATUS_OK, "c1")      # 再実行で成功
+            j.record("/Game/D", STATUS_SUFFIX)
+        state = read_journal(self.path)
+        self.assertEqual(state.completed, {"/Game/A": "c1", "/Game/B": "c1"})
+        self.assertTrue(state.is_done("/Game/A", "c1"))
+        self.assertFalse(state.is_done("/Game/A", "c2"))   # 設定が変わったらやり直す
+        self.assertEqual(state.counts, {STATUS_OK: 2, STATUS_ERROR: 1, STATUS_SUFFIX: 1})
+        self.assertEqual(read_journal(Path(self._tmp.name) / "missing").completed, {})
+
+    def test_torn_tail_is_dropped_on_resume(self):
+        with ProgressJournal(self.path) as j:
+            j.record("/Game/A", STATUS_OK, "c")
+        with self.path.open("ab") as f:
+            f.write(b'{"path":"/Game/B","sta')   # 書き込み途中で落ちた
+        state = read_journal(self.path)
+        self.assertEqual(list(state.completed), ["/Game/A"])
+        self.assertEqual(state.corrupt, 1)
+
+        with ProgressJournal(self.path, append=True) as j:
+            j.record("/Game/B", STATUS_OK, "c")
+        state = read_journal(self.path)
+        self.assertEqual(sorted(state.completed), ["/Game/A", "/Game/B"])
+        self.assertEqual(state.corrupt, 0)
+
+    def test_fsync_is_batched(self):
+        now = [0.0]
+        with mock.patch.object(progress_journal.os, "fsync") as fsync:
+            with ProgressJournal(self.path, sync_every=100, sync_interval=5.0, clock=lambda: now[0]) as j:
+                for i in range(250):
+                    j.record(f"/Game/T_{i}", STATUS_OK)
+                self.assertEqual(fsync.call_count, 2)
+                now[0] = 6.0
+                j.record("/Game/Late", STATUS_OK)   # 間隔を超えたら件数に関係なく同期
+                self.assertEqual(fsync.call_count, 3)
+            self.assertEqual(fsync.call_count, 3)   # 未同期が無ければ close で同期しない
+        self.assertEqual(len(read_journal(self.path).completed), 251)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import csv
+import importlib
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import compile_rules  # noqa: E402
+from settings_inventory import FROM_LOAD, FROM_TAG, UNKNOWN, expected_settings, inspect_texture, parse_tag_value  # noqa: E402
+from texture_config import TextureConfigParams  # noqa: E402
+from type_define import AddressMode, CompressionKind, MipGenKind, SRGBMode, TextureGroupKind  # noqa: E402
+from detail_unreal import unreal_standin  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+_UNREAL_MODULES = ("detail_unreal.inventory_unreal", "detail_unreal.texture_configurator_unreal")
+
+# nml_cc が適用済みなら持っているはずのタグ値（UE の表記）
+GOOD_TAGS = {
+    "CompressionSettings": "TC_Normalmap", "SRGB": "False", "LODGroup": "TEXTUREGROUP_Effects",
+    "MipGenSettings": "TMGS_FromTextureGroup", "AddressX": "TA_Clamp", "AddressY": "TA_Clamp",
+    "MaxTextureSize": "1024",
+}
+
+
+class TestSettingsInventory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+
+    def test_parse_tag_value(self):
+        self.assertIs(parse_tag_value("compression", "TC_Normalmap"), CompressionKind.NORMAL_MAP)
+        self.assertIs(parse_tag_value("compression", "TC_NORMALMAP"), CompressionKind.NORMAL_MAP)
+        self.assertIs(parse_tag_value("texture_group", "TEXTUREGROUP_WorldNormalMap"), TextureGroupKind.WORLD_NORMAL_MAP)
+        self.assertIs(parse_tag_value("mip_gen", "TMGS_NoMipmaps"), MipGenKind.NO_MIPMAPS)
+        self.assertIs(parse_tag_value("address_u", "TA_Mirror"), AddressMode.MIRROR)
+        self.assertIs(parse_tag_value("srgb", "True"), True)
+        self.assertEqual(parse_tag_value("max_in_game", "2048"), 2048)
+        with self.assertRaises(ValueError):
+            parse_tag_value("compression", "TC_Unknown")
+
+    def test_expected_settings_auto_srgb(self):
+        params = TextureConfigParams(compression=CompressionKind.MASKS, srgb=SRGBMode.AUTO, max_in_game=1000,
+                                     enforce_pow2=True)
+        expected = expected_settings(params)
+        self.assertIs(expected["srgb"], False)
+        self.assertEqual(expected["max_in_game"], 512)
+
+    def test_inspect_texture(self):
+        path = "/Game/VFX/T_Rock_nml_cc.T_Rock_nml_cc"
+        self.assertEqual(inspect_texture(path, GOOD_TAGS, self.rules).drifts, [])
+
+        # ソースに合わせて小さくした最大サイズは差分にしない（寸法は Dimensions タグで分かる）
+        small = {**GOOD_TAGS, "MaxTextureSize": "256", "Dimensions": "256x128"}
+        self.assertEqual(inspect_texture(path, small, self.rules).drifts, [])
+        # ソースが大きいのに設定値より小さいのは差分
+        row = inspect_texture(path, {**small, "Dimensions": "2048x2048"}, self.rules)
+        self.assertEqual([(d.field, d.expected, d.actual, d.source) for d in row.drifts],
+                         [("max_in_game", 1024, 256, FROM_TAG)])
+        # 寸法が分からなければ頭打ちか差分か決められない
+        row = inspect_texture(path, {**GOOD_TAGS, "MaxTextureSize": "256"}, self.rules)
+        self.assertEqual([(d.field, d.actual, d.source) for d in row.drifts], [("max_in_game", 256, UNKNOWN)])
+        self.assertFalse(row.drifted)
+
+        row = inspect_texture(path, {**GOOD_TAGS, "SRGB": "True", "AddressX": "TA_Wrap"}, self.rules)
+        self.assertEqual(sorted((d.field, d.source) for d in row.drifts), [("address_u", FROM_TAG), ("srgb", FROM_TAG)])
+
+        tags = {k: v for k, v in GOOD_TAGS.items() if k != "MaxTextureSize"}
+        row = inspect_texture(path, tags, self.rules)
+        self.assertEqual([(d.field, d.source) for d in row.drifts], [("max_in_game", UNKNOWN)])
+        self.assertFalse(row.drifted)
+
+        asked = []
+        row = inspect_texture(path, tags, self.rules, load=lambda p, t: asked.append(t) or {"MaxTextureSize": "4096"})
+        self.assertEqual(asked, [["MaxTextureSize"]])
+        self.assertTrue(row.loaded)
+        self.assertEqual([(d.field, d.actual, d.source) for d in row.drifts], [("max_in_game", 4096, FROM_LOAD)])
+
+        self.assertFalse(inspect_texture("/Game/VFX/T_Rock_xyz.T_Rock_xyz", {}, self.rules).ok)
+
+
+class TestInventoryUnreal(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("unreal")
+        self.unreal = unreal_standin.install()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        self.mod = importlib.import_module("detail_unreal.inventory_unreal")
+        self.rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        unreal_standin.uninstall()
+        if self._saved is not None:
+            sys.modules["unreal"] = self._saved
+
+    def _texture(self, path, **props):
+        u = self.unreal
+        good = {
+            "compression_settings": u.TextureCompressionSettings.TC_NORMALMAP, "srgb": False,
+            "lod_group": u.TextureGroup.TEXTUREGROUP_EFFECTS, "address_x": u.TextureAddress.TA_CLAMP,
+            "address_y": u.TextureAddress.TA_CLAMP, "max_texture_size": 1024,
+        }
+        return u.add_texture(path, {**good, **props})
+
+    def _run(self, **kw):
+        out = Path(self._tmp.name) / "drift.csv"
+        with redirect_stdout(io.StringIO()):
+            counts = self.mod.run_inventory(self.rules, str(out), **kw)
+        with out.open(encoding="utf-8", newline="") as f:
+            return counts, list(csv.DictReader(f))
+
+    def test_drift_report_from_tags(self):
+        self._texture("/Game/VFX/T_Good_nml_cc.T_Good_nml_cc")
+        self._texture("/Game/VFX/T_Bad_nml_cc.T_Bad_nml_cc", srgb=True)
+        self._texture("/Game/Other/T_Skip_nml_cc.T_Skip_nml_cc", srgb=True)   # 対象外のパス
+        self.unreal.add_texture("/Game/VFX/T_Name_xyz.T_Name_xyz")
+
+        counts, rows = self._run(package_paths=["/Game/VFX"], tags_only=True)
+        self.assertEqual(counts["textures"], 3)
+        self.assertEqual(counts["drifted"], 1)
+        self.assertEqual(counts["bad_name"], 1)
+        self.assertEqual(counts["loaded"], 0)
+        self.assertEqual(self.unreal.recorder.count("AssetData.get_asset"), 0)  # 一切読み込まない
+        drift = [(r["path"], r["field"], r["actual"]) for r in rows if r["source"] != UNKNOWN]
+        self.assertEqual(drift, [("/Game/VFX/T_Bad_nml_cc.T_Bad_nml_cc", "srgb", "True")])
+
+    def test_missing_tags_load_the_asset(self):
+        tex = self._texture("/Game/VFX/T_Big_nml_cc.T_Big_nml_cc", max_texture_size=4096)
+        tex.registry_tags = ("CompressionSettings", "SRGB", "LODGroup", "MipGenSettings", "AddressX", "AddressY")
+        counts, rows = self._run()
+        self.assertEqual(counts["loaded"], 1)
+        self.assertEqual([(r["field"], r["expected"], r["actual"], r["source"]) for r in rows],
+                         [("max_in_game", "1024", "4096", FROM_LOAD)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import importlib
+import io
+import json
+import random
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from compiled_rules import compile_rules  # noqa: E402
+from directory_overrides import directory_of  # noqa: E402
+from metrics import PipelineMetrics  # noqa: E402
+from path_utils.path_stream import iter_paths  # noqa: E402
+from shard_planner import (PER_TEXTURE_COST, estimate_cost, estimate_costs, imbalance, merge_csv,  # noqa: E402
+                           merge_metrics, plan_shards, source_sizes, write_manifests)
+from texture_config import TextureConfigParams  # noqa: E402
+from type_define import CompressionKind  # noqa: E402
+from detail_unreal import unreal_standin  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+_UNREAL_MODULES = ("detail_unreal.shard_planner_unreal", "detail_unreal.inventory_unreal",
+                   "detail_unreal.texture_configurator_unreal")
+
+
+class TestShardPlanner(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.costs = []
+        for d in range(300):
+            for i in range(rng.randint(1, 40)):
+                self.costs.append((f"/Game/D{d}/T_{i}_col.T_{i}_col", rng.uniform(0.5, 20.0)))
+
+    def test_directories_stay_in_one_shard(self):
+        shards = plan_shards(self.costs, 8)
+        owner = {}
+        for s in shards:
+            for p in s.paths:
+                self.assertEqual(owner.setdefault(directory_of(p), s.index), s.index)
+        self.assertEqual(sorted(p for s in shards for p in s.paths), sorted(p for p, _ in self.costs))
+        self.assertAlmostEqual(sum(s.cost for s in shards), sum(c for _, c in self.costs))
+        self.assertLess(imbalance(shards), 1.05)
+        self.assertEqual([s.paths for s in plan_shards(self.costs, 8)], [s.paths for s in shards])
+
+    def test_heavy_directory_is_not_split(self):
+        costs = [("/Game/Big/T_a.T_a", 100.0)] + [(f"/Game/S{i}/T_b.T_b", 1.0) for i in range(10)]
+        shards = plan_shards(costs, 3)
+        self.assertEqual(shards[0].directories, ["/Game/Big"])
+        self.assertEqual(sorted(len(s.paths) for s in shards[1:]), [5, 5])
+
+    def test_estimate_cost(self):
+        bc7 = TextureConfigParams(compression=CompressionKind.BC7)
+        masks = TextureConfigParams(compression=CompressionKind.MASKS)
+        self.assertGreater(estimate_cost(bc7, 4 << 20), estimate_cost(masks, 4 << 20))
+        self.assertGreater(estimate_cost(masks, 16 << 20), estimate_cost(masks, 1 << 20))
+        self.assertEqual(estimate_cost(None), PER_TEXTURE_COST)
+
+        rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+        costs = dict(estimate_costs(["/Game/VFX/T_A_col_cc.T_A_col_cc", "/Game/VFX/T_B_xyz.T_B_xyz"], rules,
+                                    {"/Game/VFX/T_A_col_cc": 1 << 20}))
+        self.assertEqual(costs["/Game/VFX/T_B_xyz.T_B_xyz"], PER_TEXTURE_COST)
+        self.assertGreater(costs["/Game/VFX/T_A_col_cc.T_A_col_cc"], PER_TEXTURE_COST)
+
+    def test_source_sizes_share_the_fallback_unit(self):
+        rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+        with tempfile.TemporaryDirectory() as d:
+            vfx = Path(d, "VFX")
+            vfx.mkdir()
+            # 2048x2048 だがファイルは数十バイト（圧縮後のファイルサイズでは見積もらない）
+            ihdr = (2048).to_bytes(4, "big") * 2 + bytes([8, 6, 0, 0, 0])
+            Path(vfx, "T_A_col_cc.png").write_bytes(b"\x89PNG\r\n\x1a\n" + (13).to_bytes(4, "big") + b"IHDR" + ihdr)
+            Path(vfx, "T_B_col_cc.png").write_bytes(b"\x89PNG\r\n\x1a\n")   # 壊れたヘッダは含めない
+            sizes = source_sizes(d, "/Game")
+        self.assertEqual(sizes, {"/Game/VFX/T_A_col_cc": 2048 * 2048 * 4})
+
+        # ソースのあるパスと、max_in_game から見積もるパスが同じ単位になる
+        params = rules.resolve_path("/Game/VFX/T_A_col_cc.T_A_col_cc")[1]
+        side = params.max_in_game
+        costs = dict(estimate_costs(["/Game/VFX/T_A_col_cc.T_A_col_cc", "/Game/VFX/T_C_col_cc.T_C_col_cc"], rules,
+                                    {"/Game/VFX/T_A_col_cc": side * side * 4}))
+        self.assertAlmostEqual(costs["/Game/VFX/T_A_col_cc.T_A_col_cc"], costs["/Game/VFX/T_C_col_cc.T_C_col_cc"])
+
+    def test_manifests_round_trip(self):
+        shards = plan_shards(self.costs, 3)
+        with tempfile.TemporaryDirectory() as d:
+            written = write_manifests(shards, d)
+            self.assertEqual([p.name for p in written], ["shard_00.txt", "shard_01.txt", "shard_02.txt", "plan.json"])
+            for s, p in zip(shards, written):
+                self.assertEqual(list(iter_paths(p)), s.paths)
+            plan = json.loads(written[-1].read_text(encoding="utf-8"))
+        self.assertEqual([s["textures"] for s in plan["shards"]], [len(s.paths) for s in shards])
+
+
+class TestMerge(unittest.TestCase):
+    def _metrics(self, d, batch_id, results, seconds):
+        m = PipelineMetrics()
+        for r in results:
+            m.observe_stage("apply", 0.01)
+            m.observe_texture(("col", "cc"), {"ok": r == "ok", "skipped": "unchanged" if r == "skipped" else None})
+        m.batch_seconds.set(seconds)
+        m.throughput.set(len(results) / seconds)
+        return m.registry.write(d, batch_id)[1]
+
+    def test_merge_metrics(self):
+        with tempfile.TemporaryDirectory() as d:
+            a = self._metrics(Path(d) / "a", "a", ["ok", "ok", "skipped"], 10.0)
+            b = self._metrics(Path(d) / "b", "b", ["ok", "error"], 4.0)
+            merged = merge_metrics([a, b])["metrics"]
+
+        def value(name, **labels):
+            return next(s["value"] for s in merged[name]["samples"] if s["labels"] == labels)
+
+        self.assertEqual(value("texnaming_textures_total", result="ok"), 3)
+        self.assertEqual(value("texnaming_textures_total", result="error"), 1)
+        self.assertEqual(value("texnaming_suffix_combination_hits_total", combination="col_cc"), 5)
+        self.assertEqual(value("texnaming_batch_duration_seconds"), 10.0)
+        self.assertAlmostEqual(value("texnaming_textures_per_second"), 0.3 + 0.5)
+        hist = merged["texnaming_stage_seconds"]["samples"][0]
+        self.assertEqual(hist["count"], 5)
+        self.assertEqual(sum(hist["buckets"].values()), 5)
+
+    def test_merge_csv(self):
+        with tempfile.TemporaryDirectory() as d:
+            a, b, c, out = (Path(d) / n for n in ("a.csv", "b.csv", "c.csv", "out.csv"))
+            a.write_text("path,field\n/Game/A,srgb\n", encoding="utf-8")
+            b.write_text("path,field\n/Game/B,compression\n/Game/C,srgb\n", encoding="utf-8")
+            c.write_text("path,action\n/x,ok\n", encoding="utf-8")
+            self.assertEqual(merge_csv([a, b], out), 3)
+            self.assertEqual(out.read_text(encoding="utf-8").splitlines(),
+                             ["path,field", "/Game/A,srgb", "/Game/B,compression", "/Game/C,srgb"])
+            with self.assertRaises(ValueError):
+                merge_csv([a, c], out)
+
+
+class TestShardPlannerUnreal(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("unreal")
+        self.unreal = unreal_standin.install()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        self.mod = importlib.import_module("detail_unreal.shard_planner_unreal")
+        self.rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json")
+
+    def tearDown(self):
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        unreal_standin.uninstall()
+        if self._saved is not None:
+            sys.modules["unreal"] = self._saved
+
+    def test_plan_from_registry(self):
+        self.unreal.add_texture("/Game/VFX/Big/T_A_col_cc.T_A_col_cc", {"dimensions": "8192x8192"})
+        for i in range(4):
+            self.unreal.add_texture(f"/Game/VFX/S{i}/T_B_col_cc.T_B_col_cc", {"dimensions": "1024x1024"})
+        self.unreal.add_texture("/Game/Other/T_C_col_cc.T_C_col_cc")
+        with tempfile.TemporaryDirectory() as d, redirect_stdout(io.StringIO()):
+            shards = self.mod.plan_from_registry(self.rules, d, 2, ["/Game/VFX"])
+            self.assertTrue((Path(d) / "plan.json").exists())
+        self.assertEqual(shards[0].directories, ["/Game/VFX/Big"])
+        self.assertEqual(len(shards[1].paths), 4)
+        self.assertEqual(self.unreal.recorder.count("AssetData.get_asset"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
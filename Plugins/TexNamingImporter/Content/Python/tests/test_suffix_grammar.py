@@ -0,0 +1,131 @@
+import sys
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from suffix_config import TextureSuffixConfig, load_texture_suffix_config  # noqa: E402
+from suffix_grammar import compile_suffix_grammar  # noqa: E402
+
+
+def _cfg(**overrides) -> TextureSuffixConfig:
+    data = {
+        "texture_type": ["col", "msk", "nml"],
+        "address_suffix_2d": {"cc": ["CLAMP", "CLAMP"], "ww": ["WRAP", "WRAP"], "cw": ["CLAMP", "WRAP"]},
+        "suffix_index": ["texture_type", "address_suffix_2d"],
+    }
+    data.update(overrides)
+    return TextureSuffixConfig.from_dict(data)
+
+
+class TestCompiledSuffixGrammar(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cfg = load_texture_suffix_config(Path(PYTHON_DIR, "tests", "assets", "SuffixSettings.json"))
+        cls.grammar = compile_suffix_grammar(cfg)
+
+    def test_ok_extracts_and_classifies(self):
+        cases = [
+            ("/Game/VFX/T_Smoke_col_cc.T_Smoke_col_cc", ["col", "cc"], "T_Smoke"),
+            ("/home/dev/tex/Rock_nml_ww.png",          ["nml", "ww"], "Rock"),
+            ("/home/dev/tex/P0_P1_Tree_mat_mw.tga",    ["mat", "mw"], "P0_P1_Tree"),
+        ]
+        for path, keys, stem in cases:
+            with self.subTest(path=path):
+                m = self.grammar.match(path)
+                self.assertTrue(m.ok, m.error)
+                self.assertEqual(m.keys, keys)
+                self.assertEqual(m.stem, stem)
+
+    def test_case_insensitive_returns_config_keys(self):
+        """大文字のサフィックスも一致し、keys は設定ファイル上の表記で返る。"""
+        m = self.grammar.match("/Game/VFX/T_Fire_COL_Cc.T_Fire_COL_Cc")
+        self.assertTrue(m.ok, m.error)
+        self.assertEqual(m.matches_by_row, ["COL", "Cc"])
+        self.assertEqual(m.keys, ["col", "cc"])
+
+    def test_ng_reports_row_like_validate_suffixes(self):
+        cases = [
+            ("/Game/T_Rock_ww_nml.T_Rock_ww_nml", 0),     # 行 0 に address が来ている
+            ("/Game/T_Rock_col_col.T_Rock_col_col", 1),   # 行 1 に texture_type が来ている
+        ]
+        for path, row in cases:
+            with self.subTest(path=path):
+                m = self.grammar.match(path)
+                self.assertFalse(m.ok)
+                self.assertEqual(m.failed_row_index, row)
+                self.assertIn("許容値", m.error or "")
+
+    def test_ng_length_mismatch(self):
+        for path in ("/Game/T_Rock_col.T_Rock_col", "/Game/T_Rock_01.T_Rock_01"):
+            with self.subTest(path=path):
+                m = self.grammar.match(path)
+                self.assertFalse(m.ok)
+                self.assertIsNone(m.failed_row_index)
+                self.assertIn("一致しません", m.error or "")
+
+    def test_name_without_stem_is_accepted(self):
+        """従来の収集 + 検証と同じく、サフィックスだけの名前も一致する（stem は None）。"""
+        m = self.grammar.match("/Game/col_cc.col_cc")
+        self.assertTrue(m.ok, m.error)
+        self.assertEqual(m.keys, ["col", "cc"])
+        self.assertIsNone(m.stem)
+
+    def test_ng_suffix_run_longer_than_rows(self):
+        """stem の最後にサフィックスのキーを押し込んで、規則より長い並びを通さない。"""
+        for path in ("/Game/T_Rock_nml_col_cc.T_Rock_nml_col_cc", "/Game/T_Rock_cc_col_cc.T_Rock_cc_col_cc",
+                     "/Game/T_Rock_COL_col_cc.T_Rock_COL_col_cc"):
+            with self.subTest(path=path):
+                m = self.grammar.match(path)
+                self.assertFalse(m.ok)
+                self.assertIn("expected=2, actual=3", m.error or "")
+
+    def test_agrees_with_collect_and_validate(self):
+        """ランダムな名前で、従来の collect_suffixes_from_path + validate_suffixes と合否が一致する。"""
+        import random
+        from path_utils.path_functions import collect_suffixes_from_path
+        from validator import build_suffix_grid, validate_suffixes
+
+        cfg = load_texture_suffix_config(Path(PYTHON_DIR, "tests", "assets", "SuffixSettings.json"))
+        grid = build_suffix_grid(cfg)
+        keys = sorted({k for row in grid for k in row})
+        words = ["T", "Rock", "Smoke", "01", "colx", "a"] + keys
+        rng = random.Random(7)
+        for _ in range(2000):
+            name = "_".join(rng.choice(words) for _ in range(rng.randint(1, 5)))
+            old = validate_suffixes(collect_suffixes_from_path(name + ".png", keys), grid)
+            with self.subTest(name=name):
+                self.assertEqual(self.grammar.match(name + ".png").ok, old.ok)
+
+    def test_optional_category(self):
+        g = compile_suffix_grammar(_cfg(suffix_index=["texture_type", "address_suffix_2d?"]))
+        with_addr = g.match("Rock_col_cw.png")
+        self.assertTrue(with_addr.ok)
+        self.assertEqual(with_addr.keys_by_row, ["col", "cw"])
+        without = g.match("Rock_col.png")
+        self.assertTrue(without.ok)
+        self.assertEqual(without.keys_by_row, ["col", None])
+        self.assertEqual(without.keys, ["col"])
+        self.assertFalse(g.match("Rock_cw.png").ok)
+
+    def test_prefix_category(self):
+        g = compile_suffix_grammar(_cfg(suffix_index=["address_suffix_2d"], prefix_index=["texture_type"]))
+        m = g.match("/Game/UI/nml_Button_cc.nml_Button_cc")
+        self.assertTrue(m.ok, m.error)
+        self.assertEqual(m.prefix_keys, ["nml"])
+        self.assertEqual(m.keys, ["cc"])
+        self.assertEqual(m.stem, "Button")
+        self.assertFalse(g.match("/Game/UI/Button_cc.Button_cc").ok)
+
+    def test_to_validation_result(self):
+        res = self.grammar.match("Rock_col_cc.png").to_validation_result()
+        self.assertTrue(res.ok)
+        self.assertEqual(res.matches_by_row, ["col", "cc"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+import sys
+import unittest
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from suffix_config import load_texture_suffix_config  # noqa: E402
+from suffix_grammar import compile_suffix_grammar  # noqa: E402
+from suffix_suggest import SuffixSuggester, osa_distance  # noqa: E402
+
+
+class TestSuffixSuggester(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cfg = load_texture_suffix_config(Path(PYTHON_DIR, "tests", "assets", "SuffixSettings.json"))
+        cls.grammar = compile_suffix_grammar(cfg)
+        cls.suggester = SuffixSuggester.from_grammar(cls.grammar)
+
+    def test_osa_distance(self):
+        self.assertEqual(osa_distance("nml", "nml"), 0)
+        self.assertEqual(osa_distance("nlm", "nml"), 1)   # 転置
+        self.assertEqual(osa_distance("nrm", "nml"), 2)
+        self.assertEqual(osa_distance("", "col"), 3)
+
+    def test_typo_in_type_row(self):
+        s = self.suggester.suggest_path("/Game/VFX/T_Rock_nrm_cc.T_Rock_nrm_cc")
+        self.assertIsNotNone(s)
+        self.assertEqual([r.row for r in s.rows], [0])
+        self.assertEqual(s.rows[0].best, "nml")
+        self.assertEqual(s.suggested_name, "T_Rock_nml_cc")
+
+    def test_typo_in_address_row(self):
+        s = self.suggester.suggest("T_Rock_col_xw")
+        self.assertEqual(s.rows[0].row, 1)
+        self.assertIn(("ww", 1), s.rows[0].candidates)
+        self.assertIsNotNone(s.suggested_name)
+
+    def test_swapped_order(self):
+        s = self.suggester.suggest("T_Rock_ww_nml")
+        self.assertEqual(s.suggested_name, "T_Rock_nml_ww")
+
+    def test_no_candidate(self):
+        s = self.suggester.suggest("T_Rock_zzzzzz_cc")
+        self.assertEqual(s.rows[0].candidates, [])
+        self.assertIsNone(s.suggested_name)
+
+    def test_valid_or_too_short(self):
+        self.assertIsNone(self.suggester.suggest("T_Rock_col_cc"))
+        self.assertIsNone(self.suggester.suggest("col_cc"))
+
+    def test_missing_suffix_does_not_blame_stem(self):
+        s = self.suggester.suggest("T_Rock_col")
+        self.assertEqual(s.rows, [])
+        self.assertEqual(s.missing_rows, [1])
+        self.assertIsNone(s.suggested_name)
+        self.assertEqual(self.suggester.suggest("T_Rock_Moss_col").missing_rows, [1])
+        self.assertEqual(self.suggester.suggest("T_Rock").missing_rows, [0, 1])
+        # 規則より長い並びは直す行も足りない行も無い
+        self.assertIsNone(self.suggester.suggest("T_Rock_nml_col_cc"))
+
+    def test_optional_and_prefix_rows(self):
+        rows = [r.keys for r in self.grammar.rows]
+        optional = SuffixSuggester(rows, optional=[1])
+        self.assertIsNone(optional.suggest("T_Rock_col"))
+        s = optional.suggest("T_Rock_nrm")
+        self.assertEqual([(r.row, r.token) for r in s.rows], [(0, "nrm")])
+        self.assertEqual(s.suggested_name, "T_Rock_nml")
+        self.assertEqual(optional.suggest("T_Rock_nrm_cc").suggested_name, "T_Rock_nml_cc")
+
+        # 必須のプレフィックスがあると、T の次のトークンは stem として残る
+        self.assertEqual(SuffixSuggester(rows).suggest("T_nrm_cc").suggested_name, "T_nml_cc")
+        prefixed = SuffixSuggester(rows, prefix_rows=1)
+        s = prefixed.suggest("T_nrm_cc")
+        self.assertEqual((s.rows, s.missing_rows), ([], [0]))
+
+    def test_audit_scale_uses_cache(self):
+        """同じ綴り間違いを大量に与えても結果が安定し、キャッシュが効く。"""
+        names = [f"T_Asset{i}_{bad}_cc" for i in range(50000) for bad in ("nrm", "clo", "mks")]
+        out = [self.suggester.suggest(n).suggested_name for n in names]
+        self.assertEqual(out[:3], ["T_Asset0_nml_cc", "T_Asset0_col_cc", "T_Asset0_msk_cc"])
+        self.assertEqual(len(out), 150000)
+        self.assertLessEqual(len(self.suggester._cache), 10)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
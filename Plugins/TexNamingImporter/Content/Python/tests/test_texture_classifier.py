@@ -0,0 +1,131 @@
+import struct
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+import texture_classifier  # noqa: E402
+from texture_classifier import ContentKind, classify_file, classify_pixels, propose_texture_type  # noqa: E402
+from texture_config import load_params_map_json  # noqa: E402
+
+np = texture_classifier._np
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+
+
+def normal_pixels(n, rng):
+    theta = rng.uniform(0, 2 * np.pi, n)
+    z = rng.uniform(0.7, 1.0, n)
+    r = np.sqrt(1 - z * z)
+    v = np.stack([r * np.cos(theta), r * np.sin(theta), z], axis=1)
+    return (v + 1) / 2
+
+
+def tga_bytes(rgb_u8):
+    h, w, _ = rgb_u8.shape
+    header = struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, w, h, 24, 0)
+    return header + rgb_u8[:, :, ::-1].tobytes()  # BGR
+
+
+@unittest.skipIf(np is None, "NumPy がインストールされていません")
+class TestClassifyPixels(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+
+    def test_normal_map(self):
+        self.assertIs(classify_pixels(normal_pixels(4096, self.rng)).kind, ContentKind.NORMAL_MAP)
+
+    def test_grayscale(self):
+        v = self.rng.uniform(0, 1, (4096, 1))
+        self.assertIs(classify_pixels(np.repeat(v, 3, axis=1)).kind, ContentKind.GRAYSCALE)
+        self.assertIs(classify_pixels(v).kind, ContentKind.GRAYSCALE)
+
+    def test_packed_mask(self):
+        self.assertIs(classify_pixels(self.rng.uniform(0, 1, (4096, 4))).kind, ContentKind.MASK)
+
+    def test_color(self):
+        lum = self.rng.uniform(0, 1, (4096, 1))
+        color = np.clip(lum * np.array([1.0, 0.8, 0.5]) + self.rng.normal(0, 0.03, (4096, 3)), 0, 1)
+        self.assertIs(classify_pixels(color).kind, ContentKind.COLOR)
+
+    def test_propose_from_config(self):
+        settings = load_params_map_json(CONFIG_DIR / "TextureConfig.json")
+        expected = {ContentKind.NORMAL_MAP: "nml", ContentKind.GRAYSCALE: "msk", ContentKind.MASK: "flw",
+                    ContentKind.COLOR: "col", ContentKind.HDR: "cub"}
+        for kind, key in expected.items():
+            with self.subTest(kind=kind):
+                self.assertEqual(propose_texture_type(kind, settings), key)
+
+
+@unittest.skipIf(np is None, "NumPy がインストールされていません")
+class TestClassifyFile(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.settings = load_params_map_json(CONFIG_DIR / "TextureConfig.json")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_tga_normal_map_is_sampled(self):
+        rng = np.random.default_rng(2)
+        px = (normal_pixels(256 * 128, rng) * 255).round().astype(np.uint8).reshape(128, 256, 3)
+        p = self.dir / "T_Rock.tga"
+        p.write_bytes(tga_bytes(px))
+        sampled = texture_classifier.sample_pixels(p, max_samples=512)
+        self.assertLessEqual(len(sampled), 512)
+        result = classify_file(p, self.settings, max_samples=512)
+        self.assertIs(result.kind, ContentKind.NORMAL_MAP)
+        self.assertEqual(result.texture_type, "nml")
+
+    def test_float_header_is_hdr(self):
+        header = bytearray(148)
+        header[0:4] = b"DDS "
+        struct.pack_into("<IIII", header, 4, 124, 0x1007, 16, 16)
+        struct.pack_into("<II4s", header, 76, 32, 0x4, b"DX10")
+        struct.pack_into("<I", header, 128, 10)  # R16G16B16A16_FLOAT
+        p = self.dir / "T_Sky.dds"
+        p.write_bytes(bytes(header))
+        result = classify_file(p, self.settings)
+        self.assertIs(result.kind, ContentKind.HDR)
+        self.assertEqual(result.texture_type, "cub")
+
+    def test_unreadable_returns_none(self):
+        p = self.dir / "notes.txt"
+        p.write_text("hello")
+        self.assertIsNone(classify_file(p, self.settings))
+
+    def test_large_pil_source_is_not_decoded(self):
+        class _Opened:
+            format = "PNG"
+            mode = "RGB"
+            size = (8192, 8192)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def __array__(self, *args, **kwargs):
+                raise AssertionError("全画素を展開した")
+
+        p = self.dir / "T_Huge.png"
+        p.write_bytes(b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", 8192, 8192) + bytes(5))
+        fake = mock.Mock(open=mock.Mock(return_value=_Opened()))
+        with mock.patch.object(texture_classifier, "_Image", fake), redirect_stderr(StringIO()) as err:
+            self.assertIsNone(texture_classifier.sample_pixels(p))
+        fake.open.assert_called_once()
+        self.assertIn("too large to decode", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import importlib
+import io
+import struct
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from detail_unreal import unreal_standin  # noqa: E402
+from config import Config, MemoryBudget  # noqa: E402
+from compiled_rules import compile_rules  # noqa: E402
+from memory_estimator import MemoryEstimator  # noqa: E402
+from metrics import PipelineMetrics  # noqa: E402
+from phash_index import PerceptualHashIndex  # noqa: E402
+from progress_journal import ProgressJournal, read_journal  # noqa: E402
+from texture_classifier import _np  # noqa: E402
+
+CONFIG_DIR = PYTHON_DIR.parents[3] / "Config" / "TexNamingImporter"
+_UNREAL_MODULES = ("texture_configurator", "detail_unreal.texture_configurator_unreal",
+                   "detail_unreal.tick_scheduler_unreal")
+
+
+class TestTextureConfiguratorPipeline(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("unreal")
+        self.unreal = unreal_standin.install()
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        self.mod = importlib.import_module("texture_configurator")
+
+    def tearDown(self):
+        for name in _UNREAL_MODULES:
+            sys.modules.pop(name, None)
+        unreal_standin.uninstall()
+        if self._saved is not None:
+            sys.modules["unreal"] = self._saved
+
+    def _run(self, paths, **kw):
+        with redirect_stdout(io.StringIO()):
+            return list(self.mod.iter_texture_property_from_config(
+                paths, str(CONFIG_DIR / "TextureConfig.json"), str(CONFIG_DIR / "SuffixConfig.json"),
+                str(CONFIG_DIR / "Config.json"), **kw))
+
+    def test_batch_with_metrics(self):
+        good = "/Game/VFX/T_Smoke_nml_cc.T_Smoke_nml_cc"
+        bad = "/Game/VFX/T_Smoke_nlm_cc.T_Smoke_nlm_cc"
+        self.unreal.add_texture(good)
+        self.unreal.add_texture(bad)
+        metrics = PipelineMetrics()
+        results = dict(self._run([good, bad], hooks=self.mod.BatchHooks(metrics=metrics)))
+
+        self.assertTrue(results[good]["ok"], results[good])
+        self.assertEqual(results[bad].get("skipped"), "suffix")
+        self.assertEqual(self.unreal.transactions, ["Configure Textures (Batch Apply)"])
+        self.assertEqual(metrics.combination_hits.get("nml_cc"), 1)
+        self.assertEqual(metrics.skipped.get("suffix"), 1)
+        self.assertEqual(metrics.stage_seconds.count("apply"), 2)
+
+    @unittest.skipIf(_np is None, "NumPy がインストールされていません")
+    def test_classify_proposes_type_for_bad_suffix(self):
+        with tempfile.TemporaryDirectory() as d:
+            # 青が強く、赤緑が 0.5 付近の平坦な法線マップ
+            src = Path(d, "T_Rock.tga")
+            src.write_bytes(struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, 8, 8, 24, 0)
+                            + bytes([255, 128, 128]) * 64)
+            bad = "/Game/VFX/T_Rock_nrm_cc.T_Rock_nrm_cc"
+            self.unreal.add_texture(bad, source_file=str(src))
+            results = dict(self._run([bad], classify=True))
+        self.assertEqual(results[bad].get("skipped"), "suffix")
+        self.assertEqual(results[bad].get("proposed_type"), "nml")
+
+    @unittest.skipIf(_np is None, "NumPy がインストールされていません")
+    def test_duplicate_sources_are_reported(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d, "gradient.tga")
+            src.write_bytes(struct.pack("<BBBHHBHHHHBB", 0, 0, 3, 0, 0, 0, 0, 0, 16, 16, 8, 0) + bytes(range(256)))
+            first = "/Game/VFX/T_Smoke_col_cc.T_Smoke_col_cc"
+            second = "/Game/FX/T_Smoke2_col_cc.T_Smoke2_col_cc"
+            for path in (first, second):
+                self.unreal.add_texture(path, source_file=str(src))
+            index = PerceptualHashIndex()
+            results = dict(self._run([first, second], hooks=self.mod.BatchHooks(duplicates=(index, 4))))
+        self.assertNotIn("duplicates", results[first])
+        self.assertEqual(results[second]["duplicates"], [first])
+        self.assertEqual(len(index), 2)
+
+    def test_malformed_source_header_does_not_stop_batch(self):
+        with tempfile.TemporaryDirectory() as d:
+            # dataWindow が 16 バイトに満たない EXR
+            src = Path(d, "bad.exr")
+            src.write_bytes(b"\x76\x2f\x31\x01" + struct.pack("<I", 2)
+                            + b"dataWindow\0box2i\0" + struct.pack("<i", 8) + bytes(8) + b"\0")
+            bad = "/Game/VFX/T_Bad_col_cc.T_Bad_col_cc"
+            good = "/Game/VFX/T_Good_col_cc.T_Good_col_cc"
+            self.unreal.add_texture(bad, source_file=str(src))
+            self.unreal.add_texture(good)
+            results = dict(self._run([bad, good]))
+        self.assertEqual(list(results), [bad, good])
+        self.assertTrue(results[good]["ok"], results[good])
+
+    def test_resume_skips_journaled_textures(self):
+        paths = [f"/Game/VFX/T_Smoke{i}_nml_cc.T_Smoke{i}_nml_cc" for i in range(4)]
+        for path in paths:
+            self.unreal.add_texture(path)
+        with tempfile.TemporaryDirectory() as d:
+            journal_path = Path(d) / "batch.journal"
+            # 2 件目まで処理したところで落ちた（最後のレコードは書きかけ）
+            with ProgressJournal(journal_path) as journal:
+                self._run(paths[:2], hooks=self.mod.BatchHooks(journal=journal))
+            with journal_path.open("ab") as f:
+                f.write(b'{"path":"' + paths[2].encode())
+            self.unreal.reset_calls()
+
+            with ProgressJournal(journal_path, append=True) as journal:
+                hooks = self.mod.BatchHooks(journal=journal, resume=read_journal(journal_path))
+                results = dict(self._run(paths, hooks=hooks))
+            state = read_journal(journal_path)
+        self.assertEqual([results[p].get("skipped") for p in paths], ["journal", "journal", None, None])
+        self.assertEqual(self.unreal.recorder.count("EditorAssetLibrary.save_loaded_asset"), 2)
+        self.assertEqual(sorted(state.completed), sorted(paths))
+        self.assertEqual(state.corrupt, 0)
+
+    @unittest.skipIf(_np is None, "NumPy がインストールされていません")
+    def test_memory_estimate_uses_source_size(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d, "T_Smoke.tga")
+            src.write_bytes(struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, 64, 32, 24, 0) + bytes(64 * 32 * 3))
+            known = "/Game/VFX/T_Smoke_col_cc.T_Smoke_col_cc"
+            unknown = "/Game/VFX/T_Fire_nml_cc.T_Fire_nml_cc"
+            self.unreal.add_texture(known, source_file=str(src))
+            self.unreal.add_texture(unknown)
+            memory = MemoryEstimator()
+            self._run([known, unknown, "/Game/VFX/T_Bad_xyz.T_Bad_xyz"], hooks=self.mod.BatchHooks(memory=memory))
+        result = memory.estimate()
+        self.assertEqual(result.paths, [known, unknown])
+        self.assertEqual(result.width.tolist()[0], 64)
+        self.assertEqual(result.estimated.tolist(), [False, True])
+
+    @unittest.skipIf(_np is None, "NumPy がインストールされていません")
+    def test_memory_estimate_on_rerun_uses_source_size(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d, "T_Smoke.tga")
+            src.write_bytes(struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, 64, 32, 24, 0) + bytes(64 * 32 * 3))
+            path = "/Game/VFX/T_Smoke_col_cc.T_Smoke_col_cc"
+            self.unreal.add_texture(path, source_file=str(src))
+            estimates = []
+            for _ in range(2):
+                memory = MemoryEstimator()
+                results = dict(self._run([path], hooks=self.mod.BatchHooks(memory=memory)))
+                estimates.append(memory.estimate())
+        # 2 回目は指紋が同じで読み飛ばされるが、見積もりは 1 回目と同じソース寸法で出す
+        self.assertEqual(results[path].get("skipped"), "unchanged")
+        self.assertEqual([e.width.tolist() for e in estimates], [[64], [64]])
+        self.assertEqual([e.estimated.tolist() for e in estimates], [[False], [False]])
+        self.assertEqual(estimates[0].total_gpu_bytes, estimates[1].total_gpu_bytes)
+
+    @unittest.skipIf(_np is None, "NumPy がインストールされていません")
+    def test_memory_budget_lowers_max_size(self):
+        paths = [f"/Game/VFX/T_Smoke{i}_nml_cc.T_Smoke{i}_nml_cc" for i in range(2)]
+        for path in paths:
+            self.unreal.add_texture(path)
+        config = Config.load(CONFIG_DIR / "Config.json")
+        config.memory_budgets = {"/Game/VFX": MemoryBudget(1.0)}
+        rules = compile_rules(CONFIG_DIR / "TextureConfig.json", CONFIG_DIR / "SuffixConfig.json",
+                              CONFIG_DIR / "Config.json")
+        with tempfile.TemporaryDirectory() as d, redirect_stdout(io.StringIO()):
+            budget_rules = self.mod.plan_memory_budget(paths, rules, config, Path(d) / "budget.json")
+            self.assertTrue((Path(d) / "budget.json").exists())
+        results = dict(self._run(paths, rules=budget_rules))
+        self.assertTrue(all(r["ok"] for r in results.values()), results)
+        # 1024 の BC5 2 枚（ミップ込み約 2.7MB）は収まらず、512（約 0.7MB）なら収まる
+        self.assertEqual([self.unreal.assets[p].get_editor_property("max_texture_size") for p in paths], [512, 512])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# tests/ の親 (= Plugins/TexNamingImporter/Content/Python) を import パスに追加
+THIS_FILE = Path(__file__).resolve()
+PYTHON_DIR = THIS_FILE.parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+from texture_config import TextureConfigParams  # noqa: E402
+from type_define import AddressMode, CompressionKind, MipGenKind, SRGBMode, TextureGroupKind  # noqa: E402
+from detail_unreal import unreal_standin  # noqa: E402
+
+
+class TestTextureConfiguratorApply(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("unreal")
+        self.unreal = unreal_standin.install()
+        sys.modules.pop("detail_unreal.texture_configurator_unreal", None)
+        self.mod = importlib.import_module("detail_unreal.texture_configurator_unreal")
+
+    def tearDown(self):
+        sys.modules.pop("detail_unreal.texture_configurator_unreal", None)
+        unreal_standin.uninstall()
+        if self._saved is not None:
+            sys.modules["unreal"] = self._saved
+
+    def _texture(self, path="/Game/T_Rock_nml_cc.T_Rock_nml_cc", **kw):
+        return self.unreal.add_texture(path, **kw)
+
+    def _params(self):
+        return TextureConfigParams(
+            compression=CompressionKind.NORMAL_MAP, srgb=SRGBMode.AUTO, max_in_game=2048,
+            texture_group=TextureGroupKind.WORLD_NORMAL_MAP, mip_gen=MipGenKind.FROM_TEXTURE_GROUP,
+            address_u=AddressMode.CLAMP, address_v=AddressMode.CLAMP,
+        )
+
+    def _apply(self, tex, params=None, **kw):
+        return self.mod.TextureConfigurator(params=params or self._params(), **kw).apply(tex.get_path_name())
+
+    def test_single_notification_per_texture(self):
+        tex = self._texture()
+        report = self._apply(tex)
+        self.assertTrue(report["ok"], report)
+        self.assertEqual(tex.notifications, 1)
+        self.assertEqual(tex.modify_count, 1)
+        self.assertEqual(self.unreal.recorder.count("Texture.post_edit_change"), 1)
+        self.assertEqual(tex.address_x, self.unreal.TextureAddress.TA_CLAMP)
+        self.assertEqual(tex.compression_settings, self.unreal.TextureCompressionSettings.TC_NORMALMAP)
+        self.assertIs(tex.srgb, False)  # AUTO は書き込む圧縮設定から決まる
+        self.assertEqual(tex.max_texture_size, 2048)
+        self.assertEqual(tex.lod_group, self.unreal.TextureGroup.TEXTUREGROUP_WORLD_NORMAL_MAP)
+        # mip_gen は既定値のままなので書き込まない
+        self.assertNotIn("mip_gen_settings", report["changed"])
+        self.assertEqual(self.unreal.saved, [tex.get_path_name()])
+        self.assertEqual(self.unreal.transactions, ["Configure Texture (Batch Apply)"])
+
+    def test_unchanged_texture_is_not_notified(self):
+        tex = self._texture()
+        configurator = self.mod.TextureConfigurator(params=self._params())
+        configurator.apply(tex.get_path_name())
+        report = configurator.apply(tex.get_path_name())
+        self.assertTrue(report["ok"], report)
+        self.assertEqual(report["changed"], [])
+        self.assertEqual(tex.notifications, 1)
+        self.assertEqual(tex.modify_count, 1)
+        self.assertEqual(len(self.unreal.saved), 1)  # ダーティでなければ保存しない
+
+    def test_batch_transaction_groups_undo(self):
+        textures = [self._texture(f"/Game/T_Rock{i}_nml_cc.T_Rock{i}_nml_cc") for i in range(3)]
+        with self.mod.batch_transaction(log=False) as stats:
+            for tex in textures:
+                self._apply(tex)
+        self.assertEqual(stats.textures, 3)
+        self.assertEqual(self.unreal.transactions, ["Configure Textures (Batch Apply)"])
+        self.assertEqual([t.modify_count for t in textures], [1, 1, 1])
+
+    def test_batch_memory_is_current_rss(self):
+        # 現在値を測るので、バッチ中に解放されれば増分は負になる（起動以来の最大値では常に 0 以上）
+        probe = iter([300 * 1024 * 1024, 200 * 1024 * 1024])
+        with mock.patch.object(self.mod, "_process_memory_bytes", lambda: next(probe)):
+            with self.mod.batch_transaction() as stats:
+                self._apply(self._texture())
+        self.assertEqual(stats.memory_delta, -100 * 1024 * 1024)
+        self.assertIn("memory -100.0 MiB", self.unreal.logs[-1][1])
+
+    @unittest.skipUnless(hasattr(os, "sysconf"), "os.sysconf がありません")
+    def test_rss_from_statm(self):
+        with tempfile.TemporaryDirectory() as d:
+            statm = Path(d, "statm")
+            statm.write_text("5000 1200 300 10 0 900 0\n", encoding="ascii")
+            self.assertEqual(self.mod._rss_from_statm(str(statm)), 1200 * os.sysconf("SC_PAGE_SIZE"))
+            statm.write_text("", encoding="ascii")
+            self.assertIsNone(self.mod._rss_from_statm(str(statm)))
+        self.assertIsNone(self.mod._rss_from_statm(str(Path(d, "missing"))))
+
+    def test_no_undo_mode_skips_modify(self):
+        tex = self._texture()
+        with self.mod.batch_transaction(undo_mode=self.mod.UndoMode.NONE, log=False) as stats:
+            self._apply(tex)
+        self.assertEqual(stats.textures, 1)
+        self.assertEqual(tex.modify_count, 0)
+        self.assertEqual(tex.notifications, 1)
+        self.assertEqual(self.unreal.transactions, [])
+
+    def test_unchanged_source_and_config_is_skipped(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d, "T_Rock_nml_cc.png")
+            src.write_bytes(b"\x89PNG" + bytes(range(256)) * 64)
+            tex = self._texture(source_file=str(src))
+
+            first = self._apply(tex)
+            self.assertNotIn("skipped", first)
+            self.assertTrue(tex.metadata)
+
+            again = self._apply(tex)
+            self.assertEqual(again.get("skipped"), "unchanged")
+
+            # 設定が変われば再適用
+            params = self._params()
+            params.max_in_game = 1024
+            self.assertNotIn("skipped", self._apply(tex, params))
+            # ソースが変わっても再適用
+            src.write_bytes(b"\x89PNG changed")
+            self.assertNotIn("skipped", self._apply(tex, params))
+            # --force 相当
+            self.assertNotIn("skipped", self._apply(tex, params, skip_unchanged=False))
+
+    def test_forced_apply_records_fingerprint(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d, "T_Rock_nml_cc.png")
+            src.write_bytes(b"\x89PNG" + bytes(range(256)) * 64)
+            tex = self._texture(source_file=str(src))
+
+            self.assertNotIn("skipped", self._apply(tex, skip_unchanged=False))
+            self.assertTrue(tex.metadata)
+            # --force で適用したあとも、次の通常のインポートは読み飛ばせる
+            self.assertEqual(self._apply(tex).get("skipped"), "unchanged")
+
+    def test_max_size_is_clamped_to_source(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d, "T_Rock_nml_cc.png")
+            ihdr = (1000).to_bytes(4, "big") + (600).to_bytes(4, "big") + bytes([8, 2, 0, 0, 0])
+            src.write_bytes(b"\x89PNG\r\n\x1a\n" + (13).to_bytes(4, "big") + b"IHDR" + ihdr)
+            tex = self._texture(source_file=str(src))
+
+            report = self._apply(tex)
+            self.assertEqual(tex.max_texture_size, 1000)  # 2048 はソースより大きいので頭打ち
+            self.assertEqual(report["source"], "png 1000x600 ch=3 bits=8")
+            self.assertEqual(len(report["warnings"]), 1)  # 非 2 の冪
+
+            params = self._params()
+            params.enforce_pow2 = True
+            self._apply(tex, params)
+            self.assertEqual(tex.max_texture_size, 1024)
+
+
+class TestUnrealStandIn(unittest.TestCase):
+    def setUp(self):
+        self.unreal = unreal_standin.StandIn()
+
+    def test_editor_property_names_and_notifications(self):
+        tex = self.unreal.add_texture("/Game/T_A.T_A")
+        N = self.unreal.PropertyAccessChangeNotifyMode
+        tex.set_editor_property("LODGroup", self.unreal.TextureGroup.TEXTUREGROUP_UI, N.NEVER)
+        self.assertEqual(tex.get_editor_property("lod_group"), self.unreal.TextureGroup.TEXTUREGROUP_UI)
+        self.assertEqual(tex.notifications, 0)
+        tex.srgb = False                        # 属性代入は通知あり
+        tex.set_editor_property("SRGB", False)  # 値が同じなら DEFAULT は通知しない
+        self.assertEqual(tex.notifications, 1)
+        self.assertFalse(hasattr(tex, "address_z"))
+        with self.assertRaises(Exception):
+            tex.set_editor_property("NoSuchProperty", 1)
+
+    def test_latency_injection(self):
+        slept = []
+        self.unreal.recorder.sleep = slept.append
+        self.unreal.recorder.set_latency("Texture.post_edit_change", 0.25)
+        tex = self.unreal.add_texture("/Game/T_A.T_A")
+        tex.post_edit_change()
+        tex.modify()
+        self.assertEqual(slept, [0.25])
+        self.assertEqual(self.unreal.recorder.names(), ["Texture.post_edit_change", "Texture.modify"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import math
+import struct
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+try:  # 画素の統計は NumPy 前提（無ければ分類しない）
+    import numpy as _np
+except ImportError:  # pragma: no cover - 環境依存
+    _np = None
+
+try:  # PNG/JPEG/PSD の展開は Pillow があるときだけ
+    from PIL import Image as _Image
+except ImportError:  # pragma: no cover - 環境依存
+    _Image = None
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+from image_header import ImageHeader, ImageHeaderError, read_image_header
+from texture_config import TextureConfigParams
+from type_define import CompressionKind, SRGBMode
+
+# 1 枚あたりに読む画素数の上限（間引き間隔はここから決める）
+DEFAULT_MAX_SAMPLES = 16384
+# Pillow で全画素を展開してよい画素数の上限（RGBA8 で 64MB）。PNG/PSD などは間引き前に全体を展開するため、
+# これより大きいものは分類しない。JPEG は draft で縮小して展開するので対象外
+MAX_DECODE_PIXELS = 4096 * 4096
+
+
+class ContentKind(Enum):
+    COLOR = 0
+    NORMAL_MAP = 1
+    GRAYSCALE = 2   # 全チャンネルがほぼ同じ（単色のマスク・高さなど）
+    MASK = 3        # チャンネルごとに独立した値を詰めたパック済みマスク
+    HDR = 4
+
+
+# 種別ごとに、texture_type を選ぶときに優先する圧縮設定
+_PREFERRED_COMPRESSION: Dict[ContentKind, Tuple[CompressionKind, ...]] = {
+    ContentKind.COLOR: (CompressionKind.BC7, CompressionKind.DEFAULT),
+    ContentKind.NORMAL_MAP: (CompressionKind.NORMAL_MAP,),
+    ContentKind.GRAYSCALE: (CompressionKind.GRAYSCALE, CompressionKind.ALPHA, CompressionKind.MASKS),
+    ContentKind.MASK: (CompressionKind.MASKS, CompressionKind.ALPHA, CompressionKind.GRAYSCALE),
+    ContentKind.HDR: (CompressionKind.HDR,),
+}
+
+
+@dataclass(frozen=True)
+class ContentClassification:
+    kind: ContentKind
+    confidence: float               # 0..1 の目安
+    reason: str
+    texture_type: Optional[str] = None  # texture_settings から選んだ候補（無ければ None）
+
+
+# ---------- 間引き読み込み ----------
+def _stride(width: int, height: int, max_samples: int) -> int:
+    return max(1, math.ceil(math.sqrt(width * height / max(1, max_samples))))
+
+
+def _to_unit(arr) -> "_np.ndarray":
+    """画素を 0..1 の float32 にする。"""
+    if arr.dtype == _np.uint8:
+        return arr.astype(_np.float32) / 255.0
+    if arr.dtype == _np.uint16:
+        return arr.astype(_np.float32) / 65535.0
+    return arr.astype(_np.float32)
+
+
+def _sample_tga(file_path: Union[str, Path], header: ImageHeader, max_samples: int):
+    """非圧縮 TGA（トゥルーカラー / グレースケール、8bit/ch）を memmap で間引き読みする。"""
+    with open(file_path, "rb") as f:
+        head = f.read(18)
+    id_len, cmap_type, image_type = head[0], head[1], head[2]
+    if image_type not in (2, 3) or cmap_type != 0 or header.bit_depth != 8:
+        return None
+    bpp = head[16] // 8
+    s = _stride(header.width, header.height, max_samples)
+    mm = _np.memmap(file_path, dtype=_np.uint8, mode="r", offset=18 + id_len,
+                    shape=(header.height, header.width, bpp))
+    px = _np.array(mm[::s, ::s])
+    if bpp >= 3:
+        px[..., [0, 2]] = px[..., [2, 0]]  # BGR(A) → RGB(A)
+    return px
+
+
+# DXGI_FORMAT → 先頭からのバイト順（R, G, B, A の位置）
+_DXGI_RGBA8 = {28: (0, 1, 2, 3), 29: (0, 1, 2, 3), 87: (2, 1, 0, 3), 91: (2, 1, 0, 3)}
+
+
+def _sample_dds(file_path: Union[str, Path], header: ImageHeader, max_samples: int):
+    """非圧縮 32bit の DDS（最上位ミップのみ）を memmap で間引き読みする。ブロック圧縮は対象外。"""
+    with open(file_path, "rb") as f:
+        head = f.read(148)
+    pf_flags, fourcc, rgb_bits = struct.unpack_from("<I4sI", head, 80)
+    offset = 128
+    if fourcc == b"DX10":
+        dxgi, = struct.unpack_from("<I", head, 128)
+        order = _DXGI_RGBA8.get(dxgi)
+        offset += 20
+    elif not pf_flags & 0x4 and rgb_bits == 32:
+        masks = struct.unpack_from("<IIII", head, 92)
+        order = tuple((m.bit_length() - 1) // 8 for m in masks if m)
+        if len(order) < 3:
+            return None
+    else:
+        return None
+    if order is None:
+        return None
+    s = _stride(header.width, header.height, max_samples)
+    mm = _np.memmap(file_path, dtype=_np.uint8, mode="r", offset=offset, shape=(header.height, header.width, 4))
+    return _np.array(mm[::s, ::s])[..., list(order)]
+
+
+def _sample_pil(file_path: Union[str, Path], header: ImageHeader, max_samples: int):
+    """
+    Pillow で展開して間引く。JPEG 以外は全画素を一度展開するので、MAX_DECODE_PIXELS を超える画像は読まない
+    （行ごとに展開できる API が無いため。大きな PNG/PSD は TGA/DDS と違い分類の対象外になる）。
+    """
+    if _Image is None:
+        return None
+    s = _stride(header.width, header.height, max_samples)
+    with _Image.open(file_path) as img:
+        if s > 1 and img.format == "JPEG":
+            # JPEG は DCT 段階で縮小して展開する（全画素を展開しない）
+            img.draft(img.mode, (header.width // s, header.height // s))
+            s = _stride(img.size[0], img.size[1], max_samples)
+        elif img.size[0] * img.size[1] > MAX_DECODE_PIXELS:
+            print(f"[TextureClassifier] skipped {file_path}: {img.size[0]}x{img.size[1]} is too large to decode "
+                  f"for sampling (limit {MAX_DECODE_PIXELS} pixels)", file=sys.stderr)
+            return None
+        if img.mode not in ("L", "LA", "RGB", "RGBA", "I;16", "I", "F"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        arr = _np.asarray(img)
+    if arr.ndim == 2:
+        arr = arr[:, :, None]
+    px = arr[::s, ::s]
+    if px.dtype == _np.int32:  # "I" モードの 16bit PNG
+        px = px.astype(_np.uint16)
+    return px
+
+
+def sample_grid(file_path: Union[str, Path], header: Optional[ImageHeader] = None, *,
+                max_samples: int = DEFAULT_MAX_SAMPLES):
+    """
+    画像から格子状に間引いた画素を (H', W', C) の 0..1 float32 で返す（H'*W' はおおよそ max_samples 以下）。
+    非圧縮 TGA/DDS は memmap で間引いた行だけを読み、それ以外は Pillow があれば使う。読めなければ None。
+    Pillow の経路は JPEG を除き MAX_DECODE_PIXELS までの画像に限る（それ以上は None）。
+    """
+    if _np is None:
+        return None
+    header = header or read_image_header(file_path)
+    if header is None:
+        return None
+    if header.format == "tga":
+        px = _sample_tga(file_path, header, max_samples)
+    elif header.format == "dds":
+        px = _sample_dds(file_path, header, max_samples)
+    else:
+        px = _sample_pil(file_path, header, max_samples)
+    return None if px is None else _to_unit(px)
+
+
+def sample_pixels(file_path: Union[str, Path], header: Optional[ImageHeader] = None, *,
+                  max_samples: int = DEFAULT_MAX_SAMPLES):
+    """sample_grid の結果を (N, C) に並べ直したもの。読めなければ None。"""
+    grid = sample_grid(file_path, header, max_samples=max_samples)
+    return None if grid is None else grid.reshape(-1, grid.shape[-1])
+
+
+# ---------- 分類 ----------
+def _max_abs_correlation(rgb) -> float:
+    """チャンネル間の相関係数の絶対値の最大（ほぼ一定のチャンネルは相関 0 とみなす）。"""
+    std = rgb.std(axis=0)
+    live = std > 1e-3
+    if live.sum() < 2:
+        return 0.0
+    corr = _np.corrcoef(rgb[:, live], rowvar=False)
+    off = _np.abs(corr[~_np.eye(corr.shape[0], dtype=bool)])
+    return float(_np.nan_to_num(off).max())
+
+
+def classify_pixels(pixels) -> ContentClassification:
+    """
+    0..1 の画素 (N, C) から内容を推定する。アルファは判定に使わない。
+    - NORMAL_MAP: (2*RGB-1) がほぼ単位長、Z（青）が正、X/Y（赤緑）の平均が 0.5 付近
+    - GRAYSCALE : 各チャンネルの差がほぼ 0
+    - MASK      : チャンネル間の相関が弱い（独立した値を詰めている）
+    - COLOR     : 上記以外（自然画像はチャンネル間の相関が強い）
+    """
+    if _np is None:
+        raise RuntimeError("texture_classifier には NumPy が必要です")
+    px = _np.asarray(pixels, dtype=_np.float32)
+    if px.ndim == 1:
+        px = px[:, None]
+    if px.shape[0] == 0:
+        raise ValueError("画素がありません")
+    channels = px.shape[1]
+    if channels <= 2:
+        return ContentClassification(ContentKind.GRAYSCALE, 0.9, f"{channels} channel(s)")
+
+    rgb = px[:, :3]
+    diff = float(_np.abs(rgb[:, 0] - rgb[:, 1]).mean() + _np.abs(rgb[:, 1] - rgb[:, 2]).mean())
+    if diff < 0.01:
+        return ContentClassification(ContentKind.GRAYSCALE, min(1.0, 1.0 - diff * 50), f"channel diff {diff:.4f}")
+
+    n = rgb * 2.0 - 1.0
+    length = _np.sqrt((n * n).sum(axis=1))
+    unit = float((_np.abs(length - 1.0) < 0.15).mean())
+    z_pos = float((n[:, 2] > -0.05).mean())
+    mean_x, mean_y = float(rgb[:, 0].mean()), float(rgb[:, 1].mean())
+    if unit > 0.85 and z_pos > 0.95 and abs(mean_x - 0.5) < 0.15 and abs(mean_y - 0.5) < 0.15:
+        return ContentClassification(ContentKind.NORMAL_MAP, unit * z_pos,
+                                     f"unit-length {unit:.2f}, z>=0 {z_pos:.2f}, mean blue {rgb[:, 2].mean():.2f}")
+
+    corr = _max_abs_correlation(rgb)
+    if corr < 0.5:
+        return ContentClassification(ContentKind.MASK, 1.0 - corr, f"max channel correlation {corr:.2f}")
+    return ContentClassification(ContentKind.COLOR, min(1.0, corr), f"max channel correlation {corr:.2f}")
+
+
+def propose_texture_type(kind: ContentKind, texture_settings: Mapping[str, TextureConfigParams]) -> Optional[str]:
+    """
+    推定した種別に合う texture_type を設定から選ぶ（圧縮設定で対応付けるので、キー名には依存しない）。
+    優先する圧縮設定の順に、設定ファイルの並びで最初に見つかったキーを返す。
+    """
+    for compression in _PREFERRED_COMPRESSION[kind]:
+        candidates = [k for k, p in texture_settings.items() if p.compression is compression]
+        if kind is ContentKind.COLOR:
+            candidates.sort(key=lambda k: texture_settings[k].srgb is not SRGBMode.ON)  # sRGB ON を優先
+        if candidates:
+            return candidates[0]
+    return None
+
+
+def classify_file(file_path: Union[str, Path],
+                  texture_settings: Optional[Mapping[str, TextureConfigParams]] = None, *,
+                  max_samples: int = DEFAULT_MAX_SAMPLES) -> Optional[ContentClassification]:
+    """
+    ソース画像を分類し、texture_settings があれば texture_type の候補も付ける。
+    float 形式（EXR / float DDS / 32bit PSD）はヘッダだけで HDR と判定する。
+    分類できない（未対応の形式、Pillow が無い、NumPy が無い）場合は None。
+    """
+    try:
+        header = read_image_header(file_path)
+        if header is None:
+            return None
+        if header.is_float:
+            result = ContentClassification(ContentKind.HDR, 1.0, f"{header.format} float {header.bit_depth}bit")
+        else:
+            pixels = sample_pixels(file_path, header, max_samples=max_samples)
+            if pixels is None:
+                return None
+            result = classify_pixels(pixels)
+    except (OSError, ImageHeaderError, ValueError) as e:
+        print(f"[TextureClassifier] failed to classify {file_path}: {e}", file=sys.stderr)
+        return None
+    if texture_settings:
+        result = ContentClassification(result.kind, result.confidence, result.reason,
+                                       propose_texture_type(result.kind, texture_settings))
+    return result
@@ -1,6 +1,8 @@
 import sys, argparse
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 _THIS_DIR = Path(__file__).resolve().parent
 if str(_THIS_DIR) not in sys.path:
@@ -9,11 +11,31 @@ if str(_THIS_DIR) not in sys.path:
 import validator
 from texture_config import overwrite_address_uv, load_params_map_json
 from suffix_config import TextureSuffixConfig, load_texture_suffix_config
+from compiled_rules import CompiledRules, compile_rules, resolve_params
+from pipeline import ResolvedTexture, iter_resolved
+from path_utils.path_stream import iter_paths
 from type_define import AddressMode
 from config import Config, TextureConfigParams
 from path_utils.path_functions import *
 
-from detail_unreal.texture_configurator_unreal import TextureConfigurator
+from batch_scheduler import TickBudgetScheduler
+from config_watcher import ConfigWatcher
+from profiling import PROFILE_MODES, ProfileOptions, profile_batch
+from metrics import PipelineMetrics, metrics_dir_from_env, process_registry
+from texture_classifier import classify_file
+from phash_index import DEFAULT_MAX_DISTANCE, PerceptualHashIndex, check_and_add
+from fingerprint import params_fingerprint
+from progress_journal import JournalState, ProgressJournal, read_journal, status_of
+from memory_estimator import MemoryEstimator, write_budget_report
+from memory_budget import BudgetSolver, log_plan, rules_with_budget
+from event_log import EventRecorder, ImportEvent, config_hashes
+from image_header import ImageHeaderError, read_image_header
+from detail_unreal.texture_configurator_unreal import TextureConfigurator, UndoMode, batch_transaction, source_file_of_path
+from detail_unreal.tick_scheduler_unreal import start_tick_batch
+
+# 重複確認の設定: (知覚ハッシュ索引, 重複とみなす距離)
+DuplicateCheck = Tuple[PerceptualHashIndex, int]
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -43,8 +65,78 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "texture_path",
+        nargs="?",
         help="対象テクスチャの Unreal アセットパス。例: /Game/Textures/T_Sample.T_Sample",
     )
+    parser.add_argument(
+        "--path-list",
+        help="改行区切りのテクスチャパス一覧ファイル（.gz 可）。texture_path の代わりに一括処理する",
+    )
+    parser.add_argument(
+        "--undo",
+        choices=["batch", "per-texture", "none"],
+        default="batch",
+        help="Undo の記録方法。batch: バッチ全体で 1 ステップ（既定）/ per-texture: 1 件ごと / none: 記録しない（大量一括適用向け）",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="ソースファイルと設定が前回の適用時から変わっていなくても再適用する",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="バッチ全体をプロファイルする（cprofile: 決定的 / sample: 低オーバーヘッド）。環境変数 TEXNAMING_PROFILE でも指定可",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        help="プロファイル結果の出力先（既定: TEXNAMING_PROFILE_DIR、無ければ一時ディレクトリ）",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="バッチ前後の tracemalloc スナップショットを比較し、確保の多い行を出力する",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        help="バッチ終了時にメトリクス（Prometheus テキスト形式と JSON）を書き出すディレクトリ。環境変数 TEXNAMING_METRICS_DIR でも指定可",
+    )
+    parser.add_argument(
+        "--classify",
+        action="store_true",
+        help="サフィックスが不正なテクスチャのソース画像を解析し、texture_type の候補を表示する（NumPy が必要）",
+    )
+    parser.add_argument(
+        "--phash-index",
+        help="知覚ハッシュ索引のパス。指定するとソース画像がほぼ同じ既存テクスチャを警告し、索引を更新する（NumPy が必要）",
+    )
+    parser.add_argument(
+        "--duplicate-distance",
+        type=int,
+        default=DEFAULT_MAX_DISTANCE,
+        help=f"重複とみなす知覚ハッシュの Hamming 距離（既定: {DEFAULT_MAX_DISTANCE}）",
+    )
+    parser.add_argument(
+        "--journal",
+        help="テクスチャごとの結果を追記するジャーナル（JSONL）のパス。--resume なしなら新しく作り直す",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="--journal の記録を読み、同じ設定で適用済みのテクスチャを読み込まずに飛ばして続きから処理する",
+    )
+    parser.add_argument(
+        "--memory-report",
+        help="バッチ終了時に、適用した設定での GPU メモリとクック後サイズの見積もりを書き出すディレクトリ（NumPy が必要）",
+    )
+    parser.add_argument(
+        "--budget-state",
+        help="Config.json の memory_budgets に収まるよう max_in_game を選ぶ。選択に使う状態ファイルのパス（毎回追記・更新、NumPy が必要）",
+    )
+    parser.add_argument(
+        "--record",
+        help="テクスチャごとのパス・時刻・設定の指紋・結果を追記するイベントログ（.jsonl.gz）のパス。event_replay で再生できる",
+    )
     return parser
 
 
@@ -69,64 +161,391 @@ def get_texture_settings_from_suffixes(suffixes: List[str],
 def build_texture_config_params(suffixes: List[str],
                                 tex_settings_dict: Dict[str, TextureConfigParams],
                                 suffix_settings: TextureSuffixConfig)-> TextureConfigParams:
-    base_settings = get_texture_settings_from_suffixes(suffixes, tex_settings_dict, suffix_settings)
-    # 現状はTex2Dのみ対応
-    address_u, address_v = get_address_settings_from_suffix(suffixes, suffix_settings)
-    return overwrite_address_uv(base_settings, address_u, address_v)
-
-
-def apply_texture_property_from_config(texture_list: List[str], texture_config_path: str, suffix_config_path: str, config_path) -> int:
-    tex_settings_dict = load_params_map_json(texture_config_path)
-    suffix_settings = load_texture_suffix_config(suffix_config_path)
-    
-    suffix_grid = validator.build_suffix_grid(suffix_settings)
-    all_suffixes = [suf for row in suffix_grid for suf in row]
+    # 共有の texture_settings を書き換えないよう、対応表と同じ規則で新しいインスタンスを作る
+    return resolve_params(suffixes, tex_settings_dict, suffix_settings)
+
+
+def _apply_texture(tex_path: str, rules: CompiledRules, *, skip_unchanged: bool = True, classify: bool = False,
+                   duplicates: Optional[DuplicateCheck] = None) -> Dict:
+    """1 テクスチャ分の 検証 → パラメータ生成 → 適用 を行い、適用結果を返す。"""
+    return _apply_resolved(next(iter_resolved((tex_path,), rules)), rules, skip_unchanged=skip_unchanged,
+                           classify=classify, duplicates=duplicates)
+
+
+def _check_duplicates(tex_path: str, duplicates: DuplicateCheck) -> List[str]:
+    """ソース画像がほぼ同じ既存テクスチャを探して警告し、索引に登録する。"""
+    index, max_distance = duplicates
+    found = check_and_add(index, tex_path, source_file_of_path(tex_path), max_distance=max_distance)
+    for other, distance in found:
+        print(f"Possible duplicate of {other} (perceptual distance {distance})")
+    return [other for other, _d in found]
+
+
+def _propose_texture_type(tex_path: str, rules: CompiledRules) -> Optional[str]:
+    """サフィックス不正で読み飛ばすテクスチャについて、ソース画像の内容から texture_type の候補を出す。"""
+    source_file = source_file_of_path(tex_path)
+    if source_file is None:
+        return None
+    result = classify_file(source_file, rules.texture_settings)
+    if result is None:
+        return None
+    print(f"Content looks like {result.kind.name} ({result.confidence:.2f}: {result.reason})"
+          + (f", texture_type candidate: {result.texture_type}" if result.texture_type else ""))
+    return result.texture_type
+
+
+def _apply_resolved(item: ResolvedTexture, rules: CompiledRules, *, skip_unchanged: bool = True,
+                    classify: bool = False, duplicates: Optional[DuplicateCheck] = None) -> Dict:
+    """検証・解決済みの 1 テクスチャを適用し、適用結果を返す。"""
+    tex_path = item.path
+    # サフィックスの抽出と行ごとの検証は 1 パスで済ませ（大小無視）、最終パラメータは対応表から引いてある
+    suffix_result, texture_settings = item.match, item.params
+    print(f"---import begin  {tex_path} ---")
+    print(suffix_result)
+    if suffix_result.ok:
+        print("Suffix OK")
+    else:
+        print(f"Suffix Error: {suffix_result.error}")
+        suggestion = rules.suggester.suggest_path(tex_path)
+        if suggestion is not None and suggestion.suggested_name:
+            print(f"Did you mean: {suggestion.suggested_name}")
+        elif suggestion is not None and suggestion.missing_rows:
+            print(f"Missing suffix: {', '.join(rules.grammar.rows[i].category for i in suggestion.missing_rows)}")
+        report = {"ok": False, "skipped": "suffix", "errors": [suffix_result.error]}
+        if classify:
+            proposed = _propose_texture_type(tex_path, rules)
+            if proposed is not None:
+                report["proposed_type"] = proposed
+        print(f"---import end  {tex_path} ---")
+        return report  # サフィックスエラーならインポートしない
+
+    # c++側で判定するのでコメントアウト
+    #is_valid_dir = validator.validate_directory(tex_path, run_directory)
+    #if is_valid_dir:
+    #     print("Valid Directory")
+    # else:
+    #     print("Invalid Directory")
+    #     print(f"---import end  {tex_path} ---")
+    #     continue
+    print(f"import property: {texture_settings}")
+    importer = TextureConfigurator(params=texture_settings, skip_unchanged=skip_unchanged)
+    import_result_dict = importer.apply(tex_path)
+    if duplicates is not None:
+        found = _check_duplicates(tex_path, duplicates)
+        if found:
+            import_result_dict["duplicates"] = found
+    print(import_result_dict)
+    if import_result_dict.get("skipped") == "unchanged":
+        print("Import Skipped (unchanged)")
+    elif import_result_dict.get("ok"):
+        print("Import Succeeded")
+    else:
+        print(f"Import Failed: {import_result_dict}")
+    print(f"---import end  {tex_path} ---")
+    return import_result_dict
+
+
+def _source_dimensions(tex_path: str) -> Tuple[int, int, int, int]:
+    """ソース画像の (幅, 高さ, チャンネル数, ビット深度)。読めなければ寸法 0（不明）。"""
+    source_file = source_file_of_path(tex_path)
+    if source_file is not None:
+        try:
+            header = read_image_header(source_file)
+        except (OSError, ImageHeaderError):
+            header = None
+        if header is not None:
+            return header.width, header.height, header.channels, header.bit_depth
+    return 0, 0, 0, 8
+
+
+def plan_memory_budget(paths: List[str], rules: CompiledRules, config: Config,
+                       state_path: Union[str, Path]) -> CompiledRules:
+    """
+    バッチ内の予算ディレクトリ以下のテクスチャを状態ファイルに追加して割り当てを解き直し、
+    選んだ max_in_game を directory_overrides に重ねたルールを返す（予算が無ければ rules のまま）。
+    """
+    if not config.memory_budgets:
+        print("[MemoryBudget] no memory_budgets in config")
+        return rules
+    solver = BudgetSolver.load_or_new(state_path, config.memory_budgets)
+    inputs = []
+    for path in paths:
+        if solver.root_of(path) is None:
+            continue
+        match, params = rules.resolve_path(path)
+        if params is not None:
+            inputs.append((path, match.keys_by_row[0], params) + _source_dimensions(path))
+    solver.add_many(inputs)
+    plan = solver.solve()
+    log_plan(plan)
+    solver.save(state_path)
+    return rules_with_budget(rules, config, plan)
+
+
+@dataclass
+class BatchOptions:
+    """
+    apply_texture_property_from_config のバッチ単位の付加機能。既定はすべて無効。
+    - metrics_dir        : バッチ終了時にメトリクスを書き出すディレクトリ（省略時は TEXNAMING_METRICS_DIR）
+    - phash_index_path   : 知覚ハッシュ索引。重複を確認し、バッチ終了時に保存する
+    - duplicate_distance : 重複とみなす知覚ハッシュの Hamming 距離
+    - journal_path       : 結果を追記するジャーナル。resume=True なら前回の記録を読んで続きから処理する
+    - memory_report_dir  : バッチ終了時にメモリの見積もり（{batch_id}.memory*.csv）を書き出すディレクトリ
+    - record_path        : 1 件ごとのイベントを追記するログ（event_replay で再生できる）
+    """
+    metrics_dir: Optional[Union[str, Path]] = None
+    phash_index_path: Optional[Union[str, Path]] = None
+    duplicate_distance: int = DEFAULT_MAX_DISTANCE
+    journal_path: Optional[Union[str, Path]] = None
+    resume: bool = False
+    memory_report_dir: Optional[Union[str, Path]] = None
+    record_path: Optional[Union[str, Path]] = None
+
+
+@dataclass
+class BatchHooks:
+    """
+    iter_texture_property_from_config が 1 件ごとに呼ぶ付加機能。None のものは使わない。
+    - metrics    : 段階ごとの所要時間と結果を記録する
+    - duplicates : (知覚ハッシュ索引, 距離)。ソース画像がほぼ同じ既存テクスチャを report["duplicates"] に入れる
+    - journal    : 1 件ごとの結果を追記する
+    - resume     : 前回のジャーナル。パラメータが同じテクスチャは読み込まずに report["skipped"]="journal" で返す
+    - memory     : 命名が正しいテクスチャを解決済みパラメータとソースの寸法で追加する
+    - recorder   : 1 件ごとに開始時刻・パラメータの指紋・結果・所要時間を記録する
+    """
+    metrics: Optional[PipelineMetrics] = None
+    duplicates: Optional[DuplicateCheck] = None
+    journal: Optional[ProgressJournal] = None
+    resume: Optional[JournalState] = None
+    memory: Optional[MemoryEstimator] = None
+    recorder: Optional[EventRecorder] = None
+    # close で書き出すときの出力先（open で作ったときのみ）
+    options: BatchOptions = field(default_factory=BatchOptions)
+
+    @classmethod
+    def open(cls, options: BatchOptions, texture_config_path: str, suffix_config_path: str,
+             config_path) -> "BatchHooks":
+        """options に従って各機能を用意する。終わったら close で保存・書き出しする。"""
+        options = replace(options, metrics_dir=options.metrics_dir or metrics_dir_from_env())
+        hooks = cls(options=options)
+        if options.metrics_dir:
+            hooks.metrics = PipelineMetrics()
+        if options.phash_index_path:
+            hooks.duplicates = (PerceptualHashIndex.load_or_new(options.phash_index_path), options.duplicate_distance)
+        if options.resume:
+            if not options.journal_path:
+                raise ValueError("resume にはジャーナルのパスが必要です")
+            hooks.resume = read_journal(options.journal_path)
+            print(f"[ProgressJournal] resuming: {len(hooks.resume.completed)} textures already done")
+        if options.journal_path:
+            hooks.journal = ProgressJournal(options.journal_path, append=options.resume)
+        if options.memory_report_dir:
+            hooks.memory = MemoryEstimator()
+        if options.record_path:
+            hooks.recorder = EventRecorder(options.record_path,
+                                           config_hashes(texture_config_path, suffix_config_path, config_path))
+        return hooks
+
+    @property
+    def needs_fingerprint(self) -> bool:
+        return self.journal is not None or self.resume is not None or self.recorder is not None
+
+    def now(self) -> float:
+        return self.recorder.now() if self.recorder is not None else 0.0
+
+    def begin(self) -> None:
+        if self.metrics is not None:
+            self.metrics.begin_batch()
+
+    def journaled(self, item: ResolvedTexture, config: str) -> bool:
+        """前回のジャーナルで、同じパラメータのまま適用済みなら True。"""
+        return self.resume is not None and item.ok and self.resume.is_done(item.path, config)
+
+    def applied(self, item: ResolvedTexture, report: Dict, config: str) -> None:
+        if self.journal is not None:
+            self.journal.record(item.path, status_of(report), config)
+
+    def estimate(self, item: ResolvedTexture, report: Dict) -> None:
+        if self.memory is not None and item.ok:
+            # unchanged / journal で読み飛ばしたものは適用結果に寸法が無いので、ヘッダを読み直す
+            width, height, channels, bit_depth = report.get("source_size") or _source_dimensions(item.path)
+            self.memory.add(item.path, item.match.keys_by_row[0], item.params, width=width, height=height,
+                            channels=channels, bit_depth=bit_depth)
+
+    def observe(self, item: ResolvedTexture, report: Dict, config: str, started: float,
+                resolve_seconds: float, apply_seconds: float) -> None:
+        if self.recorder is not None:
+            self.recorder.record(ImportEvent(started, item.path, config, status_of(report),
+                                             resolve_seconds + apply_seconds))
+        if self.metrics is not None:
+            self.metrics.observe_stage("resolve", resolve_seconds)
+            self.metrics.observe_stage("apply", apply_seconds)
+            self.metrics.observe_texture(item.match.keys_by_row if item.match.ok else None, report)
+
+    def close(self, batch_id: str) -> None:
+        """メモリの見積もり・索引・メトリクスを書き出し、ジャーナルとイベントログを閉じる。"""
+        options = self.options
+        if self.memory is not None and options.memory_report_dir:
+            write_budget_report(self.memory.estimate(), options.memory_report_dir, batch_id)
+        if self.journal is not None:
+            self.journal.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.duplicates is not None and options.phash_index_path:
+            self.duplicates[0].save(options.phash_index_path)
+        if self.metrics is not None:
+            self.metrics.end_batch()
+            if options.metrics_dir:
+                totals = process_registry()
+                totals.merge(self.metrics.registry)
+                self.metrics.registry.write(options.metrics_dir, batch_id, cumulative=totals)
+
+
+def iter_texture_property_from_config(texture_list: Union[Iterable[str], str, Path], texture_config_path: str,
+                                      suffix_config_path: str, config_path, *,
+                                      undo_mode: UndoMode = UndoMode.BATCH,
+                                      skip_unchanged: bool = True,
+                                      classify: bool = False,
+                                      rules: Optional[CompiledRules] = None,
+                                      hooks: Optional[BatchHooks] = None) -> Iterator[Tuple[str, Dict]]:
+    """
+    apply_texture_property_from_config のジェネレータ版。(テクスチャパス, 適用結果) を 1 件ずつ返す。
+    texture_list には任意の Iterable[str]、または改行区切りのパスリストファイル（.gz 可）を渡せる。
+    入力を一括で読み込まないので、数百万件でもメモリ使用量は一定。
+    Undo は undo_mode に従って記録する（既定はバッチ全体で 1 ステップ）。
+    skip_unchanged=True なら、ソースと設定が前回の適用時と同じテクスチャは読み飛ばす。
+    classify=True なら、サフィックス不正で読み飛ばすテクスチャのソース画像から texture_type の候補を出す。
+    rules を渡すと設定ファイルから作り直さずにそれを使う（予算で上書きしたルールなど）。
+    hooks（BatchHooks）を渡すと、メトリクス・重複確認・ジャーナル・メモリ見積もり・イベント記録を 1 件ごとに行う。
+    """
+    if rules is None:
+        rules = compile_rules(texture_config_path, suffix_config_path, config_path)
+    if hooks is None:
+        hooks = BatchHooks()
     config_data = Config()
     config_data = config_data.load(config_path)
     print(config_data)
-    for tex_path in texture_list:
-        print(f"---import begin  {tex_path} ---")
-        suffixes = collect_suffixes_from_path(tex_path, all_suffixes)
-        suffix_result = validator.validate_suffixes(suffixes, suffix_grid)
-        print(suffix_result)  
-        if suffix_result.ok:
-            print("Suffix OK")
-        else:
-            print(f"Suffix Error: {suffix_result.error}")
-            continue  # サフィックスエラーならインポートしない
-
-        # c++側で判定するのでコメントアウト
-        #is_valid_dir = validator.validate_directory(tex_path, run_directory)
-        #if is_valid_dir:
-        #     print("Valid Directory")
-        # else:
-        #     print("Invalid Directory")
-        #     print(f"---import end  {tex_path} ---")
-        #     continue
-        texture_settings = build_texture_config_params(suffixes, tex_settings_dict, suffix_settings)
-        print(f"import property: {texture_settings}")
-        importer = TextureConfigurator(params=texture_settings)
-        import_result_dict = importer.apply(tex_path)
-        print(import_result_dict)
-        if import_result_dict.get("ok"):
-            print("Import Succeeded")
-        else:
-            print(f"Import Failed: {import_result_dict}")
-        print(f"---import end  {tex_path} ---")
+    resolved = iter_resolved(iter_paths(texture_list), rules)
+    clock = time.perf_counter
+    with batch_transaction(undo_mode=undo_mode):
+        while True:
+            started = hooks.now()
+            t0 = clock()
+            item = next(resolved, None)
+            if item is None:
+                break
+            t1 = clock()
+            config = params_fingerprint(item.params) if item.ok and hooks.needs_fingerprint else ""
+            if hooks.journaled(item, config):
+                report = {"ok": True, "skipped": "journal"}
+            else:
+                report = _apply_resolved(item, rules, skip_unchanged=skip_unchanged, classify=classify,
+                                         duplicates=hooks.duplicates)
+                hooks.applied(item, report, config)
+            hooks.estimate(item, report)
+            t2 = clock()
+            hooks.observe(item, report, config, started, t1 - t0, t2 - t1)
+            yield item.path, report
+
+
+def apply_texture_property_from_config(texture_list: Union[Iterable[str], str, Path], texture_config_path: str,
+                                       suffix_config_path: str, config_path, *,
+                                       undo_mode: UndoMode = UndoMode.BATCH, skip_unchanged: bool = True,
+                                       profile: Optional[ProfileOptions] = None,
+                                       classify: bool = False,
+                                       budget_state_path: Optional[Union[str, Path]] = None,
+                                       options: Optional[BatchOptions] = None) -> int:
+    """
+    profile を省略した場合は環境変数（TEXNAMING_PROFILE など）に従ってプロファイルする。
+    budget_state_path があれば、適用前に memory_budgets に収まる max_in_game を選ぶ（バッチのパスは先に全件読む）。
+    options（BatchOptions）でメトリクス・重複確認・ジャーナル・メモリ見積もり・イベント記録を有効にする。
+    メトリクスは options.metrics_dir（省略時は TEXNAMING_METRICS_DIR）があればバッチ終了時に書き出す
+    （{batch_id}.metrics.json はこのバッチ分、tex_naming.prom はプロセス起動からの累計）。
+    """
+    hooks = BatchHooks.open(options or BatchOptions(), texture_config_path, suffix_config_path, config_path)
+    rules = None
+    if budget_state_path:
+        texture_list = list(iter_paths(texture_list))
+        rules = plan_memory_budget(texture_list, compile_rules(texture_config_path, suffix_config_path, config_path),
+                                   Config.load(config_path), budget_state_path)
+    with profile_batch(profile) as prof:
+        hooks.begin()
+        try:
+            for _path, _result in iter_texture_property_from_config(texture_list, texture_config_path,
+                                                                     suffix_config_path, config_path,
+                                                                     undo_mode=undo_mode, skip_unchanged=skip_unchanged,
+                                                                     classify=classify, rules=rules, hooks=hooks):
+                pass
+        finally:
+            hooks.close(prof.batch_id)
     return 0
 
 
+def schedule_texture_property_from_config(texture_list: List[str], texture_config_path: str, suffix_config_path: str,
+                                          config_path, *, budget_ms: float = 8.0,
+                                          undo_mode: UndoMode = UndoMode.PER_TEXTURE,
+                                          watcher: Optional[ConfigWatcher] = None) -> TickBudgetScheduler:
+    """
+    apply_texture_property_from_config のインクリメンタル版。
+    各 tick の予算（budget_ms）内で少しずつ処理し、エディタ UI を固めない。
+    戻り値のスケジューラで pause / resume / cancel ができる。
+    トランザクションはフレームをまたげないため、undo_mode=BATCH は 1 tick 分を 1 ステップにまとめる。
+    watcher（ConfigWatcher）を渡すと、処理中に設定が変更されても次のテクスチャから新しいルールを使う。
+    """
+    if watcher is None:
+        rules = compile_rules(texture_config_path, suffix_config_path, config_path)  # 不正ならここで例外
+
+    def _process(tex_path: str) -> Dict:
+        return _apply_texture(tex_path, watcher.rules if watcher is not None else rules)
+
+    def _on_finished(s: TickBudgetScheduler) -> None:
+        print(f"[TextureConfigurator] tick batch {s.state.name}: processed={s.processed_total}, errors={s.error_total}")
+
+    scheduler = TickBudgetScheduler(_process, budget_ms=budget_ms, on_finished=_on_finished)
+    scheduler.enqueue(texture_list)
+    start_tick_batch(scheduler, tick_context=lambda: batch_transaction(undo_mode=undo_mode, log=False))
+    return scheduler
+
+
 if __name__ == "__main__":
     parser = build_parser()
     args = parser.parse_args()
-    textures = [args.texture_path]
+    if args.path_list:
+        textures = args.path_list
+    elif args.texture_path:
+        textures = [args.texture_path]
+    else:
+        parser.error("texture_path か --path-list のどちらかを指定してください")
+    if args.resume and not args.journal:
+        parser.error("--resume には --journal が必要です")
+    profile = ProfileOptions.from_env()
+    if args.profile:
+        profile.mode = args.profile
+    if args.profile_dir:
+        profile.out_dir = Path(args.profile_dir)
+    if args.tracemalloc:
+        profile.tracemalloc = True
     # execute_texture_config() 呼び出し（戻り値が int ならそれを終了コードに、そうでなければ 1）
     try:
         ret = apply_texture_property_from_config(
             texture_list=textures,
             texture_config_path=args.texture_config_path,
             suffix_config_path=args.suffix_config_path,
-            config_path=args.config_path
+            config_path=args.config_path,
+            undo_mode=UndoMode[args.undo.upper().replace("-", "_")],
+            skip_unchanged=not args.force,
+            profile=profile,
+            classify=args.classify,
+            budget_state_path=args.budget_state,
+            options=BatchOptions(
+                metrics_dir=args.metrics_dir,
+                phash_index_path=args.phash_index,
+                duplicate_distance=args.duplicate_distance,
+                journal_path=args.journal,
+                resume=args.resume,
+                memory_report_dir=args.memory_report,
+                record_path=args.record,
+            ),
         )
         sys.exit(int(ret) if isinstance(ret, int) else 1)
     except SystemExit: